@@ -0,0 +1 @@
+"""JsonKlingonizer 基准测试套件"""
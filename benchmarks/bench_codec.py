@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+JSON 编解码基准测试
+对每个可用后端（orjson / ujson / json）测量解析、格式化输出和紧凑输出的耗时，
+并验证格式化输出与标准库 json.dump(indent=2, ensure_ascii=False) 逐字节一致。
+任何后端出现不一致时以非零状态退出。
+
+用法:
+    python benchmarks/bench_codec.py --size 20000
+    python benchmarks/bench_codec.py --size 100000 --backend orjson
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import ROOT, environment, measure, write_result
+from benchmarks.locale_generator import generate_locale
+from src import codec
+
+# 覆盖快速后端容易与标准库不一致的情况
+EDGE_CASES = {
+    'floats': [0.1, 1.5, -0.0, 1e-07, 1e+16, 1e22, 123456789.0],
+    'big_int': 2 ** 70,
+    'escapes': 'tab\t quote" backslash\\ slash/ \x00 \x7f   é 😀',
+    'empty': [{}, [], ''],
+    'nested': {'a': [1, [2, {}]], 'b': None, 'c': True},
+    # 标准库接受并原样写出，orjson 会写成 null
+    'non_finite': {'ratio': float('nan'), 'big': float('inf'), 'small': float('-inf'), 'none': None},
+}
+
+
+def available_backends() -> list:
+    """已安装的后端"""
+    names = []
+    for name in codec.BACKENDS:
+        try:
+            codec.set_backend(name)
+            names.append(name)
+        except ImportError:
+            pass
+    codec.set_backend()
+    return names
+
+
+def corpora(args) -> dict:
+    """测试语料：合成语言文件、data/input 下的文件和边界用例"""
+    documents = {
+        'generated': generate_locale(size=args.size, depth=args.depth, seed=args.seed),
+        'edge_cases': EDGE_CASES,
+    }
+    for path in sorted((ROOT / 'data' / 'input').glob('*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            documents[f"input/{path.name}"] = json.load(f)
+    return documents
+
+
+def run(args) -> dict:
+    """逐个后端测量并校验一致性"""
+    documents = corpora(args)
+    generated = documents['generated']
+    source = json.dumps(generated, indent=2, ensure_ascii=False).encode('utf-8')
+    backends = [args.backend] if args.backend else available_backends()
+
+    results = {}
+    mismatches = []
+    for name in backends:
+        codec.set_backend(name)
+        for label, document in documents.items():
+            expected = json.dumps(document, indent=2, ensure_ascii=False).encode('utf-8')
+            if codec.dumps_bytes(document) != expected:
+                mismatches.append(f"{name}: {label}")
+            # 按标准库序列化结果比较（NaN != NaN）
+            if json.dumps(codec.loads(codec.dumps_bytes(document, compact=True))) != json.dumps(document):
+                mismatches.append(f"{name}: {label} (compact round-trip)")
+        results[name] = {
+            'loads': measure(lambda: codec.loads(source), repeat=args.repeat, items=args.size),
+            'dumps_pretty': measure(lambda: codec.dumps_bytes(generated), repeat=args.repeat, items=args.size),
+            'dumps_compact': measure(lambda: codec.dumps_bytes(generated, compact=True),
+                                     repeat=args.repeat, items=args.size),
+            'compact_bytes': len(codec.dumps_bytes(generated, compact=True)),
+        }
+    codec.set_backend()
+
+    return {
+        'benchmark': 'codec',
+        'environment': environment(),
+        'params': {'size': args.size, 'depth': args.depth, 'seed': args.seed, 'repeat': args.repeat,
+                   'pretty_bytes': len(source)},
+        'results': results,
+        'mismatches': mismatches,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='JSON 编解码后端基准测试和一致性校验')
+    parser.add_argument('--size', type=int, default=20000, help='合成文件的字符串数量 (默认: 20000)')
+    parser.add_argument('--depth', type=int, default=3, help='嵌套深度 (默认: 3)')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子 (默认: 0)')
+    parser.add_argument('--repeat', type=int, default=3, help='计时重复次数 (默认: 3)')
+    parser.add_argument('--backend', choices=codec.BACKENDS, help='只测试指定后端')
+    parser.add_argument('-o', '--output', type=str, help='结果 JSON 路径（默认写入 benchmarks/results/）')
+    args = parser.parse_args()
+
+    result = run(args)
+    print(f"📊 {args.size} 个字符串，格式化输出 {result['params']['pretty_bytes']} 字节")
+    for name, res in result['results'].items():
+        print(f"   {name:<7} loads {res['loads']['seconds'] * 1000:8.2f}ms | "
+              f"pretty {res['dumps_pretty']['seconds'] * 1000:8.2f}ms | "
+              f"compact {res['dumps_compact']['seconds'] * 1000:8.2f}ms ({res['compact_bytes']} 字节)")
+    path = write_result('codec', result, args.output)
+    print(f"💾 结果已保存到: {path}")
+    if result['mismatches']:
+        print("❌ 格式化输出与标准库不一致:")
+        for item in result['mismatches']:
+            print(f"   {item}")
+        return 1
+    print("✅ 所有后端的格式化输出与标准库逐字节一致")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
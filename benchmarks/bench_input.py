@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+输入读取基准测试
+比较几种读取方式的耗时和峰值 RSS：
+- text：文本模式读取并 json.load（旧实现，解码后的字符串和解析树同时驻留内存）
+- bytes：读取全部字节后用 codec 解析（与 mmap 使用相同后端，用于区分读取方式和解析后端的影响）
+- mmap：SourceDocument 内存映射后直接解析映射的字节
+- mmap+spans：在 mmap 基础上扫描所有字符串值的字节范围
+
+每种方式在独立子进程中运行，峰值 RSS 取自子进程的 ru_maxrss。
+注意映射的文件页面在被访问后也计入 RSS，但它们是可由内核随时回收的干净页缓存，
+而 text/bytes 方式复制出的缓冲区是匿名内存。
+设置 JSONKLINGONIZER_JSON_BACKEND=json 可比较标准库后端（子进程继承环境变量）。
+
+用法:
+    python benchmarks/bench_input.py --target-mb 100
+    python benchmarks/bench_input.py --target-mb 1024 --keep /tmp/locale-1g.json   # 1 GB 合成文件
+    python benchmarks/bench_input.py --input /tmp/locale-1g.json                   # 复用已生成的文件
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import environment, write_result
+from benchmarks.locale_generator import generate_locale
+
+MODES = ('text', 'bytes', 'mmap', 'mmap+spans')
+
+
+def write_large_file(path: Path, target_mb: float, chunk_size: int, seed: int) -> int:
+    """
+    流式写入指定大小的合成语言文件（重复拼接同一块，避免生成时占用大量内存）
+
+    Returns:
+        文件字节数
+    """
+    chunk = json.dumps(generate_locale(size=chunk_size, seed=seed), indent=2, ensure_ascii=False)
+    chunk = chunk.replace('\n', '\n  ').encode('utf-8')
+    target = int(target_mb * 1024 * 1024)
+    written = 0
+    with open(path, 'wb') as f:
+        f.write(b'{\n')
+        index = 0
+        while written < target or index == 0:
+            prefix = b',\n' if index else b''
+            part = prefix + f'  "part_{index}": '.encode('utf-8') + chunk
+            f.write(part)
+            written += len(part)
+            index += 1
+        f.write(b'\n}\n')
+    return path.stat().st_size
+
+
+def child(mode: str, file_path: str) -> None:
+    """子进程：按指定方式读取文件并输出耗时和 RSS"""
+    from src import codec
+    from src.source import SourceDocument
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    strings = None
+    if mode == 'text':
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    elif mode == 'bytes':
+        with open(file_path, 'rb') as f:
+            data = codec.loads(f.read())
+    else:
+        with SourceDocument(file_path) as source:
+            data = source.parse()
+            if mode == 'mmap+spans':
+                strings = len(source.string_spans())
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        'seconds': round(elapsed, 4),
+        'baseline_rss_kb': baseline,
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'top_level_keys': len(data) if isinstance(data, dict) else None,
+        'strings': strings,
+        'backend': codec.backend_name(),
+    }))
+
+
+def run(args, file_path: Path) -> dict:
+    """逐个模式启动子进程测量"""
+    results = {}
+    for mode in args.modes:
+        output = subprocess.check_output(
+            [sys.executable, __file__, '--child', mode, str(file_path)], text=True
+        )
+        res = json.loads(output)
+        res['delta_rss_mb'] = round((res['peak_rss_kb'] - res['baseline_rss_kb']) / 1024, 1)
+        results[mode] = res
+    return {
+        'benchmark': 'input',
+        'environment': environment(),
+        'params': {'file_bytes': file_path.stat().st_size, 'chunk_size': args.chunk_size, 'seed': args.seed},
+        'results': results,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='比较文本读取与内存映射读取的耗时和峰值 RSS')
+    parser.add_argument('--target-mb', type=float, default=100, help='合成文件大小 MB (默认: 100)')
+    parser.add_argument('--chunk-size', type=int, default=20000, help='每块的字符串数量 (默认: 20000)')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子 (默认: 0)')
+    parser.add_argument('--input', type=str, help='使用已有的输入文件（不生成）')
+    parser.add_argument('--keep', type=str, help='将生成的文件保存到此路径')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES), help='要测量的读取方式')
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'FILE'), help=argparse.SUPPRESS)
+    parser.add_argument('-o', '--output', type=str, help='结果 JSON 路径（默认写入 benchmarks/results/）')
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.input:
+            file_path = Path(args.input)
+        else:
+            file_path = Path(args.keep) if args.keep else Path(tmp) / 'large.json'
+            print(f"📝 正在生成 {args.target_mb} MB 合成文件: {file_path}")
+            write_large_file(file_path, args.target_mb, args.chunk_size, args.seed)
+        result = run(args, file_path)
+
+    size_mb = result['params']['file_bytes'] / 1024 / 1024
+    print(f"📊 输入文件 {size_mb:.1f} MB")
+    for mode, res in result['results'].items():
+        print(f"   {mode:<11} [{res['backend']}] {res['seconds']:8.2f}s | 峰值 RSS {res['peak_rss_kb'] / 1024:8.1f} MB "
+              f"(读取增加 {res['delta_rss_mb']} MB)")
+    path = write_result('input', result, args.output)
+    print(f"💾 结果已保存到: {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+多关键词过滤基准
+1. 逐字符串匹配：编译后的多关键词匹配器与逐个关键词 `in` 判断的耗时
+2. 目录扫描：生成一组合成语言文件（只有少数包含关键词），比较开启 / 关闭原始字节预过滤时
+   "还有哪些待翻译" 扫描的总耗时
+
+用法:
+    python benchmarks/bench_keywords.py --files 1000 --size 1000 --marked-ratio 0.01
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import environment, measure, write_result
+from benchmarks.locale_generator import generate_locale
+from src.batch import BatchProcessor
+from src.extractor import JSONExtractor
+from src.keywords import KeywordFilter
+
+KEYWORDS = ['%TODO', '%FIXME', '[untranslated]']
+
+
+def bench_matching(size: int, repeat: int) -> dict:
+    """逐字符串匹配的耗时"""
+    extractor = JSONExtractor()
+    extractor._extract_recursive(generate_locale(size=size, seed=0), '')
+    texts = [item['original'] for item in extractor.values]
+    matcher = KeywordFilter(KEYWORDS)
+    return {
+        'keyword_filter': measure(lambda: [matcher.find(text) for text in texts], repeat=repeat, items=len(texts)),
+        'any_in': measure(lambda: [[k for k in KEYWORDS if k in text] for text in texts],
+                          repeat=repeat, items=len(texts)),
+    }
+
+
+def bench_scan(args) -> dict:
+    """目录扫描的耗时"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs = []
+        marked = max(1, int(args.files * args.marked_ratio))
+        for index in range(args.files):
+            document = generate_locale(size=args.size, seed=index)
+            if index % (args.files // marked or 1) == 0:
+                document['todo'] = f"{KEYWORDS[index % len(KEYWORDS)]} Export data"
+            path = Path(tmp) / f"locale_{index:04d}.json"
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(document, f, indent=2, ensure_ascii=False)
+            inputs.append(str(path))
+
+        for prefilter in (False, True):
+            processor = BatchProcessor(workers=0, filter_keyword=KEYWORDS, prefilter=prefilter)
+            start = time.perf_counter()
+            scanned = processor.scan(inputs)
+            elapsed = time.perf_counter() - start
+            results['prefilter' if prefilter else 'parse_all'] = {
+                'seconds': round(elapsed, 4),
+                'files_per_sec': round(args.files / elapsed, 1) if elapsed > 0 else None,
+                'matched_files': sum(1 for _, values in scanned if values),
+            }
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='测量多关键词过滤和原始字节预过滤')
+    parser.add_argument('--files', type=int, default=1000, help='文件数量 (默认: 1000)')
+    parser.add_argument('--size', type=int, default=1000, help='每个文件的字符串数量 (默认: 1000)')
+    parser.add_argument('--marked-ratio', type=float, default=0.01, help='包含关键词的文件比例 (默认: 0.01)')
+    parser.add_argument('--repeat', type=int, default=3, help='逐字符串匹配的重复次数 (默认: 3)')
+    parser.add_argument('-o', '--output', type=str, help='结果 JSON 路径（默认写入 benchmarks/results/）')
+    args = parser.parse_args()
+
+    matching = bench_matching(args.size * 100, args.repeat)
+    scan = bench_scan(args)
+    print(f"📊 逐字符串匹配（{len(KEYWORDS)} 个关键词）")
+    for name, res in matching.items():
+        print(f"   {name:<16} {res['seconds'] * 1000:8.1f} ms | {res['items_per_sec']:>12,.0f} 个/秒")
+    print(f"📊 扫描 {args.files} 个文件 × {args.size} 个字符串")
+    for name, res in scan.items():
+        print(f"   {name:<16} {res['seconds']:8.2f} s | {res['files_per_sec']:>8} 文件/秒 | 命中 {res['matched_files']} 个文件")
+
+    result = {
+        'benchmark': 'keywords',
+        'environment': environment(),
+        'params': {'files': args.files, 'size': args.size, 'marked_ratio': args.marked_ratio,
+                   'keywords': KEYWORDS},
+        'results': {'matching': matching, 'scan': scan},
+    }
+    path = write_result('keywords', result, args.output)
+    print(f"💾 结果已保存到: {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+网络路径基准测试
+在本地服务桩上运行 LibreTranslator / KlingonTranslator 的 translate_batch，
+测量吞吐量、重试次数和服务端观察到的并发度，无需访问外网。
+
+用法:
+    python benchmarks/bench_network.py --translator libre --count 200 --latency normal:20:5
+    python benchmarks/bench_network.py --translator klingon --error-ratio 0.1 --rate-limit-ratio 0.05
+    python benchmarks/bench_network.py --translator libre --clients 8 --max-rps 100
+"""
+
+import argparse
+import copy
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import environment, quiet, write_result
+from benchmarks.locale_generator import generate_locale
+from benchmarks.stub_server import StubTranslationServer, default_transform
+from src.extractor import JSONExtractor
+from src.translators import create_translator
+
+
+def build_config(server: StubTranslationServer, max_retries: int, backoff_factor: float) -> dict:
+    """生成指向服务桩的配置（放开客户端速率限制）"""
+    return {
+        'api': {
+            'base_url': server.funtranslations_url,
+            'libre_url': server.libre_url,
+            'libre_api_key': None,
+            'rate_limit': {'requests_per_hour': 10 ** 9, 'requests_per_day': 10 ** 9, 'wait_on_limit': True},
+            'retry': {'max_retries': max_retries, 'backoff_factor': backoff_factor},
+        },
+    }
+
+
+def run(args) -> dict:
+    """启动服务桩并执行翻译"""
+    document = generate_locale(size=args.count, duplicate_ratio=0.0, non_translatable_ratio=0.0, seed=args.seed)
+    extractor = JSONExtractor()
+    extractor.values = []
+    extractor._extract_recursive(document, "")
+    values = extractor.get_values()
+
+    server = StubTranslationServer(latency=args.latency, rate_limit_ratio=args.rate_limit_ratio,
+                                   retry_after=args.retry_after, error_ratio=args.error_ratio,
+                                   max_rps=args.max_rps, seed=args.seed)
+    with server:
+        config = build_config(server, args.max_retries, args.backoff_factor)
+        chunks = [values[i::args.clients] for i in range(args.clients)]
+        results = [None] * args.clients
+
+        def worker(index: int) -> None:
+            translator = create_translator(args.translator, config)
+            batch = copy.deepcopy(chunks[index])
+            results[index] = translator.translate_batch(batch, 'en', 'zh')
+
+        start = time.perf_counter()
+        with quiet():
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.clients)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        elapsed = time.perf_counter() - start
+        stats = server.get_stats()
+
+    translated = [item for chunk in results if chunk for item in chunk]
+    succeeded = sum(1 for item in translated
+                    if item['translated'] == default_transform(item['original'], 'en', 'zh'))
+    return {
+        'benchmark': 'network',
+        'environment': environment(),
+        'params': {
+            'translator': args.translator,
+            'count': args.count,
+            'clients': args.clients,
+            'latency': args.latency,
+            'rate_limit_ratio': args.rate_limit_ratio,
+            'retry_after': args.retry_after,
+            'error_ratio': args.error_ratio,
+            'max_rps': args.max_rps,
+            'max_retries': args.max_retries,
+            'seed': args.seed,
+        },
+        'results': {
+            'seconds': round(elapsed, 4),
+            'texts_per_sec': round(len(values) / elapsed, 1) if elapsed > 0 else None,
+            'succeeded': succeeded,
+            'failed': len(values) - succeeded,
+            'server': stats,
+        },
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='在本地服务桩上测试网络翻译路径')
+    parser.add_argument('--translator', choices=['libre', 'klingon'], default='libre', help='翻译器 (默认: libre)')
+    parser.add_argument('--count', type=int, default=100, help='字符串数量 (默认: 100)')
+    parser.add_argument('--clients', type=int, default=1, help='并发客户端数量 (默认: 1)')
+    parser.add_argument('--latency', type=str, default='fixed:5', help='服务端延迟分布 (默认: fixed:5)')
+    parser.add_argument('--rate-limit-ratio', type=float, default=0.0, help='随机 429 比例 (默认: 0)')
+    parser.add_argument('--retry-after', type=int, default=1, help='429 的 Retry-After 秒数 (默认: 1)')
+    parser.add_argument('--error-ratio', type=float, default=0.0, help='随机 5xx 比例 (默认: 0)')
+    parser.add_argument('--max-rps', type=float, help='服务端每秒最大请求数')
+    parser.add_argument('--max-retries', type=int, default=3, help='客户端最大重试次数 (默认: 3)')
+    parser.add_argument('--backoff-factor', type=float, default=0.1, help='客户端退避因子 (默认: 0.1)')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子 (默认: 0)')
+    parser.add_argument('-o', '--output', type=str, help='结果 JSON 路径（默认写入 benchmarks/results/）')
+    args = parser.parse_args()
+
+    result = run(args)
+    res = result['results']
+    server = res['server']
+    print(f"📊 {args.translator}: {args.count} 个字符串, {args.clients} 个客户端")
+    print(f"   耗时 {res['seconds']:.2f}s | {res['texts_per_sec']} 条/秒 | 成功 {res['succeeded']} | 失败 {res['failed']}")
+    print(f"   服务端: {server['requests']} 次请求 | 状态码 {server['status_codes']} | 最大并发 {server['max_concurrency']}")
+    path = write_result('network', result, args.output)
+    print(f"💾 结果已保存到: {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
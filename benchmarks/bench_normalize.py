@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+键规范化命中率基准
+统计语料在冷缓存下一次完整运行需要发出的请求数（= 不同缓存键数量），
+比较原始键、规范化键（NFC + 剥离首尾空白/标点）和再加大小写折叠三种方式，
+报告命中率（1 - 请求数 / 字符串数）和节省的请求数。
+
+默认语料为 data/input 下的所有 JSON 文件（合并统计，与批量处理共享缓存时一致），
+也可以追加其他文件或目录。
+
+用法:
+    python benchmarks/bench_normalize.py
+    python benchmarks/bench_normalize.py path/to/locales/ --per-file
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import ROOT, environment, write_result
+from src.extractor import JSONExtractor
+from src.normalizer import KeyNormalizer
+
+MODES = {
+    'raw': None,
+    'normalized': KeyNormalizer(casefold=False),
+    'normalized+casefold': KeyNormalizer(casefold=True),
+}
+
+
+def collect_files(paths: list) -> list:
+    """展开文件和目录"""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(path.rglob('*.json')))
+        elif path.is_file():
+            files.append(path)
+    return files
+
+
+def key_counts(texts: list) -> dict:
+    """各方式下的不同键数量"""
+    counts = {}
+    for mode, normalizer in MODES.items():
+        if normalizer is None:
+            keys = set(texts)
+        else:
+            keys = {normalizer.split(text)[1] for text in texts}
+        counts[mode] = len(keys)
+    return counts
+
+
+def summarize(texts: list) -> dict:
+    """单个语料的统计"""
+    counts = key_counts(texts)
+    total = len(texts)
+    return {
+        'strings': total,
+        'requests': counts,
+        'hit_rate': {mode: round(1 - count / total, 4) if total else 0.0 for mode, count in counts.items()},
+        'saved_vs_raw': {mode: counts['raw'] - count for mode, count in counts.items()},
+    }
+
+
+def run(args) -> dict:
+    """统计所有语料"""
+    files = collect_files(args.paths or [ROOT / 'data' / 'input'])
+    all_texts = []
+    per_file = {}
+    for path in files:
+        _, values = JSONExtractor().extract_from_file(str(path))
+        texts = [item['original'] for item in values]
+        all_texts.extend(texts)
+        if args.per_file:
+            per_file[str(path)] = summarize(texts)
+    return {
+        'benchmark': 'normalize',
+        'environment': environment(),
+        'params': {'files': [str(path) for path in files]},
+        'results': {'combined': summarize(all_texts), 'per_file': per_file},
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='统计键规范化对缓存命中率的提升')
+    parser.add_argument('paths', nargs='*', help='JSON 文件或目录（默认: data/input）')
+    parser.add_argument('--per-file', action='store_true', help='同时输出每个文件的统计')
+    parser.add_argument('-o', '--output', type=str, help='结果 JSON 路径（默认写入 benchmarks/results/）')
+    args = parser.parse_args()
+
+    result = run(args)
+    combined = result['results']['combined']
+    print(f"📊 {len(result['params']['files'])} 个文件，{combined['strings']} 个字符串")
+    for mode in MODES:
+        print(f"   {mode:<20} 请求 {combined['requests'][mode]:>7} | 命中率 {combined['hit_rate'][mode]:6.1%} | "
+              f"比原始键少 {combined['saved_vs_raw'][mode]} 次请求")
+    for path, stats in result['results']['per_file'].items():
+        rates = ' / '.join(f"{stats['hit_rate'][mode]:.1%}" for mode in MODES)
+        print(f"   {path}: {stats['strings']} 个字符串，命中率 {rates}")
+    path = write_result('normalize', result, args.output)
+    print(f"💾 结果已保存到: {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+输出写出基准测试
+比较 rebuild + save_to_file（重新序列化整个文档）与 save_preserving_format（按字节范围拼接）
+在不同变更比例下的耗时，并做往返检查：
+- 拼接输出解析后与 rebuild 结果相同
+- 没有值变化时拼接输出与源文件逐字节相同
+- 未变化的值在输出中保持源文件中的原始字节（对 data/input 下手工维护的文件也做检查）
+任何检查失败时以非零状态退出。
+
+用法:
+    python benchmarks/bench_output.py --size 20000
+    python benchmarks/bench_output.py --size 100000 --changed-ratio 0.01 0.1 1.0
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import ROOT, environment, measure, write_result
+from benchmarks.locale_generator import generate_locale
+from src.extractor import JSONExtractor
+from src.rebuilder import JSONRebuilder
+
+
+def translate(values: list, ratio: float) -> list:
+    """按比例修改值（反转字符串），其余保持原文"""
+    step = max(1, round(1 / ratio)) if ratio > 0 else None
+    for index, item in enumerate(values):
+        changed = step is not None and index % step == 0
+        item['translated'] = item['original'][::-1] + '!' if changed else item['original']
+    return values
+
+
+def check_round_trip(source: Path, output: Path, values: list, original_json) -> list:
+    """往返检查，返回失败原因列表"""
+    problems = []
+    raw = source.read_bytes()
+    rebuilt = JSONRebuilder(original_json).rebuild(values)
+    with open(output, 'r', encoding='utf-8') as f:
+        if json.load(f) != rebuilt:
+            problems.append(f"{source.name}: 拼接输出与 rebuild 结果不同")
+
+    # 没有变化时应与源文件逐字节相同
+    unchanged = [dict(item, translated=item['original']) for item in values]
+    JSONRebuilder(original_json).save_preserving_format(str(source), unchanged, str(output))
+    if output.read_bytes() != raw:
+        problems.append(f"{source.name}: 无变化时输出与源文件不同")
+    return problems
+
+
+def run(args) -> dict:
+    """执行测量和检查"""
+    results = {}
+    problems = []
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / 'source.json'
+        output = Path(tmp) / 'output.json'
+        document = generate_locale(size=args.size, seed=args.seed)
+        with open(source, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2, ensure_ascii=False)
+
+        extractor = JSONExtractor(track_spans=True)
+        original_json, values = extractor.extract_from_file(str(source))
+        rebuilder = JSONRebuilder(original_json)
+
+        for ratio in args.changed_ratio:
+            translate(values, ratio)
+
+            def reserialize():
+                rebuilder.save_to_file(rebuilder.rebuild(values), str(output))
+
+            def splice():
+                rebuilder.save_preserving_format(str(source), values, str(output))
+
+            results[str(ratio)] = {
+                'changed': sum(1 for item in values if item['translated'] != item['original']),
+                'json_dump': measure(reserialize, repeat=args.repeat, items=len(values)),
+                'splice': measure(splice, repeat=args.repeat, items=len(values)),
+            }
+            splice()
+            problems.extend(check_round_trip(source, output, values, original_json))
+
+        # 手工维护的输入文件：未变化的值保持原始写法
+        for path in sorted((ROOT / 'data' / 'input').glob('*.json')):
+            extractor = JSONExtractor(track_spans=True)
+            original_json, values = extractor.extract_from_file(str(path))
+            translate(values, 0.5)
+            JSONRebuilder(original_json).save_preserving_format(str(path), values, str(output))
+            problems.extend(check_round_trip(path, output, values, original_json))
+
+    return {
+        'benchmark': 'output',
+        'environment': environment(),
+        'params': {'size': args.size, 'seed': args.seed, 'repeat': args.repeat,
+                   'changed_ratio': args.changed_ratio},
+        'results': results,
+        'problems': problems,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='比较重新序列化与保留格式拼接的写出耗时，并做往返检查')
+    parser.add_argument('--size', type=int, default=20000, help='字符串数量 (默认: 20000)')
+    parser.add_argument('--changed-ratio', type=float, nargs='+', default=[0.01, 0.1, 1.0],
+                        help='被翻译修改的值所占比例 (默认: 0.01 0.1 1.0)')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子 (默认: 0)')
+    parser.add_argument('--repeat', type=int, default=3, help='计时重复次数 (默认: 3)')
+    parser.add_argument('-o', '--output', type=str, help='结果 JSON 路径（默认写入 benchmarks/results/）')
+    args = parser.parse_args()
+
+    result = run(args)
+    print(f"📊 {args.size} 个字符串")
+    for ratio, res in result['results'].items():
+        print(f"   变更 {float(ratio):>6.1%} ({res['changed']:>6} 个) | "
+              f"json.dump {res['json_dump']['seconds'] * 1000:8.2f}ms | "
+              f"拼接 {res['splice']['seconds'] * 1000:8.2f}ms")
+    path = write_result('output', result, args.output)
+    print(f"💾 结果已保存到: {path}")
+    if result['problems']:
+        print("❌ 往返检查失败:")
+        for problem in result['problems']:
+            print(f"   {problem}")
+        return 1
+    print("✅ 往返检查通过")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+多文件并行基准测试
+生成一组合成语言文件，用 BatchProcessor 在不同工作进程数下完成提取 -> 翻译（离线翻译器）-> 重建 -> 保存，
+报告总耗时和相对 1 个工作进程的加速比。workers=0 表示不使用进程池的串行基线。
+
+加速比受 CPU 核数限制，结果中记录了 cpu_count。
+
+用法:
+    python benchmarks/bench_parallel.py --files 32 --size 5000
+    python benchmarks/bench_parallel.py --files 200 --size 2000 --workers 0 1 2 4 8
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import environment, quiet, write_result
+from benchmarks.locale_generator import generate_locale
+from src.batch import BatchProcessor, collect_jobs
+from src.translators import create_translator
+
+# 离线翻译器所需的最小配置
+OFFLINE_CONFIG = {'api': {'retry': {'max_retries': 1, 'backoff_factor': 1}}}
+
+
+def run(args) -> dict:
+    """生成文件并按工作进程数逐个测量"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        input_dir = Path(tmp) / 'input'
+        input_dir.mkdir()
+        for index in range(args.files):
+            document = generate_locale(size=args.size, seed=args.seed + index)
+            with open(input_dir / f"locale_{index:04d}.json", 'w', encoding='utf-8') as f:
+                json.dump(document, f, indent=2, ensure_ascii=False)
+
+        for workers in args.workers:
+            output_dir = Path(tmp) / f"output_{workers}"
+            jobs = collect_jobs(str(input_dir), str(output_dir))
+            translator = create_translator(args.translator, OFFLINE_CONFIG)
+            processor = BatchProcessor(translator, 'en', 'xx', workers=workers)
+            start = time.perf_counter()
+            with quiet():
+                processor.process(jobs)
+            elapsed = time.perf_counter() - start
+            results[str(workers)] = {
+                'seconds': round(elapsed, 4),
+                'files_per_sec': round(args.files / elapsed, 2) if elapsed > 0 else None,
+                'values_per_sec': round(args.files * args.size / elapsed, 1) if elapsed > 0 else None,
+            }
+
+    baseline = results.get('1', {}).get('seconds')
+    for res in results.values():
+        res['speedup'] = round(baseline / res['seconds'], 2) if baseline else None
+
+    return {
+        'benchmark': 'parallel',
+        'environment': dict(environment(), cpu_count=os.cpu_count()),
+        'params': {'files': args.files, 'size': args.size, 'translator': args.translator, 'seed': args.seed},
+        'results': results,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='测量多文件批处理在不同工作进程数下的扩展性')
+    parser.add_argument('--files', type=int, default=32, help='文件数量 (默认: 32)')
+    parser.add_argument('--size', type=int, default=5000, help='每个文件的字符串数量 (默认: 5000)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 1, 2, 4, 8],
+                        help='要测量的工作进程数 (默认: 0 1 2 4 8)')
+    parser.add_argument('--translator', choices=['flip', 'reverse'], default='flip', help='离线翻译器 (默认: flip)')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子 (默认: 0)')
+    parser.add_argument('-o', '--output', type=str, help='结果 JSON 路径（默认写入 benchmarks/results/）')
+    args = parser.parse_args()
+
+    result = run(args)
+    print(f"📊 {args.files} 个文件 × {args.size} 个字符串（{os.cpu_count()} 个 CPU 核）")
+    for workers, res in result['results'].items():
+        label = '串行' if workers == '0' else f"{workers} 进程"
+        print(f"   {label:<6} {res['seconds']:8.2f}s | {res['files_per_sec']:>7} 文件/秒 | 加速比 {res['speedup']}")
+    path = write_result('parallel', result, args.output)
+    print(f"💾 结果已保存到: {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
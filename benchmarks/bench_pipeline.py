@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+流水线基准测试
+用合成语言文件分别测量各阶段的耗时、吞吐量和峰值内存：
+extract、skip_filter、cache_load、cache_lookup、translate（离线 flip/reverse 翻译器）、rebuild、save。
+结果写为 JSON，可用 benchmarks/compare.py 对比不同版本。
+
+用法:
+    python benchmarks/bench_pipeline.py --size 20000
+    python benchmarks/bench_pipeline.py --size 100000 --depth 5 --duplicate-ratio 0.4 -o before.json
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import environment, measure, quiet, write_result
+from benchmarks.locale_generator import generate_locale
+from src.extractor import JSONExtractor
+from src.rebuilder import JSONRebuilder
+from src.translators import create_translator
+from src.utils import CacheManager, TieredCache
+
+# 离线翻译器所需的最小配置
+OFFLINE_CONFIG = {'api': {'retry': {'max_retries': 1, 'backoff_factor': 1}}}
+
+
+def run(args) -> dict:
+    """执行全部阶段并返回结果"""
+    params = {
+        'size': args.size,
+        'depth': args.depth,
+        'width': args.width,
+        'duplicate_ratio': args.duplicate_ratio,
+        'placeholder_density': args.placeholder_density,
+        'seed': args.seed,
+        'cache_hit_ratio': args.cache_hit_ratio,
+        'repeat': args.repeat,
+    }
+    document = generate_locale(size=args.size, depth=args.depth, width=args.width,
+                               duplicate_ratio=args.duplicate_ratio,
+                               placeholder_density=args.placeholder_density, seed=args.seed)
+    stages = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_file = Path(tmp) / 'input.json'
+        output_file = Path(tmp) / 'output.json'
+        with open(input_file, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2, ensure_ascii=False)
+        params['input_bytes'] = input_file.stat().st_size
+
+        # extract：读取 + 解析 + 递归提取
+        extractor = JSONExtractor()
+        stages['extract'] = measure(lambda: extractor.extract_from_file(str(input_file)),
+                                    repeat=args.repeat, items=args.size)
+        original_json, values = extractor.extract_from_file(str(input_file))
+        texts = [item['original'] for item in values]
+
+        # skip_filter：版本号/URL/数字等跳过判断
+        probe = create_translator('reverse', OFFLINE_CONFIG)
+        stages['skip_filter'] = measure(lambda: [probe._should_skip_translation(t) for t in texts],
+                                        repeat=args.repeat, items=len(texts))
+
+        # 预热缓存：按命中率写入部分条目（直接写字典后一次性保存，避免逐条落盘）
+        cache_dir = Path(tmp) / 'cache'
+        cache = CacheManager(str(cache_dir))
+        unique_texts = list(dict.fromkeys(texts))
+        warm_count = int(len(unique_texts) * args.cache_hit_ratio)
+        for text in unique_texts[:warm_count]:
+            key = probe._cache_key(text, 'auto', 'en')
+            cache.cache[cache._hash_key(key)] = {'original': key, 'translated': text[::-1], 'timestamp': ''}
+        cache._save_cache()
+        params['cache_entries'] = warm_count
+        keys = [probe._cache_key(text, 'auto', 'en') for text in texts]
+
+        stages['cache_load'] = measure(lambda: CacheManager(str(cache_dir)),
+                                       repeat=args.repeat, items=warm_count)
+        stages['cache_lookup'] = measure(lambda: [cache.get(key) for key in keys],
+                                         repeat=args.repeat, items=len(texts))
+        # 两级缓存：内存层在重复查询时命中，不再计算 MD5
+        tiered = TieredCache(cache, capacity=len(unique_texts) or 1)
+        stages['cache_lookup_tiered'] = measure(lambda: [tiered.get(key) for key in keys],
+                                                repeat=args.repeat, items=len(texts))
+
+        # translate：离线翻译器，不使用缓存，完整走 translate_batch
+        for name in args.translators:
+            translator = create_translator(name, OFFLINE_CONFIG)
+            batch = []
+
+            def reset():
+                batch[:] = [dict(item) for item in values]
+
+            def translate():
+                with quiet():
+                    translator.translate_batch(batch, 'auto', 'en')
+
+            stages[f'translate_{name}'] = measure(translate, repeat=args.repeat,
+                                                  items=len(values), setup=reset)
+
+        reversed_values = [dict(item, translated=item['original'][::-1]) for item in values]
+
+        # rebuild：深拷贝 + 按路径回填
+        rebuilder = JSONRebuilder(original_json)
+        stages['rebuild'] = measure(lambda: rebuilder.rebuild(reversed_values),
+                                    repeat=args.repeat, items=len(values))
+        translated_json = rebuilder.rebuild(reversed_values)
+
+        # save：序列化并写入文件
+        stages['save'] = measure(lambda: rebuilder.save_to_file(translated_json, str(output_file)),
+                                 repeat=args.repeat, items=len(values))
+        params['output_bytes'] = output_file.stat().st_size
+
+    return {
+        'benchmark': 'pipeline',
+        'environment': environment(),
+        'params': params,
+        'stages': stages,
+    }
+
+
+def print_report(result: dict) -> None:
+    """打印结果表格"""
+    params = result['params']
+    print(f"📊 流水线基准: {params['size']} 个字符串, 输入 {params['input_bytes'] / 1024:.1f} KB")
+    print(f"{'阶段':<20}{'耗时 (ms)':>12}{'吞吐 (条/秒)':>16}{'峰值内存 (KB)':>16}")
+    for name, stage in result['stages'].items():
+        rate = stage.get('items_per_sec')
+        rate_text = f"{rate:,.0f}" if rate else '-'
+        print(f"{name:<20}{stage['seconds'] * 1000:>12.2f}{rate_text:>16}{stage['peak_bytes'] / 1024:>16.1f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='提取/翻译/重建/缓存流水线基准测试')
+    parser.add_argument('--size', type=int, default=10000, help='字符串数量 (默认: 10000)')
+    parser.add_argument('--depth', type=int, default=4, help='嵌套深度 (默认: 4)')
+    parser.add_argument('--width', type=int, default=10, help='每层宽度 (默认: 10)')
+    parser.add_argument('--duplicate-ratio', type=float, default=0.2, help='重复字符串比例 (默认: 0.2)')
+    parser.add_argument('--placeholder-density', type=float, default=0.1, help='占位符密度 (默认: 0.1)')
+    parser.add_argument('--cache-hit-ratio', type=float, default=0.5, help='缓存预热比例 (默认: 0.5)')
+    parser.add_argument('--translators', nargs='+', default=['flip', 'reverse'],
+                        help='参与测试的离线翻译器 (默认: flip reverse)')
+    parser.add_argument('--repeat', type=int, default=3, help='每个阶段的重复次数 (默认: 3)')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子 (默认: 0)')
+    parser.add_argument('-o', '--output', type=str, help='结果 JSON 路径（默认写入 benchmarks/results/）')
+    args = parser.parse_args()
+
+    result = run(args)
+    print_report(result)
+    path = write_result('pipeline', result, args.output)
+    print(f"💾 结果已保存到: {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+分句缓存基准
+生成由多句段落组成的合成语言文件，先完整翻译一次（离线翻译器 + 缓存），
+再修改其中一部分段落的一句后重新翻译，统计第二次运行实际调用翻译器的次数和字符数。
+比较整串缓存（默认）与分句缓存两种方式。
+
+用法:
+    python benchmarks/bench_segment.py --size 2000 --sentences 5 --edit-ratio 0.1
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import environment, quiet, write_result
+from benchmarks.locale_generator import _sentence
+from src.segmenter import Segmenter, SegmentedTranslator
+from src.translators import create_translator
+from src.utils import CacheManager, TieredCache
+
+# 离线翻译器所需的最小配置
+OFFLINE_CONFIG = {'api': {'retry': {'max_retries': 1, 'backoff_factor': 1}}}
+
+
+def make_paragraphs(size: int, sentences: int, seed: int) -> list:
+    """生成段落（每段 sentences 句，句末都有标点）"""
+    rng = random.Random(seed)
+    paragraphs = []
+    for _ in range(size):
+        parts = [_sentence(rng, 0.2, 4, 12).rstrip('.!?:') + rng.choice('.!?') for _ in range(sentences)]
+        paragraphs.append(' '.join(parts))
+    return paragraphs
+
+
+def edit(paragraphs: list, ratio: float, seed: int) -> list:
+    """修改一部分段落中的一个单词（只影响其中一句）"""
+    rng = random.Random(seed + 1)
+    edited = []
+    for paragraph in paragraphs:
+        if rng.random() < ratio:
+            parts = paragraph.split(' ')
+            parts[rng.randrange(len(parts))] = 'edited'
+            paragraph = ' '.join(parts)
+        edited.append(paragraph)
+    return edited
+
+
+def run_mode(paragraphs: list, edited: list, segmenter, translator_name: str) -> dict:
+    """完整翻译一次后翻译修改过的文档，统计第二次的翻译器调用"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TieredCache(CacheManager(tmp))
+        translator = create_translator(translator_name, OFFLINE_CONFIG, cache)
+        calls = {'count': 0, 'chars': 0}
+        translate = translator.translate
+
+        def counting_translate(text, *args, **kwargs):
+            calls['count'] += 1
+            calls['chars'] += len(text)
+            return translate(text, *args, **kwargs)
+
+        translator.translate = counting_translate
+        wrapped = SegmentedTranslator(translator, segmenter) if segmenter else translator
+
+        for document in (paragraphs, edited):
+            calls['count'] = calls['chars'] = 0
+            values = [{'path': f"p{i}", 'original': text, 'translated': None} for i, text in enumerate(document)]
+            with quiet():
+                wrapped.translate_batch(values, 'en', 'xx')
+        cache.flush()
+        return {'requests': calls['count'], 'chars': calls['chars'], 'cache_entries': len(cache.backend.cache)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='比较整串缓存与分句缓存在小幅修改后的请求量')
+    parser.add_argument('--size', type=int, default=2000, help='段落数量 (默认: 2000)')
+    parser.add_argument('--sentences', type=int, default=5, help='每段句子数 (默认: 5)')
+    parser.add_argument('--edit-ratio', type=float, default=0.1, help='修改的段落比例 (默认: 0.1)')
+    parser.add_argument('--translator', choices=['flip', 'reverse'], default='reverse', help='离线翻译器 (默认: reverse)')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子 (默认: 0)')
+    parser.add_argument('-o', '--output', type=str, help='结果 JSON 路径（默认写入 benchmarks/results/）')
+    args = parser.parse_args()
+
+    paragraphs = make_paragraphs(args.size, args.sentences, args.seed)
+    edited = edit(paragraphs, args.edit_ratio, args.seed)
+    changed = sum(1 for before, after in zip(paragraphs, edited) if before != after)
+    results = {
+        'whole': run_mode(paragraphs, edited, None, args.translator),
+        'segmented': run_mode(paragraphs, edited, Segmenter(min_length=1), args.translator),
+    }
+
+    print(f"📊 {args.size} 个段落 × {args.sentences} 句，修改了 {changed} 个段落")
+    for mode, res in results.items():
+        print(f"   {mode:<10} 重新运行请求 {res['requests']:>6} 次 | {res['chars']:>9,} 字符 | 缓存 {res['cache_entries']} 条")
+    result = {
+        'benchmark': 'segment',
+        'environment': environment(),
+        'params': {'size': args.size, 'sentences': args.sentences, 'edit_ratio': args.edit_ratio,
+                   'translator': args.translator, 'seed': args.seed, 'changed_paragraphs': changed},
+        'results': results,
+    }
+    path = write_result('segment', result, args.output)
+    print(f"💾 结果已保存到: {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
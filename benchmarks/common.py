@@ -0,0 +1,117 @@
+"""
+基准测试公共工具
+计时、峰值内存统计和结果文件读写
+"""
+
+import contextlib
+import gc
+import io
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = ROOT / 'benchmarks' / 'results'
+
+
+def git_revision() -> str:
+    """获取当前 git 版本（失败时返回 unknown）"""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+            stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return 'unknown'
+
+
+def environment() -> Dict[str, Any]:
+    """运行环境信息，写入结果文件便于跨版本比较"""
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+    }
+
+
+def measure(func: Callable[[], Any], repeat: int = 3, items: int = None,
+            setup: Callable[[], Any] = None) -> Dict[str, Any]:
+    """
+    测量函数耗时和峰值内存
+
+    先在不开启 tracemalloc 的情况下重复计时取最小值，
+    再单独运行一次统计峰值内存，避免内存跟踪拖慢计时。
+
+    Args:
+        func: 被测函数（无参数）
+        repeat: 计时重复次数
+        items: 处理的条目数（用于计算吞吐量）
+        setup: 每次运行前调用的准备函数（不计时）
+
+    Returns:
+        包含 seconds、peak_bytes 和 items_per_sec 的字典
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    if setup:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(timings)
+    result = {
+        'seconds': round(best, 6),
+        'mean_seconds': round(sum(timings) / len(timings), 6),
+        'peak_bytes': peak,
+    }
+    if items is not None:
+        result['items'] = items
+        result['items_per_sec'] = round(items / best, 1) if best > 0 else None
+    return result
+
+
+@contextlib.contextmanager
+def quiet():
+    """屏蔽被测代码的控制台输出"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def write_result(name: str, payload: Dict[str, Any], output: str = None) -> Path:
+    """
+    写入基准结果 JSON
+
+    Args:
+        name: 基准名称（用于默认文件名）
+        payload: 结果数据
+        output: 输出路径（默认写入 benchmarks/results/<name>-<revision>-<time>.json）
+
+    Returns:
+        结果文件路径
+    """
+    if output:
+        path = Path(output)
+    else:
+        env = payload.get('environment', {})
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        path = RESULTS_DIR / f"{name}-{env.get('revision', 'unknown')}-{stamp}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+    return path
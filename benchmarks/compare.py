@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+对比两次基准测试结果
+按阶段输出耗时和峰值内存的变化比例。
+
+用法:
+    python benchmarks/compare.py before.json after.json
+"""
+
+import argparse
+import json
+import sys
+
+
+def load(path: str) -> dict:
+    """读取结果文件"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _ratio(old: float, new: float) -> str:
+    if not old:
+        return '-'
+    change = (new - old) / old * 100
+    return f"{change:+.1f}%"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='对比两次基准测试结果')
+    parser.add_argument('baseline', help='基准结果 JSON')
+    parser.add_argument('candidate', help='对比结果 JSON')
+    args = parser.parse_args()
+
+    baseline = load(args.baseline)
+    candidate = load(args.candidate)
+    if baseline.get('params') != candidate.get('params'):
+        print("⚠️  两次运行的参数不同，结果可能不可比")
+
+    print(f"{baseline['environment'].get('revision')} -> {candidate['environment'].get('revision')}")
+    print(f"{'阶段':<20}{'基准 (ms)':>12}{'对比 (ms)':>12}{'耗时':>10}{'峰值内存':>10}")
+    for name, old in baseline['stages'].items():
+        new = candidate['stages'].get(name)
+        if new is None:
+            print(f"{name:<20}{old['seconds'] * 1000:>12.2f}{'-':>12}")
+            continue
+        print(f"{name:<20}{old['seconds'] * 1000:>12.2f}{new['seconds'] * 1000:>12.2f}"
+              f"{_ratio(old['seconds'], new['seconds']):>10}{_ratio(old['peak_bytes'], new['peak_bytes']):>10}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
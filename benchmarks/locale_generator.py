@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+合成语言文件生成器
+按给定的规模、深度、宽度、重复率和占位符密度生成可复现的 JSON 语言文件，
+用于基准测试。相同的参数和种子总是生成相同的文件。
+
+用法:
+    python benchmarks/locale_generator.py -o /tmp/en.json --size 50000 --depth 4 --width 12
+"""
+
+import argparse
+import json
+import random
+import sys
+from typing import Any, Dict
+
+WORDS = (
+    "save cancel open close file edit view help settings account profile search "
+    "update download upload delete remove add create new project user password "
+    "language theme dark light window message error warning success failed "
+    "loading please wait select all none copy paste undo redo share export import "
+    "network connection server request timeout retry version check available"
+).split()
+
+PLACEHOLDERS = ['{name}', '{count}', '{{user}}', '{{total}}', '%s', '%d', '%(file)s']
+
+# 不需要翻译的值（用于覆盖跳过过滤逻辑）
+NON_TRANSLATABLE = ['1.0.0', 'v2.3.1', '42', 'https://example.com/docs', 'support@example.com', 'OK']
+
+
+def _sentence(rng: random.Random, placeholder_density: float, min_words: int, max_words: int) -> str:
+    """生成一句随机文本"""
+    words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+    if rng.random() < placeholder_density:
+        words.insert(rng.randint(0, len(words)), rng.choice(PLACEHOLDERS))
+    text = ' '.join(words)
+    return text[0].upper() + text[1:] + rng.choice(['', '.', '!', '?', ':'])
+
+
+def generate_locale(size: int = 1000, depth: int = 3, width: int = 10,
+                    duplicate_ratio: float = 0.2, placeholder_density: float = 0.1,
+                    list_ratio: float = 0.1, non_translatable_ratio: float = 0.05,
+                    min_words: int = 1, max_words: int = 8, seed: int = 0) -> Dict[str, Any]:
+    """
+    生成合成语言文件
+
+    Args:
+        size: 字符串叶子节点数量
+        depth: 嵌套深度（叶子所在层级）
+        width: 每个对象的最大子节点数
+        duplicate_ratio: 复用已有字符串的比例（0-1）
+        placeholder_density: 包含占位符的字符串比例（0-1）
+        list_ratio: 以数组形式存放叶子的分组比例（0-1）
+        non_translatable_ratio: 版本号、URL 等不需要翻译的值的比例（0-1）
+        min_words: 每个字符串的最少单词数
+        max_words: 每个字符串的最多单词数
+        seed: 随机种子
+
+    Returns:
+        生成的 JSON 对象
+    """
+    rng = random.Random(seed)
+    depth = max(1, depth)
+    width = max(1, width)
+    root = {}
+    produced = []
+
+    def next_value() -> str:
+        if produced and rng.random() < duplicate_ratio:
+            return rng.choice(produced)
+        if rng.random() < non_translatable_ratio:
+            return rng.choice(NON_TRANSLATABLE)
+        value = _sentence(rng, placeholder_density, min_words, max_words)
+        produced.append(value)
+        return value
+
+    # 叶子按 width 分组，每组挂在一条 depth-1 层的路径下
+    group_count = (size + width - 1) // width
+    for group in range(group_count):
+        node = root
+        # 将分组编号按 width 进制展开为中间层的键
+        digits = []
+        n = group
+        for _ in range(depth - 1):
+            digits.append(n % width)
+            n //= width
+        if n and digits:
+            digits[-1] += n * width
+        for level, digit in enumerate(reversed(digits)):
+            node = node.setdefault(f"section{level}_{digit}", {})
+
+        count = min(width, size - group * width)
+        if rng.random() < list_ratio:
+            node[f"items_{group}"] = [next_value() for _ in range(count)]
+        else:
+            for i in range(count):
+                node[f"key{group}_{i}"] = next_value()
+
+    return root
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='生成合成 JSON 语言文件')
+    parser.add_argument('-o', '--output', type=str, help='输出文件路径（默认输出到标准输出）')
+    parser.add_argument('--size', type=int, default=1000, help='字符串数量 (默认: 1000)')
+    parser.add_argument('--depth', type=int, default=3, help='嵌套深度 (默认: 3)')
+    parser.add_argument('--width', type=int, default=10, help='每层宽度 (默认: 10)')
+    parser.add_argument('--duplicate-ratio', type=float, default=0.2, help='重复字符串比例 (默认: 0.2)')
+    parser.add_argument('--placeholder-density', type=float, default=0.1, help='占位符密度 (默认: 0.1)')
+    parser.add_argument('--max-words', type=int, default=8, help='每个字符串最多单词数 (默认: 8)')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子 (默认: 0)')
+    parser.add_argument('--indent', type=int, default=2, help='输出缩进 (默认: 2)')
+    args = parser.parse_args()
+
+    data = generate_locale(size=args.size, depth=args.depth, width=args.width,
+                           duplicate_ratio=args.duplicate_ratio,
+                           placeholder_density=args.placeholder_density,
+                           max_words=args.max_words, seed=args.seed)
+    text = json.dumps(data, indent=args.indent, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+CLI 冷启动时间基准
+在子进程中反复运行 ``main.py --extract-only``（小文件），测量冷启动耗时，
+并用 ``-X importtime`` 统计最耗时的导入模块。
+每次运行的结果追加到 benchmarks/results/startup_history.jsonl，便于长期跟踪；
+超过预算时返回非零退出码，可直接用于 CI。
+
+用法:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 20 --budget-ms 120
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import ROOT, RESULTS_DIR, environment
+
+HISTORY_FILE = RESULTS_DIR / 'startup_history.jsonl'
+
+# 冷启动预算（毫秒，取多次运行的中位数比较）
+DEFAULT_BUDGET_MS = 150
+
+SMALL_DOCUMENT = {
+    "app": {"name": "My App", "version": "1.0.0"},
+    "messages": ["Hello", "World", "Save", "Cancel"],
+}
+
+
+def _parse_importtime(stderr: str, top: int = 10) -> list:
+    """解析 -X importtime 输出，返回累计耗时最多的模块"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        parts = line[len('import time:'):].split('|', 2)
+        if len(parts) != 3:
+            continue
+        name = parts[2]
+        # 只统计顶层导入（嵌套导入的模块名前有更多缩进）
+        if name.startswith('  '):
+            continue
+        try:
+            modules.append({'module': name.strip(), 'cumulative_us': int(parts[1])})
+        except ValueError:
+            continue
+    modules.sort(key=lambda m: m['cumulative_us'], reverse=True)
+    return modules[:top]
+
+
+def measure(runs: int) -> dict:
+    """运行冷启动测量"""
+    with tempfile.TemporaryDirectory() as tmp:
+        input_file = Path(tmp) / 'small.json'
+        text_file = Path(tmp) / 'values.txt'
+        input_file.write_text(json.dumps(SMALL_DOCUMENT), encoding='utf-8')
+        cmd = [sys.executable, str(ROOT / 'main.py'), '-i', str(input_file),
+               '--extract-only', '-t', str(text_file)]
+        env = dict(os.environ, PYTHONDONTWRITEBYTECODE='0')
+
+        # 预热一次，生成 .pyc
+        subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, check=True)
+
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, check=True)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        profile = subprocess.run([sys.executable, '-X', 'importtime'] + cmd[1:], cwd=ROOT, env=env,
+                                 capture_output=True, text=True, check=True)
+
+    return {
+        'runs': runs,
+        'min_ms': round(min(timings), 2),
+        'median_ms': round(statistics.median(timings), 2),
+        'max_ms': round(max(timings), 2),
+        'top_imports': _parse_importtime(profile.stderr),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='测量 main.py --extract-only 的冷启动时间')
+    parser.add_argument('--runs', type=int, default=10, help='测量次数 (默认: 10)')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help=f'冷启动预算，毫秒 (默认: {DEFAULT_BUDGET_MS})')
+    parser.add_argument('--no-record', action='store_true', help='不写入历史记录')
+    args = parser.parse_args()
+
+    result = measure(args.runs)
+    record = {
+        **environment(),
+        'budget_ms': args.budget_ms,
+        **result,
+    }
+
+    print(f"冷启动 (--extract-only, {args.runs} 次): "
+          f"min {result['min_ms']:.1f} ms | median {result['median_ms']:.1f} ms | max {result['max_ms']:.1f} ms")
+    print("最耗时的导入:")
+    for module in result['top_imports']:
+        print(f"  {module['cumulative_us'] / 1000:8.2f} ms  {module['module']}")
+
+    if not args.no_record:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        with open(HISTORY_FILE, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        print(f"💾 已追加到 {HISTORY_FILE.relative_to(ROOT)}")
+
+    if result['median_ms'] > args.budget_ms:
+        print(f"❌ 超出预算: {result['median_ms']:.1f} ms > {args.budget_ms:.1f} ms")
+        return 1
+    print(f"✅ 在预算内 ({args.budget_ms:.1f} ms)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
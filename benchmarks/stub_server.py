@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+本地翻译服务桩（stub）
+模拟 LibreTranslate 的 /translate（q 为字符串或数组）和 Fun Translations 的
+/translate/<name>.json 接口，可注入延迟分布、带 Retry-After 的 429、5xx 错误和吞吐上限，
+用于在无网络的情况下对 LibreTranslator / KlingonTranslator 做压测和回归测试。
+
+既可以在进程内使用：
+
+    with StubTranslationServer(latency='normal:50:10', error_ratio=0.05) as server:
+        config['api']['libre_url'] = server.libre_url
+
+也可以作为独立服务运行：
+
+    python benchmarks/stub_server.py --port 5000 --latency uniform:20:80 --rate-limit-ratio 0.1
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+LANGUAGES = [
+    {'code': 'en', 'name': 'English', 'targets': ['zh', 'fr', 'de', 'ja']},
+    {'code': 'zh', 'name': 'Chinese', 'targets': ['en', 'fr', 'de', 'ja']},
+    {'code': 'fr', 'name': 'French', 'targets': ['en', 'zh']},
+    {'code': 'de', 'name': 'German', 'targets': ['en', 'zh']},
+    {'code': 'ja', 'name': 'Japanese', 'targets': ['en', 'zh']},
+]
+
+
+def default_transform(text: str, source: str, target: str) -> str:
+    """
+    默认"翻译"：逐词反转，结果确定且容易校验
+
+    按词而不是整体反转，这样 KlingonTranslator 用 " ||| " 合并的批量请求
+    翻译后仍能按原顺序拆分。
+    """
+    return ' '.join(word[::-1] for word in text.split(' '))
+
+
+class LatencyModel:
+    """
+    延迟分布
+
+    规格字符串格式（单位毫秒）:
+        fixed:50            固定 50ms
+        uniform:10:100      10~100ms 均匀分布
+        normal:50:10        均值 50ms、标准差 10ms 的正态分布（截断到 0 以上）
+        exponential:50      均值 50ms 的指数分布
+    """
+
+    def __init__(self, spec: str = 'fixed:0', seed: Optional[int] = None):
+        self.spec = spec
+        parts = spec.split(':')
+        self.kind = parts[0]
+        self.params = [float(p) for p in parts[1:]]
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        if self.kind not in ('fixed', 'uniform', 'normal', 'exponential'):
+            raise ValueError(f"未知的延迟分布: {spec}")
+
+    def sample(self) -> float:
+        """采样一次延迟（秒）"""
+        with self.lock:
+            if self.kind == 'fixed':
+                ms = self.params[0] if self.params else 0.0
+            elif self.kind == 'uniform':
+                ms = self.rng.uniform(self.params[0], self.params[1])
+            elif self.kind == 'normal':
+                ms = self.rng.gauss(self.params[0], self.params[1])
+            else:
+                ms = self.rng.expovariate(1.0 / self.params[0]) if self.params[0] > 0 else 0.0
+        return max(0.0, ms) / 1000.0
+
+
+class _TokenBucket:
+    """简单的令牌桶，用于模拟服务端吞吐上限"""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        # 容量至少为 1 个令牌，否则每秒不到 1 次的限额永远攒不够一次请求
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """请求处理器，行为由 server.stub 决定"""
+
+    server_version = 'JsonKlingonizerStub/1.0'
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.stub.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self) -> None:
+        self._dispatch('GET')
+
+    def do_POST(self) -> None:
+        self._dispatch('POST')
+
+    def _read_params(self) -> Dict[str, Any]:
+        """读取查询参数和请求体（支持 JSON 和表单）"""
+        parsed = urlparse(self.path)
+        params = {k: v if len(v) > 1 else v[0] for k, v in parse_qs(parsed.query).items()}
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            body = self.rfile.read(length).decode('utf-8')
+            if 'json' in (self.headers.get('Content-Type') or ''):
+                params.update(json.loads(body))
+            else:
+                params.update({k: v if len(v) > 1 else v[0] for k, v in parse_qs(body).items()})
+        return params
+
+    def _send_json(self, status: int, payload: Any, headers: Dict[str, str] = None) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, method: str) -> None:
+        stub = self.server.stub
+        route = urlparse(self.path).path
+
+        if route == '/languages':
+            self._send_json(200, LANGUAGES)
+            return
+        if route == '/stats':
+            self._send_json(200, stub.get_stats())
+            return
+
+        if route == '/translate' and method == 'POST':
+            api = 'libre'
+        elif route.startswith('/translate/') and route.endswith('.json'):
+            api = 'funtranslations'
+        else:
+            self._send_json(404, {'error': f'Not found: {route}'})
+            return
+
+        stub.enter()
+        try:
+            time.sleep(stub.latency.sample())
+            params = self._read_params()
+            status, payload, headers = stub.respond(api, route, params)
+            self._send_json(status, payload, headers)
+        finally:
+            stub.leave()
+
+
+class StubTranslationServer:
+    """本地翻译服务桩"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0,
+                 latency: str = 'fixed:0',
+                 rate_limit_ratio: float = 0.0,
+                 retry_after: int = 1,
+                 error_ratio: float = 0.0,
+                 error_status: int = 503,
+                 max_rps: float = None,
+                 transform: Callable[[str, str, str], str] = default_transform,
+                 seed: int = None,
+                 verbose: bool = False):
+        """
+        初始化服务桩
+
+        Args:
+            host: 监听地址
+            port: 监听端口（0 表示随机空闲端口）
+            latency: 延迟分布规格（见 LatencyModel）
+            rate_limit_ratio: 随机返回 429 的比例（0-1）
+            retry_after: 429 响应中 Retry-After 头的秒数
+            error_ratio: 随机返回 5xx 的比例（0-1）
+            error_status: 注入的 5xx 状态码
+            max_rps: 每秒最大请求数，超出时返回 429（None 表示不限）
+            transform: 翻译函数 (text, source, target) -> translated
+            seed: 随机种子（用于复现失败序列）
+            verbose: 是否输出访问日志
+        """
+        self.host = host
+        self.port = port
+        self.latency = LatencyModel(latency, seed)
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after = retry_after
+        self.error_ratio = error_ratio
+        self.error_status = error_status
+        self.bucket = _TokenBucket(max_rps) if max_rps else None
+        self.transform = transform
+        self.rng = random.Random(seed)
+        self.verbose = verbose
+
+        self.lock = threading.Lock()
+        self.httpd = None
+        self.thread = None
+        self.reset_stats()
+
+    # ---------- 生命周期 ----------
+
+    def start(self) -> 'StubTranslationServer':
+        """在后台线程中启动服务"""
+        self.httpd = ThreadingHTTPServer((self.host, self.port), _StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.stub = self
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        """停止服务"""
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+    def __enter__(self) -> 'StubTranslationServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def libre_url(self) -> str:
+        """可直接用作 config['api']['libre_url']"""
+        return f"{self.url}/translate"
+
+    @property
+    def funtranslations_url(self) -> str:
+        """可直接用作 config['api']['base_url']"""
+        return f"{self.url}/translate/klingon.json"
+
+    # ---------- 统计 ----------
+
+    def reset_stats(self) -> None:
+        """清空统计信息"""
+        with self.lock:
+            self.stats = {
+                'requests': 0,
+                'texts': 0,
+                'status_codes': {},
+                'active': 0,
+                'max_concurrency': 0,
+            }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息"""
+        with self.lock:
+            return json.loads(json.dumps(self.stats))
+
+    def enter(self) -> None:
+        with self.lock:
+            self.stats['requests'] += 1
+            self.stats['active'] += 1
+            self.stats['max_concurrency'] = max(self.stats['max_concurrency'], self.stats['active'])
+
+    def leave(self) -> None:
+        with self.lock:
+            self.stats['active'] -= 1
+
+    def _record_status(self, status: int, texts: int = 0) -> None:
+        with self.lock:
+            key = str(status)
+            self.stats['status_codes'][key] = self.stats['status_codes'].get(key, 0) + 1
+            self.stats['texts'] += texts
+
+    # ---------- 响应 ----------
+
+    def respond(self, api: str, route: str, params: Dict[str, Any]):
+        """
+        生成响应
+
+        Returns:
+            (状态码, JSON 负载, 额外响应头)
+        """
+        with self.lock:
+            roll_limit = self.rng.random()
+            roll_error = self.rng.random()
+
+        if (self.bucket and not self.bucket.acquire()) or roll_limit < self.rate_limit_ratio:
+            self._record_status(429)
+            message = f"Too Many Requests: Rate limit exceeded. Please wait for {self.retry_after} seconds."
+            payload = {'error': {'code': 429, 'message': message}} if api == 'funtranslations' else {'error': message}
+            return 429, payload, {'Retry-After': str(self.retry_after)}
+
+        if roll_error < self.error_ratio:
+            self._record_status(self.error_status)
+            return self.error_status, {'error': 'Injected server error'}, {}
+
+        if api == 'libre':
+            q = params.get('q')
+            if q is None:
+                self._record_status(400)
+                return 400, {'error': "Invalid request: missing q parameter"}, {}
+            source = params.get('source', 'auto')
+            target = params.get('target', 'en')
+            if isinstance(q, list):
+                self._record_status(200, len(q))
+                return 200, {'translatedText': [self.transform(t, source, target) for t in q]}, {}
+            self._record_status(200, 1)
+            return 200, {'translatedText': self.transform(q, source, target)}, {}
+
+        text = params.get('text')
+        if text is None:
+            self._record_status(400)
+            return 400, {'error': {'code': 400, 'message': 'Bad Request: text is missing.'}}, {}
+        translation = route.rsplit('/', 1)[-1][:-len('.json')]
+        self._record_status(200, 1)
+        return 200, {
+            'success': {'total': 1},
+            'contents': {
+                'translated': self.transform(text, 'en', translation),
+                'text': text,
+                'translation': translation,
+            },
+        }, {}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='本地 LibreTranslate / Fun Translations 服务桩')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='监听地址 (默认: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=5000, help='监听端口 (默认: 5000)')
+    parser.add_argument('--latency', type=str, default='fixed:0',
+                        help='延迟分布: fixed:MS | uniform:MIN:MAX | normal:MEAN:STD | exponential:MEAN')
+    parser.add_argument('--rate-limit-ratio', type=float, default=0.0, help='随机 429 比例 (默认: 0)')
+    parser.add_argument('--retry-after', type=int, default=1, help='429 的 Retry-After 秒数 (默认: 1)')
+    parser.add_argument('--error-ratio', type=float, default=0.0, help='随机 5xx 比例 (默认: 0)')
+    parser.add_argument('--error-status', type=int, default=503, help='注入的 5xx 状态码 (默认: 503)')
+    parser.add_argument('--max-rps', type=float, help='每秒最大请求数，超出返回 429')
+    parser.add_argument('--seed', type=int, help='随机种子')
+    parser.add_argument('-v', '--verbose', action='store_true', help='输出访问日志')
+    args = parser.parse_args()
+
+    server = StubTranslationServer(host=args.host, port=args.port, latency=args.latency,
+                                   rate_limit_ratio=args.rate_limit_ratio, retry_after=args.retry_after,
+                                   error_ratio=args.error_ratio, error_status=args.error_status,
+                                   max_rps=args.max_rps, seed=args.seed, verbose=args.verbose)
+    server.start()
+    print(f"🧪 服务桩已启动: {server.url}")
+    print(f"   LibreTranslate:    {server.libre_url}")
+    print(f"   Fun Translations:  {server.funtranslations_url}")
+    print(f"   统计信息:          {server.url}/stats")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("\n⚠️  已停止")
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
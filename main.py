@@ -5,17 +5,31 @@ JsonKlingonizer - JSON 值提取、翻译和重建工具
 """
 
 import argparse
-import json
+import os
 import sys
+import time
+from collections import Counter
 from pathlib import Path
 
-# 添加 src 目录到路径
-sys.path.insert(0, str(Path(__file__).parent / 'src'))
-
+from src.exchange import FORMATS, detect_format, import_jsonl, import_text
 from src.extractor import JSONExtractor
-from src.translators import KlingonTranslator, GoogleTranslator, LibreTranslator, ReverseTranslator, FlipTranslator
+from src.keywords import KeywordFilter
+from src.path_selector import PathSelector
+from src.translators import list_translators, get_translator_class, create_translator
 from src.rebuilder import JSONRebuilder
-from src.utils import CacheManager, ProgressTracker, Logger, load_config, ensure_dir
+from src.utils import create_cache, ProgressTracker, MultiProgress, Logger, load_config, ensure_dir, format_bytes
+from src.profiler import profiler
+from src.metrics import metrics
+
+
+# 选择翻译器后的提示信息
+TRANSLATOR_BANNERS = {
+    'klingon': "🖖 使用 Klingon 翻译器",
+    'libre': "🌍 使用 LibreTranslate 翻译器 ({source} -> {target})",
+    'reverse': "🔄 使用反转翻译器",
+    'flip': "🙃 使用字符翻转翻译器",
+    'google': "🌍 使用 Google 翻译器 ({source} -> {target})",
+}
 
 
 def main():
@@ -37,34 +51,56 @@ def main():
   # 使用缓存
   python main.py -i en.json -o zh.json --translator google --use-cache
   
-  # 仅提取值到文本文件（用于手动翻译）
-  python main.py -i en.json --extract-only -t values.txt
+  # 仅提取值到交换文件（JSON Lines，用于手动翻译）
+  python main.py -i en.json --extract-only -t values.jsonl
   
-  # 从翻译好的文本文件重建 JSON
-  python main.py -i en.json -o zh.json --from-text translated.txt
+  # 从翻译好的交换文件重建 JSON（只应用填写了译文的记录，可分批导入）
+  python main.py -i en.json -o zh.json --from-text translated.jsonl
   
   # 只翻译包含 %TODO 的内容（部分翻译）
   python main.py -i fr.json -o fr.json --translator google --source zh-cn --target fr --filter-keyword "%%TODO" --remove-keyword
   
+  # 批量翻译目录下的所有语言文件（解析和重建在多个进程中并行）
+  python main.py -i locales/en -o locales/zh --translator google --source en --target zh-cn --workers 4
+  
+  # 保留手工维护文件的格式，只改写翻译过的字符串
+  python main.py -i fr.json -o fr.json --from-text todo_fr.jsonl --filter-keyword "%%TODO" --remove-keyword --preserve-format
+  
+  # 启动常驻服务，之后的调用通过环境变量交给它处理（缓存和连接常驻，省去每次的启动开销）
+  python main.py --serve unix:/tmp/jsonklingonizer.sock &
+  JSONKLINGONIZER_DAEMON=unix:/tmp/jsonklingonizer.sock python main.py -i en.json -o zh.json --translator google
+  
+  # 开发时监视 en.json，保存后只翻译改动的键并更新 zh.json
+  python main.py -i en.json -o zh.json --translator google --source en --target zh-cn --watch
+  
   # 提取包含 %TODO 的内容到文本文件
-  python main.py -i fr.json --extract-only -t todo.txt --filter-keyword "%%TODO"
+  python main.py -i fr.json --extract-only -t todo.jsonl --filter-keyword "%%TODO"
+
+  # 只翻译 settings 和 menu 下的内容，跳过任意层级的 metadata 和 url
+  python main.py -i en.json -o zh.json --translator google --include "settings" --include "menu" --exclude "**.metadata" --exclude "**.url"
+
+  # 统计目录中还有哪些待翻译的值（多个关键词，没有关键词的文件不解析）
+  python main.py -i locales/ --extract-only --filter-keyword "%%TODO" --filter-keyword "%%FIXME" --filter-keyword "[untranslated]"
   
   # 清空翻译缓存
   python main.py --clear-cache
   
   # 列出支持的翻译器
   python main.py --list-translators
+  
+  # 记录各阶段耗时（网络、退避等待、重建……）
+  python main.py -i en.json -o zh.json --translator libre --profile profile.json --profile-collapsed stacks.txt
         '''
     )
     
     parser.add_argument('-i', '--input', type=str,
-                       help='输入的 JSON 文件路径')
+                       help='输入的 JSON 文件路径（为目录时批量处理其中所有 JSON 文件）')
     parser.add_argument('-o', '--output', type=str,
-                       help='输出的 JSON 文件路径')
+                       help='输出的 JSON 文件路径（批量模式下为输出目录）')
     parser.add_argument('-c', '--config', type=str, default='config/config.json',
                        help='配置文件路径 (默认: config/config.json)')
-    parser.add_argument('--translator', type=str, choices=['google', 'klingon', 'libre', 'reverse', 'flip'],
-                       help='翻译器类型 (google, klingon, libre, reverse, flip)')
+    parser.add_argument('--translator', type=str,
+                       help='翻译器类型 (google, klingon, libre, reverse, flip 或已安装的插件)')
     parser.add_argument('--source', '--source-lang', type=str, dest='source_lang',
                        help='源语言代码（如 en, zh-cn, auto）')
     parser.add_argument('--target', '--target-lang', type=str, dest='target_lang',
@@ -80,35 +116,104 @@ def main():
     parser.add_argument('-t', '--text-file', type=str,
                        help='文本文件路径（用于提取或导入）')
     parser.add_argument('--from-text', type=str,
-                       help='从翻译好的文本文件导入')
-    parser.add_argument('--filter-keyword', type=str,
-                       help='过滤关键词，只提取包含此关键词的值（如 %%TODO）')
+                       help='从翻译好的文本文件导入（自动识别 JSON Lines 或旧的 "~" 文本格式）')
+    parser.add_argument('--text-format', choices=FORMATS,
+                       help='--extract-only 导出的格式：jsonl（按路径对应，可部分导入）或 text（旧的 "~" 分隔格式），默认读取配置')
+    parser.add_argument('--filter-keyword', type=str, action='append',
+                       help='过滤关键词，只提取包含此关键词的值（如 %%TODO）；可重复指定多个关键词')
+    parser.add_argument('--include', type=str, action='append', metavar='SELECTOR',
+                       help='只提取匹配的路径（如 "settings.*"、"**.title"），可重复指定')
+    parser.add_argument('--exclude', type=str, action='append', metavar='SELECTOR',
+                       help='跳过匹配的路径及其子树（如 "**.metadata"、"changelog[*]"），可重复指定')
     parser.add_argument('--remove-keyword', action='store_true',
                        help='翻译后从结果中移除过滤关键词')
+    parser.add_argument('--workers', type=int,
+                       help='批量模式的工作进程数（默认: CPU 核数，0 表示不使用进程池）')
+    parser.add_argument('--normalize-keys', action='store_true',
+                       help='规范化缓存键和请求文本（NFC、剥离首尾空白和标点、可选大小写折叠）')
+    parser.add_argument('--segment', action='store_true',
+                       help='长字符串按句子拆分后逐句缓存和翻译')
+    parser.add_argument('--preserve-format', action='store_true',
+                       help='保留输入文件的格式，只替换翻译过的字符串（不重新序列化整个文件）')
     parser.add_argument('--log-file', type=str,
                        help='日志文件路径')
+    parser.add_argument('--log-json', action='store_true',
+                       help='日志文件使用 JSON Lines 格式')
     parser.add_argument('-v', '--verbose', action='store_true',
                        help='显示详细信息')
+    parser.add_argument('--profile', type=str, metavar='REPORT',
+                       help='记录各阶段耗时，并将 JSON 报告写入此路径')
+    parser.add_argument('--profile-cprofile', type=str, metavar='FILE',
+                       help='同时用 cProfile 剖析，并将结果写入此路径（可用 snakeviz 查看）')
+    parser.add_argument('--profile-collapsed', type=str, metavar='FILE',
+                       help='写入火焰图兼容的折叠栈文件')
+    parser.add_argument('--watch', action='store_true',
+                       help='处理完成后继续监视输入文件或目录，保存时只翻译变化的值并更新输出')
+    parser.add_argument('--serve', type=str, nargs='?', const='', metavar='ADDRESS',
+                       help='以常驻服务方式运行（地址如 unix:/tmp/jk.sock 或 127.0.0.1:8765，默认读取配置 service.address）')
+    parser.add_argument('--serve-allow-remote', action='store_true',
+                       help='允许常驻服务监听非回环 TCP 地址（请求仍需令牌）')
+    parser.add_argument('--daemon', type=str, metavar='ADDRESS',
+                       help='把单文件翻译交给已启动的常驻服务（也可设置环境变量 JSONKLINGONIZER_DAEMON），连接失败时在本地执行')
+    parser.add_argument('--metrics-file', type=str, metavar='FILE',
+                       help='运行结束时将指标（缓存命中率、请求延迟、重试等）写入此文件')
+    parser.add_argument('--metrics-format', choices=['openmetrics', 'prometheus'], default='openmetrics',
+                       help='指标文件格式 (默认: openmetrics)')
     
     args = parser.parse_args()
     
+    # 性能剖析
+    profiling = args.profile or args.profile_cprofile or args.profile_collapsed
+    cprofile = None
+    if profiling:
+        profiler.enable()
+        if args.profile_cprofile:
+            import cProfile
+            cprofile = cProfile.Profile()
+            cprofile.enable()
+    
+    try:
+        return run(args, parser)
+    finally:
+        if profiling:
+            write_profile(args, cprofile)
+        if args.metrics_file:
+            metrics.write_textfile(args.metrics_file, openmetrics=args.metrics_format == 'openmetrics')
+            print(f"💾 指标已保存到: {args.metrics_file}")
+
+
+def write_profile(args, cprofile=None) -> None:
+    """输出剖析结果"""
+    if cprofile:
+        cprofile.disable()
+        cprofile.dump_stats(args.profile_cprofile)
+        print(f"💾 cProfile 结果已保存到: {args.profile_cprofile}")
+    for line in profiler.summary_lines():
+        print(line)
+    if args.profile:
+        profiler.write_report(args.profile)
+        print(f"💾 剖析报告已保存到: {args.profile}")
+    if args.profile_collapsed:
+        profiler.write_collapsed(args.profile_collapsed)
+        print(f"💾 折叠栈已保存到: {args.profile_collapsed}")
+    profiler.disable()
+
+
+def run(args, parser) -> int:
+    """执行命令"""
     # 列出翻译器
     if args.list_translators:
         print("可用的翻译器：")
-        print("\n1. Google Translator (google) - 免费，无需 API Key")
-        print("   支持的语言：")
-        for code, name in GoogleTranslator.get_supported_languages().items():
-            print(f"     {code}: {name}")
-        print("\n2. Klingon Translator (klingon) - Fun Translations API")
-        print("   翻译为克林贡语")
-        print("\n3. LibreTranslate (libre) - 开源，可自托管")
-        print("   支持的语言：")
-        for code, name in LibreTranslator.get_supported_languages().items():
-            print(f"     {code}: {name}")
-        print("\n4. Reverse Translator (reverse) - 趣味翻译")
-        print("   将文本字符顺序颠倒")
-        print("\n5. Flip Translator (flip) - 趣味翻译")
-        print("   将英文字符翻转为上下颠倒的样子")
+        for idx, (name, description) in enumerate(list_translators().items(), 1):
+            print(f"\n{idx}. {description} ({name})")
+            try:
+                languages = get_translator_class(name).get_supported_languages()
+            except Exception as e:
+                print(f"   ⚠️  无法加载: {e}")
+                continue
+            print("   支持的语言：")
+            for code, lang_name in languages.items():
+                print(f"     {code}: {lang_name}")
         return 0
     
     # 加载配置
@@ -128,14 +233,341 @@ def main():
             'logging': {'level': 'INFO', 'show_progress': True}
         }
     
-    # 初始化日志
-    log_level = 'DEBUG' if args.verbose else config['logging'].get('level', 'INFO')
-    logger = Logger(args.log_file, log_level)
+    # 初始化日志（后台线程写出，结束时统一刷新）
+    logging_config = config.get('logging', {})
+    log_level = 'DEBUG' if args.verbose else logging_config.get('level', 'INFO')
+    logger = Logger(args.log_file, log_level,
+                    flush_interval=logging_config.get('flush_interval', 0.2),
+                    json_lines=args.log_json or logging_config.get('format') == 'json',
+                    buffered=logging_config.get('buffered', True))
+    
+    try:
+        if args.serve is not None:
+            return serve_daemon(args, config, logger)
+        return process(args, parser, config, logger)
+    finally:
+        logger.close()
+
+
+def serve_daemon(args, config: dict, logger: Logger) -> int:
+    """常驻服务模式：缓存和翻译器常驻内存，通过本地 HTTP 接收翻译请求"""
+    # 只有服务端和客户端需要 http.server / http.client，按需导入以免拖慢普通调用的启动
+    from src.service import DEFAULT_ADDRESS, TranslationService, serve, token_path
+    
+    options = config.get('service', {})
+    address = args.serve or options.get('address', DEFAULT_ADDRESS)
+    service = TranslationService(config, logger)
+    if service.cache is not None:
+        logger.info(f"💾 缓存状态: {service.cache.get_stats()['total_entries']} 条记录")
+    try:
+        serve(service, address, token_path(args.config, options), options.get('flush_interval', 30),
+              allow_remote=args.serve_allow_remote)
+    except (OSError, ValueError) as e:
+        logger.error(f"❌ 无法启动翻译服务: {e}")
+        return 1
+    return 0
+
+
+def route_to_daemon(args, config: dict, address: str, logger: Logger):
+    """
+    把单文件翻译请求交给常驻服务
+    
+    Returns:
+        退出码；服务不可用、配置不一致或需要本地状态时返回 None（由调用方在本地执行）
+    """
+    # 指标和剖析都作用于当前进程，服务无法代为完成
+    local_flags = [flag for flag, enabled in (
+        ('--metrics-file', args.metrics_file),
+        ('--profile', args.profile or args.profile_cprofile or args.profile_collapsed),
+    ) if enabled]
+    if local_flags:
+        logger.info(f"💡 使用了 {', '.join(local_flags)}，在本地执行")
+        return None
+    
+    from src.service import ServiceClient, ServiceError, config_fingerprint, read_token, token_path
+    
+    token = read_token(token_path(args.config, config.get('service', {})))
+    if token is None:
+        logger.warning("⚠️  找不到翻译服务的令牌文件，改为在本地执行")
+        return None
+    request = {
+        'input': str(Path(args.input).resolve()),
+        'output': str(Path(args.output).resolve()),
+        'translator': args.translator,
+        'source_lang': args.source_lang,
+        'target_lang': args.target_lang,
+        'filter_keyword': args.filter_keyword,
+        'remove_keyword': args.remove_keyword,
+        'include': args.include,
+        'exclude': args.exclude,
+        'normalize_keys': args.normalize_keys,
+        'segment': args.segment,
+        'preserve_format': args.preserve_format,
+        # --use-cache 计入指纹：服务同样开启了缓存时照常转发，否则返回 409 后在本地执行
+        'config_fingerprint': config_fingerprint(
+            dict(config, processing=dict(config['processing'], use_cache=True)) if args.use_cache else config),
+    }
+    try:
+        client = ServiceClient(address, token)
+    except ValueError as e:
+        logger.error(f"❌ {e}")
+        return 1
+    try:
+        result = client.translate(request)
+    except ServiceError as e:
+        if e.status in (401, 409):
+            # 令牌过期（服务已重启）或服务加载的配置不同：结果可能与本地不一致
+            logger.warning(f"⚠️  翻译服务拒绝请求 ({e.status}): {e}，改为在本地执行")
+            return None
+        logger.error(f"❌ 翻译服务返回错误 ({e.status}): {e}")
+        return 1
+    except OSError as e:
+        logger.warning(f"⚠️  无法连接翻译服务 {address}（{e}），改为在本地执行")
+        return None
+    finally:
+        client.close()
+    if result['output'] is None:
+        logger.warning(f"⚠️  未找到包含 {', '.join(args.filter_keyword)} 的内容")
+        return 0
+    logger.info(f"🛰️  由翻译服务 {address} 处理: {result['translated']}/{result['values']} 个值已翻译")
+    logger.info(f"🎉 完成！翻译后的文件已保存到: {args.output}")
+    return 0
+
+
+def setup_translator(args, config: dict, logger: Logger) -> tuple:
+    """
+    初始化缓存管理器和翻译器
+    
+    Returns:
+        (翻译器, 缓存管理器或 None, 源语言, 目标语言)
+    """
+    # 初始化缓存管理器
+    cache_manager = None
+    if args.use_cache or config['processing'].get('use_cache', True):
+        logger.flush()
+        cache_manager = create_cache(config['processing'])
+        stats = cache_manager.get_stats()
+        logger.info(f"💾 缓存状态: {stats['total_entries']} 条记录")
+    
+    # 确定翻译器类型
+    translator_type = args.translator or config.get('translator', {}).get('type', 'google')
+    source_lang = args.source_lang or config.get('translator', {}).get('source_lang', 'auto')
+    target_lang = args.target_lang or config.get('translator', {}).get('target_lang', 'en')
+    
+    # 初始化翻译器（只导入被选中的实现）
+    translator = create_translator(translator_type, config, cache_manager)
+    banner = TRANSLATOR_BANNERS.get(translator_type, f"🔌 使用 {translator_type} 翻译器")
+    logger.info(banner.format(source=source_lang, target=target_lang))
+    
+    # 可选的键规范化（缓存查询和请求都使用规范化后的文本）；规范化和分句模块按需导入
+    from src.normalizer import KeyNormalizer, NormalizedTranslator
+    from src.segmenter import Segmenter, SegmentedTranslator
+    processing = config['processing']
+    if args.normalize_keys:
+        processing = dict(processing, normalize_keys=dict(processing.get('normalize_keys', {}), enabled=True))
+    normalizer = KeyNormalizer.from_config(processing)
+    if normalizer:
+        translator = NormalizedTranslator(translator, normalizer)
+        logger.info(f"🔤 已启用键规范化（大小写折叠: {'是' if normalizer.casefold else '否'}）")
+    
+    # 可选的分句（在规范化之前拆分，每个句子再单独规范化）
+    if args.segment:
+        processing = dict(processing, segmentation=dict(processing.get('segmentation', {}), enabled=True))
+    segmenter = Segmenter.from_config(processing)
+    if segmenter:
+        translator = SegmentedTranslator(translator, segmenter)
+        logger.info(f"✂️  已启用分句翻译（不短于 {segmenter.min_length} 个字符的字符串）")
+    
+    return translator, cache_manager, source_lang, target_lang
+
+
+def finish_cache(cache_manager, logger: Logger) -> None:
+    """输出缓存命中率；配置了容量上限或过期时间时执行压缩"""
+    stats = cache_manager.get_stats()
+    logger.info(f"💾 缓存命中率: {stats['hit_ratio']:.1%} (命中 {stats['hits']}, 未命中 {stats['misses']})")
+    if 'memory_hits' in stats:
+        logger.info(f"   内存层命中 {stats['memory_hits']} / 未命中 {stats['memory_misses']}，"
+                    f"持久层命中 {stats['persistent_hits']} / 未命中 {stats['persistent_misses']}")
+    if stats['failures']:
+        logger.info(f"   失败缓存 {stats['failures']} 条（过期前不会重新请求）")
+    if cache_manager.needs_compaction():
+        result = cache_manager.compact()
+        logger.info(f"🧹 缓存压缩: 过期 {result['expired']}，淘汰 {result['evicted']}，保留 {result['retained']} 条 "
+                    f"({format_bytes(result['bytes_before'])} -> {format_bytes(result['bytes_after'])})")
+    else:
+        cache_manager.close()
+
+
+def sweep_directory(args, config: dict, logger: Logger, selector: PathSelector = None) -> int:
+    """目录 + --extract-only + --filter-keyword：统计每个文件中包含关键词的值，不翻译也不写出"""
+    from src.batch import BatchProcessor, collect_jobs
+    keyword_filter = KeywordFilter(args.filter_keyword)
+    inputs = [input_path for input_path, _ in collect_jobs(args.input, args.input)]
+    prefilter = config['processing'].get('keyword_prefilter', True)
+    processor = BatchProcessor(workers=args.workers, filter_keyword=keyword_filter.keywords,
+                               prefilter=prefilter, selector=selector)
+    
+    start = time.perf_counter()
+    with profiler.span('stage.extract'):
+        results = processor.scan(inputs)
+    elapsed = time.perf_counter() - start
+    
+    totals = Counter()
+    matched_files = 0
+    for input_path, values in results:
+        if not values:
+            continue
+        matched_files += 1
+        counts = Counter(keyword for item in values for keyword in item['keywords'])
+        totals.update(counts)
+        detail = '，'.join(f"{keyword} {count}" for keyword, count in counts.most_common())
+        logger.info(f"   {input_path}: {len(values)} 个值（{detail}）")
+        if args.verbose:
+            for item in values:
+                logger.info(f"      {item['path']}: {item['original'][:80]}")
     
+    total_values = sum(len(values) for _, values in results)
+    logger.info(f"🔍 {len(inputs)} 个文件中有 {matched_files} 个包含 {keyword_filter.describe()}，"
+                f"共 {total_values} 个值，用时 {elapsed:.2f} 秒")
+    if not keyword_filter.can_prefilter and prefilter:
+        logger.info("💡 关键词包含引号、斜杠或非 ASCII 字符，无法按原始字节预过滤，已逐个解析文件")
+    return 0
+
+
+def process_directory(args, config: dict, logger: Logger, selector: PathSelector = None) -> int:
+    """批量模式：并行处理目录下的所有 JSON 文件"""
+    # 批处理会加载 concurrent.futures / multiprocessing，只在处理目录时导入
+    from src.batch import BatchProcessor, collect_jobs
+    if args.extract_only and args.filter_keyword and not args.from_text:
+        return sweep_directory(args, config, logger, selector)
+    if not args.output:
+        logger.error("❌ 输入为目录时必须用 -o/--output 指定输出目录")
+        return 1
+    if args.extract_only or args.from_text:
+        logger.error("❌ 目录批量模式不支持 --from-text，--extract-only 只能与 --filter-keyword 一起用于统计")
+        return 1
+    
+    jobs = collect_jobs(args.input, args.output)
+    if not jobs:
+        logger.warning(f"⚠️  目录 {args.input} 中没有 JSON 文件")
+        return 0
+    
+    translator, cache_manager, source_lang, target_lang = setup_translator(args, config, logger)
+    processor = BatchProcessor(
+        translator, source_lang, target_lang, workers=args.workers,
+        filter_keyword=args.filter_keyword,
+        partial_update=bool(args.filter_keyword and args.remove_keyword),
+        preserve_format=args.preserve_format,
+        prefilter=config['processing'].get('keyword_prefilter', True),
+        selector=selector
+    )
+    logger.info(f"📂 批量处理 {len(jobs)} 个文件，{processor.workers} 个工作进程")
+    logger.flush()
+    
+    # 每个文件一个进度任务，汇总显示
+    progress = MultiProgress("翻译进度") if config['logging'].get('show_progress', True) else None
+    
+    def translate_file(input_path, values):
+        if not values:
+            return values
+        if progress is None:
+            return translator.translate_batch(values, source_lang, target_lang)
+        tracker = progress.job(input_path, len(values))
+        values = translator.translate_batch(
+            values, source_lang, target_lang,
+            lambda current, total, success_count: tracker.update(current, success_count)
+        )
+        tracker.finish()
+        return values
+    
+    results = processor.process(jobs, translate_file)
+    if progress:
+        progress.finish()
+    
+    for result in results:
+        logger.info(f"   {result['input']} -> {result['output']} ({result.get('written', 0)}/{result.get('values', 0)})")
+    if cache_manager:
+        finish_cache(cache_manager, logger)
+    logger.info(f"🎉 完成！{len(results)} 个文件已保存到: {args.output}")
+    return 0
+
+
+def watch_inputs(args, config: dict, logger: Logger, selector: PathSelector = None) -> int:
+    """--watch：先完整处理一次，之后每次保存只翻译变化的值并更新输出"""
+    from src.batch import collect_jobs, nested_output
+    from src.watcher import FileWatcher, WatchSession
+    if not args.output:
+        logger.error("❌ --watch 需要用 -o/--output 指定输出文件或目录")
+        return 1
+    if args.extract_only or args.from_text:
+        logger.error("❌ --watch 不能与 --extract-only 或 --from-text 一起使用")
+        return 1
+    
+    input_root = Path(os.path.abspath(args.input))
+    jobs = collect_jobs(args.input, args.output) if input_root.is_dir() else [(args.input, args.output)]
+    translator, cache_manager, source_lang, target_lang = setup_translator(args, config, logger)
+    keyword_filter = KeywordFilter.create(args.filter_keyword)
+    prefilter = config['processing'].get('keyword_prefilter', True)
+    session = WatchSession(
+        translator, source_lang, target_lang,
+        lambda: JSONExtractor(filter_keyword=keyword_filter, track_spans=args.preserve_format,
+                              prefilter=prefilter, selector=selector),
+        partial_update=bool(keyword_filter and args.remove_keyword),
+        filter_keyword=args.filter_keyword, preserve_format=args.preserve_format
+    )
+    for input_path, output_path in jobs:
+        ensure_dir(str(Path(output_path).parent))
+        session.add(input_path, output_path)
+    
+    # 输出目录位于输入目录之内时不监视它，否则写出的结果会被当作新的输入
+    nested = nested_output(args.input, args.output) if input_root.is_dir() else None
+    options = config.get('watch', {})
+    watcher = FileWatcher([args.input], debounce=options.get('debounce', 0.2),
+                          poll_interval=options.get('poll_interval', 0.5), backend=options.get('backend', 'auto'),
+                          exclude=[os.path.abspath(args.output)] if nested else ())
+    
+    def update(path: str) -> None:
+        if nested and Path(path).resolve().is_relative_to(nested):
+            return
+        if path not in session.outputs and input_root.is_dir():
+            # 目录中新建的文件
+            output_path = Path(args.output) / Path(path).relative_to(input_root)
+            ensure_dir(str(output_path.parent))
+            session.add(path, str(output_path))
+        try:
+            result = session.update(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  {path}: 无法处理（{e}），等待下一次保存")
+            return
+        if result and result['written']:
+            logger.info(f"🔁 {path}: 翻译 {result['changed']} 个变化的值，删除 {result['removed']} 个，"
+                        f"共 {result['values']} 个值，用时 {result['seconds'] * 1000:.0f} ms")
+    
+    try:
+        for path in list(session.outputs):
+            update(path)
+        logger.info(f"👀 正在监视 {args.input}（{watcher.backend}），按 Ctrl+C 退出")
+        logger.flush()
+        while True:
+            for path in sorted(watcher.wait()):
+                update(path)
+            logger.flush()
+            if cache_manager and hasattr(cache_manager, 'flush'):
+                cache_manager.flush()
+    except KeyboardInterrupt:
+        logger.info("👋 停止监视")
+    finally:
+        watcher.close()
+        if cache_manager:
+            finish_cache(cache_manager, logger)
+    return 0
+
+
+def process(args, parser, config: dict, logger: Logger) -> int:
+    """执行提取、翻译和重建"""
     # 清空缓存
     if args.clear_cache:
-        cache_dir = config['processing'].get('cache_dir', 'data/cache')
-        cache_manager = CacheManager(cache_dir)
+        cache_manager = create_cache(config['processing'])
         cache_manager.clear()
         return 0
     
@@ -144,6 +576,29 @@ def main():
         parser.print_help()
         return 1
     
+    # 单文件翻译可以交给常驻服务
+    daemon = args.daemon or os.environ.get('JSONKLINGONIZER_DAEMON')
+    if daemon and args.output and not (args.extract_only or args.from_text) and Path(args.input).is_file():
+        code = route_to_daemon(args, config, daemon, logger)
+        if code is not None:
+            return code
+    
+    # 路径选择器（配置和命令行合并）
+    try:
+        selector = PathSelector.from_config(config['processing'], args.include, args.exclude)
+    except ValueError as e:
+        logger.error(f"❌ {e}")
+        return 1
+    if selector:
+        logger.info(f"🧭 路径选择：包含 {selector.include or ['全部']}，排除 {selector.exclude or ['无']}")
+    
+    if args.watch:
+        return watch_inputs(args, config, logger, selector)
+    
+    # 输入为目录时进入批量模式
+    if Path(args.input).is_dir():
+        return process_directory(args, config, logger, selector)
+    
     # 确保输出目录存在
     if args.output:
         ensure_dir(Path(args.output).parent)
@@ -153,18 +608,22 @@ def main():
         logger.info(f"📖 正在读取 JSON 文件: {args.input}")
         
         # 如果指定了过滤关键词，使用过滤模式
-        if args.filter_keyword:
-            logger.info(f"🔍 过滤模式：只提取包含 '{args.filter_keyword}' 的内容")
-            extractor = JSONExtractor(filter_keyword=args.filter_keyword)
+        keyword_filter = KeywordFilter.create(args.filter_keyword)
+        if keyword_filter:
+            logger.info(f"🔍 过滤模式：只提取包含 {keyword_filter.describe()} 的内容")
+            extractor = JSONExtractor(filter_keyword=keyword_filter, track_spans=args.preserve_format,
+                                      prefilter=config['processing'].get('keyword_prefilter', True),
+                                      selector=selector)
         else:
-            extractor = JSONExtractor()
+            extractor = JSONExtractor(track_spans=args.preserve_format, selector=selector)
         
-        original_json, values = extractor.extract_from_file(args.input)
+        with profiler.span('stage.extract'):
+            original_json, values = extractor.extract_from_file(args.input)
         logger.info(f"✅ 提取了 {len(values)} 个字符串值")
         
         # 如果使用了过滤关键词但没有找到匹配项
         if args.filter_keyword and len(values) == 0:
-            logger.warning(f"⚠️  未找到包含 '{args.filter_keyword}' 的内容")
+            logger.warning(f"⚠️  未找到包含 {keyword_filter.describe()} 的内容")
             return 0
         
         # 仅提取模式
@@ -173,81 +632,64 @@ def main():
                 logger.error("❌ 使用 --extract-only 时必须指定 --text-file")
                 return 1
             
-            line_separator = config['processing'].get('line_separator', '~')
-            logger.info(f"💾 正在导出到文本文件: {args.text_file}")
-            logger.info(f"💡 使用行分隔符: '{line_separator}' (翻译后请保留此符号)")
-            extractor.export_to_text(args.text_file, line_separator)
-            logger.info(f"✅ 已导出到 {args.text_file}")
-            logger.info(f"💡 每行末尾的 '{line_separator}' 符号用于标记换行，翻译时请保留它")
+            text_format = args.text_format or config['processing'].get('text_format', 'jsonl')
+            if text_format == 'jsonl':
+                logger.info(f"💾 正在导出到 JSON Lines 文件: {args.text_file}")
+                extractor.export_to_jsonl(args.text_file)
+                logger.info(f"✅ 已导出 {len(values)} 条记录到 {args.text_file}")
+                logger.info("💡 在每条记录的 translation 字段填写译文，未填写的记录导入时保持原文")
+            else:
+                line_separator = config['processing'].get('line_separator', '~')
+                logger.info(f"💾 正在导出到文本文件: {args.text_file}")
+                logger.info(f"💡 使用行分隔符: '{line_separator}' (翻译后请保留此符号)")
+                extractor.export_to_text(args.text_file, line_separator)
+                logger.info(f"✅ 已导出到 {args.text_file}")
+                logger.info(f"💡 每行末尾的 '{line_separator}' 符号用于标记换行，翻译时请保留它")
             logger.info("💡 翻译完成后使用 --from-text 导入")
             return 0
         
         # ============= 翻译阶段 =============
         if args.from_text:
-            # 从文本文件导入翻译
-            logger.info(f"📖 正在从文本文件导入翻译: {args.from_text}")
-            line_separator = config['processing'].get('line_separator', '~')
-            
-            with open(args.from_text, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # 使用行分隔符分割文本，而不是按换行符
-            # 这样即使翻译后所有文本都在一行，也能正确分割
-            translated_lines = content.split(line_separator)
-            
-            # 移除最后一个元素，如果它只是文件末尾的空白
-            # 但要保留中间的空字符串（因为某些原始值可能就是空的）
-            if translated_lines and translated_lines[-1].strip() == '':
-                translated_lines = translated_lines[:-1]
-            
-            # 去除每个条目两端的换行符，但保留空字符串
-            translated_lines = [line.strip('\n\r') for line in translated_lines]
-            
-            if len(translated_lines) != len(values):
-                logger.error(f"❌ 文本条目数 ({len(translated_lines)}) 与提取的值数量 ({len(values)}) 不匹配")
-                logger.error(f"💡 提示：请确保翻译时保留了每行末尾的 '{line_separator}' 分隔符")
-                logger.info(f"📊 调试信息：提取了 {len(values)} 个值，导入了 {len(translated_lines)} 个条目")
-                return 1
-            
-            for i, translated_text in enumerate(translated_lines):
-                # 直接使用分割后的文本
-                values[i]['translated'] = translated_text
-            
-            logger.info(f"✅ 已导入 {len(values)} 个翻译值")
+            # 从交换文件导入翻译（JSON Lines 按 id 部分导入；旧的文本格式按顺序整体导入）
+            text_format = detect_format(args.from_text)
+            logger.info(f"📖 正在从{'JSON Lines' if text_format == 'jsonl' else '文本'}文件导入翻译: {args.from_text}")
+            if text_format == 'jsonl':
+                stats = import_jsonl(values, args.from_text)
+                logger.info(f"✅ 已导入 {stats['applied']}/{len(values)} 个翻译值（有效记录 {stats['records']} 条）")
+                if stats['empty']:
+                    logger.info(f"   {stats['empty']} 条记录没有译文，保持原文")
+                if stats['duplicates']:
+                    logger.warning(f"⚠️  {stats['duplicates']} 条记录的 id 重复，以最后一条为准")
+                if stats['stale']:
+                    logger.warning(f"⚠️  {stats['stale']} 条记录的原文已变化，已跳过（如 {', '.join(stats['stale_ids'][:3])}）")
+                if stats['unknown']:
+                    logger.warning(f"⚠️  {stats['unknown']} 条记录在输入文件中找不到（如 {', '.join(stats['unknown_ids'][:3])}）")
+                if stats['invalid']:
+                    logger.warning(f"⚠️  {stats['invalid']} 行无法解析，已跳过（{stats['errors'][0]}）")
+                # 只重建导入了译文的值，其余值保持原样
+                values = [item for item in values if item['translated'] is not None]
+                if not values:
+                    logger.warning("⚠️  没有可导入的译文")
+                    return 0
+            else:
+                line_separator = config['processing'].get('line_separator', '~')
+                try:
+                    import_text(values, args.from_text, line_separator)
+                except ValueError as e:
+                    logger.error(f"❌ {e}")
+                    logger.error(f"💡 提示：请确保翻译时保留了每行末尾的 '{line_separator}' 分隔符，"
+                                 f"或改用 JSON Lines 格式（--text-format jsonl）")
+                    return 1
+                logger.info(f"✅ 已导入 {len(values)} 个翻译值")
         
         else:
             # 使用 API 翻译
             logger.info("🌐 开始翻译...")
             
-            # 初始化缓存管理器
-            cache_manager = None
-            if args.use_cache or config['processing'].get('use_cache', True):
-                cache_dir = config['processing'].get('cache_dir', 'data/cache')
-                cache_manager = CacheManager(cache_dir)
-                stats = cache_manager.get_stats()
-                logger.info(f"💾 缓存状态: {stats['total_entries']} 条记录")
-            
-            # 确定翻译器类型
-            translator_type = args.translator or config.get('translator', {}).get('type', 'google')
-            source_lang = args.source_lang or config.get('translator', {}).get('source_lang', 'auto')
-            target_lang = args.target_lang or config.get('translator', {}).get('target_lang', 'en')
+            translator, cache_manager, source_lang, target_lang = setup_translator(args, config, logger)
             
-            # 初始化翻译器
-            if translator_type == 'klingon':
-                translator = KlingonTranslator(config, cache_manager)
-                logger.info("🖖 使用 Klingon 翻译器")
-            elif translator_type == 'libre':
-                translator = LibreTranslator(config, cache_manager)
-                logger.info(f"🌍 使用 LibreTranslate 翻译器 ({source_lang} -> {target_lang})")
-            elif translator_type == 'reverse':
-                translator = ReverseTranslator(config, cache_manager)
-                logger.info("🔄 使用反转翻译器")
-            elif translator_type == 'flip':
-                translator = FlipTranslator(config, cache_manager)
-                logger.info("🙃 使用字符翻转翻译器")
-            else:  # google
-                translator = GoogleTranslator(config, cache_manager)
-                logger.info(f"🌍 使用 Google 翻译器 ({source_lang} -> {target_lang})")
+            # 翻译器和进度条直接输出到控制台，先写出已缓冲的日志以保持顺序
+            logger.flush()
             
             # 进度跟踪
             if config['logging'].get('show_progress', True):
@@ -256,33 +698,53 @@ def main():
                 def progress_callback(current, total, success_count):
                     tracker.update(current, success_count)
                 
-                values = translator.translate_batch(values, source_lang, target_lang, progress_callback)
+                with profiler.span('stage.translate'):
+                    values = translator.translate_batch(values, source_lang, target_lang, progress_callback)
                 tracker.finish()
             else:
-                values = translator.translate_batch(values, source_lang, target_lang)
+                with profiler.span('stage.translate'):
+                    values = translator.translate_batch(values, source_lang, target_lang)
             
             # 统计翻译结果
             translated_count = sum(1 for v in values if v.get('translated') and v['translated'] != v['original'])
             logger.info(f"✅ 翻译完成: {translated_count}/{len(values)} 个值已翻译")
+            if cache_manager:
+                finish_cache(cache_manager, logger)
         
         # ============= 重建阶段 =============
         if not args.output:
             logger.error("❌ 必须指定输出文件 (-o/--output)")
             return 1
         
-        logger.info("🔨 正在重建 JSON...")
         rebuilder = JSONRebuilder(original_json)
+        partial_update = bool(args.filter_keyword and args.remove_keyword)
+        
+        # 保留格式：直接拼接源文件片段和翻译后的字符串
+        if args.preserve_format:
+            logger.info(f"💾 正在保留格式写出到: {args.output}")
+            with profiler.span('stage.save'):
+                replaced = rebuilder.save_preserving_format(
+                    args.input, values, args.output,
+                    partial_update=partial_update, filter_keyword=args.filter_keyword
+                )
+            logger.info(f"🎉 完成！替换了 {replaced} 个值，文件已保存到: {args.output}")
+            return 0
+        
+        logger.info("🔨 正在重建 JSON...")
         
         # 如果使用了过滤关键词和移除关键词选项，进行部分更新
-        if args.filter_keyword and args.remove_keyword:
-            logger.info(f"🔧 部分更新模式：将移除关键词 '{args.filter_keyword}'")
-            translated_json = rebuilder.rebuild(values, partial_update=True, filter_keyword=args.filter_keyword)
+        if partial_update:
+            logger.info(f"🔧 部分更新模式：将移除命中的关键词 {keyword_filter.describe()}")
+            with profiler.span('stage.rebuild'):
+                translated_json = rebuilder.rebuild(values, partial_update=True, filter_keyword=args.filter_keyword)
         else:
-            translated_json = rebuilder.rebuild(values)
+            with profiler.span('stage.rebuild'):
+                translated_json = rebuilder.rebuild(values)
         
         # 保存到文件
         logger.info(f"💾 正在保存到: {args.output}")
-        rebuilder.save_to_file(translated_json, args.output, indent=2, ensure_ascii=False)
+        with profiler.span('stage.save'):
+            rebuilder.save_to_file(translated_json, args.output, indent=2, ensure_ascii=False)
         
         logger.info(f"🎉 完成！翻译后的文件已保存到: {args.output}")
         
@@ -296,6 +758,7 @@ def main():
         logger.error(f"❌ 发生错误: {str(e)}")
         if args.verbose:
             import traceback
+            logger.flush()
             traceback.print_exc()
         return 1
 
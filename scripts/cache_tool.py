@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+翻译缓存维护工具
+
+子命令:
+    stats     按命名空间（翻译器@版本）和语言对统计条目数、失败条目、文件大小和时间范围
+    compact   清理损坏条目，按配置（或参数）删除过期条目并按 LRU 淘汰
+    export    以 JSON Lines 流式导出（每行一个条目）
+    import    从 JSON Lines 流式导入，按冲突规则合并
+    merge     合并其他机器上的缓存文件（translation_cache.json 或 JSON Lines）
+    seed      按路径对齐已有的源语言 / 目标语言文件，把现成的译文一次性写入缓存
+
+用法:
+    python scripts/cache_tool.py stats
+    python scripts/cache_tool.py compact --max-entries 50000
+    python scripts/cache_tool.py export -o cache.jsonl
+    python scripts/cache_tool.py import cache.jsonl --strategy newest
+    python scripts/cache_tool.py merge runner-a/translation_cache.json runner-b.jsonl --strategy prefer --prefer-translator google
+    python scripts/cache_tool.py seed locales/en locales/zh --source-lang en --target-lang zh-cn --translator google
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import codec
+from src.aligner import align_files, cache_units, pair_files
+from src.normalizer import KeyNormalizer
+from src.segmenter import Segmenter
+from src.translators import get_translator_class
+from src.translators.base_translator import cache_namespace, make_cache_key
+from src.utils import CacheManager, load_config, format_bytes
+
+
+def read_config(args) -> dict:
+    """读取配置文件（不存在时返回空配置）"""
+    return load_config(args.config) if Path(args.config).exists() else {}
+
+
+def open_cache(args) -> CacheManager:
+    """按配置文件和命令行参数打开缓存"""
+    config = read_config(args)
+    processing = dict(config.get('processing', {}))
+    if args.cache_dir:
+        processing['cache_dir'] = args.cache_dir
+    return CacheManager.from_config(processing)
+
+
+def read_jsonl(path: str) -> Iterator[dict]:
+    """逐行读取 JSON Lines（"-" 表示标准输入），跳过空行"""
+    stream = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')
+    try:
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield codec.loads(line)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def read_entries(path: str) -> Iterator[dict]:
+    """读取缓存文件或 JSON Lines 导出文件中的条目"""
+    if path == '-' or path.endswith('.jsonl'):
+        yield from read_jsonl(path)
+        return
+    data = codec.load(path)
+    yield from data.values()
+
+
+def cmd_stats(args) -> int:
+    cache = open_cache(args)
+    entries = list(cache.iter_entries())
+    by_translator = Counter()
+    by_namespace = Counter()
+    by_pair = Counter()
+    timestamps = []
+    accessed = 0
+    failures = Counter()
+    for entry in entries:
+        info = CacheManager.describe_key(entry.get('original', ''), entry)
+        by_translator[info['translator'] or '未知'] += 1
+        namespace = f"{info['translator']}@{info['version']}" if info['version'] is not None else '旧格式（无命名空间）'
+        by_namespace[namespace] += 1
+        if 'failed' in entry:
+            failures[entry['failed']] += 1
+        pair = f"{info['source']} -> {info['target']}" if info['source'] else '未知'
+        by_pair[pair] += 1
+        if entry.get('timestamp'):
+            timestamps.append(entry['timestamp'])
+        if entry.get('accessed'):
+            accessed += 1
+
+    stats = {
+        'cache_file': str(cache.cache_file),
+        'entries': len(entries),
+        'size_bytes': cache.cache_file.stat().st_size if cache.cache_file.exists() else 0,
+        'oldest': min(timestamps) if timestamps else None,
+        'newest': max(timestamps) if timestamps else None,
+        'with_access_time': accessed,
+        'failures': dict(failures.most_common()),
+        'by_translator': dict(by_translator.most_common()),
+        'by_namespace': dict(by_namespace.most_common()),
+        'by_language_pair': dict(by_pair.most_common()),
+    }
+    if args.json:
+        print(json.dumps(stats, indent=2, ensure_ascii=False))
+        return 0
+
+    print(f"📦 缓存文件: {stats['cache_file']} ({format_bytes(stats['size_bytes'])})")
+    print(f"   条目数: {stats['entries']}（记录过访问时间: {accessed}）")
+    if timestamps:
+        print(f"   时间范围: {stats['oldest']} ~ {stats['newest']}")
+    if failures:
+        reasons = '，'.join(f"{reason} {count}" for reason, count in failures.most_common())
+        print(f"   失败条目: {sum(failures.values())}（{reasons}）")
+    print("   按命名空间:")
+    for name, count in by_namespace.most_common():
+        print(f"     {name:<20} {count:>8}")
+    print("   按语言对:")
+    for pair, count in by_pair.most_common():
+        print(f"     {pair:<20} {count:>8}")
+    return 0
+
+
+def cmd_compact(args) -> int:
+    cache = open_cache(args)
+    vacuum = cache.vacuum()
+    result = cache.compact(args.max_entries, args.max_bytes)
+    print(f"🧹 清理损坏条目 {vacuum['removed']}，修正键 {vacuum['rekeyed']}")
+    print(f"   压缩前 {result['before']} 条 ({format_bytes(result['bytes_before'])})，"
+          f"过期 {result['expired']}，淘汰 {result['evicted']}，"
+          f"保留 {result['retained']} 条 ({format_bytes(result['bytes_after'])})")
+    return 0
+
+
+def cmd_export(args) -> int:
+    cache = open_cache(args)
+    stream = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    count = 0
+    try:
+        for entry in cache.iter_entries():
+            stream.write(codec.dumps(entry, compact=True) + '\n')
+            count += 1
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    if args.output != '-':
+        print(f"💾 已导出 {count} 个条目到: {args.output}")
+    return 0
+
+
+def cmd_merge(args) -> int:
+    cache = open_cache(args)
+    totals = Counter()
+    for path in args.sources:
+        stats = cache.merge(read_entries(path), args.strategy, args.prefer_translator, save=False)
+        totals.update(stats)
+        print(f"📥 {path}: 新增 {stats['added']}，替换 {stats['replaced']}，保留原有 {stats['kept']}，"
+              f"无效 {stats['invalid']}")
+    cache.save()
+    print(f"✅ 合并完成：新增 {totals['added']}，替换 {totals['replaced']}，共 {len(cache.cache)} 条")
+    return 0
+
+
+def cmd_seed(args) -> int:
+    config = read_config(args)
+    translator_config = config.get('translator', {})
+    translator_id = args.translator or translator_config.get('type', 'google')
+    source_lang = args.source_lang or translator_config.get('source_lang', 'auto')
+    target_lang = args.target_lang or translator_config.get('target_lang', 'en')
+    namespace = cache_namespace(translator_id, config)
+    # 与翻译时相同的键：翻译器决定键中的语言对，分句和规范化决定键文本
+    try:
+        key_source, key_target = get_translator_class(translator_id).cache_languages(source_lang, target_lang)
+    except (ValueError, ImportError) as e:
+        print(f"⚠️  无法加载翻译器 {translator_id}（{e}），缓存键使用 {source_lang}:{target_lang}")
+        key_source, key_target = source_lang, target_lang
+    processing = config.get('processing', {})
+    if args.normalize_keys:
+        processing = dict(processing, normalize_keys=dict(processing.get('normalize_keys', {}), enabled=True))
+    if args.segment:
+        processing = dict(processing, segmentation=dict(processing.get('segmentation', {}), enabled=True))
+    normalizer = KeyNormalizer.from_config(processing)
+    segmenter = Segmenter.from_config(processing)
+
+    start = time.perf_counter()
+    file_pairs, unmatched = pair_files(args.source, args.target, args.pattern)
+    workers = (os.cpu_count() or 1) if args.workers is None else args.workers
+    if workers and len(file_pairs) > 1:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) as executor:
+            results = list(executor.map(align_files, *zip(*file_pairs),
+                                        [args.include_identical] * len(file_pairs),
+                                        chunksize=max(1, len(file_pairs) // (workers * 4))))
+    else:
+        results = [align_files(source, target, args.include_identical) for source, target in file_pairs]
+
+    # 同一原文在不同文件中译法不同时保留第一次出现的译文
+    translations = {}
+    conflicts = 0
+    totals = Counter()
+    for result in results:
+        if 'error' in result:
+            totals['errors'] += 1
+            continue
+        for text, translation in result['pairs']:
+            units = cache_units(text, translation, normalizer, segmenter) if normalizer or segmenter \
+                else [(text, translation)]
+            if units is None:
+                totals['unaligned'] += 1
+                continue
+            for key_text, key_translation in units:
+                existing = translations.setdefault(key_text, key_translation)
+                if existing != key_translation:
+                    conflicts += 1
+        for field in ('source', 'paired', 'identical', 'empty', 'missing', 'extra'):
+            totals[field] += result[field]
+
+    cache = open_cache(args)
+    timestamp = datetime.now().isoformat()
+    entries = (
+        {'original': make_cache_key(namespace, text, key_source, key_target), 'translated': translation,
+         'timestamp': timestamp, 'translator': translator_id}
+        for text, translation in translations.items()
+    )
+    merged = cache.merge(entries, args.strategy, translator_id, save=False)
+    cache.save()
+    elapsed = time.perf_counter() - start
+
+    coverage = totals['paired'] / totals['source'] if totals['source'] else 0.0
+    report = {
+        'namespace': namespace,
+        'language_pair': f"{key_source}:{key_target}",
+        'normalize_keys': normalizer is not None,
+        'segment': segmenter is not None,
+        'files': len(file_pairs),
+        'files_without_target': unmatched,
+        'files_with_errors': [{'file': r['source_file'], 'error': r['error']} for r in results if 'error' in r],
+        'strings': dict(totals),
+        'coverage': round(coverage, 4),
+        'unique_translations': len(translations),
+        'conflicts': conflicts,
+        'cache': merged,
+        'mismatched_files': [
+            {'source': r['source_file'], 'target': r['target_file'], 'missing': r['missing'], 'extra': r['extra'],
+             'missing_paths': r['missing_paths'], 'extra_paths': r['extra_paths']}
+            for r in results if 'error' not in r and (r['missing'] or r['extra'])
+        ],
+        'seconds': round(elapsed, 3),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return 0
+
+    print(f"🌱 对齐 {len(file_pairs)} 个文件对（{namespace}，{key_source} -> {key_target}），用时 {elapsed:.2f} 秒")
+    print(f"   源字符串 {totals['source']}，成对 {totals['paired']}（覆盖率 {coverage:.1%}），"
+          f"与原文相同 {totals['identical']}，译文为空 {totals['empty']}")
+    print(f"   目标缺少路径 {totals['missing']}，目标多出路径 {totals['extra']}，"
+          f"不同译法冲突 {conflicts}")
+    if totals['unaligned']:
+        print(f"   {totals['unaligned']} 对无法按分句 / 规范化规则对应（句数或首尾标点不同），未写入")
+    print(f"   缓存：新增 {merged['added']}，替换 {merged['replaced']}，保留原有 {merged['kept']}")
+    if unmatched:
+        print(f"⚠️  {len(unmatched)} 个源文件没有对应的目标文件:")
+        for path in unmatched[:10]:
+            print(f"     {path}")
+    for item in report['files_with_errors'][:10]:
+        print(f"❌ 无法解析: {item['file']}: {item['error']}")
+    if report['mismatched_files']:
+        print(f"⚠️  {len(report['mismatched_files'])} 个文件对结构不一致:")
+        for item in report['mismatched_files'][:10]:
+            print(f"     {item['target']}: 缺少 {item['missing']}，多出 {item['extra']}"
+                  f"（如 {', '.join((item['missing_paths'] or item['extra_paths'])[:3])}）")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='翻译缓存维护工具')
+    parser.add_argument('-c', '--config', type=str, default='config/config.json',
+                        help='配置文件路径 (默认: config/config.json)')
+    parser.add_argument('--cache-dir', type=str, help='缓存目录（覆盖配置）')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    stats = subparsers.add_parser('stats', help='按翻译器和语言对统计')
+    stats.add_argument('--json', action='store_true', help='以 JSON 输出')
+    stats.set_defaults(func=cmd_stats)
+
+    compact = subparsers.add_parser('compact', help='清理、过期和按 LRU 淘汰')
+    compact.add_argument('--max-entries', type=int, help='最大条目数（默认使用配置）')
+    compact.add_argument('--max-bytes', type=int, help='最大字节数（默认使用配置）')
+    compact.set_defaults(func=cmd_compact)
+
+    export = subparsers.add_parser('export', help='导出为 JSON Lines')
+    export.add_argument('-o', '--output', type=str, default='-', help='输出路径（默认: 标准输出）')
+    export.set_defaults(func=cmd_export)
+
+    for name, help_text in (('import', '从 JSON Lines 导入'), ('merge', '合并其他缓存文件')):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('sources', nargs='+', help='JSON Lines 文件（"-" 为标准输入）或缓存 JSON 文件')
+        sub.add_argument('--strategy', choices=['newest', 'prefer', 'keep'], default='newest',
+                         help='冲突规则：newest 保留较新条目，prefer 优先指定翻译器，keep 保留已有条目')
+        sub.add_argument('--prefer-translator', type=str, help='strategy 为 prefer 时优先的翻译器 ID')
+        sub.set_defaults(func=cmd_merge)
+
+    seed = subparsers.add_parser('seed', help='对齐已有的源语言 / 目标语言文件并写入缓存')
+    seed.add_argument('source', help='源语言文件或目录')
+    seed.add_argument('target', help='已翻译的目标语言文件或目录（目录按相对路径对应）')
+    seed.add_argument('--source-lang', type=str, help='源语言代码（默认使用配置）')
+    seed.add_argument('--target-lang', type=str, help='目标语言代码（默认使用配置）')
+    seed.add_argument('--translator', type=str, help='写入哪个翻译器的缓存命名空间（默认使用配置）')
+    seed.add_argument('--pattern', type=str, default='*.json', help='目录模式下的文件匹配模式 (默认: *.json)')
+    seed.add_argument('--strategy', choices=['newest', 'keep'], default='newest',
+                      help='与已有缓存冲突时：newest 用现成译文替换，keep 保留已有条目')
+    seed.add_argument('--include-identical', action='store_true', help='译文与原文相同时也写入缓存')
+    seed.add_argument('--normalize-keys', action='store_true',
+                      help='按规范化后的核心文本写入（与翻译时的 --normalize-keys 一致，也读取配置）')
+    seed.add_argument('--segment', action='store_true',
+                      help='长字符串按句写入（与翻译时的 --segment 一致，也读取配置；句数不同的对跳过）')
+    seed.add_argument('--workers', type=int, help='解析文件的工作进程数（默认: CPU 核数，0 表示不使用进程池）')
+    seed.add_argument('--json', action='store_true', help='以 JSON 输出报告')
+    seed.set_defaults(func=cmd_seed)
+
+    args = parser.parse_args()
+    if getattr(args, 'strategy', None) == 'prefer' and not args.prefer_translator:
+        parser.error('--strategy prefer 需要同时指定 --prefer-translator')
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
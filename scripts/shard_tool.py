@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+分片导出与合并工具（多个翻译供应商 / 流水线并行翻译同一批语言文件）
+
+子命令:
+    export    提取源文件，去重后按字符数均衡拆成 N 个分片，写出清单和源文件索引
+    merge     并行读取返回的分片，译文写入缓存，只重建包含新译文的输出文件
+    status    查看各分片的合并状态和整体覆盖率
+
+用法:
+    python scripts/shard_tool.py export locales/en -o shards/ --shards 4 --source-lang en --target-lang zh-cn
+    python scripts/shard_tool.py merge shards/ vendor-a/shard-001.jsonl vendor-b/shard-003.jsonl -o locales/zh
+    python scripts/shard_tool.py status shards/
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import codec
+from src.batch import BatchProcessor, rebuild_file
+from src.exchange import read_jsonl
+from src.path_selector import PathSelector
+from src.sharding import (INDEX, MANIFEST, MERGED, TRANSLATIONS, affected_values, append_translations,
+                          collect_strings, file_digest, iter_index, load_manifest, load_merged, load_translations,
+                          read_shard, save_merged, write_shards)
+from src.translators.base_translator import cache_namespace, make_cache_key
+from src.utils import CacheManager, ensure_dir, load_config
+
+
+def read_config(args) -> dict:
+    """读取配置文件（不存在时返回空配置）"""
+    return load_config(args.config) if Path(args.config).exists() else {}
+
+
+def open_cache(args, config: dict) -> CacheManager:
+    """按配置文件和命令行参数打开缓存"""
+    processing = dict(config.get('processing', {}))
+    if args.cache_dir:
+        processing['cache_dir'] = args.cache_dir
+    return CacheManager.from_config(processing)
+
+
+def executor_for(workers: int, tasks: int):
+    """任务多于一个且允许多进程时返回进程池，否则返回 None"""
+    if workers and tasks > 1:
+        return ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'))
+    return None
+
+
+def cmd_export(args) -> int:
+    config = read_config(args)
+    processing = config.get('processing', {})
+    translator_config = config.get('translator', {})
+    translator_id = args.translator or translator_config.get('type', 'google')
+    source_lang = args.source_lang or translator_config.get('source_lang', 'auto')
+    target_lang = args.target_lang or translator_config.get('target_lang', 'en')
+    namespace = cache_namespace(translator_id, config)
+
+    output_dir = Path(args.output)
+    if (output_dir / MANIFEST).exists() and not args.force:
+        print(f"❌ {output_dir} 中已有分片清单，使用 --force 覆盖")
+        return 1
+    try:
+        selector = PathSelector.from_config(processing, args.include, args.exclude)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    start = time.perf_counter()
+    source = Path(args.source)
+    root = source.parent if source.is_file() else source
+    inputs = [str(source)] if source.is_file() else [str(p) for p in sorted(source.rglob(args.pattern)) if p.is_file()]
+    if not inputs:
+        print(f"⚠️  {args.source} 中没有 JSON 文件")
+        return 0
+    workers = (os.cpu_count() or 1) if args.workers is None else args.workers
+    processor = BatchProcessor(workers=workers if len(inputs) > 1 else 0, filter_keyword=args.filter_keyword,
+                               prefilter=processing.get('keyword_prefilter', True), selector=selector)
+    strings, index = collect_strings(processor.scan(inputs), root)
+    occurrences = sum(info['count'] for info in strings.values())
+
+    # 缓存中已有译文的字符串不再分发，直接记为已合并
+    ensure_dir(str(output_dir))
+    for path in [output_dir / TRANSLATIONS, output_dir / MERGED, *output_dir.glob('shard-*.jsonl')]:
+        if path.exists():
+            path.unlink()
+    cached = []
+    if args.skip_cached:
+        cache = open_cache(args, config)
+        for key, info in list(strings.items()):
+            translation = cache.get(make_cache_key(namespace, info['text'], source_lang, target_lang))
+            if translation is not None:
+                cached.append((key, info['text'], translation))
+                del strings[key]
+        append_translations(output_dir, cached)
+
+    shards = write_shards(strings, args.shards, output_dir) if strings else []
+    with open(output_dir / INDEX, 'w', encoding='utf-8', newline='\n') as f:
+        for entry in index:
+            f.write(codec.dumps(entry, compact=True))
+            f.write('\n')
+    manifest = {
+        'version': 1,
+        'created': datetime.now().isoformat(),
+        'namespace': namespace,
+        'translator': translator_id,
+        'source_lang': source_lang,
+        'target_lang': target_lang,
+        'root': str(root),
+        'files': len(index),
+        'filter_keyword': args.filter_keyword,
+        'selectors': {'include': selector.include, 'exclude': selector.exclude} if selector else None,
+        'strings': len(strings) + len(cached),
+        'occurrences': occurrences,
+        'cached': len(cached),
+        'shards': shards,
+    }
+    codec.dump(manifest, output_dir / MANIFEST)
+    elapsed = time.perf_counter() - start
+
+    print(f"📦 {len(index)} 个文件，{occurrences} 个字符串，去重后 {manifest['strings']} 个"
+          f"（缓存中已有 {len(cached)} 个），用时 {elapsed:.2f} 秒")
+    for shard in shards:
+        print(f"   {shard['name']}  {shard['strings']:>7} 个字符串 | {shard['chars']:>10,} 字符")
+    if shards:
+        chars = [shard['chars'] for shard in shards]
+        print(f"   最大 / 最小分片字符数: {max(chars):,} / {min(chars):,}")
+    print(f"💾 分片和清单已写入: {output_dir}")
+    return 0
+
+
+def cmd_merge(args) -> int:
+    config = read_config(args)
+    shard_dir = Path(args.shard_dir)
+    manifest = load_manifest(shard_dir)
+    files = args.files or [str(shard_dir / shard['name']) for shard in manifest['shards']]
+    missing = [path for path in files if not Path(path).is_file()]
+    merged = load_merged(shard_dir)
+
+    start = time.perf_counter()
+    pending = []
+    for path in files:
+        if path in missing:
+            continue
+        if args.force or merged.get(str(Path(path).resolve())) != file_digest(path):
+            pending.append(path)
+    workers = (os.cpu_count() or 1) if args.workers is None else args.workers
+
+    # 并行解析返回的分片
+    executor = executor_for(workers, len(pending))
+    if executor:
+        with executor:
+            results = list(executor.map(read_shard, pending))
+    else:
+        results = [read_shard(path) for path in pending]
+
+    translations = load_translations(shard_dir)
+    new_records = []
+    changed = set()
+    for result in results:
+        for key, source, translation in result['records']:
+            if translations.get(key) != (source, translation):
+                translations[key] = (source, translation)
+                new_records.append((key, source, translation))
+                changed.add(key)
+    append_translations(shard_dir, new_records)
+
+    cache_report = {'added': 0, 'replaced': 0, 'kept': 0}
+    if new_records and not args.no_cache:
+        cache = open_cache(args, config)
+        timestamp = datetime.now().isoformat()
+        entries = (
+            {'original': make_cache_key(manifest['namespace'], source, manifest['source_lang'],
+                                        manifest['target_lang']),
+             'translated': translation, 'timestamp': timestamp, 'translator': manifest['translator']}
+            for _, source, translation in new_records
+        )
+        cache_report = cache.merge(entries, 'newest', manifest['translator'], save=False)
+        cache.save()
+    for result in results:
+        if result['records']:
+            merged[str(Path(result['file']).resolve())] = result['sha256']
+    save_merged(shard_dir, merged)
+
+    # 只重建包含新译文的文件（--all 时重建全部）
+    root = Path(manifest['root'])
+    output_root = Path(args.output)
+    jobs = []
+    for entry in iter_index(shard_dir):
+        values = affected_values(entry, translations, None if args.all else changed)
+        if values is None:
+            continue
+        output_path = output_root / entry['file']
+        ensure_dir(str(output_path.parent))
+        jobs.append((str(root / entry['file']), str(output_path), values))
+    partial_update = bool(args.remove_keyword and manifest.get('filter_keyword'))
+    executor = executor_for(workers, len(jobs))
+    if executor:
+        with executor:
+            futures = [executor.submit(rebuild_file, input_path, output_path, values, partial_update,
+                                       manifest.get('filter_keyword')) for input_path, output_path, values in jobs]
+            rebuilt = [future.result() for future in futures]
+    else:
+        rebuilt = [rebuild_file(input_path, output_path, values, partial_update, manifest.get('filter_keyword'))
+                   for input_path, output_path, values in jobs]
+    elapsed = time.perf_counter() - start
+
+    print(f"🔀 合并 {len(results)} 个分片（跳过未变化的 {len(files) - len(missing) - len(pending)} 个），"
+          f"新译文 {len(new_records)} 条，用时 {elapsed:.2f} 秒")
+    for result in results:
+        print(f"   {result['file']}: 译文 {len(result['records'])}，未翻译 {result['empty']}"
+              + (f"，原文不符 {result['mismatched']}" if result['mismatched'] else '')
+              + (f"，无法解析 {result['invalid']}（{result['errors'][0]}）" if result['invalid'] else ''))
+    print(f"   缓存：新增 {cache_report['added']}，替换 {cache_report['replaced']}，保留原有 {cache_report['kept']}")
+    print(f"   重建 {len(rebuilt)}/{manifest['files']} 个文件 -> {output_root}")
+    total = manifest['strings']
+    print(f"📊 覆盖率: {len(translations)}/{total} ({len(translations) / total if total else 1:.1%})")
+    for path in missing:
+        print(f"⚠️  找不到分片文件: {path}")
+    return 0
+
+
+def cmd_status(args) -> int:
+    shard_dir = Path(args.shard_dir)
+    manifest = load_manifest(shard_dir)
+    merged = load_merged(shard_dir)
+    translations = load_translations(shard_dir)
+    print(f"📦 {manifest['root']}：{manifest['files']} 个文件，{manifest['strings']} 个去重字符串，"
+          f"{manifest['namespace']}，{manifest['source_lang']} -> {manifest['target_lang']}")
+    for shard in manifest['shards']:
+        # 按分片中的 id 统计已合并的译文（返回文件可以在其他位置）
+        path = shard_dir / shard['name']
+        done = sum(1 for _, record in read_jsonl(str(path)) if record['id'] in translations) if path.exists() else 0
+        print(f"   {shard['name']}  {shard['strings']:>7} 个字符串 | {shard['chars']:>10,} 字符 | "
+              f"已合并 {done}/{shard['strings']}")
+    total = manifest['strings']
+    print(f"📊 覆盖率: {len(translations)}/{total} ({len(translations) / total if total else 1:.1%})，"
+          f"已合并 {len(merged)} 个返回文件")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='分片导出与合并工具')
+    parser.add_argument('-c', '--config', type=str, default='config/config.json',
+                        help='配置文件路径 (默认: config/config.json)')
+    parser.add_argument('--cache-dir', type=str, help='缓存目录（覆盖配置）')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export = subparsers.add_parser('export', help='去重并按字符数均衡拆分')
+    export.add_argument('source', help='源语言文件或目录')
+    export.add_argument('-o', '--output', type=str, required=True, help='分片目录')
+    export.add_argument('--shards', type=int, default=4, help='分片数 (默认: 4)')
+    export.add_argument('--source-lang', type=str, help='源语言代码（默认使用配置）')
+    export.add_argument('--target-lang', type=str, help='目标语言代码（默认使用配置）')
+    export.add_argument('--translator', type=str, help='合并时写入哪个翻译器的缓存命名空间（默认使用配置）')
+    export.add_argument('--pattern', type=str, default='*.json', help='目录模式下的文件匹配模式 (默认: *.json)')
+    export.add_argument('--filter-keyword', type=str, action='append', help='只导出包含此关键词的值；可重复指定')
+    export.add_argument('--include', type=str, action='append', metavar='SELECTOR', help='只导出匹配的路径')
+    export.add_argument('--exclude', type=str, action='append', metavar='SELECTOR', help='跳过匹配的路径')
+    export.add_argument('--skip-cached', action='store_true', help='缓存中已有译文的字符串不导出，直接记为已合并')
+    export.add_argument('--workers', type=int, help='解析文件的工作进程数（默认: CPU 核数，0 表示不使用进程池）')
+    export.add_argument('--force', action='store_true', help='覆盖已有的分片目录')
+    export.set_defaults(func=cmd_export)
+
+    merge = subparsers.add_parser('merge', help='合并返回的分片并重建受影响的文件')
+    merge.add_argument('shard_dir', help='export 生成的分片目录')
+    merge.add_argument('files', nargs='*', help='返回的分片文件（默认: 分片目录中的全部分片）')
+    merge.add_argument('-o', '--output', type=str, required=True, help='输出目录（按相对路径写出）')
+    merge.add_argument('--remove-keyword', action='store_true', help='写回时移除导出时使用的过滤关键词')
+    merge.add_argument('--all', action='store_true', help='重建所有文件，而不只是包含新译文的文件')
+    merge.add_argument('--force', action='store_true', help='内容未变化的分片也重新合并')
+    merge.add_argument('--no-cache', action='store_true', help='不写入翻译缓存')
+    merge.add_argument('--workers', type=int, help='工作进程数（默认: CPU 核数，0 表示不使用进程池）')
+    merge.set_defaults(func=cmd_merge)
+
+    status = subparsers.add_parser('status', help='查看合并状态')
+    status.add_argument('shard_dir', help='export 生成的分片目录')
+    status.set_defaults(func=cmd_status)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,3 +2,22 @@
 
 __version__ = "1.0.0"
 __author__ = "HsxMark"
+
+# 进程内 API（延迟导入，命令行导入 src.* 子模块时不加载）
+_API_EXPORTS = ('TranslationSession', 'translate_document', 'translate_documents', 'build_translator')
+
+
+def __getattr__(attr: str):
+    """``from src import TranslationSession`` 等写法（延迟导入 src.api）"""
+    if attr in _API_EXPORTS:
+        from . import api
+        return getattr(api, attr)
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
+
+
+__all__ = [
+    'TranslationSession',
+    'translate_document',
+    'translate_documents',
+    'build_translator',
+]
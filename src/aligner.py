@@ -0,0 +1,170 @@
+"""
+Locale Aligner
+按路径对齐源语言文件和已翻译的目标语言文件，得到 (原文, 译文) 对，用于预热翻译缓存。
+路径与 JSONExtractor 提取时使用的格式一致（a.b[0].c），两边路径不一致的部分作为结构差异报告。
+"""
+
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .extractor import JSONExtractor
+from .normalizer import KeyNormalizer
+from .segmenter import Segmenter
+
+# 每个文件最多保留的差异路径示例数
+MAX_EXAMPLES = 20
+
+
+def align_values(source_values: List[Dict[str, Any]], target_values: List[Dict[str, Any]],
+                 include_identical: bool = False) -> Dict[str, Any]:
+    """
+    按路径对齐两组提取结果
+
+    Args:
+        source_values: 源文件的提取结果
+        target_values: 目标文件的提取结果
+        include_identical: 是否保留译文与原文相同的对（通常表示尚未翻译）
+
+    Returns:
+        统计与结果：pairs（(原文, 译文) 列表）、source（源字符串数）、paired、identical、empty、
+        missing / extra（目标缺少 / 多出的路径数）及对应的路径示例 missing_paths / extra_paths
+    """
+    targets = {item['path']: item['original'] for item in target_values}
+    pairs = []
+    missing = []
+    identical = empty = 0
+    for item in source_values:
+        path = item['path']
+        if path not in targets:
+            missing.append(path)
+            continue
+        text, translation = item['original'], targets.pop(path)
+        if not text.strip():
+            continue
+        if not translation.strip():
+            empty += 1
+            continue
+        if translation == text and not include_identical:
+            identical += 1
+            continue
+        pairs.append((text, translation))
+    return {
+        'pairs': pairs,
+        'source': len(source_values),
+        'paired': len(pairs),
+        'identical': identical,
+        'empty': empty,
+        'missing': len(missing),
+        'extra': len(targets),
+        'missing_paths': missing[:MAX_EXAMPLES],
+        'extra_paths': list(targets)[:MAX_EXAMPLES],
+    }
+
+
+def cache_units(text: str, translation: str, normalizer: Optional[KeyNormalizer] = None,
+                segmenter: Optional[Segmenter] = None) -> Optional[List[Tuple[str, str]]]:
+    """
+    把一对 (原文, 译文) 换算成翻译时实际查询的缓存单元，使预热的条目与 --segment / --normalize-keys 一致
+
+    - 分句：原文会被拆分时，译文按同样的规则拆分，句数一致才逐句对应
+    - 规范化：缓存键是去掉首尾标点和空白（可选转小写）的核心文本，译文去掉同样的首尾部分后作为核心译文
+
+    Args:
+        text: 原文
+        translation: 译文
+        normalizer: 键规范化器（未启用时为 None）
+        segmenter: 分句器（未启用时为 None）
+
+    Returns:
+        [(缓存键文本, 缓存译文)]；无法可靠对应（句数不同、首尾标点或大小写不一致）时返回 None
+    """
+    pairs = [(text, translation)]
+    if segmenter is not None:
+        segments, _ = segmenter.split(text)
+        if len(segments) > 1:
+            # 译文可能比原文短，按不限长度的同一规则拆分
+            translated, _ = Segmenter(min_length=0).split(translation)
+            if len(translated) != len(segments):
+                return None
+            pairs = list(zip(segments, translated))
+        elif segments[0] != text:
+            # 长字符串即使只有一句，查询时也去掉了首尾空白
+            pairs = [(segments[0], translation.strip())]
+    if normalizer is None:
+        return pairs
+
+    units = []
+    for segment, translated in pairs:
+        prefix, core, suffix, style = normalizer.split(segment)
+        translated = unicodedata.normalize('NFC', translated)
+        if not (translated.startswith(prefix) and translated.endswith(suffix)) \
+                or len(translated) <= len(prefix) + len(suffix):
+            return None
+        middle = translated[len(prefix):len(translated) - len(suffix)]
+        # 查询时按 style 恢复大小写，缓存中存放恢复前的形式
+        if style == 'upper':
+            if middle != middle.upper():
+                return None
+            middle = middle.lower()
+        elif style == 'capitalized':
+            if middle[:1] != middle[:1].upper():
+                return None
+            middle = middle[:1].lower() + middle[1:]
+        if middle == core:
+            # 与核心原文相同会被当作未翻译
+            continue
+        units.append((core, middle))
+    return units
+
+
+def align_files(source_path: str, target_path: str, include_identical: bool = False) -> Dict[str, Any]:
+    """
+    对齐两个文件（可在工作进程中运行）
+
+    Args:
+        source_path: 源语言文件
+        target_path: 已翻译的目标语言文件
+        include_identical: 是否保留译文与原文相同的对
+
+    Returns:
+        align_values() 的结果，另含 source_file、target_file；文件无法解析时只含 error
+    """
+    try:
+        _, source_values = JSONExtractor().extract_from_file(source_path)
+        _, target_values = JSONExtractor().extract_from_file(target_path)
+    except Exception as e:
+        return {'source_file': source_path, 'target_file': target_path, 'error': str(e)}
+    result = align_values(source_values, target_values, include_identical)
+    result['source_file'] = source_path
+    result['target_file'] = target_path
+    return result
+
+
+def pair_files(source: str, target: str, pattern: str = '*.json') -> Tuple[List[Tuple[str, str]], List[str]]:
+    """
+    列出要对齐的文件对：两个文件直接成对；两个目录按相对路径成对
+
+    Args:
+        source: 源文件或目录
+        target: 目标文件或目录
+        pattern: 目录模式下的文件匹配模式（递归）
+
+    Returns:
+        ((源文件, 目标文件) 列表, 目标目录中缺少对应文件的源文件列表)
+    """
+    source_root = Path(source)
+    target_root = Path(target)
+    if source_root.is_file():
+        return [(str(source_root), str(target_root))], []
+    pairs = []
+    unmatched = []
+    for path in sorted(source_root.rglob(pattern)):
+        if not path.is_file():
+            continue
+        counterpart = target_root / path.relative_to(source_root)
+        if counterpart.is_file():
+            pairs.append((str(path), str(counterpart)))
+        else:
+            unmatched.append(str(path))
+    return pairs, unmatched
@@ -0,0 +1,273 @@
+"""
+Library API
+在进程内翻译已解析的 Python 对象，不经过临时文件和子进程：
+
+    from src.api import TranslationSession
+
+    with TranslationSession(config, target_lang='zh-cn') as session:
+        translated = session.translate({'title': 'Hello'})
+        for document in session.translate_many(documents):
+            ...
+
+会话在多次调用之间共享翻译器（HTTP 会话、速率限制器）和缓存；
+translate_many() 把若干文档的值合并成一批，相同的原文只翻译一次。
+"""
+
+import threading
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .extractor import JSONExtractor
+from .keywords import KeywordFilter
+from .normalizer import KeyNormalizer, NormalizedTranslator
+from .path_selector import PathSelector
+from .rebuilder import JSONRebuilder
+from .segmenter import Segmenter, SegmentedTranslator
+from .translators import create_translator
+from .utils import create_cache
+
+# translate_many() 默认每批合并的文档数
+DEFAULT_BATCH_DOCUMENTS = 32
+
+
+def build_translator(translator_id: str, config: dict, cache=None,
+                     normalize_keys: bool = False, segment: bool = False):
+    """
+    创建翻译器，并按配置（或参数强制开启）包装键规范化和分句
+
+    Args:
+        translator_id: 翻译器名称
+        config: 完整配置
+        cache: 缓存（可选）
+        normalize_keys: 强制开启键规范化
+        segment: 强制开启分句翻译
+
+    Returns:
+        翻译器（可能是 NormalizedTranslator / SegmentedTranslator 包装）
+    """
+    translator = create_translator(translator_id, config, cache)
+    processing = config.get('processing', {})
+    if normalize_keys:
+        processing = dict(processing, normalize_keys=dict(processing.get('normalize_keys', {}), enabled=True))
+    normalizer = KeyNormalizer.from_config(processing)
+    if normalizer:
+        translator = NormalizedTranslator(translator, normalizer)
+    if segment:
+        processing = dict(processing, segmentation=dict(processing.get('segmentation', {}), enabled=True))
+    segmenter = Segmenter.from_config(processing)
+    if segmenter:
+        translator = SegmentedTranslator(translator, segmenter)
+    return translator
+
+
+class TranslationSession:
+    """共享翻译器和缓存的翻译会话"""
+
+    def __init__(self, config: Optional[dict] = None, translator: Optional[str] = None,
+                 source_lang: Optional[str] = None, target_lang: Optional[str] = None,
+                 use_cache: Optional[bool] = None, cache=None, logger=None):
+        """
+        初始化会话
+
+        Args:
+            config: 配置字典（与 config/config.json 结构相同，缺省项使用默认值）
+            translator: 默认翻译器（默认 translator.type）
+            source_lang: 默认源语言（默认 translator.source_lang）
+            target_lang: 默认目标语言（默认 translator.target_lang）
+            use_cache: 是否使用缓存（默认 processing.use_cache）
+            cache: 外部传入的缓存（传入时不会在 close() 中关闭）
+            logger: 日志记录器（可选）
+        """
+        self.config = config or {}
+        self.processing = self.config.get('processing', {})
+        defaults = self.config.get('translator', {})
+        self.translator_id = translator or defaults.get('type', 'google')
+        self.source_lang = source_lang or defaults.get('source_lang', 'auto')
+        self.target_lang = target_lang or defaults.get('target_lang', 'en')
+        self.logger = logger
+        self._owns_cache = cache is None
+        if cache is None and (self.processing.get('use_cache', True) if use_cache is None else use_cache):
+            cache = create_cache(self.processing)
+        self.cache = cache
+        self.translators = {}
+        # 翻译器和缓存不保证线程安全：翻译阶段串行执行
+        self._lock = threading.Lock()
+        self._create_lock = threading.Lock()
+
+    def translator(self, translator_id: Optional[str] = None, normalize_keys: bool = False,
+                   segment: bool = False):
+        """获取（必要时创建）翻译器"""
+        key = (translator_id or self.translator_id, normalize_keys, segment)
+        with self._create_lock:
+            translator = self.translators.get(key)
+            if translator is None:
+                translator = build_translator(key[0], self.config, self.cache, normalize_keys, segment)
+                self.translators[key] = translator
+                if self.logger:
+                    self.logger.info(f"🔌 已创建翻译器 {key[0]}")
+        return translator
+
+    def translate(self, document: Any, **options) -> Any:
+        """
+        翻译一个文档
+
+        Args:
+            document: 已解析的 JSON 对象（dict / list，或单个字符串）
+            **options: 见 translate_many()
+
+        Returns:
+            翻译后的文档；默认返回新对象，in_place=True 时直接修改并返回 document
+            （字符串文档返回译文）
+        """
+        return next(self.translate_many([document], batch_documents=1, **options))
+
+    def translate_many(self, documents: Iterable[Any], translator: Optional[str] = None,
+                       source_lang: Optional[str] = None, target_lang: Optional[str] = None,
+                       filter_keyword=None, remove_keyword: bool = False,
+                       include: Optional[List[str]] = None, exclude: Optional[List[str]] = None,
+                       normalize_keys: bool = False, segment: bool = False, in_place: bool = False,
+                       batch_documents: int = DEFAULT_BATCH_DOCUMENTS) -> Iterator[Any]:
+        """
+        逐个翻译文档（可以是生成器，按批读取，不会一次读完）
+
+        Args:
+            documents: 文档序列
+            translator: 翻译器名称（默认使用会话的翻译器）
+            source_lang: 源语言代码
+            target_lang: 目标语言代码
+            filter_keyword: 只翻译包含关键词的值（字符串或列表）
+            remove_keyword: 翻译后移除命中的关键词（需要 filter_keyword）
+            include: 只翻译匹配的路径（与 --include 语法相同）
+            exclude: 跳过匹配的路径
+            normalize_keys: 开启键规范化
+            segment: 开启分句翻译
+            in_place: 直接修改传入的文档，不复制
+            batch_documents: 每批合并翻译的文档数
+
+        Yields:
+            翻译后的文档（顺序与输入一致）
+
+        Raises:
+            ValueError: 关键词或路径选择器无效
+        """
+        keyword_filter = KeywordFilter.create(filter_keyword)
+        selector = PathSelector.from_config(self.processing, include, exclude)
+        partial_update = bool(keyword_filter and remove_keyword)
+        extractor = JSONExtractor(filter_keyword=keyword_filter, selector=selector)
+        source_lang = source_lang or self.source_lang
+        target_lang = target_lang or self.target_lang
+        session_translator = self.translator(translator, normalize_keys, segment)
+
+        iterator = iter(documents)
+        while True:
+            batch = list(islice(iterator, max(1, batch_documents)))
+            if not batch:
+                return
+            extracted = [extractor.extract_from_object(document) for document in batch]
+            self._translate_values([item for values in extracted for item in values],
+                                   session_translator, source_lang, target_lang)
+            for document, values in zip(batch, extracted):
+                if not values:
+                    # 没有需要翻译的值（例如过滤模式下没有命中），原样返回
+                    yield document
+                    continue
+                rebuilder = JSONRebuilder(document)
+                if in_place:
+                    yield rebuilder.patch(document, values, partial_update=partial_update,
+                                          filter_keyword=keyword_filter)
+                else:
+                    yield rebuilder.rebuild(values, partial_update=partial_update, filter_keyword=keyword_filter)
+
+    def translate_texts(self, texts: Iterable[str], translator: Optional[str] = None,
+                        source_lang: Optional[str] = None, target_lang: Optional[str] = None,
+                        normalize_keys: bool = False, segment: bool = False) -> List[str]:
+        """
+        翻译字符串列表
+
+        Returns:
+            译文列表（与输入一一对应；失败的项保留原文）
+        """
+        values = [{'path': f"[{index}]", 'original': text} for index, text in enumerate(texts)]
+        self._translate_values(values, self.translator(translator, normalize_keys, segment),
+                               source_lang or self.source_lang, target_lang or self.target_lang)
+        return [item['translated'] for item in values]
+
+    def _translate_values(self, values: List[Dict[str, Any]], translator,
+                          source_lang: str, target_lang: str) -> None:
+        """去重后翻译，结果写回每个值的 translated"""
+        if not values:
+            return
+        unique = {}
+        for item in values:
+            if item['original'] not in unique:
+                unique[item['original']] = {'path': item['path'], 'original': item['original']}
+        with self._lock:
+            translator.translate_batch(list(unique.values()), source_lang, target_lang)
+        for item in values:
+            item['translated'] = unique[item['original']].get('translated', item['original'])
+
+    def flush(self) -> None:
+        """把缓存中待写的条目写入磁盘"""
+        if self.cache is not None and hasattr(self.cache, 'flush'):
+            with self._lock:
+                self.cache.flush()
+
+    def close(self) -> None:
+        """写出缓存（外部传入的缓存只刷新，不关闭）"""
+        if self.cache is None:
+            return
+        if not self._owns_cache:
+            self.flush()
+            return
+        with self._lock:
+            if self.cache.needs_compaction():
+                self.cache.compact()
+            else:
+                self.cache.close()
+
+    def __enter__(self) -> 'TranslationSession':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def translate_document(document: Any, config: Optional[dict] = None, **options) -> Any:
+    """
+    用临时会话翻译一个文档（多次调用时请复用 TranslationSession）
+
+    Args:
+        document: 已解析的 JSON 对象
+        config: 配置字典
+        **options: translator、source_lang、target_lang 用于创建会话，其余同 translate_many()
+
+    Returns:
+        翻译后的文档
+    """
+    session_options, options = _split_options(options)
+    with TranslationSession(config, **session_options) as session:
+        return session.translate(document, **options)
+
+
+def translate_documents(documents: Iterable[Any], config: Optional[dict] = None, **options) -> Iterator[Any]:
+    """
+    用临时会话逐个翻译文档，迭代结束时写出缓存
+
+    Args:
+        documents: 文档序列
+        config: 配置字典
+        **options: 同 translate_document()
+
+    Yields:
+        翻译后的文档
+    """
+    session_options, options = _split_options(options)
+    with TranslationSession(config, **session_options) as session:
+        yield from session.translate_many(documents, **options)
+
+
+def _split_options(options: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """把会话参数和翻译参数分开"""
+    session_keys = ('translator', 'source_lang', 'target_lang', 'use_cache', 'cache', 'logger')
+    session_options = {key: options.pop(key) for key in session_keys if key in options}
+    return session_options, options
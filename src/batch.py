@@ -0,0 +1,240 @@
+"""
+Batch Processor
+多文件并行处理：解析、提取、重建和序列化在进程池中按文件分发到多个核心，
+翻译请求统一由协调进程（调用方所在进程）发出，缓存和速率限制只有一份。
+
+流水线：所有文件的提取任务先提交到进程池；每个文件提取完成后由协调进程翻译，
+再把重建任务提交回进程池，因此翻译一个文件时其他文件的提取/重建可以同时进行。
+"""
+
+import os
+import shutil
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .extractor import JSONExtractor
+from .path_selector import PathSelector
+from .rebuilder import JSONRebuilder
+from .source import SourceDocument
+from .profiler import profiler
+from .metrics import EXTRACTED_VALUES, REBUILT_VALUES, STAGE_DURATION
+
+
+def extract_file(input_path: str, filter_keyword: Union[str, List[str]] = None,
+                 track_spans: bool = False, prefilter: bool = False,
+                 selector: PathSelector = None) -> Tuple[str, List[Dict[str, Any]], float]:
+    """
+    提取单个文件（在工作进程中运行，只返回值列表，不回传解析树）
+
+    Returns:
+        (输入路径, 值列表, 耗时秒数)
+    """
+    start = time.perf_counter()
+    extractor = JSONExtractor(filter_keyword=filter_keyword, track_spans=track_spans,
+                              prefilter=prefilter, selector=selector)
+    _, values = extractor.extract_from_file(input_path)
+    return input_path, values, time.perf_counter() - start
+
+
+def rebuild_file(input_path: str, output_path: str, values: List[Dict[str, Any]],
+                 partial_update: bool = False, filter_keyword: Union[str, List[str]] = None,
+                 preserve_format: bool = False) -> Tuple[str, int, float]:
+    """
+    重建并保存单个文件（在工作进程中运行，重新解析源文件，避免在进程间传递解析树）
+
+    Returns:
+        (输出路径, 写回的值数量, 耗时秒数)
+    """
+    start = time.perf_counter()
+    if filter_keyword and not values:
+        # 过滤模式下没有命中的文件原样复制，不解析
+        if os.path.abspath(input_path) != os.path.abspath(output_path):
+            shutil.copyfile(input_path, output_path)
+        written = 0
+    elif preserve_format:
+        written = JSONRebuilder(None).save_preserving_format(
+            input_path, values, output_path, partial_update=partial_update, filter_keyword=filter_keyword
+        )
+    else:
+        with SourceDocument(input_path) as source:
+            original_json = source.parse()
+        rebuilder = JSONRebuilder(original_json)
+        result = rebuilder.rebuild(values, partial_update=partial_update, filter_keyword=filter_keyword)
+        rebuilder.save_to_file(result, output_path)
+        written = len(values)
+    return output_path, written, time.perf_counter() - start
+
+
+class _InlineExecutor:
+    """workers=0 时使用的同步执行器（与进程池接口一致，便于对比）"""
+
+    def submit(self, func, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(func(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class BatchProcessor:
+    """多文件批处理器"""
+
+    def __init__(self, translator=None, source_lang: str = 'auto', target_lang: str = 'en',
+                 workers: Optional[int] = None, filter_keyword: Union[str, List[str]] = None,
+                 partial_update: bool = False, preserve_format: bool = False, prefilter: bool = False,
+                 selector: PathSelector = None):
+        """
+        初始化批处理器
+
+        Args:
+            translator: 翻译器实例（只在协调进程中使用；None 时原样写回）
+            source_lang: 源语言代码
+            target_lang: 目标语言代码
+            workers: 工作进程数（None 为 CPU 核数，0 为不使用进程池）
+            filter_keyword: 过滤关键词（一个或多个）
+            partial_update: 是否在写回时移除过滤关键词
+            preserve_format: 是否保留源文件格式写出
+            prefilter: 过滤模式下先在原始字节中查找关键词，没有关键词的文件不解析
+            selector: include / exclude 路径选择器
+        """
+        self.translator = translator
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.filter_keyword = filter_keyword
+        self.partial_update = partial_update
+        self.preserve_format = preserve_format
+        self.prefilter = prefilter
+        self.selector = selector
+
+    def _executor(self):
+        if self.workers == 0:
+            return _InlineExecutor()
+        # spawn：协调进程里有日志等后台线程，fork 可能复制到被持有的锁
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context('spawn'))
+
+    def process(self, jobs: List[Tuple[str, str]],
+                on_translate: Callable[[str, List[Dict[str, Any]]], None] = None) -> List[Dict[str, Any]]:
+        """
+        处理一组文件
+
+        Args:
+            jobs: (输入路径, 输出路径) 列表
+            on_translate: 翻译每个文件时调用 on_translate(输入路径, 值列表) 并使用其返回的值列表，
+                          用于由调用方接管翻译（如显示进度）；None 时直接调用 translate_batch
+
+        Returns:
+            每个文件的结果字典（input、output、values、written），顺序与 jobs 相同
+        """
+        outputs = dict(jobs)
+        results = {input_path: {'input': input_path, 'output': output_path}
+                   for input_path, output_path in jobs}
+
+        with self._executor() as executor:
+            extract_futures = [
+                executor.submit(extract_file, input_path, self.filter_keyword, self.preserve_format,
+                                self.prefilter, self.selector)
+                for input_path, _ in jobs
+            ]
+            rebuild_futures = {}
+            for future in as_completed(extract_futures):
+                input_path, values, elapsed = future.result()
+                STAGE_DURATION.observe(elapsed, stage='extract')
+                EXTRACTED_VALUES.inc(len(values))
+                results[input_path]['values'] = len(values)
+
+                with profiler.span('stage.translate'):
+                    if on_translate:
+                        values = on_translate(input_path, values)
+                    elif self.translator and values:
+                        values = self.translator.translate_batch(values, self.source_lang, self.target_lang)
+                    else:
+                        # 没有翻译器：原样写回
+                        for item in values:
+                            item['translated'] = item['original']
+
+                Path(outputs[input_path]).parent.mkdir(parents=True, exist_ok=True)
+                rebuild_future = executor.submit(
+                    rebuild_file, input_path, outputs[input_path], values,
+                    self.partial_update, self.filter_keyword, self.preserve_format
+                )
+                rebuild_futures[rebuild_future] = input_path
+
+            for future in as_completed(rebuild_futures):
+                _, written, elapsed = future.result()
+                STAGE_DURATION.observe(elapsed, stage='rebuild')
+                REBUILT_VALUES.inc(written)
+                results[rebuild_futures[future]]['written'] = written
+
+        return [results[input_path] for input_path, _ in jobs]
+
+    def scan(self, inputs: List[str]) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        只提取不翻译（如统计还有哪些 %TODO）
+
+        Args:
+            inputs: 输入文件路径列表
+
+        Returns:
+            (输入路径, 值列表) 列表，顺序与 inputs 相同
+        """
+        with self._executor() as executor:
+            futures = [executor.submit(extract_file, input_path, self.filter_keyword, False,
+                                       self.prefilter, self.selector)
+                       for input_path in inputs]
+            results = []
+            for future in futures:
+                input_path, values, elapsed = future.result()
+                STAGE_DURATION.observe(elapsed, stage='extract')
+                EXTRACTED_VALUES.inc(len(values))
+                results.append((input_path, values))
+        return results
+
+
+def collect_jobs(input_dir: str, output_dir: str, pattern: str = '*.json') -> List[Tuple[str, str]]:
+    """
+    列出目录下的 JSON 文件及对应的输出路径（保留相对目录结构）
+
+    Args:
+        input_dir: 输入目录
+        output_dir: 输出目录
+        pattern: 文件匹配模式（递归）
+
+    Returns:
+        (输入路径, 输出路径) 列表；输出目录位于输入目录之内时跳过其中的文件（上一次的输出不是输入）
+    """
+    input_root = Path(input_dir)
+    output_root = Path(output_dir)
+    nested = nested_output(input_dir, output_dir)
+    # 输出目录相对于输入目录的路径分段
+    skip = nested.relative_to(input_root.resolve()).parts if nested else None
+    jobs = []
+    for path in sorted(input_root.rglob(pattern)):
+        relative = path.relative_to(input_root)
+        if path.is_file() and not (skip and relative.parts[:len(skip)] == skip):
+            jobs.append((str(path), str(output_root / relative)))
+    return jobs
+
+
+def nested_output(input_dir: str, output_dir: str) -> Optional[Path]:
+    """
+    输出目录是否位于输入目录之内（不含两者相同的原地翻译）
+
+    Returns:
+        输出目录的绝对路径；不在输入目录之内时返回 None
+    """
+    input_root = Path(input_dir).resolve()
+    output_root = Path(output_dir).resolve()
+    if output_root != input_root and output_root.is_relative_to(input_root):
+        return output_root
+    return None
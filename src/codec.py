@@ -0,0 +1,184 @@
+"""
+JSON 编解码
+统一的 JSON 读写入口：安装了 orjson / ujson 时使用更快的后端，否则回退到标准库 json。
+
+- 格式化输出（indent=2，面向用户的文件）与标准库 json.dump(indent=2, ensure_ascii=False)
+  逐字节一致；快速后端无法保证一致时（科学计数法浮点数、超出 64 位的整数、NaN/Infinity 等）
+  自动回退到标准库
+- 紧凑输出（compact=True）用于缓存等只给程序读的文件，不保证与标准库格式一致
+
+可用环境变量 JSONKLINGONIZER_JSON_BACKEND=orjson|ujson|json 强制指定后端。
+"""
+
+import json
+import os
+import re
+from typing import Any, Optional, Union
+
+BACKENDS = ('orjson', 'ujson', 'json')
+
+# 快速后端的数字格式与标准库不同的情况（如 1e-07 / 1e-7），出现时回退到标准库
+_EXPONENT = re.compile(rb'[0-9][eE][-+0-9]')
+
+# orjson 把超出 64 位的整数解析成浮点数；出现 19 位以上的连续数字时改用标准库解析
+# （数字统一映射为 0 后做子串查找，比正则扫描快得多）
+_DIGITS = bytes.maketrans(b'0123456789', b'0' * 10)
+_LONG_NUMBER = b'0' * 19
+
+_backend = None
+_module = None
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """是否包含 NaN / Infinity（orjson 会把它们写成 null）"""
+    if isinstance(obj, float):
+        return obj != obj or obj in (float('inf'), float('-inf'))
+    if isinstance(obj, dict):
+        return any(_has_non_finite(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(value) for value in obj)
+    return False
+
+
+def _has_long_number(data: Union[str, bytes]) -> bool:
+    """是否包含 19 位以上的连续数字（可能超出 64 位整数范围）"""
+    raw = data.encode('utf-8') if isinstance(data, str) else bytes(data)
+    return _LONG_NUMBER in raw.translate(_DIGITS)
+
+
+def set_backend(name: Optional[str] = None) -> str:
+    """
+    选择 JSON 后端
+
+    Args:
+        name: 'orjson'、'ujson' 或 'json'；None 时按环境变量或 orjson > ujson > json 自动选择
+
+    Returns:
+        实际使用的后端名称
+    """
+    global _backend, _module
+    candidates = [name] if name else ([os.environ['JSONKLINGONIZER_JSON_BACKEND']]
+                                      if os.environ.get('JSONKLINGONIZER_JSON_BACKEND') else BACKENDS)
+    for candidate in candidates:
+        if candidate not in BACKENDS:
+            raise ValueError(f"未知的 JSON 后端: {candidate}（可选: {', '.join(BACKENDS)}）")
+        if candidate == 'json':
+            _backend, _module = 'json', json
+            return _backend
+        try:
+            _module = __import__(candidate)
+            _backend = candidate
+            return _backend
+        except ImportError:
+            if name:
+                raise
+    _backend, _module = 'json', json
+    return _backend
+
+
+def backend_name() -> str:
+    """当前使用的后端名称"""
+    if _backend is None:
+        set_backend()
+    return _backend
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    解析 JSON
+
+    Args:
+        data: JSON 文本、UTF-8 字节或支持缓冲区协议的对象（如 mmap）；
+              orjson 直接解析缓冲区，其他后端需要先复制为 bytes
+
+    Returns:
+        解析后的对象
+    """
+    backend = backend_name()
+    if not isinstance(data, (str, bytes)) and backend != 'orjson':
+        data = bytes(data)
+    if backend == 'orjson' and not _has_long_number(data):
+        try:
+            return _module.loads(data)
+        except _module.JSONDecodeError:
+            # orjson 拒绝 NaN/Infinity 等标准库接受的扩展语法
+            pass
+    elif backend == 'ujson':
+        try:
+            return _module.loads(data)
+        except (ValueError, OverflowError):
+            pass
+    if not isinstance(data, str):
+        data = bytes(data).decode('utf-8-sig')
+    return json.loads(data)
+
+
+def dumps_bytes(obj: Any, indent: Optional[int] = 2, ensure_ascii: bool = False,
+                compact: bool = False) -> bytes:
+    """
+    序列化为 UTF-8 字节
+
+    Args:
+        obj: 要序列化的对象
+        indent: 缩进空格数（compact=True 时忽略）
+        ensure_ascii: 是否转义非 ASCII 字符
+        compact: 紧凑模式（无空白，用于机器读取的文件）
+
+    Returns:
+        JSON 字节
+    """
+    backend = backend_name()
+    if not ensure_ascii and backend != 'json':
+        try:
+            if backend == 'orjson':
+                if compact:
+                    data = _module.dumps(obj)
+                    # 只有输出中出现 null 时才需要检查是否有被改写的 NaN/Infinity
+                    if b'null' not in data or not _has_non_finite(obj):
+                        return data
+                elif indent == 2:
+                    data = _module.dumps(obj, option=_module.OPT_INDENT_2)
+                    if not _EXPONENT.search(data) and (b'null' not in data or not _has_non_finite(obj)):
+                        return data
+            elif compact:
+                return _module.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode('utf-8')
+        except (TypeError, ValueError, OverflowError):
+            pass
+    if compact:
+        text = json.dumps(obj, ensure_ascii=ensure_ascii, separators=(',', ':'))
+    else:
+        text = json.dumps(obj, indent=indent, ensure_ascii=ensure_ascii)
+    return text.encode('utf-8')
+
+
+def dumps(obj: Any, indent: Optional[int] = 2, ensure_ascii: bool = False, compact: bool = False) -> str:
+    """序列化为字符串（参数同 dumps_bytes）"""
+    return dumps_bytes(obj, indent, ensure_ascii, compact).decode('utf-8')
+
+
+def load(path: Union[str, os.PathLike]) -> Any:
+    """
+    读取并解析 JSON 文件
+
+    Args:
+        path: 文件路径（UTF-8 编码）
+
+    Returns:
+        解析后的对象
+    """
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def dump(obj: Any, path: Union[str, os.PathLike], indent: Optional[int] = 2,
+         ensure_ascii: bool = False, compact: bool = False) -> None:
+    """
+    序列化并写入 JSON 文件（参数同 dumps_bytes）
+
+    Args:
+        obj: 要序列化的对象
+        path: 输出路径
+    """
+    data = dumps_bytes(obj, indent, ensure_ascii, compact)
+    with open(path, 'wb') as f:
+        f.write(data)
@@ -0,0 +1,197 @@
+"""
+Exchange Format
+手动翻译用的 JSON Lines 交换文件：每行一条记录，以提取路径作为 id
+
+    {"id": "settings.title", "source": "Settings", "translation": ""}
+
+- 逐行写出、逐行读取，导入时不需要把整个文件读入内存
+- 记录可以乱序、缺失或分多批导入，只应用文件中出现的记录
+- 源文件在导出之后被修改过的值（source 不一致）不会被覆盖
+- 兼容旧的 "~" 分隔纯文本格式（按条目顺序对应，数量必须一致）
+"""
+
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+FORMATS = ('jsonl', 'text')
+
+# 导入统计中保留的问题示例数
+MAX_EXAMPLES = 20
+
+
+def export_jsonl(values: List[Dict[str, Any]], output_path: str) -> int:
+    """
+    将提取的值导出为 JSON Lines 交换文件
+
+    Args:
+        values: 提取的值列表
+        output_path: 输出路径
+
+    Returns:
+        写出的记录数
+    """
+    with open(output_path, 'w', encoding='utf-8', newline='\n') as f:
+        for item in values:
+            record = {'id': item['path'], 'source': item['original'], 'translation': ''}
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write('\n')
+    return len(values)
+
+
+def read_jsonl(input_path: str, errors: Optional[List[str]] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    逐行读取交换文件
+
+    Args:
+        input_path: 交换文件路径
+        errors: 收集无法解析的行（"第 N 行: 原因"），为 None 时不收集
+
+    Yields:
+        (行号, 记录)；空行和无法解析的行被跳过
+    """
+    with open(input_path, 'r', encoding='utf-8-sig') as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                if errors is not None:
+                    errors.append(f"第 {number} 行: {e}")
+                continue
+            if not isinstance(record, dict) or not isinstance(record.get('id'), str):
+                if errors is not None:
+                    errors.append(f"第 {number} 行: 缺少字符串 id")
+                continue
+            yield number, record
+
+
+def import_jsonl(values: List[Dict[str, Any]], input_path: str) -> Dict[str, Any]:
+    """
+    把交换文件中的译文填入提取的值（部分导入，记录顺序任意）
+
+    Args:
+        values: 提取的值列表（被导入的项填入 translated）
+        input_path: 交换文件路径
+
+    Returns:
+        统计：records（有效记录数）、applied、empty（译文为空）、unknown（id 不存在）、
+        stale（源文本已变化）、duplicates（同一 id 出现多次，以最后一条为准）、invalid（无法解析的行），
+        以及对应的示例 unknown_ids / stale_ids / errors
+    """
+    by_path = {item['path']: item for item in values}
+    seen = set()
+    errors = []
+    unknown = []
+    stale = []
+    stats = {'records': 0, 'applied': 0, 'empty': 0, 'duplicates': 0}
+    for _, record in read_jsonl(input_path, errors):
+        stats['records'] += 1
+        path = record['id']
+        item = by_path.get(path)
+        if item is None:
+            unknown.append(path)
+            continue
+        if 'source' in record and record['source'] != item['original']:
+            stale.append(path)
+            continue
+        translation = record.get('translation')
+        if not isinstance(translation, str) or translation == '':
+            stats['empty'] += 1
+            continue
+        if path in seen:
+            stats['duplicates'] += 1
+        else:
+            seen.add(path)
+            stats['applied'] += 1
+        item['translated'] = translation
+    stats.update({
+        'unknown': len(unknown),
+        'stale': len(stale),
+        'invalid': len(errors),
+        'unknown_ids': unknown[:MAX_EXAMPLES],
+        'stale_ids': stale[:MAX_EXAMPLES],
+        'errors': errors[:MAX_EXAMPLES],
+    })
+    return stats
+
+
+def export_text(values: List[Dict[str, Any]], output_path: str, line_separator: str = "~") -> int:
+    """
+    导出为旧的纯文本格式（每行一个值，以分隔符结尾）
+
+    Args:
+        values: 提取的值列表
+        output_path: 输出路径
+        line_separator: 行分隔符，用于标记每个值的结尾
+
+    Returns:
+        写出的条目数
+    """
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for item in values:
+            # 不转义换行符，而是在末尾添加分隔符
+            # 这样即使文本被翻译成一行，也能通过分隔符正确还原
+            f.write(f"{item['original']}{line_separator}\n")
+    return len(values)
+
+
+def import_text(values: List[Dict[str, Any]], input_path: str, line_separator: str = "~") -> int:
+    """
+    从旧的纯文本格式导入（按顺序对应）
+
+    Args:
+        values: 提取的值列表
+        input_path: 翻译好的文本文件
+        line_separator: 行分隔符
+
+    Returns:
+        导入的条目数
+
+    Raises:
+        ValueError: 条目数与提取的值数量不一致
+    """
+    with open(input_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    # 使用行分隔符分割文本，而不是按换行符
+    # 这样即使翻译后所有文本都在一行，也能正确分割
+    translated_lines = content.split(line_separator)
+
+    # 移除最后一个元素，如果它只是文件末尾的空白
+    # 但要保留中间的空字符串（因为某些原始值可能就是空的）
+    if translated_lines and translated_lines[-1].strip() == '':
+        translated_lines = translated_lines[:-1]
+
+    # 去除每个条目两端的换行符，但保留空字符串
+    translated_lines = [line.strip('\n\r') for line in translated_lines]
+
+    if len(translated_lines) != len(values):
+        raise ValueError(f"文本条目数 ({len(translated_lines)}) 与提取的值数量 ({len(values)}) 不匹配")
+
+    for item, translated_text in zip(values, translated_lines):
+        item['translated'] = translated_text
+    return len(values)
+
+
+def detect_format(input_path: str) -> str:
+    """
+    根据第一条非空内容判断交换文件格式
+
+    Returns:
+        'jsonl'（以 JSON 对象开头）或 'text'
+    """
+    with open(input_path, 'r', encoding='utf-8-sig') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('{'):
+                try:
+                    if isinstance(json.loads(line), dict):
+                        return 'jsonl'
+                except ValueError:
+                    pass
+            return 'text'
+    return 'jsonl'
@@ -3,40 +3,122 @@ JSON Value Extractor
 提取 JSON 文件中的所有字符串值，保留路径信息以便后续重建
 """
 
-import json
 from typing import Dict, List, Any, Union
 
+from .exchange import export_jsonl, export_text
+from .keywords import KeywordFilter
+from .path_selector import FREE, PathSelector
+from .source import SourceDocument
+from .profiler import profiler
+from .metrics import EXTRACTED_VALUES, STAGE_DURATION, timer
+
 
 class JSONExtractor:
     """JSON 值提取器"""
     
-    def __init__(self, filter_keyword: str = None):
+    def __init__(self, filter_keyword: Union[str, List[str], KeywordFilter] = None,
+                 track_spans: bool = False, prefilter: bool = False, selector: PathSelector = None):
         """
         初始化提取器
         
         Args:
-            filter_keyword: 可选的过滤关键词，只提取包含此关键词的值
+            filter_keyword: 可选的过滤关键词（一个或多个），只提取包含其中任一关键词的值，
+                            命中的关键词记录在值的 "keywords" 字段
+            track_spans: 是否记录每个值在源文件中的字节范围（写入值的 "span" 字段）
+            prefilter: 过滤模式下先在原始字节中查找关键词，文件中没有关键词时不解析
+                       （此时返回的 JSON 对象为 None）
+            selector: 可选的 include / exclude 路径选择器，未被选中的子树不会被访问
         """
         self.values = []
         self.filter_keyword = filter_keyword
+        self.keyword_filter = KeywordFilter.create(filter_keyword)
+        self.track_spans = track_spans
+        self.prefilter = prefilter
+        self.selector = selector
     
     def extract_from_file(self, file_path: str) -> tuple:
         """
-        从文件中提取 JSON 值
+        从文件中提取 JSON 值（以内存映射方式读取，直接解析映射的字节）
         
         Args:
             file_path: JSON 文件路径
             
         Returns:
-            (原始JSON对象, 提取的值列表)
+            (原始JSON对象, 提取的值列表)；预过滤跳过的文件返回 (None, [])
+        """
+        with timer(STAGE_DURATION, stage='extract'), SourceDocument(file_path) as source:
+            if self.prefilter and self.keyword_filter:
+                with profiler.span('extract.prefilter'):
+                    found = self.keyword_filter.may_match(source.data)
+                if not found:
+                    self.values = []
+                    return None, self.values
+            
+            with profiler.span('extract.parse'):
+                json_data = source.parse()
+            
+            self._walk(json_data)
+            
+            if self.track_spans:
+                spans = source.string_spans()
+                for item in self.values:
+                    item['span'] = spans.get(item['path'])
+        EXTRACTED_VALUES.inc(len(self.values))
+        
+        return json_data, self.values
+    
+    def extract_from_object(self, json_data: Any) -> List[Dict[str, Any]]:
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            json_data = json.load(f)
+        从已解析的 JSON 对象中提取值（不支持预过滤和字节范围）
         
+        Args:
+            json_data: JSON 对象
+            
+        Returns:
+            提取的值列表
+        """
+        with timer(STAGE_DURATION, stage='extract'):
+            self._walk(json_data)
+        EXTRACTED_VALUES.inc(len(self.values))
+        return self.values
+    
+    def _walk(self, json_data: Any) -> None:
+        """遍历整个文档，结果写入 self.values"""
         self.values = []
-        self._extract_recursive(json_data, "")
+        with profiler.span('extract.walk'):
+            if self.selector is None:
+                self._extract_recursive(json_data, "")
+            else:
+                state = self.selector.start()
+                if state is not None:
+                    self._extract_selected(json_data, "", state)
+    
+    def _extract_selected(self, obj: Any, path: str, state: tuple) -> None:
+        """
+        按路径选择器递归提取：被排除或不可能被包含的子树直接跳过，
+        子树整体被选中且没有排除规则时交给 _extract_recursive
         
-        return json_data, self.values
+        Args:
+            obj: JSON 对象
+            path: 当前值的路径
+            state: 当前节点的选择器状态
+        """
+        if state is FREE:
+            self._extract_recursive(obj, path)
+            return
+        step = self.selector.step
+        if isinstance(obj, dict):
+            for key, value in obj.items():
+                child = step(state, key, False)
+                if child is not None:
+                    self._extract_selected(value, f"{path}.{key}" if path else key, child)
+        elif isinstance(obj, list):
+            for idx, item in enumerate(obj):
+                child = step(state, idx, True)
+                if child is not None:
+                    self._extract_selected(item, f"{path}[{idx}]", child)
+        elif isinstance(obj, str) and self.selector.selected(state):
+            self._extract_recursive(obj, path)
     
     def _extract_recursive(self, obj: Any, path: str) -> None:
         """
@@ -58,13 +140,22 @@ class JSONExtractor:
                 
         elif isinstance(obj, str):
             # 只提取字符串类型的值
-            # 如果设置了过滤关键词，则只提取包含该关键词的值
-            if self.filter_keyword is None or self.filter_keyword in obj:
+            # 如果设置了过滤关键词，则只提取包含其中任一关键词的值
+            if self.keyword_filter is None:
                 self.values.append({
                     "path": path,
                     "original": obj,
                     "translated": None  # 将在翻译后填充
                 })
+            else:
+                keywords = self.keyword_filter.find(obj)
+                if keywords:
+                    self.values.append({
+                        "path": path,
+                        "original": obj,
+                        "translated": None,
+                        "keywords": keywords  # 重建时移除这些关键词
+                    })
     
     def export_to_text(self, output_path: str, line_separator: str = "~") -> None:
         """
@@ -75,11 +166,17 @@ class JSONExtractor:
             output_path: 输出文本文件路径
             line_separator: 行分隔符（默认为 "~"），用于标记每行结尾，翻译后可以正确分割
         """
-        with open(output_path, 'w', encoding='utf-8') as f:
-            for item in self.values:
-                # 不再转义换行符，而是在末尾添加分隔符
-                # 这样即使文本被翻译成一行，也能通过分隔符正确还原
-                f.write(f"{item['original']}{line_separator}\n")
+        export_text(self.values, output_path, line_separator)
+    
+    def export_to_jsonl(self, output_path: str) -> None:
+        """
+        将提取的值导出为 JSON Lines 交换文件（每行一条 {id, source, translation} 记录）
+        用于手动翻译，导入时按 id（路径）对应，可以部分导入、乱序导入
+        
+        Args:
+            output_path: 输出文件路径
+        """
+        export_jsonl(self.values, output_path)
     
     def get_values(self) -> List[Dict[str, Any]]:
         """获取提取的值列表"""
@@ -90,13 +187,13 @@ class JSONExtractor:
         return [item['original'] for item in self.values]
 
 
-def extract_json_values(file_path: str, filter_keyword: str = None) -> tuple:
+def extract_json_values(file_path: str, filter_keyword: Union[str, List[str]] = None) -> tuple:
     """
     便捷函数：从 JSON 文件提取值
     
     Args:
         file_path: JSON 文件路径
-        filter_keyword: 可选的过滤关键词
+        filter_keyword: 可选的过滤关键词（一个或多个）
         
     Returns:
         (原始JSON对象, 提取的值列表)
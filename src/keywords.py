@@ -0,0 +1,107 @@
+"""
+Keyword Filter
+多关键词过滤（如 %TODO、%FIXME、[untranslated]）：
+- 所有关键词编译成一个正则交替式（长的在前），每个字符串只在 C 层扫描一遍，
+  关键词数量增加时开销基本不变
+- 记录每个值命中了哪些关键词，重建时只移除实际命中的关键词
+- 原始字节预过滤：文件中完全没有关键词时跳过解析
+"""
+
+import re
+from typing import Iterable, List, Optional, Union
+
+# 在 JSON 源文件中可能被转义的字符（"、\、/ 和控制字符），以及非 ASCII 字符：
+# 关键词包含这些字符时无法可靠地在原始字节中查找，预过滤自动关闭
+_UNSAFE_FOR_BYTES = re.compile(r'["\\/\x00-\x1f\x7f-\U0010ffff]')
+
+
+class KeywordFilter:
+    """多关键词匹配器"""
+
+    def __init__(self, keywords: Union[str, Iterable[str]]):
+        """
+        初始化匹配器
+
+        Args:
+            keywords: 一个或多个关键词（空字符串会被忽略）
+        """
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        # 去重并按长度从长到短排列，使 "%TODO" 优先于它的子串 "TODO"
+        self.keywords = sorted(dict.fromkeys(k for k in keywords if k), key=len, reverse=True)
+        if not self.keywords:
+            raise ValueError("至少需要一个非空关键词")
+        self.pattern = re.compile('|'.join(map(re.escape, self.keywords)))
+        self.byte_pattern = None
+        if not any(_UNSAFE_FOR_BYTES.search(keyword) for keyword in self.keywords):
+            self.byte_pattern = re.compile(b'|'.join(re.escape(k.encode('ascii')) for k in self.keywords))
+
+    @classmethod
+    def create(cls, keywords) -> Optional['KeywordFilter']:
+        """
+        由关键词（字符串、列表或已有的匹配器）创建匹配器
+
+        Returns:
+            没有关键词时返回 None
+        """
+        if keywords is None or isinstance(keywords, cls):
+            return keywords
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        keywords = [k for k in keywords if k]
+        return cls(keywords) if keywords else None
+
+    def find(self, text: str) -> List[str]:
+        """
+        查找文本中出现的关键词
+
+        Args:
+            text: 要检查的文本
+
+        Returns:
+            命中的关键词（按出现顺序去重），没有命中时为空列表
+        """
+        found = self.pattern.findall(text)
+        if len(found) > 1:
+            return list(dict.fromkeys(found))
+        return found
+
+    def strip(self, text: str, keywords: Optional[List[str]] = None) -> str:
+        """
+        移除关键词
+
+        Args:
+            text: 文本
+            keywords: 要移除的关键词（默认移除所有关键词）
+
+        Returns:
+            移除关键词并去掉首尾空白后的文本
+        """
+        if keywords is None:
+            return self.pattern.sub('', text).strip()
+        for keyword in keywords:
+            text = text.replace(keyword, '')
+        return text.strip()
+
+    @property
+    def can_prefilter(self) -> bool:
+        """关键词是否都能直接在原始字节中查找"""
+        return self.byte_pattern is not None
+
+    def may_match(self, data) -> bool:
+        """
+        原始字节中是否可能包含关键词（用于跳过整个文件）
+
+        Args:
+            data: 文件内容（bytes 或 mmap）
+
+        Returns:
+            False 表示一定不包含；关键词无法预过滤时总是返回 True
+        """
+        if self.byte_pattern is None:
+            return True
+        return self.byte_pattern.search(data) is not None
+
+    def describe(self) -> str:
+        """用于日志的关键词列表"""
+        return ', '.join(f"'{keyword}'" for keyword in self.keywords)
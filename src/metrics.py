@@ -0,0 +1,306 @@
+"""
+指标注册表
+提供计数器（Counter）、仪表（Gauge）和直方图（Histogram），
+可导出为 OpenMetrics / Prometheus 文本格式，用于生产环境统计缓存命中率、
+请求延迟、状态码、重试次数和吞吐量。
+"""
+
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Tuple
+
+# 默认的延迟分桶（秒）
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_value(value: float) -> str:
+    """格式化样本值"""
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """转义标签值"""
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: Tuple[str, str] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric:
+    """指标基类"""
+
+    type_name = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+        self.values = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"指标 {self.name} 需要标签 {self.labelnames}，实际为 {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def reset(self) -> None:
+        """清空所有样本"""
+        with self.lock:
+            self.values = {}
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """单调递增的计数器"""
+
+    type_name = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """
+        增加计数
+
+        Args:
+            amount: 增量（不能为负）
+            **labels: 标签值
+        """
+        if amount < 0:
+            raise ValueError("计数器不能减少")
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """获取当前值（未出现过的标签组合返回 0）"""
+        return self.values.get(self._key(labels), 0)
+
+    def total(self) -> float:
+        """所有标签组合的合计"""
+        with self.lock:
+            return sum(self.values.values())
+
+    def samples(self) -> List[str]:
+        with self.lock:
+            items = sorted(self.values.items())
+        return [f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in items]
+
+
+class Gauge(_Metric):
+    """可增可减的仪表"""
+
+    type_name = 'gauge'
+
+    def set(self, value: float, **labels) -> None:
+        """设置当前值"""
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """增加"""
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        """减少"""
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        """获取当前值"""
+        return self.values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self.lock:
+            items = sorted(self.values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in items]
+
+
+class Histogram(_Metric):
+    """分桶直方图"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels) -> None:
+        """
+        记录一次观测值
+
+        Args:
+            value: 观测值（如请求耗时秒数）
+            **labels: 标签值
+        """
+        key = self._key(labels)
+        with self.lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state['counts'][i] += 1
+                    break
+            state['sum'] += value
+            state['count'] += 1
+
+    def count(self, **labels) -> int:
+        """观测次数"""
+        state = self.values.get(self._key(labels))
+        return state['count'] if state else 0
+
+    def sum(self, **labels) -> float:
+        """观测值总和"""
+        state = self.values.get(self._key(labels))
+        return state['sum'] if state else 0.0
+
+    def samples(self) -> List[str]:
+        with self.lock:
+            items = sorted((key, dict(state, counts=list(state['counts']))) for key, state in self.values.items())
+        lines = []
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state['counts']):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ('le', _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state['sum'])}")
+            lines.append(f"{self.name}_count{labels} {state['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """指标注册表"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self.lock:
+            existing = self.metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"指标 {metric.name} 已以不同的类型或标签注册")
+                return existing
+            self.metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        """注册（或获取已存在的）计数器"""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        """注册（或获取已存在的）仪表"""
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        """注册（或获取已存在的）直方图"""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> _Metric:
+        """按名称获取指标"""
+        return self.metrics[name]
+
+    def reset(self) -> None:
+        """清空所有指标的样本（保留注册信息）"""
+        for metric in list(self.metrics.values()):
+            metric.reset()
+
+    def to_text(self, openmetrics: bool = True) -> str:
+        """
+        导出为文本格式
+
+        Args:
+            openmetrics: True 输出 OpenMetrics 格式（以 "# EOF" 结尾），
+                         False 输出 Prometheus 文本格式（适用于 node_exporter textfile collector）
+
+        Returns:
+            指标文本
+        """
+        lines = []
+        for name in sorted(self.metrics):
+            metric = self.metrics[name]
+            family = name if openmetrics or metric.type_name != 'counter' else f"{name}_total"
+            lines.append(f"# HELP {family} {metric.documentation}")
+            lines.append(f"# TYPE {family} {metric.type_name}")
+            lines.extend(metric.samples())
+        if openmetrics:
+            lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: str, openmetrics: bool = True) -> None:
+        """
+        将指标写入文件（先写临时文件再替换，避免采集方读到不完整内容）
+
+        Args:
+            path: 输出路径
+            openmetrics: 是否使用 OpenMetrics 格式
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_text(openmetrics))
+        os.replace(tmp_path, path)
+
+
+@contextmanager
+def timer(histogram: Histogram, **labels):
+    """
+    计时上下文，退出时将耗时（秒）记录到直方图
+
+    Args:
+        histogram: 目标直方图
+        **labels: 标签值
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - start, **labels)
+
+
+# 全局指标注册表
+metrics = MetricsRegistry()
+
+# ---------- 内置指标 ----------
+
+CACHE_LOOKUPS = metrics.counter('jsonklingonizer_cache_lookups', '缓存查询次数', ['result'])
+CACHE_WRITES = metrics.counter('jsonklingonizer_cache_writes', '缓存写入次数')
+CACHE_ENTRIES = metrics.gauge('jsonklingonizer_cache_entries', '缓存条目数')
+CACHE_TIER_LOOKUPS = metrics.counter('jsonklingonizer_cache_tier_lookups', '各缓存层的查询次数', ['tier', 'result'])
+
+REQUESTS = metrics.counter('jsonklingonizer_requests', '翻译服务请求次数', ['translator', 'status'])
+REQUEST_LATENCY = metrics.histogram('jsonklingonizer_request_duration_seconds', '翻译服务请求耗时',
+                                    ['translator'])
+RETRIES = metrics.counter('jsonklingonizer_retries', '翻译请求重试次数', ['translator'])
+SLEEP_SECONDS = metrics.counter('jsonklingonizer_sleep_seconds', '退避和速率限制等待的秒数', ['reason'])
+TRANSLATIONS = metrics.counter('jsonklingonizer_translations', '处理的翻译条目数',
+                               ['translator', 'result'])
+
+EXTRACTED_VALUES = metrics.counter('jsonklingonizer_extracted_values', '提取的字符串值数量')
+REBUILT_VALUES = metrics.counter('jsonklingonizer_rebuilt_values', '重建时写回的值数量')
+STAGE_DURATION = metrics.histogram('jsonklingonizer_stage_duration_seconds', '各处理阶段耗时',
+                                   ['stage'])
+
+SERVICE_REQUESTS = metrics.counter('jsonklingonizer_service_requests', '常驻服务收到的请求数',
+                                   ['endpoint', 'status'])
+SERVICE_LATENCY = metrics.histogram('jsonklingonizer_service_request_duration_seconds', '常驻服务处理请求的耗时',
+                                    ['endpoint'])
@@ -0,0 +1,179 @@
+"""
+Key Normalizer
+可选的缓存键 / 请求文本规范化：
+- NFC 规范化，使 NFD 与 NFC 写法共享同一条缓存
+- 剥离首尾空白和句读标点（"Save " 与 "Save." 都按 "Save" 翻译），翻译后原样接回
+- 可选按小写形式翻译（"SAVE"、"Save"、"save" 共享一次请求），翻译后恢复原来的大小写风格
+- 同一批次中规范化后相同的文本只翻译一次
+
+规范化发生在调用翻译器之前，因此缓存查询和发出的请求使用同一个规范化文本，对所有翻译器（包括插件）都生效。
+"""
+
+import unicodedata
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 首尾可剥离的字符：空白和句读标点（不含括号、引号、%、{ 等，避免破坏占位符）
+_EDGE_CHARS = set(' \t\r\n 　.,;:!?…。，；：！？、')
+_LEADING_CHARS = _EDGE_CHARS | set('¿¡')
+
+
+def _case_style(text: str) -> Optional[str]:
+    """
+    识别大小写风格
+
+    Returns:
+        'lower'、'upper'、'capitalized'，无法安全还原时返回 None
+    """
+    if text == text.lower():
+        return 'lower'
+    if text == text.upper():
+        return 'upper'
+    if text[:1].isupper() and text[1:] == text[1:].lower():
+        return 'capitalized'
+    return None
+
+
+def _apply_case(text: str, style: Optional[str]) -> str:
+    """按大小写风格还原译文"""
+    if style == 'upper':
+        return text.upper()
+    if style == 'capitalized':
+        return text[:1].upper() + text[1:]
+    return text
+
+
+class KeyNormalizer:
+    """缓存键与请求文本规范化"""
+
+    def __init__(self, casefold: bool = False):
+        """
+        初始化规范化器
+
+        Args:
+            casefold: 是否按小写形式翻译并在之后恢复大小写
+        """
+        self.casefold = casefold
+
+    @classmethod
+    def from_config(cls, processing: dict) -> Optional['KeyNormalizer']:
+        """
+        根据配置创建规范化器
+
+        Args:
+            processing: 配置中的 processing 部分（normalize_keys: {enabled, casefold}）
+
+        Returns:
+            未启用时返回 None
+        """
+        options = processing.get('normalize_keys', {})
+        if not options.get('enabled'):
+            return None
+        return cls(casefold=options.get('casefold', False))
+
+    def split(self, text: str) -> Tuple[str, str, str, Optional[str]]:
+        """
+        拆分文本
+
+        Args:
+            text: 原文
+
+        Returns:
+            (前缀, 规范化后的核心文本, 后缀, 大小写风格)；核心为空时返回原文作为核心
+        """
+        normalized = unicodedata.normalize('NFC', text)
+        start = 0
+        end = len(normalized)
+        while start < end and normalized[start] in _LEADING_CHARS:
+            start += 1
+        while end > start and normalized[end - 1] in _EDGE_CHARS:
+            end -= 1
+        if start == end:
+            return '', text, '', None
+
+        core = normalized[start:end]
+        style = None
+        if self.casefold:
+            style = _case_style(core)
+            if style is not None:
+                core = core.lower()
+        return normalized[:start], core, normalized[end:], style
+
+    def restore(self, translated: str, prefix: str, suffix: str, style: Optional[str]) -> str:
+        """
+        还原译文：恢复大小写并接回首尾字符
+
+        Args:
+            translated: 核心文本的译文
+            prefix: 前缀
+            suffix: 后缀
+            style: 大小写风格
+
+        Returns:
+            完整译文
+        """
+        return prefix + _apply_case(translated, style) + suffix
+
+    def translate_batch(self, translate_batch: Callable, values: List[Dict[str, Any]],
+                        source_lang: str, target_lang: str,
+                        progress_callback: Callable = None) -> List[Dict[str, Any]]:
+        """
+        规范化后去重翻译，再把结果还原到每个值上
+
+        Args:
+            translate_batch: 翻译器的 translate_batch
+            values: 值列表
+            source_lang: 源语言代码
+            target_lang: 目标语言代码
+            progress_callback: 进度回调（按原始值数量换算）
+
+        Returns:
+            翻译后的值列表
+        """
+        cores = {}
+        parts = []
+        for item in values:
+            prefix, core, suffix, style = self.split(item['original'])
+            if core not in cores:
+                cores[core] = {'path': item['path'], 'original': core, 'translated': None}
+            parts.append((prefix, core, suffix, style))
+
+        unique = list(cores.values())
+        callback = None
+        if progress_callback:
+            scale = len(values) / len(unique) if unique else 1
+
+            def callback(current, total, success_count):
+                progress_callback(min(len(values), round(current * scale)), len(values), success_count)
+
+        translate_batch(unique, source_lang, target_lang, callback)
+
+        for item, (prefix, core, suffix, style) in zip(values, parts):
+            translated = cores[core].get('translated')
+            if not translated or translated == core:
+                # 未翻译（跳过或失败）时保留原文
+                item['translated'] = item['original']
+            else:
+                item['translated'] = self.restore(translated, prefix, suffix, style)
+        return values
+
+
+class NormalizedTranslator:
+    """在翻译器外包一层规范化，其余属性和方法透传给原翻译器"""
+
+    def __init__(self, translator, normalizer: KeyNormalizer):
+        """
+        Args:
+            translator: 翻译器实例
+            normalizer: 规范化器
+        """
+        self.translator = translator
+        self.normalizer = normalizer
+
+    def translate_batch(self, values: List[Dict[str, Any]], source_lang: str = 'auto',
+                        target_lang: str = 'en', progress_callback: Callable = None) -> List[Dict[str, Any]]:
+        """规范化后批量翻译（参数同 BaseTranslator.translate_batch）"""
+        return self.normalizer.translate_batch(self.translator.translate_batch, values,
+                                               source_lang, target_lang, progress_callback)
+
+    def __getattr__(self, name: str):
+        return getattr(self.translator, name)
@@ -0,0 +1,270 @@
+"""
+Path Selector
+按路径选择要提取的值：include / exclude 选择器编译成一棵前缀树，JSONExtractor 在下降时逐段匹配，
+被排除的子树和不可能被包含的子树都不会被访问。
+
+选择器语法（与提取路径 a.b[0].c 的写法一致，从根开始匹配）：
+    a.b          键 a 下的键 b（及其整个子树）
+    *            任意一个键
+    [3] / [*]    第 3 个元素 / 任意元素
+    **           任意多层（包括零层）
+    ["a.b"]      包含特殊字符的键
+    $.a / $..a   JSONPath 写法（$ 表示根，.. 等同于 .**.）
+例如 **.metadata、changelog[*]、**.url、settings.*
+"""
+
+import re
+from typing import Iterable, List, Optional, Tuple
+
+# 选择器中的一段：["quoted"]、[数字]、[*]、** 、* 或普通键
+_TOKEN = re.compile(r'\["((?:[^"\\]|\\.)*)"\]|\[(\d+|\*)\]|(\*\*)|([^.\[\]]+)')
+
+# 状态转移缓存的上限（键名种类非常多时清空重建）
+_MEMO_LIMIT = 200000
+
+# 转移缓存中代表“没有对应字面量子节点的任意键”
+_OTHER = object()
+
+
+class _Node:
+    """前缀树节点"""
+
+    __slots__ = ('keys', 'indices', 'any_key', 'any_index', 'deep', 'loop', 'terminal')
+
+    def __init__(self, loop: bool = False):
+        self.keys = {}
+        self.indices = {}
+        self.any_key = None
+        self.any_index = None
+        self.deep = None
+        # ** 节点：可以消耗任意一段后停留在自身
+        self.loop = loop
+        self.terminal = False
+
+
+def parse_selector(selector: str) -> List[Tuple[str, object]]:
+    """
+    解析选择器
+
+    Args:
+        selector: 选择器文本
+
+    Returns:
+        [(类型, 值)]，类型为 'key'、'index'、'any_key'、'any_index' 或 'deep'
+
+    Raises:
+        ValueError: 选择器无法解析
+    """
+    text = selector.strip()
+    if text.startswith('$'):
+        text = text[1:]
+    text = text.replace('..', '.**.')
+    tokens = []
+    position = 0
+    while position < len(text):
+        if text[position] == '.':
+            position += 1
+            continue
+        match = _TOKEN.match(text, position)
+        if not match:
+            raise ValueError(f"无法解析路径选择器: {selector}")
+        quoted, index, deep, key = match.groups()
+        if quoted is not None:
+            tokens.append(('key', re.sub(r'\\(.)', r'\1', quoted)))
+        elif index == '*':
+            tokens.append(('any_index', None))
+        elif index is not None:
+            tokens.append(('index', int(index)))
+        elif deep:
+            tokens.append(('deep', None))
+        elif key == '*':
+            tokens.append(('any_key', None))
+        else:
+            tokens.append(('key', key))
+        position = match.end()
+    if not tokens:
+        raise ValueError(f"空的路径选择器: {selector}")
+    return tokens
+
+
+class _Trie:
+    """一组选择器编译成的前缀树，按节点集合（NFA 状态）匹配"""
+
+    def __init__(self, selectors: Iterable[str]):
+        self.root = _Node()
+        for selector in selectors:
+            self._add(parse_selector(selector))
+        self.start = self._closure({self.root})
+
+    def _add(self, tokens: List[Tuple[str, object]]) -> None:
+        node = self.root
+        for kind, value in tokens:
+            if kind == 'key':
+                node = node.keys.setdefault(value, _Node())
+            elif kind == 'index':
+                node = node.indices.setdefault(value, _Node())
+            elif kind == 'any_key':
+                node.any_key = node.any_key or _Node()
+                node = node.any_key
+            elif kind == 'any_index':
+                node.any_index = node.any_index or _Node()
+                node = node.any_index
+            else:
+                node.deep = node.deep or _Node(loop=True)
+                node = node.deep
+        node.terminal = True
+
+    @staticmethod
+    def _closure(nodes: set) -> frozenset:
+        """加入 ** 可以匹配零层时到达的节点"""
+        pending = list(nodes)
+        result = set(nodes)
+        while pending:
+            node = pending.pop()
+            if node.deep is not None and node.deep not in result:
+                result.add(node.deep)
+                pending.append(node.deep)
+        return frozenset(result)
+
+    def step(self, state: frozenset, segment, is_index: bool) -> frozenset:
+        """消耗一段路径后的状态"""
+        result = set()
+        for node in state:
+            if node.loop:
+                result.add(node)
+            if is_index:
+                child = node.indices.get(segment)
+                if child is not None:
+                    result.add(child)
+                if node.any_index is not None:
+                    result.add(node.any_index)
+            else:
+                child = node.keys.get(segment)
+                if child is not None:
+                    result.add(child)
+                if node.any_key is not None:
+                    result.add(node.any_key)
+        return self._closure(result)
+
+    @staticmethod
+    def matched(state: frozenset) -> bool:
+        """当前路径是否被某个选择器完整匹配"""
+        return any(node.terminal for node in state)
+
+
+# 状态：(包含前缀树的节点集合或 None（已被包含）, 排除前缀树的节点集合)
+FREE = (None, frozenset())
+
+
+class PathSelector:
+    """include / exclude 路径选择器"""
+
+    def __init__(self, include: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None):
+        """
+        初始化选择器
+
+        Args:
+            include: 包含选择器（为空表示包含全部）
+            exclude: 排除选择器（优先于包含）
+        """
+        self.include = list(include or [])
+        self.exclude = list(exclude or [])
+        self._include = _Trie(self.include) if self.include else None
+        self._exclude = _Trie(self.exclude)
+        self._memo = {}
+        self._literals = {}
+
+    @classmethod
+    def from_config(cls, processing: dict, include: Optional[List[str]] = None,
+                    exclude: Optional[List[str]] = None) -> Optional['PathSelector']:
+        """
+        根据配置和命令行参数创建选择器
+
+        Args:
+            processing: 配置中的 processing 部分（selectors: {include, exclude}）
+            include: 追加的包含选择器（命令行）
+            exclude: 追加的排除选择器（命令行）
+
+        Returns:
+            没有任何选择器时返回 None
+        """
+        options = processing.get('selectors', {})
+        include = list(options.get('include') or []) + list(include or [])
+        exclude = list(options.get('exclude') or []) + list(exclude or [])
+        if not include and not exclude:
+            return None
+        return cls(include, exclude)
+
+    def start(self) -> Optional[tuple]:
+        """根节点的状态（根本身被排除时返回 None）"""
+        result = self._resolve(self._include.start if self._include else None,
+                               self._exclude.start if self.exclude else frozenset())
+        return FREE if result == FREE else result
+
+    def _resolve(self, include_state, exclude_state) -> Optional[tuple]:
+        """规范化状态：被排除或不可能再被包含时返回 None，已被包含时包含部分记为 None"""
+        if self._exclude.matched(exclude_state):
+            return None
+        if include_state is not None:
+            if self._include.matched(include_state):
+                include_state = None
+            elif not include_state:
+                return None
+        return include_state, exclude_state
+
+    def step(self, state: tuple, segment, is_index: bool = False) -> Optional[tuple]:
+        """
+        下降一层
+
+        Args:
+            state: 父节点的状态
+            segment: 键或数组下标
+            is_index: segment 是否为数组下标
+
+        Returns:
+            子节点的状态；子树可以整个跳过时返回 None，之后无需再检查时返回 FREE
+        """
+        # 状态中没有节点以该键为字面量子节点时，结果与任何其他键相同，共用一条缓存
+        literals = self._literals.get(state)
+        if literals is None:
+            literals = self._literals[state] = self._collect_literals(state)
+        memo_key = (state, segment if segment in literals[is_index] else _OTHER, is_index)
+        result = self._memo.get(memo_key, False)
+        if result is not False:
+            return result
+        include_state, exclude_state = state
+        if include_state is not None:
+            include_state = self._include.step(include_state, segment, is_index)
+        if exclude_state:
+            exclude_state = self._exclude.step(exclude_state, segment, is_index)
+        result = self._resolve(include_state, exclude_state)
+        if result == FREE:
+            result = FREE
+        if len(self._memo) >= _MEMO_LIMIT:
+            self._memo.clear()
+            self._literals.clear()
+        self._memo[memo_key] = result
+        return result
+
+    @staticmethod
+    def _collect_literals(state: tuple) -> tuple:
+        """状态中所有节点的字面量键和下标：(键集合, 下标集合)，按 is_index 取用"""
+        keys = set()
+        indices = set()
+        for nodes in state:
+            for node in nodes or ():
+                keys.update(node.keys)
+                indices.update(node.indices)
+        return keys, indices
+
+    @staticmethod
+    def selected(state: tuple) -> bool:
+        """状态对应的值是否被选中"""
+        return state[0] is None
+
+    def __getstate__(self):
+        # 传给工作进程时不携带转移缓存
+        return {'include': self.include, 'exclude': self.exclude}
+
+    def __setstate__(self, state):
+        self.__init__(state['include'], state['exclude'])
@@ -0,0 +1,189 @@
+"""
+轻量级性能剖析
+提供按阶段计时的 span，统计调用次数、总耗时和分位数，
+并可导出火焰图兼容的折叠栈（collapsed stack）文件。
+
+默认关闭，关闭时 span() 返回共享的空上下文，开销只有一次方法调用。
+"""
+
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+from .metrics import SLEEP_SECONDS
+
+
+class _NullSpan:
+    """关闭剖析时使用的空上下文"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profiler:
+    """按阶段计时的剖析器"""
+
+    def __init__(self):
+        """初始化剖析器（默认关闭）"""
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.reset()
+
+    def reset(self) -> None:
+        """清空已记录的数据"""
+        with self.lock:
+            self.durations = {}
+            self.collapsed = {}
+            self.start_time = time.perf_counter()
+
+    def enable(self) -> None:
+        """开启剖析"""
+        self.reset()
+        self.enabled = True
+
+    def disable(self) -> None:
+        """关闭剖析"""
+        self.enabled = False
+
+    def span(self, name: str):
+        """
+        计时上下文
+
+        Args:
+            name: 阶段名称（如 "extract.parse"、"request.libre"）
+
+        Returns:
+            上下文管理器
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name)
+
+    @contextmanager
+    def _span(self, name: str):
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        # 每层记录 [名称, 子阶段累计耗时]
+        frame = [name, 0.0]
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            path = ';'.join(f[0] for f in stack)
+            stack.pop()
+            if stack:
+                stack[-1][1] += elapsed
+            with self.lock:
+                self.durations.setdefault(name, []).append(elapsed)
+                self.collapsed[path] = self.collapsed.get(path, 0.0) + (elapsed - frame[1])
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        直接记录一次耗时（用于无法包裹的代码）
+
+        耗时记在当前线程已打开的 span 之下（与 span() 相同的折叠栈路径），
+        并从父 span 的自身耗时中扣除。
+
+        Args:
+            name: 阶段名称
+            seconds: 耗时（秒）
+        """
+        if not self.enabled:
+            return
+        stack = getattr(self.local, 'stack', None) or []
+        path = ';'.join([f[0] for f in stack] + [name])
+        if stack:
+            stack[-1][1] += seconds
+        with self.lock:
+            self.durations.setdefault(name, []).append(seconds)
+            self.collapsed[path] = self.collapsed.get(path, 0.0) + seconds
+
+    @staticmethod
+    def _percentile(sorted_values: List[float], pct: float) -> float:
+        """最近秩法计算分位数"""
+        if not sorted_values:
+            return 0.0
+        rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+        return sorted_values[rank]
+
+    def report(self) -> Dict:
+        """
+        生成剖析报告
+
+        Returns:
+            包含总耗时和每个阶段统计（次数、总耗时、均值、p50/p90/p99、最大值）的字典
+        """
+        with self.lock:
+            durations = {name: sorted(values) for name, values in self.durations.items()}
+            wall = time.perf_counter() - self.start_time
+
+        stages = {}
+        for name, values in sorted(durations.items(), key=lambda kv: sum(kv[1]), reverse=True):
+            total = sum(values)
+            stages[name] = {
+                'count': len(values),
+                'total_seconds': round(total, 6),
+                'mean_ms': round(total / len(values) * 1000, 4),
+                'p50_ms': round(self._percentile(values, 50) * 1000, 4),
+                'p90_ms': round(self._percentile(values, 90) * 1000, 4),
+                'p99_ms': round(self._percentile(values, 99) * 1000, 4),
+                'max_ms': round(values[-1] * 1000, 4),
+            }
+        return {'wall_seconds': round(wall, 6), 'stages': stages}
+
+    def write_report(self, path: str) -> None:
+        """将剖析报告写入 JSON 文件"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+
+    def write_collapsed(self, path: str) -> None:
+        """
+        写入折叠栈文件（每行 "a;b;c 微秒数"），可直接交给 flamegraph.pl 或 speedscope
+        """
+        with self.lock:
+            collapsed = dict(self.collapsed)
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, seconds in sorted(collapsed.items()):
+                micros = int(seconds * 1_000_000)
+                if micros > 0:
+                    f.write(f"{stack} {micros}\n")
+
+    def summary_lines(self, top: int = 10) -> List[str]:
+        """生成用于日志输出的摘要行"""
+        report = self.report()
+        lines = [f"⏱️  总耗时 {report['wall_seconds']:.3f}s，耗时最多的阶段："]
+        for name, stage in list(report['stages'].items())[:top]:
+            lines.append(f"   {name:<28} {stage['total_seconds']:>9.3f}s  x{stage['count']:<7} "
+                         f"p50 {stage['p50_ms']:.2f}ms  p99 {stage['p99_ms']:.2f}ms")
+        return lines
+
+
+# 全局剖析器
+profiler = Profiler()
+
+
+def timed_sleep(seconds: float, name: str = 'sleep.backoff') -> None:
+    """
+    带剖析记录的 time.sleep，用于退避和速率限制等待
+    等待时间同时累计到 jsonklingonizer_sleep_seconds 指标
+
+    Args:
+        seconds: 等待秒数
+        name: 阶段名称（最后一段作为指标的 reason 标签）
+    """
+    SLEEP_SECONDS.inc(seconds, reason=name.rsplit('.', 1)[-1])
+    with profiler.span(name):
+        time.sleep(seconds)
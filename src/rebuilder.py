@@ -5,8 +5,14 @@ JSON Rebuilder
 
 import json
 import copy
+import os
 from typing import Dict, List, Any, Union
 
+from . import codec
+from .source import SourceDocument
+from .profiler import profiler
+from .metrics import REBUILT_VALUES, STAGE_DURATION, timer
+
 
 class JSONRebuilder:
     """JSON 重建器"""
@@ -22,35 +28,76 @@ class JSONRebuilder:
     
     def rebuild(self, translated_values: List[Dict[str, Any]], 
                 partial_update: bool = False, 
-                filter_keyword: str = None) -> Any:
+                filter_keyword: Union[str, List[str]] = None) -> Any:
         """
         使用翻译后的值重建 JSON
         
         Args:
             translated_values: 包含路径和翻译值的列表
             partial_update: 是否为部分更新模式（只更新提供的值）
-            filter_keyword: 过滤关键词（用于在部分更新时去除关键词）
+            filter_keyword: 过滤关键词（部分更新时，值没有 "keywords" 字段则移除这些关键词）
             
         Returns:
             重建后的 JSON 对象
         """
-        # 深拷贝原始结构
-        result = copy.deepcopy(self.original_json)
-        
-        # 替换所有值
-        for item in translated_values:
-            path = item['path']
-            translated = item.get('translated', item['original'])
-            
-            # 如果是部分更新模式且有过滤关键词，需要移除关键词
-            if partial_update and filter_keyword and translated:
-                # 移除关键词（如 %TODO ）
-                translated = translated.replace(filter_keyword, '').strip()
+        with timer(STAGE_DURATION, stage='rebuild'):
+            # 深拷贝原始结构
+            with profiler.span('rebuild.deepcopy'):
+                result = copy.deepcopy(self.original_json)
             
-            self._set_value_by_path(result, path, translated)
+            # 替换所有值
+            with profiler.span('rebuild.set_values'):
+                result = self._apply_values(result, translated_values, partial_update, filter_keyword)
+        REBUILT_VALUES.inc(len(translated_values))
+        
+        return result
+    
+    def patch(self, document: Any, translated_values: List[Dict[str, Any]],
+              partial_update: bool = False, filter_keyword: Union[str, List[str]] = None) -> Any:
+        """
+        就地把部分值写回已有的文档（不复制，用于增量更新上一次的输出）
         
+        Args:
+            document: 要修改的 JSON 对象（路径必须已存在）
+            translated_values: 包含路径和翻译值的列表
+            partial_update: 是否为部分更新模式
+            filter_keyword: 过滤关键词
+            
+        Returns:
+            修改后的 document（顶层是字符串时返回新的字符串）
+        """
+        document = self._apply_values(document, translated_values, partial_update, filter_keyword)
+        REBUILT_VALUES.inc(len(translated_values))
+        return document
+    
+    def _apply_values(self, result: Any, translated_values: List[Dict[str, Any]],
+                      partial_update: bool, filter_keyword: Union[str, List[str]]) -> Any:
+        """将翻译值按路径写回 result，返回写回后的结果（顶层字符串没有容器，直接替换）"""
+        for item in translated_values:
+            translated = self._final_value(item, partial_update, filter_keyword)
+            if not item['path']:
+                result = translated
+                continue
+            self._set_value_by_path(result, item['path'], translated)
         return result
     
+    @staticmethod
+    def _final_value(item: Dict[str, Any], partial_update: bool, filter_keyword: Union[str, List[str]]) -> Any:
+        """计算写回的值"""
+        translated = item.get('translated', item['original'])
+        
+        # 如果是部分更新模式，移除该值实际命中的关键词（如 %TODO ）
+        if partial_update and translated:
+            keywords = item.get('keywords')
+            if keywords is None and filter_keyword:
+                keywords = [filter_keyword] if isinstance(filter_keyword, str) else filter_keyword
+            if keywords:
+                for keyword in keywords:
+                    translated = translated.replace(keyword, '')
+                translated = translated.strip()
+        
+        return translated
+    
     def _set_value_by_path(self, obj: Any, path: str, value: str) -> None:
         """
         根据路径设置值
@@ -139,12 +186,72 @@ class JSONRebuilder:
             indent: 缩进空格数
             ensure_ascii: 是否转义非 ASCII 字符
         """
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(json_obj, f, indent=indent, ensure_ascii=ensure_ascii)
+        with timer(STAGE_DURATION, stage='save'), profiler.span('save.serialize'):
+            codec.dump(json_obj, output_path, indent=indent, ensure_ascii=ensure_ascii)
+    
+    def save_preserving_format(self, source_path: str, translated_values: List[Dict[str, Any]],
+                               output_path: str, partial_update: bool = False,
+                               filter_keyword: Union[str, List[str]] = None) -> int:
+        """
+        保留源文件格式写出：只替换发生变化的字符串值，其余字节（缩进、键顺序、转义写法）原样复制
+        
+        值需要带有 "span" 字段（由 JSONExtractor(track_spans=True) 记录）。
+        先写入临时文件再替换，输出路径可以与源文件相同。
+        
+        Args:
+            source_path: 提取时使用的源文件路径
+            translated_values: 包含路径、字节范围和翻译值的列表
+            output_path: 输出文件路径
+            partial_update: 是否为部分更新模式
+            filter_keyword: 过滤关键词（部分更新时，值没有 "keywords" 字段则移除这些关键词）
+            
+        Returns:
+            替换的值数量
+        """
+        with timer(STAGE_DURATION, stage='save'), profiler.span('save.splice'):
+            replacements = []
+            for item in translated_values:
+                translated = self._final_value(item, partial_update, filter_keyword)
+                if translated == item['original']:
+                    continue
+                span = item.get('span')
+                if span is None:
+                    raise ValueError(f"值 {item['path']} 没有字节范围，请使用 JSONExtractor(track_spans=True) 提取")
+                replacements.append((span[0], span[1], item, translated))
+            replacements.sort(key=lambda r: r[0])
+            
+            tmp_path = f"{output_path}.tmp"
+            try:
+                with SourceDocument(source_path) as source, open(tmp_path, 'wb') as f:
+                    position = 0
+                    for start, end, item, translated in replacements:
+                        # 源文件在提取后被修改时字节范围会错位，此时放弃写出
+                        if not self._span_matches(source.slice(start, end), item['original']):
+                            raise ValueError(f"源文件 {source_path} 在提取后已被修改（{item['path']}）")
+                        f.write(source.slice(position, start))
+                        f.write(json.dumps(translated, ensure_ascii=False).encode('utf-8'))
+                        position = end
+                    f.write(source.slice(position, len(source)))
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            os.replace(tmp_path, output_path)
+        REBUILT_VALUES.inc(len(replacements))
+        
+        return len(replacements)
+    
+    @staticmethod
+    def _span_matches(raw: bytes, original: str) -> bool:
+        """字节范围内是否仍是提取时的字符串（错位的范围通常无法解析）"""
+        try:
+            return codec.loads(raw) == original
+        except ValueError:
+            return False
 
 
 def rebuild_json(original_json: Any, translated_values: List[Dict[str, Any]], 
-                 partial_update: bool = False, filter_keyword: str = None) -> Any:
+                 partial_update: bool = False, filter_keyword: Union[str, List[str]] = None) -> Any:
     """
     便捷函数：重建 JSON
     
@@ -152,7 +259,7 @@ def rebuild_json(original_json: Any, translated_values: List[Dict[str, Any]],
         original_json: 原始 JSON 数据
         translated_values: 翻译后的值列表
         partial_update: 是否为部分更新模式
-        filter_keyword: 过滤关键词
+        filter_keyword: 过滤关键词（一个或多个）
         
     Returns:
         重建后的 JSON 对象
@@ -162,7 +269,7 @@ def rebuild_json(original_json: Any, translated_values: List[Dict[str, Any]],
 
 
 if __name__ == "__main__":
-    # 测试代码
+    # 示例（包内使用相对导入，请在仓库根目录以 python -m src.rebuilder 运行；测试见 tests/test_rebuilder.py）
     test_json = {
         "app": {
             "name": "My App",
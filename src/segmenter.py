@@ -0,0 +1,156 @@
+"""
+Segmenter
+可选的分句翻译：长字符串（帮助文本、描述等）按句子拆分后逐句缓存和翻译，再按原样拼回。
+- 分句边界不会落在占位符（{name}、{{user}}、%s、%(file)s、<b> 等）内部
+- 整个文档中相同的句子只翻译一次（与短字符串一起批量交给翻译器）
+- 句子之间的空白原样保留
+修改段落中的一句后重新运行，只有改动的句子会缓存未命中并发出请求。
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Tuple
+
+# 与 FlipTranslator 一致的占位符，另加 HTML 标签
+_PLACEHOLDER = re.compile(r'\{\{[^}]+\}\}|\{[^}]+\}|%\([^)]+\)[sd]|%[sd]|<[^<>]+>')
+
+# 句末标点 + 空白（下一句不以小写字母开头，避免在 "e.g. foo" 这类缩写处断开），
+# 全角句末标点后可以没有空白，换行总是边界
+_BOUNDARY = re.compile(r'(?<=[.!?…])\s+(?=[^\sa-z])|(?<=[。！？])\s*|\s*\n\s*')
+
+
+class Segmenter:
+    """长字符串分句"""
+
+    def __init__(self, min_length: int = 80):
+        """
+        初始化分句器
+
+        Args:
+            min_length: 达到该长度（字符数）的字符串才分句
+        """
+        self.min_length = min_length
+
+    @classmethod
+    def from_config(cls, processing: dict) -> 'Segmenter':
+        """
+        根据配置创建分句器
+
+        Args:
+            processing: 配置中的 processing 部分（segmentation: {enabled, min_length}）
+
+        Returns:
+            未启用时返回 None
+        """
+        options = processing.get('segmentation', {})
+        if not options.get('enabled'):
+            return None
+        return cls(min_length=options.get('min_length', 80))
+
+    def split(self, text: str) -> Tuple[List[str], List[str]]:
+        """
+        拆分文本
+
+        Args:
+            text: 原文
+
+        Returns:
+            (句子列表, 分隔符列表)；分隔符比句子多一个（首尾空白），
+            sep[0] + seg[0] + sep[1] + ... + seg[-1] + sep[-1] == text。
+            不需要拆分时句子列表只有一项
+        """
+        stripped = text.strip()
+        if len(text) < self.min_length or not stripped:
+            return [text], ['', '']
+
+        protected = [match.span() for match in _PLACEHOLDER.finditer(text)]
+        start = len(text) - len(text.lstrip())
+        end = start + len(stripped)
+        segments = []
+        separators = [text[:start]]
+        position = start
+        for match in _BOUNDARY.finditer(text, start, end):
+            cut, resume = match.span()
+            if cut == position or resume >= end:
+                continue
+            # 分句边界不能落在占位符内部
+            if any(left < cut < right for left, right in protected):
+                continue
+            segments.append(text[position:cut])
+            separators.append(text[cut:resume])
+            position = resume
+        segments.append(text[position:end])
+        separators.append(text[end:])
+        return segments, separators
+
+    @staticmethod
+    def join(segments: List[str], separators: List[str]) -> str:
+        """按原分隔符拼回句子"""
+        parts = [separators[0]]
+        for segment, separator in zip(segments, separators[1:]):
+            parts.append(segment)
+            parts.append(separator)
+        return ''.join(parts)
+
+    def translate_batch(self, translate_batch: Callable, values: List[Dict[str, Any]],
+                        source_lang: str, target_lang: str,
+                        progress_callback: Callable = None) -> List[Dict[str, Any]]:
+        """
+        分句后去重翻译，再拼回每个值
+
+        Args:
+            translate_batch: 翻译器的 translate_batch
+            values: 值列表
+            source_lang: 源语言代码
+            target_lang: 目标语言代码
+            progress_callback: 进度回调（按原始值数量换算）
+
+        Returns:
+            翻译后的值列表
+        """
+        units = {}
+        layouts = []
+        for item in values:
+            segments, separators = self.split(item['original'])
+            for index, segment in enumerate(segments):
+                if segment not in units:
+                    path = item['path'] if len(segments) == 1 else f"{item['path']}#{index}"
+                    units[segment] = {'path': path, 'original': segment, 'translated': None}
+            layouts.append((segments, separators))
+
+        unique = list(units.values())
+        callback = None
+        if progress_callback:
+            scale = len(values) / len(unique) if unique else 1
+
+            def callback(current, total, success_count):
+                progress_callback(min(len(values), round(current * scale)), len(values), success_count)
+
+        translate_batch(unique, source_lang, target_lang, callback)
+
+        for item, (segments, separators) in zip(values, layouts):
+            # 未翻译（跳过或失败）的句子保留原文
+            translated = [units[segment].get('translated') or segment for segment in segments]
+            item['translated'] = self.join(translated, separators)
+        return values
+
+
+class SegmentedTranslator:
+    """在翻译器外包一层分句，其余属性和方法透传给原翻译器"""
+
+    def __init__(self, translator, segmenter: Segmenter):
+        """
+        Args:
+            translator: 翻译器实例（可以是 NormalizedTranslator）
+            segmenter: 分句器
+        """
+        self.translator = translator
+        self.segmenter = segmenter
+
+    def translate_batch(self, values: List[Dict[str, Any]], source_lang: str = 'auto',
+                        target_lang: str = 'en', progress_callback: Callable = None) -> List[Dict[str, Any]]:
+        """分句后批量翻译（参数同 BaseTranslator.translate_batch）"""
+        return self.segmenter.translate_batch(self.translator.translate_batch, values,
+                                              source_lang, target_lang, progress_callback)
+
+    def __getattr__(self, name: str):
+        return getattr(self.translator, name)
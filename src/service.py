@@ -0,0 +1,559 @@
+"""
+Translation Service
+常驻翻译服务：缓存、翻译器（HTTP 会话、速率限制器）常驻在进程中，通过本地 HTTP（TCP 或 Unix 套接字）
+接收翻译请求，省去每次调用的解释器启动、缓存加载、翻译器初始化和建立连接。
+
+接口：
+    POST /translate   请求体为 JSON：
+                      {"input": 路径, "output": 路径}   翻译文件（路径在服务所在机器上解析）
+                      {"document": JSON 文档}           直接返回翻译后的文档
+                      可选：translator、source_lang、target_lang、filter_keyword、remove_keyword、
+                      include、exclude、normalize_keys、segment、preserve_format（仅文件模式）
+    GET  /health      运行状态
+    GET  /metrics     OpenMetrics 指标
+    POST /shutdown    写出缓存后退出
+
+地址写法：unix:/path/to/socket、host:port 或 http://host:port（默认使用 Unix 套接字；
+TCP 只允许监听回环地址，除非显式允许远程访问）
+
+安全：
+    - 每次启动生成随机令牌，写入权限为 0600 的令牌文件（默认在配置文件旁），
+      所有请求都要带 "Authorization: Bearer <令牌>"
+    - POST 请求体必须是 application/json；带 Origin 头的请求（浏览器发起的跨站请求）一律拒绝
+    - TCP 上的 Host 头必须是回环地址，防止 DNS 重绑定
+    - 请求可以带 config_fingerprint，与服务加载的配置不一致时返回 409，客户端改为在本地执行
+"""
+
+import hashlib
+import hmac
+import ipaddress
+import json
+import os
+import secrets
+import signal
+import socket
+import socketserver
+import threading
+import time
+from http.client import HTTPConnection
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .api import build_translator
+from .extractor import JSONExtractor
+from .keywords import KeywordFilter
+from .metrics import SERVICE_LATENCY, SERVICE_REQUESTS, metrics
+from .path_selector import PathSelector
+from .rebuilder import JSONRebuilder
+from .utils import create_cache
+
+DEFAULT_ADDRESS = 'unix:data/service.sock'
+
+# 令牌文件名（默认放在配置文件所在目录）
+TOKEN_FILE = '.service-token'
+
+# 不影响翻译结果的配置部分，不参与配置指纹
+_FINGERPRINT_EXCLUDED = ('logging', 'service', 'watch')
+
+# TCP 上允许的 Host 头（另外允许监听地址本身）
+_LOOPBACK_HOSTS = ('localhost', '127.0.0.1', '::1')
+
+
+class ServiceError(Exception):
+    """服务返回错误（status 为 HTTP 状态码）"""
+
+    def __init__(self, message: str, status: int = 500):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_address(address: str) -> Tuple[str, Any]:
+    """
+    解析服务地址
+
+    Args:
+        address: unix:/path/to/socket、host:port 或 http://host:port
+
+    Returns:
+        ('unix', 套接字路径) 或 ('tcp', (主机, 端口))
+    """
+    if address.startswith('unix:'):
+        return 'unix', address[len('unix:'):]
+    if address.startswith('http://'):
+        address = address[len('http://'):].rstrip('/')
+    host, _, port = address.rpartition(':')
+    if not port.isdigit():
+        raise ValueError(f"无法解析服务地址: {address}（应为 unix:/path、host:port 或 http://host:port）")
+    return 'tcp', (host or '127.0.0.1', int(port))
+
+
+def is_loopback(host: str) -> bool:
+    """主机名是否为回环地址"""
+    if host in _LOOPBACK_HOSTS:
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _host_name(header: str) -> str:
+    """Host 头中的主机名（去掉端口和 IPv6 的方括号）"""
+    if header.startswith('['):
+        return header[1:].split(']', 1)[0]
+    return header.rsplit(':', 1)[0] if header.count(':') == 1 else header
+
+
+def config_fingerprint(config: dict) -> str:
+    """配置指纹（忽略日志、服务和监视等不影响翻译结果的部分）"""
+    relevant = {key: value for key, value in config.items() if key not in _FINGERPRINT_EXCLUDED}
+    # 缓存默认开启：省略 use_cache 与显式写 true 视为同一配置
+    processing = relevant.get('processing', {})
+    relevant['processing'] = dict(processing, use_cache=bool(processing.get('use_cache', True)))
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def token_path(config_path: str, options: Optional[dict] = None) -> Path:
+    """令牌文件路径：service.token_file，默认为配置文件旁的 .service-token"""
+    configured = (options or {}).get('token_file')
+    if configured:
+        return Path(configured)
+    return Path(config_path).resolve().parent / TOKEN_FILE
+
+
+def write_token(path: Path) -> str:
+    """生成新令牌并写入权限为 0600 的文件"""
+    token = secrets.token_urlsafe(32)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(token)
+    # 文件已存在时 os.open 不会修改权限
+    os.chmod(path, 0o600)
+    return token
+
+
+def read_token(path: Path) -> Optional[str]:
+    """读取令牌；文件不存在时返回 None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+class TranslationService:
+    """常驻的翻译服务（与传输层无关）"""
+
+    def __init__(self, config: dict, logger=None):
+        """
+        初始化服务：创建缓存；翻译器在第一次使用时创建并保留
+
+        Args:
+            config: 配置字典
+            logger: 日志记录器（可选）
+        """
+        self.config = config
+        self.fingerprint = config_fingerprint(config)
+        self.processing = config.get('processing', {})
+        self.logger = logger
+        self.cache = None
+        if self.processing.get('use_cache', True):
+            # 常驻进程的内存层更大，持久层主要靠定期写出（每次写出都要序列化整个缓存文件）
+            options = config.get('service', {})
+            cache_options = dict(self.processing.get('cache', {}))
+            cache_options['memory_entries'] = options.get('memory_entries', cache_options.get('memory_entries', 1024))
+            cache_options['write_batch'] = options.get('write_batch', 1000)
+            self.cache = create_cache(dict(self.processing, cache=cache_options))
+        self.translators = {}
+        self.started = time.time()
+        self.requests = 0
+        # 翻译器、缓存和速率限制器不保证线程安全：翻译阶段串行执行，解析和重建可以并发
+        self.translate_lock = threading.Lock()
+        self._create_lock = threading.Lock()
+        self._count_lock = threading.Lock()
+
+    def translator(self, translator_id: str, normalize_keys: bool = False, segment: bool = False):
+        """获取（必要时创建）翻译器，按配置包装规范化和分句"""
+        key = (translator_id, normalize_keys, segment)
+        with self._create_lock:
+            translator = self.translators.get(key)
+            if translator is not None:
+                return translator
+            translator = build_translator(translator_id, self.config, self.cache, normalize_keys, segment)
+            self.translators[key] = translator
+            if self.logger:
+                self.logger.info(f"🔌 已创建翻译器 {translator_id}")
+            return translator
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        处理一个翻译请求
+
+        Args:
+            request: 请求内容（见模块说明）
+
+        Returns:
+            文档模式：{document, values, translated}；文件模式：{output, values, translated}
+
+        Raises:
+            ServiceError: 请求无效（400）；配置指纹不一致（409）
+        """
+        fingerprint = request.get('config_fingerprint')
+        if fingerprint is not None and fingerprint != self.fingerprint:
+            raise ServiceError("客户端的配置与服务加载的配置不一致", 409)
+        defaults = self.config.get('translator', {})
+        translator_id = request.get('translator') or defaults.get('type', 'google')
+        source_lang = request.get('source_lang') or defaults.get('source_lang', 'auto')
+        target_lang = request.get('target_lang') or defaults.get('target_lang', 'en')
+        filter_keyword = request.get('filter_keyword')
+        try:
+            keyword_filter = KeywordFilter.create(filter_keyword)
+            selector = PathSelector.from_config(self.processing, request.get('include'), request.get('exclude'))
+        except ValueError as e:
+            raise ServiceError(str(e), 400)
+        partial_update = bool(keyword_filter and request.get('remove_keyword'))
+        preserve_format = bool(request.get('preserve_format'))
+
+        if 'document' in request:
+            document = request['document']
+            extractor = JSONExtractor(filter_keyword=keyword_filter, selector=selector)
+            values = extractor.extract_from_object(document)
+        elif request.get('input'):
+            if not request.get('output'):
+                raise ServiceError("文件模式需要 output", 400)
+            input_path = request['input']
+            if not os.path.isfile(input_path):
+                raise ServiceError(f"找不到输入文件: {input_path}", 400)
+            extractor = JSONExtractor(filter_keyword=keyword_filter, track_spans=preserve_format,
+                                      prefilter=self.processing.get('keyword_prefilter', True), selector=selector)
+            document, values = extractor.extract_from_file(input_path)
+        else:
+            raise ServiceError("请求需要 document 或 input/output", 400)
+
+        with self._count_lock:
+            self.requests += 1
+        if keyword_filter and not values:
+            # 与命令行一致：过滤模式下没有命中时不写出
+            return {'document': document, 'values': 0, 'translated': 0} if 'document' in request \
+                else {'output': None, 'values': 0, 'translated': 0}
+
+        translator = self.translator(translator_id, bool(request.get('normalize_keys')), bool(request.get('segment')))
+        with self.translate_lock:
+            values = translator.translate_batch(values, source_lang, target_lang)
+        translated = sum(1 for v in values if v.get('translated') and v['translated'] != v['original'])
+
+        if 'document' in request:
+            result = JSONRebuilder(document).rebuild(values, partial_update=partial_update,
+                                                     filter_keyword=filter_keyword)
+            return {'document': result, 'values': len(values), 'translated': translated}
+
+        output_path = request['output']
+        if preserve_format:
+            JSONRebuilder(None).save_preserving_format(request['input'], values, output_path,
+                                                       partial_update=partial_update, filter_keyword=filter_keyword)
+        else:
+            rebuilder = JSONRebuilder(document)
+            result = rebuilder.rebuild(values, partial_update=partial_update, filter_keyword=filter_keyword)
+            rebuilder.save_to_file(result, output_path, indent=2, ensure_ascii=False)
+        return {'output': output_path, 'values': len(values), 'translated': translated}
+
+    def health(self) -> Dict[str, Any]:
+        """运行状态"""
+        status = {
+            'status': 'ok',
+            'pid': os.getpid(),
+            'uptime': round(time.time() - self.started, 1),
+            'requests': self.requests,
+            'translators': sorted({key[0] for key in self.translators}),
+        }
+        if self.cache is not None:
+            # 缓存的字典由翻译线程修改，统计时需要与翻译阶段互斥
+            with self.translate_lock:
+                stats = self.cache.get_stats()
+            status['cache'] = {'entries': stats['total_entries'], 'hits': stats['hits'], 'misses': stats['misses']}
+        return status
+
+    def flush(self) -> None:
+        """把缓存中待写的条目写入磁盘"""
+        if self.cache is not None and hasattr(self.cache, 'flush'):
+            with self.translate_lock:
+                self.cache.flush()
+
+    def close(self) -> None:
+        """退出前写出缓存（配置了容量上限时顺便压缩）"""
+        if self.cache is None:
+            return
+        with self.translate_lock:
+            if self.cache.needs_compaction():
+                self.cache.compact()
+            else:
+                self.cache.close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """HTTP 请求处理"""
+
+    server_version = 'JsonKlingonizer'
+    # 保持连接，客户端可以复用同一连接发送多个请求
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self) -> None:
+        # TCP 连接上响应头和响应体分两次写出，关闭 Nagle 算法，避免与延迟确认叠加出约 40ms 的停顿
+        self.disable_nagle_algorithm = self.server.address_family != socket.AF_UNIX
+        super().setup()
+
+    def address_string(self) -> str:
+        # Unix 套接字没有客户端地址
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format: str, *args) -> None:
+        logger = self.server.service.logger
+        if logger:
+            logger.debug(f"🌐 {self.address_string()} {format % args}")
+
+    def _send(self, status: int, body: bytes, content_type: str = 'application/json; charset=utf-8') -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+
+    def _rejection(self, post: bool) -> Optional[Tuple[int, str]]:
+        """
+        检查请求来源和令牌
+
+        Returns:
+            (状态码, 原因)；请求合法时返回 None
+        """
+        if self.headers.get('Origin') is not None:
+            # 浏览器发起的跨站请求都会带 Origin，本地客户端不会
+            return 403, "不接受带 Origin 的请求"
+        if self.server.address_family != socket.AF_UNIX and not self.server.allow_remote:
+            host = _host_name(self.headers.get('Host') or '')
+            if not (is_loopback(host) or host == self.server.server_address[0]):
+                return 403, f"不接受的 Host: {self.headers.get('Host')}"
+        authorization = self.headers.get('Authorization') or ''
+        token = authorization[len('Bearer '):] if authorization.startswith('Bearer ') else ''
+        if not hmac.compare_digest(token.encode('utf-8'), self.server.token.encode('utf-8')):
+            return 401, "缺少或错误的令牌"
+        if post and self.headers.get_content_type() != 'application/json':
+            return 415, "请求体必须是 application/json"
+        return None
+
+    def do_GET(self) -> None:
+        start = time.perf_counter()
+        endpoint = self.path if self.path in ('/health', '/metrics') else 'unknown'
+        status = 200
+        rejection = self._rejection(post=False)
+        if rejection is not None:
+            status = rejection[0]
+            self._send_json(status, {'error': rejection[1]})
+        elif endpoint == '/health':
+            self._send_json(status, self.server.service.health())
+        elif endpoint == '/metrics':
+            self._send(status, metrics.to_text().encode('utf-8'),
+                       'application/openmetrics-text; version=1.0.0; charset=utf-8')
+        else:
+            status = 404
+            self._send_json(status, {'error': f"未知路径: {self.path}"})
+        SERVICE_REQUESTS.inc(endpoint=endpoint, status=str(status))
+        SERVICE_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint)
+
+    def do_POST(self) -> None:
+        start = time.perf_counter()
+        endpoint = self.path if self.path in ('/translate', '/shutdown') else 'unknown'
+        # 始终读完请求体，否则保持的连接上残留的字节会被当作下一个请求
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0) or 0))
+        rejection = self._rejection(post=True)
+        if rejection is not None:
+            status = rejection[0]
+            self._send_json(status, {'error': rejection[1]})
+        elif endpoint == '/shutdown':
+            status = 200
+            self._send_json(status, {'status': 'shutting down'})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        elif endpoint == '/translate':
+            try:
+                request = json.loads(body or b'{}')
+                if not isinstance(request, dict):
+                    raise ServiceError("请求体必须是 JSON 对象", 400)
+                status, payload = 200, self.server.service.handle(request)
+            except ServiceError as e:
+                status, payload = e.status, {'error': str(e)}
+            except ValueError as e:
+                status, payload = 400, {'error': f"无法解析请求: {e}"}
+            except Exception as e:
+                status, payload = 500, {'error': f"{type(e).__name__}: {e}"}
+            self._send_json(status, payload)
+        else:
+            status = 404
+            self._send_json(status, {'error': f"未知路径: {self.path}"})
+        SERVICE_REQUESTS.inc(endpoint=endpoint, status=str(status))
+        SERVICE_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint)
+
+
+class _TCPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def _socket_alive(path: str) -> bool:
+    """Unix 套接字上是否有服务在监听"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def serve(service: TranslationService, address: str, token_file: Path, flush_interval: float = 30.0,
+          ready: Optional[threading.Event] = None, allow_remote: bool = False) -> None:
+    """
+    启动服务并阻塞，直到收到 /shutdown、SIGTERM 或 Ctrl+C
+
+    Args:
+        service: 翻译服务
+        address: 监听地址
+        token_file: 令牌文件（监听成功后写入新令牌，退出时删除）
+        flush_interval: 定期把缓存写入磁盘的间隔（秒，0 表示只在退出时写出）
+        ready: 开始监听后设置的事件（可选）
+        allow_remote: 允许监听非回环 TCP 地址
+
+    Raises:
+        ValueError: 地址无效，或未允许远程访问时监听非回环地址
+    """
+    kind, target = parse_address(address)
+    if kind == 'unix':
+        if os.path.exists(target):
+            if _socket_alive(target):
+                raise OSError(f"已有服务在监听 {target}")
+            # 上次异常退出留下的套接字文件
+            os.unlink(target)
+        if os.path.dirname(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+        # 创建时就限制权限，避免 chmod 之前的短暂窗口
+        umask = os.umask(0o177)
+        try:
+            server = _UnixServer(target, _Handler)
+        finally:
+            os.umask(umask)
+    else:
+        if not is_loopback(target[0]) and not allow_remote:
+            raise ValueError(f"拒绝监听非回环地址 {target[0]}（需要显式允许远程访问）")
+        server = _TCPServer(target, _Handler)
+    server.service = service
+    # 监听成功后才写入令牌，地址被占用时不会覆盖正在运行的服务的令牌
+    try:
+        server.token = write_token(token_file)
+    except OSError:
+        server.server_close()
+        raise
+    server.allow_remote = allow_remote
+
+    stop = threading.Event()
+
+    def flush_periodically():
+        while not stop.wait(flush_interval):
+            service.flush()
+
+    if flush_interval:
+        threading.Thread(target=flush_periodically, daemon=True).start()
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+    if service.logger:
+        service.logger.info(f"🛰️  翻译服务已启动: {address}（PID {os.getpid()}，令牌文件 {token_file}）")
+        service.logger.flush()
+    if ready is not None:
+        ready.set()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+        service.close()
+        token_file.unlink(missing_ok=True)
+        if kind == 'unix' and os.path.exists(target):
+            os.unlink(target)
+        if service.logger:
+            service.logger.info(f"👋 翻译服务已停止，共处理 {service.requests} 个请求")
+
+
+class _UnixHTTPConnection(HTTPConnection):
+    """通过 Unix 套接字连接的 HTTPConnection"""
+
+    def __init__(self, path: str, timeout: Optional[float] = None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+class ServiceClient:
+    """常驻服务的客户端"""
+
+    def __init__(self, address: str, token: str, timeout: Optional[float] = None):
+        """
+        Args:
+            address: 服务地址
+            token: 服务启动时写入令牌文件的令牌
+            timeout: 单个请求的超时秒数（None 表示一直等待翻译完成）
+        """
+        self.address = address
+        self.token = token
+        kind, target = parse_address(address)
+        if kind == 'unix':
+            self.connection = _UnixHTTPConnection(target, timeout)
+        else:
+            self.connection = HTTPConnection(target[0], target[1], timeout=timeout)
+
+    def _request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Any:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8') if payload is not None else None
+        headers = {'Authorization': f"Bearer {self.token}"}
+        if body is not None:
+            headers['Content-Type'] = 'application/json'
+        self.connection.request(method, path, body=body, headers=headers)
+        response = self.connection.getresponse()
+        data = response.read()
+        if response.getheader('Content-Type', '').startswith('application/json'):
+            data = json.loads(data)
+        if response.status != 200:
+            message = data.get('error') if isinstance(data, dict) else data
+            raise ServiceError(str(message), response.status)
+        return data
+
+    def translate(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """发送翻译请求（见模块说明）；连接失败时抛出 OSError"""
+        return self._request('POST', '/translate', request)
+
+    def health(self) -> Dict[str, Any]:
+        """查询运行状态"""
+        return self._request('GET', '/health')
+
+    def metrics(self) -> str:
+        """获取指标文本"""
+        return self._request('GET', '/metrics').decode('utf-8')
+
+    def shutdown(self) -> None:
+        """请求服务退出"""
+        self._request('POST', '/shutdown', {})
+
+    def close(self) -> None:
+        self.connection.close()
@@ -0,0 +1,237 @@
+"""
+Sharding
+把一批语言文件中去重后的字符串按字符数均衡地拆成 N 个分片，交给不同的翻译供应商或流水线；
+分片陆续返回后写入缓存，并只重建受影响的输出文件。
+
+分片目录结构：
+    manifest.json        分片清单（语言对、缓存命名空间、源文件、每个分片的字符串数和字符数）
+    index.jsonl          每个源文件一行：{"file": 相对路径, "values": [[路径, id], ...]}，重建时不需要重新提取
+    shard-001.jsonl ...  交换文件格式的记录 {"id", "source", "translation", "context"}
+    translations.jsonl   已合并的译文（追加写入，同一 id 以最后一条为准）
+    merged.json          已合并的返回文件及其 SHA-256，内容未变化的文件不会重复合并
+
+id 是原文的 MD5，合并时用它校验记录的 source 没有被改动。
+"""
+
+import hashlib
+import heapq
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+MANIFEST = 'manifest.json'
+INDEX = 'index.jsonl'
+TRANSLATIONS = 'translations.jsonl'
+MERGED = 'merged.json'
+
+# 合并统计中保留的问题示例数
+MAX_EXAMPLES = 20
+
+
+def text_id(text: str) -> str:
+    """字符串的稳定 id（原文的 MD5）"""
+    return hashlib.md5(text.encode('utf-8')).hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """文件内容的 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def collect_strings(scanned: List[Tuple[str, List[Dict[str, Any]]]], root: Path) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    对提取结果去重
+
+    Args:
+        scanned: (文件路径, 值列表) 列表
+        root: 源目录（index 中记录相对路径）
+
+    Returns:
+        ({id: {'text', 'count', 'context'}}（按首次出现排序）, index 行列表)
+    """
+    strings = {}
+    index = []
+    for input_path, values in scanned:
+        entries = []
+        for item in values:
+            text = item['original']
+            if not text.strip():
+                continue
+            key = text_id(text)
+            info = strings.get(key)
+            if info is None:
+                strings[key] = {'text': text, 'count': 1, 'context': item['path']}
+            else:
+                info['count'] += 1
+            entries.append([item['path'], key])
+        index.append({'file': Path(input_path).relative_to(root).as_posix(), 'values': entries})
+    return strings, index
+
+
+def balance(sizes: List[int], shards: int) -> List[List[int]]:
+    """
+    按大小均衡分组（最长处理时间优先：从大到小依次放入当前总量最小的分组）
+
+    Args:
+        sizes: 每一项的大小（字符数）
+        shards: 分组数
+
+    Returns:
+        每个分组的项下标（组内保持原顺序）
+    """
+    heap = [(0, shard) for shard in range(shards)]
+    groups = [[] for _ in range(shards)]
+    for position in sorted(range(len(sizes)), key=lambda i: sizes[i], reverse=True):
+        total, shard = heapq.heappop(heap)
+        groups[shard].append(position)
+        heapq.heappush(heap, (total + sizes[position], shard))
+    for group in groups:
+        group.sort()
+    return groups
+
+
+def write_shards(strings: Dict[str, Dict[str, Any]], shards: int, output_dir: Path) -> List[Dict[str, Any]]:
+    """
+    写出分片文件
+
+    Args:
+        strings: collect_strings() 返回的去重字符串
+        shards: 分片数（不超过字符串数）
+        output_dir: 分片目录
+
+    Returns:
+        分片清单：[{'name', 'strings', 'chars'}]
+    """
+    ids = list(strings)
+    groups = balance([len(strings[key]['text']) for key in ids], max(1, min(shards, len(ids))))
+    manifest = []
+    for number, group in enumerate(groups, 1):
+        name = f"shard-{number:03d}.jsonl"
+        chars = 0
+        with open(output_dir / name, 'w', encoding='utf-8', newline='\n') as f:
+            for position in group:
+                key = ids[position]
+                info = strings[key]
+                chars += len(info['text'])
+                f.write(json.dumps({'id': key, 'source': info['text'], 'translation': '',
+                                    'context': info['context']}, ensure_ascii=False))
+                f.write('\n')
+        manifest.append({'name': name, 'strings': len(group), 'chars': chars})
+    return manifest
+
+
+def read_shard(path: str) -> Dict[str, Any]:
+    """
+    读取一个返回的分片（可在工作进程中运行）
+
+    Args:
+        path: 返回的分片文件
+
+    Returns:
+        file、sha256、records（[(id, 原文, 译文)]）、empty（未翻译）、mismatched（source 与 id 不符）、
+        invalid（无法解析的行）、errors（示例）
+    """
+    result = {'file': path, 'sha256': file_digest(path), 'records': [], 'empty': 0, 'mismatched': 0,
+              'invalid': 0, 'errors': []}
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+                key, source = record['id'], record['source']
+            except (ValueError, TypeError, KeyError) as e:
+                result['invalid'] += 1
+                if len(result['errors']) < MAX_EXAMPLES:
+                    result['errors'].append(f"第 {number} 行: {e}")
+                continue
+            if not isinstance(source, str) or text_id(source) != key:
+                result['mismatched'] += 1
+                continue
+            translation = record.get('translation')
+            if not isinstance(translation, str) or not translation:
+                result['empty'] += 1
+                continue
+            result['records'].append((key, source, translation))
+    return result
+
+
+def load_manifest(shard_dir: Path) -> Dict[str, Any]:
+    """读取分片清单"""
+    with open(shard_dir / MANIFEST, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_merged(shard_dir: Path) -> Dict[str, str]:
+    """已合并的返回文件 {路径: SHA-256}"""
+    path = shard_dir / MERGED
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_merged(shard_dir: Path, merged: Dict[str, str]) -> None:
+    """保存已合并的返回文件"""
+    with open(shard_dir / MERGED, 'w', encoding='utf-8') as f:
+        json.dump(merged, f, indent=2, ensure_ascii=False)
+
+
+def append_translations(shard_dir: Path, records: List[Tuple[str, str, str]]) -> None:
+    """追加已合并的译文"""
+    with open(shard_dir / TRANSLATIONS, 'a', encoding='utf-8', newline='\n') as f:
+        for key, source, translation in records:
+            f.write(json.dumps({'id': key, 'source': source, 'translation': translation}, ensure_ascii=False))
+            f.write('\n')
+
+
+def load_translations(shard_dir: Path) -> Dict[str, Tuple[str, str]]:
+    """读取已合并的全部译文 {id: (原文, 译文)}（后写入的优先）"""
+    translations = {}
+    path = shard_dir / TRANSLATIONS
+    if not path.exists():
+        return translations
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                translations[record['id']] = (record['source'], record['translation'])
+    return translations
+
+
+def iter_index(shard_dir: Path) -> Iterator[Dict[str, Any]]:
+    """逐行读取源文件索引"""
+    with open(shard_dir / INDEX, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def affected_values(entry: Dict[str, Any], translations: Dict[str, Tuple[str, str]],
+                    changed: Optional[set] = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    一个源文件的重建值列表
+
+    Args:
+        entry: index 中的一行
+        translations: 全部已合并的译文
+        changed: 本次新合并的 id（None 表示不论是否变化都重建）
+
+    Returns:
+        有译文的值列表（与 JSONExtractor 的值格式一致）；文件不受本次合并影响时返回 None
+    """
+    if changed is not None and not any(key in changed for _, key in entry['values']):
+        return None
+    values = []
+    for path, key in entry['values']:
+        pair = translations.get(key)
+        if pair is not None:
+            values.append({'path': path, 'original': pair[0], 'translated': pair[1]})
+    return values
@@ -0,0 +1,159 @@
+"""
+Source Document
+以内存映射方式读取 JSON 源文件，直接从映射的字节解析，不再先解码成完整的 Python 字符串；
+并可扫描出每个字符串值在源文件中的字节范围，供后续阶段（部分导出、原地修改）引用源文件片段而无需复制。
+"""
+
+import mmap
+import re
+from typing import Any, Dict, Tuple
+
+from . import codec
+from .profiler import profiler
+
+# 词法单元：字符串 | 容器开始 | 容器结束 | 逗号（数字、字面量和冒号不影响路径，直接跳过）
+_TOKEN = re.compile(rb'("[^"\\]*(?:\\.[^"\\]*)*")|([{\[])|([}\]])|(,)', re.DOTALL)
+
+
+def _decode_key(raw: bytes) -> str:
+    """解码对象键（不含引号）"""
+    if b'\\' in raw:
+        return codec.loads(b'"' + raw + b'"')
+    return raw.decode('utf-8')
+
+
+def scan_string_spans(data) -> Dict[str, Tuple[int, int]]:
+    """
+    扫描 JSON 字节，记录每个字符串值的字节范围
+
+    路径格式与 JSONExtractor 一致（"user.name"、"items[0].title"）。
+    范围包含两侧引号，即 data[start:end] 是该值在源文件中的原始 JSON 字符串字面量。
+    对象中出现重复键时与解析结果一致，以最后一次出现为准。
+
+    Args:
+        data: 合法的 JSON 字节（bytes、mmap 等支持缓冲区协议的对象）
+
+    Returns:
+        路径到 (起始偏移, 结束偏移) 的映射
+    """
+    spans = {}
+    # 每层记录 [是否对象, 容器路径, 当前键或下标, 是否期待键]
+    stack = []
+    for match in _TOKEN.finditer(data):
+        kind = match.lastindex
+        if kind == 1:
+            start, end = match.span()
+            if stack:
+                frame = stack[-1]
+                if frame[3]:
+                    frame[2] = _decode_key(data[start + 1:end - 1])
+                    frame[3] = False
+                    continue
+                if frame[0]:
+                    path = f"{frame[1]}.{frame[2]}" if frame[1] else frame[2]
+                else:
+                    path = f"{frame[1]}[{frame[2]}]"
+            else:
+                path = ""
+            spans[path] = (start, end)
+        elif kind == 2:
+            if stack:
+                frame = stack[-1]
+                if frame[0]:
+                    path = f"{frame[1]}.{frame[2]}" if frame[1] else frame[2]
+                else:
+                    path = f"{frame[1]}[{frame[2]}]"
+            else:
+                path = ""
+            is_object = data[match.start()] == 0x7B
+            stack.append([is_object, path, None if is_object else 0, is_object])
+        elif kind == 3:
+            stack.pop()
+        else:
+            frame = stack[-1]
+            if frame[0]:
+                frame[3] = True
+            else:
+                frame[2] += 1
+    return spans
+
+
+class SourceDocument:
+    """内存映射的 JSON 源文件"""
+
+    def __init__(self, file_path: str):
+        """
+        打开并映射源文件
+
+        Args:
+            file_path: JSON 文件路径
+        """
+        self.file_path = file_path
+        self.file = open(file_path, 'rb')
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 空文件无法映射
+            self.data = b''
+        self.spans = None
+
+    def parse(self) -> Any:
+        """
+        从映射的字节解析 JSON
+
+        只有 orjson 能直接解析缓冲区；其他后端需要 bytes，此时直接读取文件，
+        避免映射页面和复制出的 bytes 同时驻留内存
+
+        Returns:
+            解析后的对象
+        """
+        with profiler.span('source.parse'):
+            if codec.backend_name() != 'orjson':
+                self.file.seek(0)
+                return codec.loads(self.file.read())
+            view = memoryview(self.data)
+            try:
+                return codec.loads(view)
+            finally:
+                view.release()
+
+    def string_spans(self) -> Dict[str, Tuple[int, int]]:
+        """
+        每个字符串值的字节范围（首次调用时扫描，之后复用）
+
+        Returns:
+            路径到 (起始偏移, 结束偏移) 的映射
+        """
+        if self.spans is None:
+            with profiler.span('source.scan'):
+                self.spans = scan_string_spans(self.data)
+        return self.spans
+
+    def slice(self, start: int, end: int) -> bytes:
+        """
+        读取源文件片段
+
+        Args:
+            start: 起始字节偏移
+            end: 结束字节偏移
+
+        Returns:
+            片段字节
+        """
+        return self.data[start:end]
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def close(self) -> None:
+        """关闭映射和文件"""
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -1,20 +1,157 @@
 """
 翻译器模块
 支持多种翻译服务
+
+翻译器按名称登记，实现模块只在被选中时才导入，
+这样 --list-translators、--extract-only 等不需要翻译的命令不会加载
+requests / googletrans 等重量级依赖。
+第三方翻译器可以通过 entry point 组 ``jsonklingonizer.translators`` 注册，
+值的格式为 ``package.module:ClassName``。
 """
 
+import importlib
+from typing import Dict, Any
+
 from .base_translator import BaseTranslator
-from .klingon_translator import KlingonTranslator
-from .googletrans_translator import GoogleTranslator
-from .libre_translator import LibreTranslator
-from .reverse_translator import ReverseTranslator
-from .flip_translator import FlipTranslator
+
+# entry point 组名（第三方翻译器）
+ENTRY_POINT_GROUP = 'jsonklingonizer.translators'
+
+# 内置翻译器：名称 -> (模块, 类名, 描述)
+_BUILTIN_TRANSLATORS = {
+    'google': ('.googletrans_translator', 'GoogleTranslator', 'Google Translator - 免费，无需 API Key'),
+    'klingon': ('.klingon_translator', 'KlingonTranslator', 'Klingon Translator - Fun Translations API，翻译为克林贡语'),
+    'libre': ('.libre_translator', 'LibreTranslator', 'LibreTranslate - 开源，可自托管'),
+    'reverse': ('.reverse_translator', 'ReverseTranslator', 'Reverse Translator - 趣味翻译，将文本字符顺序颠倒'),
+    'flip': ('.flip_translator', 'FlipTranslator', 'Flip Translator - 趣味翻译，将英文字符翻转为上下颠倒的样子'),
+}
+
+# 运行时注册的翻译器：名称 -> (目标, 描述)，目标为 "module:Class" 字符串或类
+_registered = {}
+
+# 已解析的翻译器类缓存
+_loaded_classes = {}
+
+# entry point 扫描结果（首次需要时才扫描）
+_entry_points = None
+
+
+def _discover_entry_points() -> Dict[str, Any]:
+    """扫描已安装包声明的翻译器 entry point（结果会被缓存）"""
+    global _entry_points
+    if _entry_points is None:
+        _entry_points = {}
+        try:
+            from importlib.metadata import entry_points
+            eps = entry_points()
+            if hasattr(eps, 'select'):
+                group = eps.select(group=ENTRY_POINT_GROUP)
+            else:
+                group = eps.get(ENTRY_POINT_GROUP, [])
+            for ep in group:
+                _entry_points[ep.name] = ep
+        except Exception as e:
+            print(f"⚠️  扫描翻译器插件失败: {e}")
+    return _entry_points
+
+
+def register_translator(name: str, target: Any, description: str = '') -> None:
+    """
+    注册翻译器
+
+    Args:
+        name: 翻译器名称（用于 --translator）
+        target: 翻译器类，或 "package.module:ClassName" 形式的延迟导入路径
+        description: 描述文本（用于 --list-translators）
+    """
+    _registered[name] = (target, description)
+    _loaded_classes.pop(name, None)
+
+
+def list_translators() -> Dict[str, str]:
+    """
+    列出所有可用的翻译器（不会导入任何翻译器实现）
+
+    Returns:
+        翻译器名称到描述的映射字典
+    """
+    result = {name: spec[2] for name, spec in _BUILTIN_TRANSLATORS.items()}
+    for name, ep in _discover_entry_points().items():
+        result.setdefault(name, f"插件 ({ep.value})")
+    for name, (target, description) in _registered.items():
+        result[name] = description or str(target)
+    return result
+
+
+def get_translator_class(name: str):
+    """
+    按名称获取翻译器类，首次调用时才导入实现模块
+
+    Args:
+        name: 翻译器名称
+
+    Returns:
+        翻译器类
+
+    Raises:
+        ValueError: 未知的翻译器名称
+    """
+    if name in _loaded_classes:
+        return _loaded_classes[name]
+
+    if name in _registered:
+        target = _registered[name][0]
+        if isinstance(target, str):
+            module_name, _, class_name = target.partition(':')
+            cls = getattr(importlib.import_module(module_name), class_name)
+        else:
+            cls = target
+    elif name in _BUILTIN_TRANSLATORS:
+        module_name, class_name, _ = _BUILTIN_TRANSLATORS[name]
+        cls = getattr(importlib.import_module(module_name, __name__), class_name)
+    elif name in _discover_entry_points():
+        cls = _discover_entry_points()[name].load()
+    else:
+        available = ', '.join(sorted(list_translators()))
+        raise ValueError(f"未知的翻译器: {name}（可用: {available}）")
+
+    _loaded_classes[name] = cls
+    return cls
+
+
+def create_translator(name: str, config: Dict[str, Any], cache_manager=None) -> BaseTranslator:
+    """
+    按名称创建翻译器实例
+
+    Args:
+        name: 翻译器名称
+        config: 配置字典
+        cache_manager: 缓存管理器实例（可选）
+
+    Returns:
+        翻译器实例
+    """
+    return get_translator_class(name)(config, cache_manager)
+
+
+def __getattr__(attr: str):
+    """兼容旧的 ``from src.translators import GoogleTranslator`` 写法（延迟导入）"""
+    for name, (_, class_name, _) in _BUILTIN_TRANSLATORS.items():
+        if class_name == attr:
+            return get_translator_class(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
+
 
 __all__ = [
     'BaseTranslator',
-    'KlingonTranslator', 
+    'KlingonTranslator',
     'GoogleTranslator',
     'LibreTranslator',
     'ReverseTranslator',
     'FlipTranslator',
+    'ENTRY_POINT_GROUP',
+    'register_translator',
+    'list_translators',
+    'get_translator_class',
+    'create_translator',
 ]
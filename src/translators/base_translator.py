@@ -7,10 +7,44 @@ from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
 import re
 
+from ..profiler import profiler
+from ..metrics import TRANSLATIONS
+
+# 与具体文本相关、重试也不会成功的 HTTP 状态码（401/403 等属于配置问题，不按文本记录）
+PERMANENT_STATUS = {400, 413, 422}
+
+# 会写入失败缓存的失败原因
+NEGATIVE_CACHE_REASONS = ('permanent', 'timeout')
+
+
+def cache_namespace(translator_id: str, config: Dict[str, Any]) -> str:
+    """
+    缓存键命名空间：翻译器 ID + 版本标签（processing.cache.version，可按翻译器配置）
+    
+    Args:
+        translator_id: 翻译器 ID
+        config: 配置字典
+        
+    Returns:
+        "翻译器ID@版本"
+    """
+    version = config.get('processing', {}).get('cache', {}).get('version', '1')
+    if isinstance(version, dict):
+        version = version.get(translator_id, version.get('default', '1'))
+    return f"{translator_id}@{version}"
+
+
+def make_cache_key(namespace: str, text: str, source_lang: str, target_lang: str) -> str:
+    """生成缓存键文本（格式为 翻译器ID@版本|源语言:目标语言:原文）"""
+    return f"{namespace}|{source_lang}:{target_lang}:{text}"
+
 
 class BaseTranslator(ABC):
     """翻译器基类"""
     
+    # 翻译器标识（用于指标标签、缓存键命名空间等），子类应覆盖
+    translator_id = None
+    
     def __init__(self, config: Dict[str, Any], cache_manager=None):
         """
         初始化翻译器
@@ -21,6 +55,56 @@ class BaseTranslator(ABC):
         """
         self.config = config
         self.cache_manager = cache_manager
+        if not self.translator_id:
+            self.translator_id = type(self).__name__.lower()
+        self.cache_namespace = cache_namespace(self.translator_id, config)
+        # 最近一次 translate() 失败的原因：'permanent'、'timeout'、'transient' 或 None
+        self.last_error = None
+    
+    @classmethod
+    def cache_languages(cls, source_lang: str, target_lang: str) -> tuple:
+        """
+        缓存键中使用的语言对（忽略语言参数的翻译器可以覆盖，预热缓存时也按此生成键）
+        
+        Returns:
+            (源语言, 目标语言)
+        """
+        return source_lang, target_lang
+    
+    def _cache_key(self, text: str, source_lang: str, target_lang: str) -> str:
+        """
+        生成缓存键文本（所有翻译器统一使用）
+        
+        Args:
+            text: 原文
+            source_lang: 源语言代码
+            target_lang: 目标语言代码
+            
+        Returns:
+            "翻译器ID@版本|源语言:目标语言:原文"
+        """
+        return make_cache_key(self.cache_namespace, text, source_lang, target_lang)
+    
+    def _known_failure(self, cache_key: str) -> Optional[str]:
+        """
+        查询失败缓存
+        
+        Returns:
+            未过期的失败原因，没有记录时返回 None
+        """
+        if self.cache_manager:
+            return self.cache_manager.get_failure(cache_key)
+        return None
+    
+    def _record_failure(self, cache_key: str) -> None:
+        """按 last_error 记录失败缓存（只记录永久失败和超时）"""
+        if self.cache_manager and self.last_error in NEGATIVE_CACHE_REASONS:
+            self.cache_manager.set_failure(cache_key, self.last_error, translator=self.translator_id)
+    
+    @staticmethod
+    def _is_timeout(error: Exception) -> bool:
+        """异常是否为超时（兼容 requests、httpx 和内置 TimeoutError）"""
+        return isinstance(error, TimeoutError) or 'Timeout' in type(error).__name__
     
     @abstractmethod
     def translate(self, text: str, source_lang: str = 'auto', target_lang: str = 'en') -> Optional[str]:
@@ -56,6 +140,7 @@ class BaseTranslator(ABC):
         total = len(values)
         translated_count = 0
         skipped_count = 0
+        failed_known = 0
         
         # 第一步：处理缓存和跳过不需要翻译的项
         need_translation = []
@@ -65,26 +150,41 @@ class BaseTranslator(ABC):
             original = item['original']
             
             # 检查是否应该跳过翻译
-            if self._should_skip_translation(original):
+            with profiler.span('translate.skip_filter'):
+                skip = self._should_skip_translation(original)
+            if skip:
                 item['translated'] = original
                 skipped_count += 1
                 continue
             
             # 检查缓存
             if self.cache_manager:
-                cache_key = f"{source_lang}:{target_lang}:{original}"
-                cached = self.cache_manager.get(cache_key)
+                cache_key = self._cache_key(original, source_lang, target_lang)
+                with profiler.span('cache.lookup'):
+                    cached = self.cache_manager.get(cache_key)
+                    failure = None if cached else self._known_failure(cache_key)
                 if cached:
                     item['translated'] = cached
                     translated_count += 1
                     continue
+                if failure:
+                    # 近期已确认失败，直接保留原文，不再请求和退避
+                    item['translated'] = original
+                    failed_known += 1
+                    continue
             
             # 需要翻译
             need_translation.append(original)
             need_translation_indices.append(idx)
         
+        TRANSLATIONS.inc(skipped_count, translator=self.translator_id, result='skipped')
+        TRANSLATIONS.inc(translated_count, translator=self.translator_id, result='cached')
+        TRANSLATIONS.inc(failed_known, translator=self.translator_id, result='known_failure')
+        
         if skipped_count > 0:
             print(f"💡 跳过了 {skipped_count} 个不需要翻译的项（版本号、数字等）")
+        if failed_known > 0:
+            print(f"💡 跳过了 {failed_known} 个近期翻译失败的项（失败缓存未过期，保留原文）")
         
         if not need_translation:
             print(f"✅ 所有内容都已在缓存中或无需翻译！")
@@ -95,18 +195,23 @@ class BaseTranslator(ABC):
         # 第二步：逐个翻译
         for i, idx in enumerate(need_translation_indices):
             original = need_translation[i]
-            translated = self.translate(original, source_lang, target_lang)
+            self.last_error = None
+            with profiler.span('translate.call'):
+                translated = self.translate(original, source_lang, target_lang)
             
             if translated:
                 values[idx]['translated'] = translated
                 translated_count += 1
+                TRANSLATIONS.inc(translator=self.translator_id, result='success')
                 
                 # 保存到缓存
                 if self.cache_manager:
-                    cache_key = f"{source_lang}:{target_lang}:{original}"
-                    self.cache_manager.set(cache_key, translated)
+                    self.cache_manager.set(self._cache_key(original, source_lang, target_lang),
+                                           translated, translator=self.translator_id)
             else:
                 values[idx]['translated'] = original
+                self._record_failure(self._cache_key(original, source_lang, target_lang))
+                TRANSLATIONS.inc(translator=self.translator_id, result='failure')
                 print(f"⚠️  翻译失败，保留原文: {original[:50]}...")
             
             if progress_callback:
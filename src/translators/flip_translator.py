@@ -11,6 +11,8 @@ from .base_translator import BaseTranslator
 class FlipTranslator(BaseTranslator):
     """字符翻转翻译器，将英文字符转换为上下颠倒的Unicode字符"""
 
+    translator_id = 'flip'
+
     # 字符映射表：正常字符 -> 翻转后的字符
     FLIP_MAP = {
         'a': 'ɐ',
@@ -4,13 +4,16 @@ Google Translator
 """
 
 from typing import Optional, Dict, Any
-import time
 
 from .base_translator import BaseTranslator
+from ..profiler import profiler, timed_sleep
+from ..metrics import REQUESTS, REQUEST_LATENCY, RETRIES, timer
 
 
 class GoogleTranslator(BaseTranslator):
     """Google 翻译器（使用 googletrans 库）"""
+
+    translator_id = 'google'
     
     def __init__(self, config: Dict[str, Any], cache_manager=None):
         """
@@ -54,8 +57,8 @@ class GoogleTranslator(BaseTranslator):
             return None
         
         # 检查缓存
+        cache_key = self._cache_key(text, source_lang, target_lang)
         if self.cache_manager:
-            cache_key = f"{source_lang}:{target_lang}:{text}"
             cached = self.cache_manager.get(cache_key)
             if cached:
                 return cached
@@ -63,27 +66,31 @@ class GoogleTranslator(BaseTranslator):
         # 尝试翻译
         for attempt in range(self.max_retries):
             try:
-                result = self.translator.translate(
-                    text,
-                    src=source_lang,
-                    dest=target_lang
-                )
+                with profiler.span('request.google'), timer(REQUEST_LATENCY, translator=self.translator_id):
+                    result = self.translator.translate(
+                        text,
+                        src=source_lang,
+                        dest=target_lang
+                    )
+                REQUESTS.inc(translator=self.translator_id, status='ok')
                 
                 translated = result.text
                 
                 # 保存到缓存
                 if self.cache_manager:
-                    cache_key = f"{source_lang}:{target_lang}:{text}"
-                    self.cache_manager.set(cache_key, translated)
+                    self.cache_manager.set(cache_key, translated, translator=self.translator_id)
                 
                 return translated
             
             except Exception as e:
+                REQUESTS.inc(translator=self.translator_id, status='error')
                 print(f"❌ 翻译异常: {str(e)}")
+                self.last_error = 'timeout' if self._is_timeout(e) else 'transient'
                 if attempt < self.max_retries - 1:
+                    RETRIES.inc(translator=self.translator_id)
                     wait_time = self.backoff_factor ** attempt
                     print(f"   等待 {wait_time} 秒后重试...")
-                    time.sleep(wait_time)
+                    timed_sleep(wait_time)
                 else:
                     return None
         
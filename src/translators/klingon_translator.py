@@ -4,16 +4,18 @@ Klingon Translator
 包含速率限制、重试机制和缓存支持
 """
 
-import requests
-import time
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 
-from .base_translator import BaseTranslator
+from .base_translator import BaseTranslator, PERMANENT_STATUS
+from ..profiler import profiler, timed_sleep
+from ..metrics import REQUESTS, REQUEST_LATENCY, RETRIES, TRANSLATIONS, timer
 
 
 class KlingonTranslator(BaseTranslator):
     """克林贡语翻译器"""
+
+    translator_id = 'klingon'
     
     def __init__(self, config: Dict[str, Any], cache_manager=None):
         """
@@ -24,6 +26,11 @@ class KlingonTranslator(BaseTranslator):
             cache_manager: 缓存管理器实例（可选）
         """
         super().__init__(config, cache_manager)
+        
+        # 延迟导入 requests，只有真正使用该翻译器时才加载
+        import requests
+        self.session = requests.Session()
+        
         self.api_url = config['api']['base_url']
         
         # 速率限制
@@ -39,6 +46,15 @@ class KlingonTranslator(BaseTranslator):
         self.hourly_requests = []
         self.daily_requests = []
     
+    @classmethod
+    def cache_languages(cls, source_lang: str, target_lang: str) -> tuple:
+        """API 忽略语言参数，缓存键固定使用 auto -> klingon"""
+        return 'auto', 'klingon'
+    
+    def _key(self, text: str) -> str:
+        """缓存键"""
+        return self._cache_key(text, *self.cache_languages('auto', 'klingon'))
+    
     def translate(self, text: str, source_lang: str = 'auto', target_lang: str = 'klingon') -> Optional[str]:
         """
         翻译单个文本为克林贡语
@@ -52,8 +68,9 @@ class KlingonTranslator(BaseTranslator):
             翻译后的文本，如果失败返回 None
         """
         # 检查缓存
+        cache_key = self._key(text)
         if self.cache_manager:
-            cached = self.cache_manager.get(text)
+            cached = self.cache_manager.get(cache_key)
             if cached:
                 return cached
         
@@ -63,11 +80,13 @@ class KlingonTranslator(BaseTranslator):
         # 尝试翻译
         for attempt in range(self.max_retries):
             try:
-                response = requests.get(
-                    self.api_url,
-                    params={'text': text},
-                    timeout=30
-                )
+                with profiler.span('request.klingon'), timer(REQUEST_LATENCY, translator=self.translator_id):
+                    response = self.session.get(
+                        self.api_url,
+                        params={'text': text},
+                        timeout=30
+                    )
+                REQUESTS.inc(translator=self.translator_id, status=str(response.status_code))
                 
                 # 记录请求
                 self._record_request()
@@ -78,7 +97,7 @@ class KlingonTranslator(BaseTranslator):
                     
                     # 保存到缓存
                     if self.cache_manager:
-                        self.cache_manager.set(text, translated)
+                        self.cache_manager.set(cache_key, translated, translator=self.translator_id)
                     
                     return translated
                 
@@ -86,26 +105,39 @@ class KlingonTranslator(BaseTranslator):
                     # 速率限制
                     self._handle_rate_limit(response)
                     if attempt < self.max_retries - 1:
+                        RETRIES.inc(translator=self.translator_id)
                         continue
                     else:
                         print(f"⚠️  达到最大重试次数，跳过: {text[:50]}...")
+                        self.last_error = 'transient'
                         return None
                 
+                elif response.status_code in PERMANENT_STATUS:
+                    # 文本本身无法翻译，重试也不会成功
+                    print(f"❌ API 错误 {response.status_code}（不重试）: {response.text}")
+                    self.last_error = 'permanent'
+                    return None
+                
                 else:
                     print(f"❌ API 错误 {response.status_code}: {response.text}")
+                    self.last_error = 'transient'
                     if attempt < self.max_retries - 1:
+                        RETRIES.inc(translator=self.translator_id)
                         wait_time = self.backoff_factor ** attempt
                         print(f"   等待 {wait_time} 秒后重试...")
-                        time.sleep(wait_time)
+                        timed_sleep(wait_time)
                     else:
                         return None
             
             except Exception as e:
+                REQUESTS.inc(translator=self.translator_id, status='error')
                 print(f"❌ 请求异常: {str(e)}")
+                self.last_error = 'timeout' if self._is_timeout(e) else 'transient'
                 if attempt < self.max_retries - 1:
+                    RETRIES.inc(translator=self.translator_id)
                     wait_time = self.backoff_factor ** attempt
                     print(f"   等待 {wait_time} 秒后重试...")
-                    time.sleep(wait_time)
+                    timed_sleep(wait_time)
                 else:
                     return None
         
@@ -130,6 +162,7 @@ class KlingonTranslator(BaseTranslator):
         total = len(values)
         translated_count = 0
         skipped_count = 0
+        failed_known = 0
         
         # 第一步：处理缓存和跳过不需要翻译的项
         need_translation = []
@@ -139,25 +172,41 @@ class KlingonTranslator(BaseTranslator):
             original = item['original']
             
             # 检查是否应该跳过翻译
-            if self._should_skip_translation(original):
+            with profiler.span('translate.skip_filter'):
+                skip = self._should_skip_translation(original)
+            if skip:
                 item['translated'] = original
                 skipped_count += 1
                 continue
             
             # 检查缓存
             if self.cache_manager:
-                cached = self.cache_manager.get(original)
+                cache_key = self._key(original)
+                with profiler.span('cache.lookup'):
+                    cached = self.cache_manager.get(cache_key)
+                    failure = None if cached else self._known_failure(cache_key)
                 if cached:
                     item['translated'] = cached
                     translated_count += 1
                     continue
+                if failure:
+                    # 近期已确认失败，直接保留原文
+                    item['translated'] = original
+                    failed_known += 1
+                    continue
             
             # 需要翻译
             need_translation.append(original)
             need_translation_indices.append(idx)
         
+        TRANSLATIONS.inc(skipped_count, translator=self.translator_id, result='skipped')
+        TRANSLATIONS.inc(translated_count, translator=self.translator_id, result='cached')
+        TRANSLATIONS.inc(failed_known, translator=self.translator_id, result='known_failure')
+        
         if skipped_count > 0:
             print(f"💡 跳过了 {skipped_count} 个不需要翻译的项（版本号、数字等）")
+        if failed_known > 0:
+            print(f"💡 跳过了 {failed_known} 个近期翻译失败的项（失败缓存未过期，保留原文）")
         
         if not need_translation:
             print(f"✅ 所有内容都已在缓存中或无需翻译！")
@@ -187,6 +236,13 @@ class KlingonTranslator(BaseTranslator):
                 for i, idx in enumerate(need_translation_indices):
                     values[idx]['translated'] = translated_parts[i].strip()
                     translated_count += 1
+                # 逐条写入缓存，下次运行可以单独命中
+                if self.cache_manager:
+                    self.cache_manager.set_many([
+                        (self._key(need_translation[i]), values[idx]['translated'], self.translator_id)
+                        for i, idx in enumerate(need_translation_indices)
+                    ])
+                TRANSLATIONS.inc(len(need_translation), translator=self.translator_id, result='success')
                 
                 print(f"✅ 批量翻译成功！")
             else:
@@ -194,13 +250,17 @@ class KlingonTranslator(BaseTranslator):
                 print(f"⚠️  批量翻译分割失败，回退到逐个翻译...")
                 for i, idx in enumerate(need_translation_indices):
                     original = need_translation[i]
+                    self.last_error = None
                     translated = self.translate(original)
                     
                     if translated:
                         values[idx]['translated'] = translated
                         translated_count += 1
+                        TRANSLATIONS.inc(translator=self.translator_id, result='success')
                     else:
                         values[idx]['translated'] = original
+                        self._record_failure(self._key(original))
+                        TRANSLATIONS.inc(translator=self.translator_id, result='failure')
                         print(f"⚠️  翻译失败，保留原文: {original[:50]}...")
                     
                     if progress_callback:
@@ -210,13 +270,17 @@ class KlingonTranslator(BaseTranslator):
             print(f"⚠️  批量翻译失败，回退到逐个翻译...")
             for i, idx in enumerate(need_translation_indices):
                 original = need_translation[i]
+                self.last_error = None
                 translated = self.translate(original)
                 
                 if translated:
                     values[idx]['translated'] = translated
                     translated_count += 1
+                    TRANSLATIONS.inc(translator=self.translator_id, result='success')
                 else:
                     values[idx]['translated'] = original
+                    self._record_failure(self._key(original))
+                    TRANSLATIONS.inc(translator=self.translator_id, result='failure')
                     print(f"⚠️  翻译失败，保留原文: {original[:50]}...")
                 
                 if progress_callback:
@@ -245,7 +309,7 @@ class KlingonTranslator(BaseTranslator):
                 wait_seconds = (wait_until - now).total_seconds()
                 if wait_seconds > 0:
                     print(f"⏳ 达到小时限制，等待 {wait_seconds:.0f} 秒...")
-                    time.sleep(wait_seconds + 1)
+                    timed_sleep(wait_seconds + 1, 'sleep.rate_limit')
                     self._check_rate_limit()  # 递归检查
             else:
                 raise Exception("已达到每小时请求限制")
@@ -257,7 +321,7 @@ class KlingonTranslator(BaseTranslator):
                 wait_seconds = (wait_until - now).total_seconds()
                 if wait_seconds > 0:
                     print(f"⏳ 达到每日限制，等待 {wait_seconds:.0f} 秒...")
-                    time.sleep(wait_seconds + 1)
+                    timed_sleep(wait_seconds + 1, 'sleep.rate_limit')
                     self._check_rate_limit()  # 递归检查
             else:
                 raise Exception("已达到每日请求限制")
@@ -268,7 +332,7 @@ class KlingonTranslator(BaseTranslator):
         self.hourly_requests.append(now)
         self.daily_requests.append(now)
     
-    def _handle_rate_limit(self, response: requests.Response) -> None:
+    def _handle_rate_limit(self, response: 'requests.Response') -> None:
         """处理 API 返回的速率限制"""
         # 尝试从响应头获取重试时间
         retry_after = response.headers.get('Retry-After')
@@ -280,6 +344,18 @@ class KlingonTranslator(BaseTranslator):
         
         print(f"⏳ API 速率限制，等待 {wait_seconds} 秒...")
         if self.wait_on_limit:
-            time.sleep(wait_seconds)
+            timed_sleep(wait_seconds, 'sleep.rate_limit')
         else:
             raise Exception("API 速率限制")
+    
+    @staticmethod
+    def get_supported_languages() -> Dict[str, str]:
+        """
+        获取支持的语言列表
+        
+        Returns:
+            语言代码到语言名称的映射字典
+        """
+        return {
+            'klingon': '克林贡语',
+        }
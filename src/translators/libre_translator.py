@@ -3,15 +3,17 @@ LibreTranslate Translator
 使用 LibreTranslate API 进行翻译（开源、可自托管）
 """
 
-import requests
-import time
 from typing import Optional, Dict, Any
 
-from .base_translator import BaseTranslator
+from .base_translator import BaseTranslator, PERMANENT_STATUS
+from ..profiler import profiler, timed_sleep
+from ..metrics import REQUESTS, REQUEST_LATENCY, RETRIES, timer
 
 
 class LibreTranslator(BaseTranslator):
     """LibreTranslate 翻译器"""
+
+    translator_id = 'libre'
     
     def __init__(self, config: Dict[str, Any], cache_manager=None):
         """
@@ -23,6 +25,10 @@ class LibreTranslator(BaseTranslator):
         """
         super().__init__(config, cache_manager)
         
+        # 延迟导入 requests，只有真正使用该翻译器时才加载
+        import requests
+        self.session = requests.Session()
+        
         # LibreTranslate API 配置
         self.api_url = config.get('api', {}).get('libre_url', 'https://libretranslate.com/translate')
         self.api_key = config.get('api', {}).get('libre_api_key', None)
@@ -43,9 +49,9 @@ class LibreTranslator(BaseTranslator):
         Returns:
             翻译后的文本，如果失败返回 None
         """
-        # 检查缓存
+        # 检查缓存（缓存键使用调用方传入的语言代码，查询和写入一致）
+        cache_key = self._cache_key(text, source_lang, target_lang)
         if self.cache_manager:
-            cache_key = f"{source_lang}:{target_lang}:{text}"
             cached = self.cache_manager.get(cache_key)
             if cached:
                 return cached
@@ -70,12 +76,14 @@ class LibreTranslator(BaseTranslator):
                 if self.api_key:
                     payload['api_key'] = self.api_key
                 
-                response = requests.post(
-                    self.api_url,
-                    json=payload,
-                    headers={'Content-Type': 'application/json'},
-                    timeout=30
-                )
+                with profiler.span('request.libre'), timer(REQUEST_LATENCY, translator=self.translator_id):
+                    response = self.session.post(
+                        self.api_url,
+                        json=payload,
+                        headers={'Content-Type': 'application/json'},
+                        timeout=30
+                    )
+                REQUESTS.inc(translator=self.translator_id, status=str(response.status_code))
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -83,26 +91,36 @@ class LibreTranslator(BaseTranslator):
                     
                     # 保存到缓存
                     if self.cache_manager:
-                        cache_key = f"{source_lang}:{target_lang}:{text}"
-                        self.cache_manager.set(cache_key, translated)
+                        self.cache_manager.set(cache_key, translated, translator=self.translator_id)
                     
                     return translated
                 
+                elif response.status_code in PERMANENT_STATUS:
+                    # 文本本身无法翻译，重试也不会成功
+                    print(f"❌ API 错误 {response.status_code}（不重试）: {response.text}")
+                    self.last_error = 'permanent'
+                    return None
+                
                 else:
                     print(f"❌ API 错误 {response.status_code}: {response.text}")
+                    self.last_error = 'transient'
                     if attempt < self.max_retries - 1:
+                        RETRIES.inc(translator=self.translator_id)
                         wait_time = self.backoff_factor ** attempt
                         print(f"   等待 {wait_time} 秒后重试...")
-                        time.sleep(wait_time)
+                        timed_sleep(wait_time)
                     else:
                         return None
             
             except Exception as e:
+                REQUESTS.inc(translator=self.translator_id, status='error')
                 print(f"❌ 请求异常: {str(e)}")
+                self.last_error = 'timeout' if self._is_timeout(e) else 'transient'
                 if attempt < self.max_retries - 1:
+                    RETRIES.inc(translator=self.translator_id)
                     wait_time = self.backoff_factor ** attempt
                     print(f"   等待 {wait_time} 秒后重试...")
-                    time.sleep(wait_time)
+                    timed_sleep(wait_time)
                 else:
                     return None
         
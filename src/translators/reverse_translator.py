@@ -10,6 +10,8 @@ from .base_translator import BaseTranslator
 class ReverseTranslator(BaseTranslator):
     """反转翻译器，将文本字符顺序颠倒"""
 
+    translator_id = 'reverse'
+
     def translate(self, text: str, source_lang: str = 'auto', target_lang: str = 'en') -> Optional[str]:
         """
         将文本反转
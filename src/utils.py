@@ -3,51 +3,183 @@
 包含缓存管理、日志记录、进度显示等工具
 """
 
+import atexit
 import json
 import hashlib
+import math
+import queue
+import re
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, Any
 from datetime import datetime
 
+from . import codec
+from .profiler import profiler
+from .metrics import CACHE_LOOKUPS, CACHE_WRITES, CACHE_ENTRIES, CACHE_TIER_LOOKUPS
+
+# 缓存键中的语言代码（如 en、zh-cn、auto）
+_LANG_CODE = re.compile(r'^[A-Za-z]{2,8}(?:[-_][A-Za-z0-9]{1,8})*$')
+
+# 缓存键的命名空间前缀（"翻译器ID@版本|"）
+_NAMESPACE = re.compile(r'^([\w.-]+)@([^|]*)\|')
+
 
 class CacheManager:
-    """翻译缓存管理器"""
+    """
+    翻译缓存管理器
+    
+    支持容量上限（条目数 / 字节数）、按最近访问时间的 LRU 淘汰和按翻译器配置的 TTL。
+    访问时间只记录在内存中，保存或压缩时才写入条目的 "accessed" 字段，get() 不会触发写盘。
+    淘汰在 compact() 中执行。
+    
+    失败缓存：永久失败或超时的文本记录为带 "failed" 字段（没有 "translated"）的条目，
+    在 negative_ttl 秒内 get_failure() 返回失败原因，get() 视为未命中。
+    """
     
-    def __init__(self, cache_dir: str = "data/cache"):
+    def __init__(self, cache_dir: str = "data/cache", max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None, ttl: Optional[dict] = None,
+                 negative_ttl: Optional[float] = 3600):
         """
         初始化缓存管理器
         
         Args:
             cache_dir: 缓存目录路径
+            max_entries: 最大条目数（None 表示不限制）
+            max_bytes: 缓存文件的最大字节数（按紧凑格式估算，None 表示不限制）
+            ttl: 按翻译器配置的过期秒数，如 {"google": 2592000, "default": null}；
+                 未配置的翻译器使用 "default"，为 None 时永不过期
+            negative_ttl: 失败缓存的有效秒数（None 或 0 表示不记录失败）
         """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.cache_file = self.cache_dir / "translation_cache.json"
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl or {}
+        self.negative_ttl = negative_ttl or None
         self.cache = self._load_cache()
+        # 内存中的最近访问时间（键 -> 时间戳），保存时合并到条目中
+        self.access = {}
+        # 本实例的查询和写入次数（指标注册表是进程全局的，只用于导出）
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        CACHE_ENTRIES.set(len(self.cache))
+    
+    @classmethod
+    def from_config(cls, processing: dict) -> 'CacheManager':
+        """
+        根据配置创建缓存管理器
+        
+        Args:
+            processing: 配置中的 processing 部分
+                        （cache_dir 和可选的 cache: {max_entries, max_bytes, ttl, negative_ttl}）
+            
+        Returns:
+            缓存管理器实例
+        """
+        options = processing.get('cache', {})
+        return cls(processing.get('cache_dir', 'data/cache'),
+                   max_entries=options.get('max_entries'),
+                   max_bytes=options.get('max_bytes'),
+                   ttl=options.get('ttl'),
+                   negative_ttl=options.get('negative_ttl', 3600))
     
     def _load_cache(self) -> dict:
         """加载缓存"""
         if self.cache_file.exists():
             try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with profiler.span('cache.load'):
+                    return codec.load(self.cache_file)
             except Exception as e:
                 print(f"⚠️  加载缓存失败: {e}")
                 return {}
         return {}
     
     def _save_cache(self) -> None:
-        """保存缓存"""
+        """保存缓存（紧凑格式，只供程序读取）"""
+        self._merge_access()
         try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, indent=2, ensure_ascii=False)
+            with profiler.span('cache.save'):
+                codec.dump(self.cache, self.cache_file, compact=True)
         except Exception as e:
             print(f"⚠️  保存缓存失败: {e}")
     
+    def _merge_access(self) -> None:
+        """将内存中的访问时间写入条目"""
+        for key, accessed in self.access.items():
+            entry = self.cache.get(key)
+            if entry is not None:
+                entry['accessed'] = accessed
+        self.access = {}
+    
     def _hash_key(self, text: str) -> str:
         """生成缓存键（使用 MD5 哈希）"""
         return hashlib.md5(text.encode('utf-8')).hexdigest()
     
+    @staticmethod
+    def describe_key(text: str, entry: Optional[dict] = None) -> dict:
+        """
+        解析缓存键文本
+        
+        Args:
+            text: 写入缓存时使用的键文本（条目的 original 字段），
+                  格式为 "翻译器ID@版本|源语言:目标语言:原文"（旧版本没有命名空间前缀）
+            entry: 条目（旧格式键用于读取 translator 字段）
+            
+        Returns:
+            {translator, version, source, target, text}，无法识别的部分为 None
+        """
+        translator = (entry or {}).get('translator')
+        version = None
+        match = _NAMESPACE.match(text)
+        if match:
+            translator, version = match.group(1), match.group(2)
+            text = text[match.end():]
+        parts = text.split(':', 2)
+        if len(parts) == 3 and all(_LANG_CODE.match(part) for part in parts[:2]):
+            return {'translator': translator, 'version': version,
+                    'source': parts[0], 'target': parts[1], 'text': parts[2]}
+        return {'translator': translator, 'version': version, 'source': None, 'target': None, 'text': text}
+    
+    def _ttl_for(self, entry: dict) -> Optional[float]:
+        """条目所属翻译器的过期秒数"""
+        return self.ttl.get(entry.get('translator'), self.ttl.get('default'))
+    
+    @staticmethod
+    def _created_at(entry: dict) -> float:
+        """条目的创建时间（时间戳）"""
+        try:
+            return datetime.fromisoformat(entry['timestamp']).timestamp()
+        except (KeyError, TypeError, ValueError):
+            return 0.0
+    
+    def _is_expired(self, entry: dict, now: float) -> bool:
+        """条目是否已过期（失败条目按 negative_ttl）"""
+        ttl = self._ttl_for(entry) if 'failed' not in entry else (self.negative_ttl or 0)
+        return ttl is not None and now - self._created_at(entry) > ttl
+    
+    def expires_at(self, text: str) -> Optional[float]:
+        """
+        条目的过期时间（时间戳）
+        
+        Args:
+            text: 原文
+            
+        Returns:
+            过期时间；没有配置 TTL 或条目不存在时返回 None
+        """
+        entry = self.cache.get(self._hash_key(text)) if self.ttl else None
+        if entry is None:
+            return None
+        ttl = self._ttl_for(entry)
+        return None if ttl is None else self._created_at(entry) + ttl
+    
     def get(self, text: str) -> Optional[str]:
         """
         从缓存获取翻译
@@ -56,148 +188,846 @@ class CacheManager:
             text: 原文
             
         Returns:
-            翻译结果，如果不存在返回 None
+            翻译结果，如果不存在或已过期返回 None
         """
         key = self._hash_key(text)
-        if key in self.cache:
-            return self.cache[key]['translated']
+        entry = self.cache.get(key)
+        if entry is not None and 'translated' in entry:
+            now = time.time()
+            if not (self.ttl and self._is_expired(entry, now)):
+                self.access[key] = now
+                self.hits += 1
+                CACHE_LOOKUPS.inc(result='hit')
+                return entry['translated']
+        self.misses += 1
+        CACHE_LOOKUPS.inc(result='miss')
         return None
     
-    def set(self, text: str, translated: str) -> None:
+    def get_failure(self, text: str) -> Optional[str]:
+        """
+        查询失败缓存
+        
+        Args:
+            text: 原文（缓存键文本）
+            
+        Returns:
+            未过期的失败原因（如 'permanent'、'timeout'），没有记录或已过期时返回 None
+        """
+        key = self._hash_key(text)
+        entry = self.cache.get(key)
+        if entry is None or 'failed' not in entry:
+            return None
+        if self._is_expired(entry, time.time()):
+            # 过期的失败条目直接丢弃，下次保存时写出
+            del self.cache[key]
+            CACHE_ENTRIES.set(len(self.cache))
+            return None
+        return entry['failed']
+    
+    def set_failure(self, text: str, reason: str, translator: Optional[str] = None, save: bool = True) -> None:
+        """
+        记录失败（不会覆盖已有的译文）
+        
+        Args:
+            text: 原文（缓存键文本）
+            reason: 失败原因
+            translator: 翻译器 ID
+            save: 是否立即保存
+        """
+        if not self.negative_ttl:
+            return
+        key = self._hash_key(text)
+        existing = self.cache.get(key)
+        if existing is not None and 'translated' in existing:
+            return
+        entry = {'original': text, 'failed': reason, 'timestamp': datetime.now().isoformat()}
+        if translator:
+            entry['translator'] = translator
+        self.cache[key] = entry
+        self.writes += 1
+        CACHE_WRITES.inc()
+        CACHE_ENTRIES.set(len(self.cache))
+        if save:
+            self._save_cache()
+    
+    def set(self, text: str, translated: str, translator: Optional[str] = None) -> None:
         """
         保存翻译到缓存
         
         Args:
             text: 原文
             translated: 译文
+            translator: 产生译文的翻译器 ID（用于按翻译器过期）
         """
         key = self._hash_key(text)
-        self.cache[key] = {
+        entry = {
             'original': text,
             'translated': translated,
             'timestamp': datetime.now().isoformat()
         }
+        if translator:
+            entry['translator'] = translator
+        self.cache[key] = entry
+        self.access[key] = time.time()
+        self.writes += 1
+        CACHE_WRITES.inc()
+        CACHE_ENTRIES.set(len(self.cache))
         self._save_cache()
     
+    def set_many(self, items: list) -> None:
+        """
+        批量保存翻译，只写一次文件
+        
+        Args:
+            items: (原文, 译文, 翻译器 ID) 列表
+        """
+        if not items:
+            return
+        timestamp = datetime.now().isoformat()
+        now = time.time()
+        for text, translated, translator in items:
+            key = self._hash_key(text)
+            entry = {'original': text, 'translated': translated, 'timestamp': timestamp}
+            if translator:
+                entry['translator'] = translator
+            self.cache[key] = entry
+            self.access[key] = now
+        self.writes += len(items)
+        CACHE_WRITES.inc(len(items))
+        CACHE_ENTRIES.set(len(self.cache))
+        self._save_cache()
+    
+    def compact(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None) -> dict:
+        """
+        压缩缓存：删除过期条目，再按最近访问时间淘汰最旧的条目直到满足容量上限，然后保存
+        
+        Args:
+            max_entries: 最大条目数（默认使用初始化时的设置）
+            max_bytes: 最大字节数（默认使用初始化时的设置）
+            
+        Returns:
+            统计信息（before、expired、evicted、retained、bytes_before、bytes_after）
+        """
+        max_entries = self.max_entries if max_entries is None else max_entries
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        self._merge_access()
+        now = time.time()
+        
+        with profiler.span('cache.compact'):
+            before = len(self.cache)
+            sizes = {key: len(codec.dumps_bytes({key: entry}, compact=True)) - 1
+                     for key, entry in self.cache.items()}
+            bytes_before = sum(sizes.values()) + 1
+            
+            expired = [key for key, entry in self.cache.items() if self._is_expired(entry, now)]
+            for key in expired:
+                del self.cache[key]
+            
+            # 按最近访问时间从旧到新排序，依次淘汰
+            order = sorted(self.cache, key=lambda k: self.cache[k].get('accessed') or self._created_at(self.cache[k]))
+            total_bytes = sum(sizes[key] for key in self.cache) + 1
+            evicted = 0
+            for key in order:
+                over_entries = max_entries is not None and len(self.cache) > max_entries
+                over_bytes = max_bytes is not None and total_bytes > max_bytes
+                if not (over_entries or over_bytes):
+                    break
+                total_bytes -= sizes[key]
+                del self.cache[key]
+                evicted += 1
+        
+        CACHE_ENTRIES.set(len(self.cache))
+        self._save_cache()
+        return {
+            'before': before,
+            'expired': len(expired),
+            'evicted': evicted,
+            'retained': len(self.cache),
+            'bytes_before': bytes_before,
+            'bytes_after': total_bytes,
+        }
+    
+    @staticmethod
+    def _is_valid(entry) -> bool:
+        """条目是否完整（原文 + 译文或失败原因）"""
+        return isinstance(entry, dict) and isinstance(entry.get('original'), str) and (
+            isinstance(entry.get('translated'), str) or isinstance(entry.get('failed'), str))
+    
+    def vacuum(self) -> dict:
+        """
+        清理损坏的条目（缺少原文，或既没有译文也没有失败原因），并修正与原文哈希不一致的键，然后保存
+        
+        Returns:
+            统计信息（removed、rekeyed）
+        """
+        self._merge_access()
+        removed = rekeyed = 0
+        for key in list(self.cache):
+            entry = self.cache[key]
+            if not self._is_valid(entry):
+                del self.cache[key]
+                removed += 1
+                continue
+            expected = self._hash_key(entry['original'])
+            if expected != key:
+                del self.cache[key]
+                self.cache[expected] = entry
+                rekeyed += 1
+        CACHE_ENTRIES.set(len(self.cache))
+        self._save_cache()
+        return {'removed': removed, 'rekeyed': rekeyed}
+    
+    def iter_entries(self):
+        """
+        遍历所有条目（访问时间已合并）
+        
+        Yields:
+            条目字典（original、translated、timestamp 等）
+        """
+        self._merge_access()
+        for entry in self.cache.values():
+            yield entry
+    
+    def merge(self, entries, strategy: str = 'newest', prefer_translator: Optional[str] = None,
+              save: bool = True) -> dict:
+        """
+        合并其他来源的条目
+        
+        Args:
+            entries: 条目可迭代对象（可以是流式读取的生成器）
+            strategy: 冲突规则：'newest' 保留较新的条目，'prefer' 优先保留 prefer_translator 产生的条目
+                      （双方都不是或都是该翻译器时退回 newest），'keep' 保留已有条目；
+                      任何规则下译文都优先于失败条目
+            prefer_translator: strategy 为 'prefer' 时优先的翻译器 ID
+            save: 合并后是否保存
+            
+        Returns:
+            统计信息（added、replaced、kept、invalid）
+        """
+        if strategy not in ('newest', 'prefer', 'keep'):
+            raise ValueError(f"未知的合并规则: {strategy}")
+        stats = {'added': 0, 'replaced': 0, 'kept': 0, 'invalid': 0}
+        for entry in entries:
+            if not self._is_valid(entry):
+                stats['invalid'] += 1
+                continue
+            key = self._hash_key(entry['original'])
+            existing = self.cache.get(key)
+            if existing is None:
+                self.cache[key] = entry
+                stats['added'] += 1
+                continue
+            if ('failed' in entry) != ('failed' in existing):
+                replace = 'failed' in existing
+            elif strategy == 'keep':
+                replace = False
+            else:
+                replace = self._created_at(entry) > self._created_at(existing)
+                if strategy == 'prefer':
+                    incoming_preferred = entry.get('translator') == prefer_translator
+                    existing_preferred = existing.get('translator') == prefer_translator
+                    if incoming_preferred != existing_preferred:
+                        replace = incoming_preferred
+            if replace:
+                self.cache[key] = entry
+                stats['replaced'] += 1
+            else:
+                stats['kept'] += 1
+        CACHE_ENTRIES.set(len(self.cache))
+        if save:
+            self._save_cache()
+        return stats
+    
+    def needs_compaction(self) -> bool:
+        """是否配置了容量上限或过期时间（需要在结束时压缩）"""
+        return self.max_entries is not None or self.max_bytes is not None or any(
+            value is not None for value in self.ttl.values())
+    
+    def save(self) -> None:
+        """立即保存缓存文件"""
+        self._save_cache()
+    
+    def close(self) -> None:
+        """保存内存中的访问时间"""
+        if self.access:
+            self._save_cache()
+    
     def get_stats(self) -> dict:
-        """获取缓存统计信息"""
+        """获取本实例的缓存统计信息"""
+        hits, misses = self.hits, self.misses
         return {
             'total_entries': len(self.cache),
             'cache_file': str(self.cache_file),
-            'cache_size_bytes': self.cache_file.stat().st_size if self.cache_file.exists() else 0
+            'cache_size_bytes': self.cache_file.stat().st_size if self.cache_file.exists() else 0,
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / (hits + misses) if hits + misses else 0.0,
+            'writes': self.writes,
+            'failures': sum(1 for entry in self.cache.values() if 'failed' in entry),
         }
     
     def clear(self) -> None:
         """清空缓存"""
         self.cache = {}
+        self.access = {}
+        CACHE_ENTRIES.set(0)
         self._save_cache()
         print("✅ 缓存已清空")
 
 
+class TieredCache:
+    """
+    两级缓存：进程内有界 LRU 在前，持久化 CacheManager 在后
+    
+    内存层直接以原文字符串为键（Python 字符串哈希会缓存在对象上，重复查询几乎没有开销），
+    不计算 MD5；只有内存层未命中时才查询持久层。
+    写入先进入内存层和待写队列，攒够 write_batch 条后一次性写入持久层（close() 时写出剩余部分）。
+    失败缓存只存放在持久层（同样延迟到 flush() 时保存）。
+    持久层配置了 TTL 时，内存层条目记录过期时间，过期后丢弃并回到持久层查询。
+    各层命中次数在查询时已持有的锁内累计，flush()/get_stats() 时才汇总到指标注册表。
+    """
+    
+    def __init__(self, backend: CacheManager, capacity: int = 1024, write_batch: int = 100):
+        """
+        初始化两级缓存
+        
+        Args:
+            backend: 持久层缓存管理器
+            capacity: 内存层最大条目数
+            write_batch: 累计多少条写入后写透到持久层
+        """
+        self.backend = backend
+        self.capacity = capacity
+        self.write_batch = write_batch
+        # 原文 -> (译文, 过期时间或 None)
+        self.memory = OrderedDict()
+        self.pending = {}
+        # 持久层中是否有尚未保存的失败条目
+        self.unsaved_failures = False
+        self.lock = threading.Lock()
+        # (层, 结果) -> 尚未汇总到指标的次数
+        self.counts = {('memory', 'hit'): 0, ('memory', 'miss'): 0,
+                       ('persistent', 'hit'): 0, ('persistent', 'miss'): 0}
+        # 本实例累计的各层次数（get_stats() 使用，不受其它实例影响）
+        self.totals = dict(self.counts)
+        _open_caches.add(self)
+    
+    def get(self, text: str) -> Optional[str]:
+        """
+        从缓存获取翻译（先查内存层，再查持久层并回填内存层）
+        
+        Args:
+            text: 原文
+            
+        Returns:
+            翻译结果，如果不存在返回 None
+        """
+        with self.lock:
+            translated = None
+            cached = self.memory.get(text)
+            if cached is not None:
+                if cached[1] is not None and time.time() > cached[1]:
+                    # 已过期：丢弃，由持久层按 TTL 判断
+                    del self.memory[text]
+                else:
+                    translated = cached[0]
+                    self.memory.move_to_end(text)
+            elif text in self.pending:
+                # 已被内存层淘汰但尚未写入持久层
+                translated = self.pending[text][1]
+            if translated is not None:
+                self.counts['memory', 'hit'] += 1
+                return translated
+            self.counts['memory', 'miss'] += 1
+        
+        translated = self.backend.get(text)
+        expires = self.backend.expires_at(text) if translated is not None else None
+        with self.lock:
+            if translated is not None:
+                self.counts['persistent', 'hit'] += 1
+                self._remember_locked(text, translated, expires)
+            else:
+                self.counts['persistent', 'miss'] += 1
+        return translated
+    
+    def _publish_counts(self) -> None:
+        """将本地计数汇总到指标注册表"""
+        with self.lock:
+            counts = dict(self.counts)
+            for key in self.counts:
+                self.totals[key] += self.counts[key]
+                self.counts[key] = 0
+        for (tier, result), count in counts.items():
+            if count:
+                CACHE_TIER_LOOKUPS.inc(count, tier=tier, result=result)
+        # 内存层命中不经过持久层，这里补记到总体查询计数
+        if counts['memory', 'hit']:
+            CACHE_LOOKUPS.inc(counts['memory', 'hit'], result='hit')
+    
+    def _remember_locked(self, text: str, translated: str, expires: Optional[float]) -> None:
+        """写入内存层并淘汰最久未用的条目（调用方持有锁）"""
+        self.memory[text] = (translated, expires)
+        self.memory.move_to_end(text)
+        while len(self.memory) > self.capacity:
+            self.memory.popitem(last=False)
+    
+    def set(self, text: str, translated: str, translator: Optional[str] = None) -> None:
+        """
+        保存翻译（内存层立即生效，持久层按批写入）
+        
+        Args:
+            text: 原文
+            translated: 译文
+            translator: 产生译文的翻译器 ID
+        """
+        # 新条目从现在开始计算 TTL
+        ttl = self.backend.ttl.get(translator, self.backend.ttl.get('default'))
+        expires = None if ttl is None else time.time() + ttl
+        with self.lock:
+            self._remember_locked(text, translated, expires)
+            self.pending[text] = (text, translated, translator)
+            full = len(self.pending) >= self.write_batch
+        if full:
+            self.flush()
+    
+    def set_many(self, items: list) -> None:
+        """批量保存翻译（参数同 CacheManager.set_many）"""
+        for text, translated, translator in items:
+            self.set(text, translated, translator)
+    
+    def get_failure(self, text: str) -> Optional[str]:
+        """查询失败缓存（参数同 CacheManager.get_failure）"""
+        return self.backend.get_failure(text)
+    
+    def set_failure(self, text: str, reason: str, translator: Optional[str] = None) -> None:
+        """记录失败（随下一次 flush() 保存，参数同 CacheManager.set_failure）"""
+        with self.lock:
+            if text in self.memory or text in self.pending:
+                return
+            self.unsaved_failures = True
+        self.backend.set_failure(text, reason, translator, save=False)
+    
+    def flush(self) -> None:
+        """将待写条目和失败条目写入持久层"""
+        self._publish_counts()
+        with self.lock:
+            items = list(self.pending.values())
+            self.pending = {}
+            unsaved_failures, self.unsaved_failures = self.unsaved_failures, False
+        if items:
+            self.backend.set_many(items)
+        elif unsaved_failures:
+            self.backend.save()
+    
+    def close(self) -> None:
+        """写出待写条目和访问时间"""
+        self.flush()
+        self.backend.close()
+        _open_caches.discard(self)
+    
+    def compact(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None) -> dict:
+        """写出待写条目后压缩持久层（参数同 CacheManager.compact）"""
+        self.flush()
+        return self.backend.compact(max_entries, max_bytes)
+    
+    def needs_compaction(self) -> bool:
+        """持久层是否需要压缩"""
+        return self.backend.needs_compaction()
+    
+    def clear(self) -> None:
+        """清空两级缓存"""
+        with self.lock:
+            self.memory.clear()
+            self.pending = {}
+        self.backend.clear()
+    
+    def get_stats(self) -> dict:
+        """获取缓存统计信息（包含各层的命中/未命中次数）"""
+        self._publish_counts()
+        stats = self.backend.get_stats()
+        for tier in ('memory', 'persistent'):
+            stats[f'{tier}_hits'] = self.totals[tier, 'hit']
+            stats[f'{tier}_misses'] = self.totals[tier, 'miss']
+        # 内存层命中不经过持久层
+        stats['hits'] += stats['memory_hits']
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = stats['hits'] / lookups if lookups else 0.0
+        stats['memory_entries'] = len(self.memory)
+        stats['pending_writes'] = len(self.pending)
+        return stats
+
+
+# 尚未关闭的两级缓存（弱引用，不会延长缓存的生命周期），进程退出时统一写出
+_open_caches = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_caches() -> None:
+    """进程退出时写出未关闭的两级缓存中的待写条目"""
+    for cache in list(_open_caches):
+        cache.flush()
+
+
+def create_cache(processing: dict):
+    """
+    根据配置创建缓存：processing.cache.memory_entries 大于 0 时在持久层前加内存层
+    
+    Args:
+        processing: 配置中的 processing 部分
+        
+    Returns:
+        CacheManager 或 TieredCache
+    """
+    backend = CacheManager.from_config(processing)
+    options = processing.get('cache', {})
+    capacity = options.get('memory_entries', 1024)
+    if not capacity:
+        return backend
+    return TieredCache(backend, capacity, options.get('write_batch', 100))
+
+
+class _RateEstimator:
+    """指数加权移动平均（EWMA）吞吐量估计，按时间衰减，不受采样间隔不均匀影响"""
+    
+    def __init__(self, time_constant: float = 5.0):
+        """
+        Args:
+            time_constant: 衰减时间常数（秒），越小对速度变化越敏感
+        """
+        self.time_constant = time_constant
+        self.rate = None
+        self.last_time = time.monotonic()
+        self.last_count = 0
+    
+    def sample(self, count: int, now: float) -> Optional[float]:
+        """用当前完成数量更新速率估计，返回当前速率（条/秒）"""
+        dt = now - self.last_time
+        if dt <= 0:
+            return self.rate
+        instant = (count - self.last_count) / dt
+        if self.rate is None:
+            self.rate = instant
+        else:
+            alpha = 1 - math.exp(-dt / self.time_constant)
+            self.rate += alpha * (instant - self.rate)
+        self.last_time = now
+        self.last_count = count
+        return self.rate
+
+
+def _format_eta(rate: Optional[float], remaining: int) -> str:
+    """格式化预计剩余时间"""
+    if remaining <= 0:
+        return "ETA: 0s"
+    if not rate or rate <= 0:
+        return "ETA: N/A"
+    return f"ETA: {int(remaining / rate)}s"
+
+
+class MultiProgress:
+    """
+    多任务进度显示
+    
+    汇总多个并发任务（如 文件 × 语言）的进度到一行显示；重绘频率受 min_interval 限制，
+    吞吐量使用 EWMA 估计（速率限制等待后 ETA 能很快反映真实速度）。
+    stdout 不是终端时改为每隔 log_interval 秒输出一行日志。
+    """
+    
+    def __init__(self, description: str = "处理中", min_interval: float = 0.1,
+                 log_interval: float = 5.0, stream=None):
+        """
+        初始化多任务进度
+        
+        Args:
+            description: 描述文本
+            min_interval: 终端模式下的最短重绘间隔（秒）
+            log_interval: 非终端模式下的日志输出间隔（秒）
+            stream: 输出流（默认 sys.stdout）
+        """
+        self.description = description
+        self.stream = stream or sys.stdout
+        self.is_tty = hasattr(self.stream, 'isatty') and self.stream.isatty()
+        self.min_interval = min_interval if self.is_tty else log_interval
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.estimator = _RateEstimator()
+        self.start_time = datetime.now()
+        self.last_draw = 0.0
+        self.last_state = None
+    
+    def job(self, name: str, total: int) -> 'ProgressTracker':
+        """
+        注册一个任务
+        
+        Args:
+            name: 任务名称（如 "zh.json -> fr"）
+            total: 任务总数
+            
+        Returns:
+            该任务的进度跟踪器
+        """
+        with self.lock:
+            self.jobs[name] = {'current': 0, 'total': total, 'success': None}
+        return ProgressTracker(total, name, parent=self)
+    
+    def _update_job(self, name: str, current: int, success_count: int = None) -> None:
+        with self.lock:
+            job = self.jobs[name]
+            job['current'] = current
+            job['success'] = success_count
+        self.render()
+    
+    def render(self, force: bool = False) -> None:
+        """按节流间隔重绘（force=True 时立即重绘）"""
+        now = time.monotonic()
+        with self.lock:
+            current = sum(job['current'] for job in self.jobs.values())
+            total = sum(job['total'] for job in self.jobs.values())
+            done = current >= total
+            if (current, total) == self.last_state:
+                return
+            if not force and not done and now - self.last_draw < self.min_interval:
+                return
+            self.last_state = (current, total)
+            self.last_draw = now
+            rate = self.estimator.sample(current, now)
+            finished_jobs = sum(1 for job in self.jobs.values() if job['current'] >= job['total'])
+            successes = [job['success'] for job in self.jobs.values() if job['success'] is not None]
+            job_count = len(self.jobs)
+        
+        percentage = (current / total * 100) if total > 0 else 0
+        status = f"{self.description}: "
+        if self.is_tty:
+            bar_length = 30
+            filled = int(bar_length * current / total) if total > 0 else 0
+            status += "[" + "█" * filled + "░" * (bar_length - filled) + "] "
+        status += f"{current}/{total} ({percentage:.1f}%)"
+        if successes:
+            status += f" | 成功: {sum(successes)}"
+        if job_count > 1:
+            status += f" | 任务: {finished_jobs}/{job_count}"
+        if rate:
+            status += f" | {rate:.1f} 条/秒"
+        status += f" | {_format_eta(rate, total - current)}"
+        
+        if self.is_tty:
+            self.stream.write("\r" + status)
+        else:
+            self.stream.write(status + "\n")
+        self.stream.flush()
+    
+    def finish(self) -> None:
+        """完成进度"""
+        self.render(force=True)
+        elapsed = (datetime.now() - self.start_time).total_seconds()
+        print(("\n" if self.is_tty else "") + f"✅ 完成！总耗时: {elapsed:.2f}秒", file=self.stream)
+
+
 class ProgressTracker:
     """进度跟踪器"""
     
-    def __init__(self, total: int, description: str = "处理中"):
+    def __init__(self, total: int, description: str = "处理中", parent: MultiProgress = None, **options):
         """
         初始化进度跟踪器
         
         Args:
             total: 总数
-            description: 描述文本
+            description: 描述文本（作为子任务时为任务名称）
+            parent: 所属的多任务进度（None 时独立显示）
+            **options: 传给 MultiProgress 的显示选项（min_interval、log_interval、stream）
         """
         self.total = total
         self.current = 0
         self.description = description
         self.start_time = datetime.now()
+        self.owns_parent = parent is None
+        if parent is None:
+            parent = MultiProgress(description, **options)
+            parent.jobs[description] = {'current': 0, 'total': total, 'success': None}
+        self.parent = parent
     
     def update(self, current: int, success_count: int = None) -> None:
         """
-        更新进度
+        更新进度（重绘受频率限制，可以每处理一条调用一次）
         
         Args:
             current: 当前进度
             success_count: 成功数量（可选）
         """
         self.current = current
-        percentage = (current / self.total * 100) if self.total > 0 else 0
-        
-        # 计算预计剩余时间
-        elapsed = (datetime.now() - self.start_time).total_seconds()
-        if current > 0:
-            avg_time = elapsed / current
-            remaining = avg_time * (self.total - current)
-            eta = f"ETA: {int(remaining)}s"
-        else:
-            eta = "ETA: N/A"
-        
-        # 显示进度
-        bar_length = 30
-        filled = int(bar_length * current / self.total) if self.total > 0 else 0
-        bar = "█" * filled + "░" * (bar_length - filled)
-        
-        status = f"\r{self.description}: [{bar}] {current}/{self.total} ({percentage:.1f}%)"
-        if success_count is not None:
-            status += f" | 成功: {success_count}"
-        status += f" | {eta}"
-        
-        print(status, end='', flush=True)
-        
-        if current >= self.total:
-            print()  # 换行
+        self.parent._update_job(self.description, current, success_count)
     
     def finish(self) -> None:
         """完成进度"""
-        elapsed = (datetime.now() - self.start_time).total_seconds()
-        print(f"\n✅ 完成！总耗时: {elapsed:.2f}秒")
+        if self.owns_parent:
+            self.parent.finish()
+        else:
+            self.parent._update_job(self.description, self.total, self.parent.jobs[self.description]['success'])
 
 
 class Logger:
-    """简单的日志记录器"""
+    """
+    缓冲日志记录器
     
-    def __init__(self, log_file: Optional[str] = None, level: str = "INFO"):
+    日志记录先放入队列，由后台线程按 flush_interval 批量格式化并写出，
+    日志文件在整个运行期间保持打开。级别过滤在格式化之前完成，
+    被过滤掉的消息不会产生任何格式化开销。
+    """
+    
+    levels = {"DEBUG": 0, "INFO": 1, "WARNING": 2, "ERROR": 3}
+    
+    def __init__(self, log_file: Optional[str] = None, level: str = "INFO",
+                 flush_interval: float = 0.2, json_lines: bool = False,
+                 buffered: bool = True, console: bool = True):
         """
         初始化日志记录器
         
         Args:
             log_file: 日志文件路径（可选）
             level: 日志级别
+            flush_interval: 后台线程的最长刷新间隔（秒）
+            json_lines: 日志文件是否使用 JSON Lines 格式（控制台始终为文本）
+            buffered: 是否使用后台线程写出；False 时同步写出
+            console: 是否输出到控制台
         """
         self.log_file = Path(log_file) if log_file else None
         self.level = level
-        self.levels = {"DEBUG": 0, "INFO": 1, "WARNING": 2, "ERROR": 3}
+        self.threshold = self.levels.get(level, 1)
+        self.flush_interval = flush_interval
+        self.json_lines = json_lines
+        self.buffered = buffered
+        self.console = console
+        
+        self._file = None
+        self._file_failed = False
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closed = False
     
-    def _log(self, level: str, message: str) -> None:
-        """记录日志"""
-        if self.levels.get(level, 1) >= self.levels.get(self.level, 1):
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            log_message = f"[{timestamp}] [{level}] {message}"
-            
-            # 输出到控制台
-            print(log_message)
-            
-            # 输出到文件
-            if self.log_file:
+    def is_enabled_for(self, level: str) -> bool:
+        """判断某个级别的日志是否会被输出"""
+        return self.levels.get(level, 1) >= self.threshold
+    
+    def _log(self, level: str, message: str, *args) -> None:
+        """记录日志（args 不为空时按 % 格式化，且只在通过级别过滤后才格式化）"""
+        if self.levels.get(level, 1) < self.threshold:
+            return
+        record = (time.time(), level, message, args)
+        if not self.buffered or self._closed:
+            self._write([record])
+            return
+        self._ensure_thread()
+        self._queue.put(record)
+    
+    def _ensure_thread(self) -> None:
+        """首次记录日志时启动后台写线程"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name='logger-writer', daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+    
+    def _worker(self) -> None:
+        """后台写线程：攒批后统一写出"""
+        while True:
+            try:
+                record = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [record]
+            deadline = time.monotonic() + self.flush_interval
+            stop = record is None
+            # 尽量把队列中已有的记录一起写出
+            while not stop and time.monotonic() < deadline:
                 try:
-                    with open(self.log_file, 'a', encoding='utf-8') as f:
-                        f.write(log_message + '\n')
-                except Exception as e:
-                    print(f"⚠️  写入日志文件失败: {e}")
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(record)
+                stop = record is None
+            self._write([r for r in batch if r is not None])
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+    
+    def _format(self, record: tuple) -> tuple:
+        """格式化一条记录，返回 (文本行, 文件行)"""
+        created, level, message, args = record
+        if args:
+            try:
+                message = message % args
+            except (TypeError, ValueError):
+                message = f"{message} {args}"
+        timestamp = datetime.fromtimestamp(created).strftime("%Y-%m-%d %H:%M:%S")
+        text_line = f"[{timestamp}] [{level}] {message}"
+        if self.json_lines:
+            file_line = json.dumps({
+                'timestamp': datetime.fromtimestamp(created).isoformat(),
+                'level': level,
+                'message': message,
+            }, ensure_ascii=False)
+        else:
+            file_line = text_line
+        return text_line, file_line
+    
+    def _write(self, records: list) -> None:
+        """写出一批记录"""
+        if not records:
+            return
+        lines = [self._format(record) for record in records]
+        
+        # 输出到控制台
+        if self.console:
+            sys.stdout.write('\n'.join(line[0] for line in lines) + '\n')
+            sys.stdout.flush()
+        
+        # 输出到文件（保持打开，避免每条日志都打开/关闭文件）
+        if self.log_file and not self._file_failed:
+            try:
+                if self._file is None:
+                    self._file = open(self.log_file, 'a', encoding='utf-8')
+                self._file.write('\n'.join(line[1] for line in lines) + '\n')
+                self._file.flush()
+            except Exception as e:
+                self._file_failed = True
+                print(f"⚠️  写入日志文件失败: {e}")
+    
+    def flush(self) -> None:
+        """等待队列中的日志全部写出"""
+        if self._thread is not None and not self._closed:
+            self._queue.join()
+    
+    def close(self) -> None:
+        """写出剩余日志并停止后台线程"""
+        if self._closed:
+            return
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+        self._closed = True
+        if self._file is not None:
+            self._file.close()
+            self._file = None
     
-    def debug(self, message: str) -> None:
+    def debug(self, message: str, *args) -> None:
         """调试日志"""
-        self._log("DEBUG", message)
+        self._log("DEBUG", message, *args)
     
-    def info(self, message: str) -> None:
+    def info(self, message: str, *args) -> None:
         """信息日志"""
-        self._log("INFO", message)
+        self._log("INFO", message, *args)
     
-    def warning(self, message: str) -> None:
+    def warning(self, message: str, *args) -> None:
         """警告日志"""
-        self._log("WARNING", message)
+        self._log("WARNING", message, *args)
     
-    def error(self, message: str) -> None:
+    def error(self, message: str, *args) -> None:
         """错误日志"""
-        self._log("ERROR", message)
+        self._log("ERROR", message, *args)
 
 
 def load_config(config_path: str = "config/config.json") -> dict:
@@ -211,8 +1041,7 @@ def load_config(config_path: str = "config/config.json") -> dict:
         配置字典
     """
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return codec.load(config_path)
     except Exception as e:
         print(f"❌ 加载配置文件失败: {e}")
         return {}
@@ -0,0 +1,385 @@
+"""
+Watcher
+--watch 模式：监视输入文件，保存后只翻译变化的值并更新输出文件。
+
+- Linux 上通过 ctypes 调用 inotify 监视所在目录（编辑器常用"写临时文件再改名"的方式保存，
+  直接监视文件会在改名后失效），其他平台或 inotify 不可用时按间隔比较文件的修改时间和大小
+- 一次保存往往触发多个事件，收到事件后等待一段安静期（debounce）再统一处理
+- 每个输入文件保留上一次的值快照（路径 -> 原文、译文），重新提取后只把原文变化或新增的路径交给翻译器，
+  其余路径直接沿用上一次的译文，然后重建输出文件
+- 译文与原文相同的路径（翻译失败时保留原文）标记为待重试，下次保存时重新交给翻译器
+"""
+
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import select
+import shutil
+import struct
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .rebuilder import JSONRebuilder
+
+# inotify 事件掩码（见 <sys/inotify.h>）
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE
+_EVENT = struct.Struct('iIII')
+
+
+def _signature(path: str) -> Optional[Tuple[int, int]]:
+    """文件的 (修改时间纳秒, 大小)，文件不存在时返回 None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class _Inotify:
+    """通过 ctypes 调用的 inotify"""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError("当前平台不支持 inotify")
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 失败")
+        self.directories = {}
+
+    def add(self, directory: str) -> None:
+        """监视一个目录"""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"无法监视目录: {directory}")
+        self.directories[wd] = directory
+
+    def read(self, timeout: Optional[float]) -> Optional[List[Tuple[str, int]]]:
+        """
+        读取事件
+
+        Returns:
+            [(完整路径, 掩码)]；超时返回空列表；事件队列溢出时返回 None
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                return None
+            directory = self.directories.get(wd)
+            if directory is not None and name:
+                events.append((os.path.join(directory, os.fsdecode(name)), mask))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class FileWatcher:
+    """监视一组文件或目录（目录递归匹配 pattern）"""
+
+    def __init__(self, paths: Iterable[str], pattern: str = '*.json', debounce: float = 0.2,
+                 poll_interval: float = 0.5, backend: str = 'auto', exclude: Iterable[str] = ()):
+        """
+        初始化监视器
+
+        Args:
+            paths: 要监视的文件或目录
+            pattern: 目录中要监视的文件名模式
+            debounce: 最后一个事件之后等待的安静期（秒）
+            poll_interval: 轮询模式下的检查间隔（秒）
+            backend: 'auto'（优先 inotify）、'inotify' 或 'polling'
+            exclude: 不监视的目录（例如位于输入目录之内的输出目录）
+        """
+        self.pattern = pattern
+        self.exclude = [os.path.abspath(path) for path in exclude]
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.files = set()
+        self.roots = []
+        for path in paths:
+            path = os.path.abspath(path)
+            if os.path.isdir(path):
+                self.roots.append(path)
+            else:
+                self.files.add(path)
+        self._inotify = None
+        if backend != 'polling':
+            try:
+                self._inotify = _Inotify()
+                for directory in self._directories():
+                    self._inotify.add(directory)
+            except (OSError, AttributeError):
+                if self._inotify is not None:
+                    self._inotify.close()
+                    self._inotify = None
+                if backend == 'inotify':
+                    raise
+        self.backend = 'inotify' if self._inotify else 'polling'
+        self._signatures = self._scan()
+
+    def _directories(self) -> Set[str]:
+        """需要监视的目录：单个文件的所在目录、目录输入及其全部子目录"""
+        directories = {os.path.dirname(path) for path in self.files}
+        for root in self.roots:
+            directories.add(root)
+            directories.update(str(p) for p in Path(root).rglob('*') if p.is_dir() and not self._excluded(str(p)))
+        return directories
+
+    def _excluded(self, path: str) -> bool:
+        """路径是否位于排除的目录中"""
+        return any(path == root or path.startswith(root + os.sep) for root in self.exclude)
+
+    def _wanted(self, path: str) -> bool:
+        """路径是否属于监视范围"""
+        if path in self.files:
+            return True
+        return fnmatch.fnmatch(os.path.basename(path), self.pattern) and \
+            any(path.startswith(root + os.sep) for root in self.roots) and not self._excluded(path)
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """当前所有被监视文件的签名"""
+        signatures = {}
+        for path in self.files:
+            signature = _signature(path)
+            if signature:
+                signatures[path] = signature
+        for root in self.roots:
+            for path in Path(root).rglob(self.pattern):
+                if self.exclude and self._excluded(str(path)):
+                    continue
+                signature = _signature(str(path))
+                if signature:
+                    signatures[str(path)] = signature
+        return signatures
+
+    def _poll_changes(self) -> Set[str]:
+        """与上一次扫描比较，返回新增、修改或删除的文件"""
+        signatures = self._scan()
+        changed = {path for path, signature in signatures.items() if self._signatures.get(path) != signature}
+        changed.update(set(self._signatures) - set(signatures))
+        self._signatures = signatures
+        return changed
+
+    def _read_inotify(self, timeout: Optional[float]) -> Set[str]:
+        events = self._inotify.read(timeout)
+        if events is None:
+            # 事件队列溢出，退回到全量比较
+            return self._poll_changes()
+        changed = set()
+        for path, mask in events:
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and any(path.startswith(root) for root in self.roots) \
+                        and not self._excluded(path):
+                    self._inotify.add(path)
+                    changed.update(str(p) for p in Path(path).rglob(self.pattern) if not self._excluded(str(p)))
+                continue
+            if self._wanted(path):
+                changed.add(path)
+        return changed
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """
+        等待文件变化（收到变化后继续收集，直到安静 debounce 秒）
+
+        Args:
+            timeout: 最长等待秒数（None 表示一直等待）
+
+        Returns:
+            变化的文件路径（绝对路径）；超时返回空集合
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed = set()
+        while not changed:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return changed
+            if self._inotify:
+                changed = self._read_inotify(remaining)
+            else:
+                time.sleep(self.poll_interval if remaining is None else min(self.poll_interval, remaining))
+                changed = self._poll_changes()
+        # 去抖动：一次保存可能产生多个事件（截断、写入、改名）
+        while True:
+            if self._inotify:
+                more = self._read_inotify(self.debounce)
+                if not more:
+                    break
+            else:
+                time.sleep(self.debounce)
+                more = self._poll_changes()
+                if not more:
+                    break
+            changed.update(more)
+        return changed
+
+    def close(self) -> None:
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+
+
+class WatchSession:
+    """保存每个输入文件的值快照，增量翻译并更新输出"""
+
+    def __init__(self, translator, source_lang: str, target_lang: str,
+                 make_extractor: Callable[[], Any], partial_update: bool = False,
+                 filter_keyword=None, preserve_format: bool = False):
+        """
+        初始化会话
+
+        Args:
+            translator: 翻译器（实现 translate_batch）
+            source_lang: 源语言代码
+            target_lang: 目标语言代码
+            make_extractor: 创建 JSONExtractor 的函数（每次提取使用新的提取器）
+            partial_update: 是否在写回时移除过滤关键词
+            filter_keyword: 过滤关键词
+            preserve_format: 是否保留源文件格式写出
+        """
+        self.translator = translator
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.make_extractor = make_extractor
+        self.partial_update = partial_update
+        self.filter_keyword = filter_keyword
+        self.preserve_format = preserve_format
+        self.outputs = {}
+        # 输入路径 -> {值路径: (原文, 译文)}
+        self.snapshots = {}
+        # 输出路径 -> 写出后的文件签名（输出就是输入时，忽略自己写出引起的变化）
+        self.written = {}
+        # 输入路径 -> (上一次的输入文档, 上一次的输出文档)，用于只有字符串变化时修补输出
+        self.documents = {}
+        # 输入路径 -> 译文与原文相同（可能翻译失败）、下次保存时重试的值路径
+        self.retry = {}
+
+    def add(self, input_path: str, output_path: str) -> None:
+        """登记一个输入文件及其输出路径"""
+        self.outputs[os.path.abspath(input_path)] = output_path
+
+    def update(self, input_path: str) -> Optional[Dict[str, Any]]:
+        """
+        处理一个输入文件：提取、与快照比较、只翻译变化的值并写出
+
+        只有字符串值变化时直接修补上一次的输出文档；结构或非字符串值变化时完整重建。
+
+        Args:
+            input_path: 输入文件（绝对路径）
+
+        Returns:
+            统计 {values, changed, removed, written, patched, seconds}；
+            文件未登记、已删除或只是自己写出的结果时返回 None
+
+        Raises:
+            ValueError / OSError: 文件无法解析（快照保持不变，下次保存时重试）
+        """
+        output_path = self.outputs.get(input_path)
+        if output_path is None or not os.path.exists(input_path):
+            return None
+        if self.written.get(input_path) == _signature(input_path):
+            return None
+        start = time.perf_counter()
+        document, values = self.make_extractor().extract_from_file(input_path)
+        previous = self.snapshots.get(input_path)
+        known = previous or {}
+        retry = self.retry.get(input_path, ())
+        changed = [item for item in values
+                   if item['path'] in retry or known.get(item['path'], (None,))[0] != item['original']]
+        removed = len(set(known) - {item['path'] for item in values})
+        stats = {'values': len(values), 'changed': len(changed), 'removed': removed, 'written': False, 'patched': False}
+
+        last_input, last_output = self.documents.get(input_path, (None, None))
+        patchable = (last_input is not None and document is not None and not removed
+                     and all(item['path'] in known for item in changed)
+                     and self._same_structure(document, last_input, changed, known))
+        if patchable and not changed:
+            stats['seconds'] = time.perf_counter() - start
+            return stats
+
+        if changed:
+            translated = self.translator.translate_batch(changed, self.source_lang, self.target_lang)
+            for item, result in zip(changed, translated):
+                item['translated'] = result.get('translated')
+        for item in values:
+            if item['translated'] is None:
+                # 未变化的值沿用上一次的译文；翻译器没有给出结果的值保留原文
+                last = known.get(item['path'])
+                item['translated'] = last[1] if last is not None and last[0] == item['original'] else item['original']
+        self.snapshots[input_path] = {item['path']: (item['original'], item['translated']) for item in values}
+        # 翻译失败的值保留原文，不能当作已翻译写入快照，否则原文不再变化时永远不会重试
+        self.retry[input_path] = {item['path'] for item in changed if item['translated'] == item['original']}
+        if patchable and all(item['path'] in retry and item['translated'] == item['original'] for item in changed):
+            # 只是重试，结果仍是原文：输出不变
+            stats['seconds'] = time.perf_counter() - start
+            return stats
+
+        if patchable:
+            # 只有字符串变化：修补上一次的输出，省去深拷贝和逐个路径写回
+            rebuilder = JSONRebuilder(None)
+            last_output = rebuilder.patch(last_output, changed, self.partial_update, self.filter_keyword)
+            rebuilder.save_to_file(last_output, output_path, indent=2, ensure_ascii=False)
+            self.documents[input_path] = (document, last_output)
+            stats['patched'] = True
+        else:
+            self._write(input_path, output_path, document, values)
+        self.written[os.path.abspath(output_path)] = _signature(output_path)
+        stats['written'] = True
+        stats['seconds'] = time.perf_counter() - start
+        return stats
+
+    @staticmethod
+    def _same_structure(document: Any, last_document: Any, changed: List[Dict[str, Any]],
+                        known: Dict[str, Tuple[str, str]]) -> bool:
+        """除变化的字符串外，文档是否与上一次完全相同（临时换回旧原文后整体比较）"""
+        if any(not item['path'] for item in changed):
+            # 顶层字符串没有容器可以临时替换，上一次同样是顶层字符串即可修补
+            return isinstance(last_document, str)
+        # 直接按路径写值：临时替换不是重建，不计入重建指标
+        rebuilder = JSONRebuilder(None)
+        for item in changed:
+            rebuilder._set_value_by_path(document, item['path'], known[item['path']][0])
+        try:
+            return document == last_document
+        finally:
+            for item in changed:
+                rebuilder._set_value_by_path(document, item['path'], item['original'])
+
+    def _write(self, input_path: str, output_path: str, document: Any, values: List[Dict[str, Any]]) -> None:
+        """完整重建并写出输出文件"""
+        self.documents.pop(input_path, None)
+        if document is None or (self.filter_keyword and not values):
+            # 过滤模式下没有命中的文件原样复制
+            if os.path.abspath(output_path) != input_path:
+                shutil.copyfile(input_path, output_path)
+        elif self.preserve_format:
+            JSONRebuilder(None).save_preserving_format(input_path, values, output_path,
+                                                       partial_update=self.partial_update,
+                                                       filter_keyword=self.filter_keyword)
+        else:
+            rebuilder = JSONRebuilder(document)
+            result = rebuilder.rebuild(values, partial_update=self.partial_update, filter_keyword=self.filter_keyword)
+            rebuilder.save_to_file(result, output_path, indent=2, ensure_ascii=False)
+            self.documents[input_path] = (document, result)
@@ -0,0 +1,8 @@
+"""
+测试公共设置：把仓库根目录加入导入路径，测试以 ``from src.xxx import ...`` 导入
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,121 @@
+"""
+缓存预热测试：按路径对齐源/目标文件，换算成翻译时实际查询的缓存键，并在翻译时命中
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.aligner import align_values, cache_units, pair_files
+from src.api import build_translator
+from src.normalizer import KeyNormalizer
+from src.segmenter import Segmenter
+from src.utils import CacheManager
+
+ROOT = Path(__file__).resolve().parent.parent
+HELP = "Open a file first. Then press save to keep it. Changes are lost when you close the window."
+HELP_DE = ("Öffnen Sie zuerst eine Datei. Drücken Sie dann Speichern, um sie zu behalten. "
+           "Änderungen gehen beim Schließen des Fensters verloren.")
+
+
+def _values(mapping):
+    return [{'path': path, 'original': text} for path, text in mapping.items()]
+
+
+def test_align_values_pairs_by_path_and_reports_differences():
+    source = _values({'a': 'Save', 'b': 'Open', 'c': 'Close', 'd': 'Same', 'e': 'Empty'})
+    target = _values({'a': 'Speichern', 'b': 'Öffnen', 'd': 'Same', 'e': ' ', 'x': 'Extra'})
+
+    result = align_values(source, target)
+
+    assert result['pairs'] == [('Save', 'Speichern'), ('Open', 'Öffnen')]
+    assert (result['missing'], result['extra'], result['identical'], result['empty']) == (1, 1, 1, 1)
+    assert result['missing_paths'] == ['c'] and result['extra_paths'] == ['x']
+    assert align_values(source, target, include_identical=True)['paired'] == 3
+
+
+def test_pair_files_matches_relative_paths(tmp_path):
+    for name in ('en/a.json', 'en/sub/b.json', 'en/c.json', 'de/a.json', 'de/sub/b.json'):
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text('{}', encoding='utf-8')
+
+    pairs, unmatched = pair_files(str(tmp_path / 'en'), str(tmp_path / 'de'))
+
+    assert pairs == [(str(tmp_path / 'en/a.json'), str(tmp_path / 'de/a.json')),
+                     (str(tmp_path / 'en/sub/b.json'), str(tmp_path / 'de/sub/b.json'))]
+    assert unmatched == [str(tmp_path / 'en/c.json')]
+
+
+def test_cache_units_without_options_is_the_pair():
+    assert cache_units('Save', 'Speichern') == [('Save', 'Speichern')]
+
+
+@pytest.mark.parametrize('text, translation, units', [
+    ('Save.', 'Speichern.', [('save', 'speichern')]),
+    ('SAVE', 'SPEICHERN', [('save', 'speichern')]),
+    ('Save', 'Speichern', [('save', 'speichern')]),
+    ('Close!', 'Schliessen', None),
+    ('SAVE', 'Speichern', None),
+])
+def test_cache_units_follow_normalization(text, translation, units):
+    assert cache_units(text, translation, normalizer=KeyNormalizer(casefold=True)) == units
+
+
+def test_cache_units_pair_sentences_only_when_counts_match():
+    segmenter = Segmenter(min_length=40)
+
+    assert cache_units(HELP, HELP_DE, segmenter=segmenter) == list(zip(segmenter.split(HELP)[0],
+                                                                       segmenter.split(HELP_DE)[0]))
+    assert cache_units(HELP, 'Ein einziger Satz ohne Grenzen', segmenter=segmenter) is None
+
+
+def _seed(config_path, source, target, *options):
+    """运行 cache_tool seed，返回 JSON 报告"""
+    completed = subprocess.run(
+        [sys.executable, str(ROOT / 'scripts' / 'cache_tool.py'), '-c', str(config_path), 'seed',
+         str(source), str(target), '--workers', '0', '--json', *options],
+        capture_output=True, text=True, cwd=ROOT, check=True)
+    return json.loads(completed.stdout[completed.stdout.index('{'):])
+
+
+def test_seeded_entries_are_hit_at_translation_time(tmp_path):
+    source = {'save': 'Save', 'shout': 'SAVE', 'open': 'Open file.', 'help': HELP}
+    target = {'save': 'Speichern', 'shout': 'SPEICHERN', 'open': 'Datei öffnen.', 'help': HELP_DE}
+    (tmp_path / 'en.json').write_text(json.dumps(source), encoding='utf-8')
+    (tmp_path / 'de.json').write_text(json.dumps(target, ensure_ascii=False), encoding='utf-8')
+    config = {
+        'translator': {'type': 'reverse', 'source_lang': 'en', 'target_lang': 'de'},
+        'processing': {'cache_dir': str(tmp_path / 'cache'), 'normalize_keys': {'casefold': True},
+                       'segmentation': {'min_length': 40}},
+    }
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps(config), encoding='utf-8')
+
+    report = _seed(config_path, tmp_path / 'en.json', tmp_path / 'de.json', '--normalize-keys', '--segment')
+    assert report['language_pair'] == 'en:de'
+    assert report['unique_translations'] == 5
+
+    # 反转翻译器对任何未命中的文本都会给出倒序结果；全部命中时输出与目标文件一致
+    translator = build_translator('reverse', config, CacheManager(str(tmp_path / 'cache')),
+                                  normalize_keys=True, segment=True)
+    values = translator.translate_batch(_values(source), 'en', 'de')
+
+    assert {item['path']: item['translated'] for item in values} == target
+
+
+def test_seed_uses_translator_language_pair(tmp_path):
+    pytest.importorskip('requests')
+    (tmp_path / 'en.json').write_text(json.dumps({'a': 'Hello'}), encoding='utf-8')
+    (tmp_path / 'tlh.json').write_text(json.dumps({'a': 'nuqneH'}), encoding='utf-8')
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps({'processing': {'cache_dir': str(tmp_path / 'cache')}}), encoding='utf-8')
+
+    report = _seed(config_path, tmp_path / 'en.json', tmp_path / 'tlh.json', '--translator', 'klingon',
+                   '--source-lang', 'en', '--target-lang', 'tlh')
+
+    # KlingonTranslator 忽略语言参数，查询时固定使用 auto:klingon
+    assert report['language_pair'] == 'auto:klingon'
+    assert CacheManager(str(tmp_path / 'cache')).get('klingon@1|auto:klingon:Hello') == 'nuqneH'
@@ -0,0 +1,186 @@
+"""
+进程内 API 与常驻服务测试：TranslationSession 和 TranslationService 对同样的文档（包括顶层字符串）给出相同结果
+"""
+
+import json
+import threading
+
+import pytest
+
+from src.api import TranslationSession, translate_document
+from src.service import ServiceClient, ServiceError, TranslationService, config_fingerprint, serve
+from src.translators.reverse_translator import ReverseTranslator
+
+CONFIG = {
+    'translator': {'type': 'reverse', 'source_lang': 'en', 'target_lang': 'zh'},
+    'processing': {'use_cache': False},
+}
+
+DOCUMENT = {'app': {'name': 'Save', 'version': 1}, 'messages': ['Open', 'Save', '%T% Close']}
+TRANSLATED = {'app': {'name': 'evaS', 'version': 1}, 'messages': ['nepO', 'evaS', 'esolC %T%']}
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """记录 ReverseTranslator 实际翻译的原文"""
+    recorded = []
+    translate = ReverseTranslator.translate
+
+    def recording(self, text, source_lang='auto', target_lang='en'):
+        recorded.append(text)
+        return translate(self, text, source_lang, target_lang)
+
+    monkeypatch.setattr(ReverseTranslator, 'translate', recording)
+    return recorded
+
+
+@pytest.fixture
+def session():
+    with TranslationSession(CONFIG) as session:
+        yield session
+
+
+@pytest.fixture
+def service():
+    service = TranslationService(CONFIG)
+    yield service
+    service.close()
+
+
+def test_translate_returns_new_document(session):
+    result = session.translate(DOCUMENT)
+
+    assert result == TRANSLATED
+    assert DOCUMENT['app']['name'] == 'Save'
+
+
+def test_translate_in_place_modifies_document(session):
+    document = json.loads(json.dumps(DOCUMENT))
+
+    result = session.translate(document, in_place=True)
+
+    assert result is document
+    assert document == TRANSLATED
+
+
+@pytest.mark.parametrize('in_place', [False, True])
+def test_translate_top_level_string(session, in_place):
+    assert session.translate('Hello', in_place=in_place) == 'olleH'
+
+
+def test_translate_many_keeps_order_and_deduplicates(session, calls):
+    documents = (document for document in [{'a': 'Save'}, 'Open', ['Save', 'Close'], {'n': 1}, 'Open'])
+
+    results = list(session.translate_many(documents, batch_documents=2))
+
+    assert results == [{'a': 'evaS'}, 'nepO', ['evaS', 'esolC'], {'n': 1}, 'nepO']
+    # 每批内相同的原文只翻译一次
+    assert calls == ['Save', 'Open', 'Save', 'Close', 'Open']
+
+
+def test_filter_keyword_and_selectors(session):
+    assert session.translate(DOCUMENT, filter_keyword='%T%', remove_keyword=True)['messages'] == \
+        ['Open', 'Save', 'esolC']
+    unmatched = {'a': 'Save'}
+    assert session.translate(unmatched, filter_keyword='%TODO') is unmatched
+    assert session.translate(DOCUMENT, include=['messages[0]']) == \
+        {'app': {'name': 'Save', 'version': 1}, 'messages': ['nepO', 'Save', '%T% Close']}
+    with pytest.raises(ValueError):
+        session.translate(DOCUMENT, include=['a['])
+
+
+def test_translate_texts(session):
+    assert session.translate_texts(['Save', '', 'Save']) == ['evaS', '', 'evaS']
+
+
+def test_translate_document_with_cache(tmp_path, calls):
+    config = dict(CONFIG, processing={'use_cache': True, 'cache_dir': str(tmp_path)})
+
+    assert translate_document({'a': 'Save'}, config) == {'a': 'evaS'}
+    assert translate_document({'b': 'Save'}, config) == {'b': 'evaS'}
+    assert calls == ['Save']
+
+
+def test_service_document_mode_matches_session(service, session):
+    response = service.handle({'document': DOCUMENT})
+
+    assert response == {'document': TRANSLATED, 'values': 4, 'translated': 4}
+    assert response['document'] == session.translate(DOCUMENT)
+
+
+def test_service_translates_top_level_string(service, session):
+    response = service.handle({'document': 'Hello'})
+
+    assert response == {'document': 'olleH', 'values': 1, 'translated': 1}
+    assert response['document'] == session.translate('Hello')
+
+
+def test_service_file_mode(service, tmp_path):
+    input_path = tmp_path / 'en.json'
+    output_path = tmp_path / 'zh.json'
+    input_path.write_text(json.dumps(DOCUMENT), encoding='utf-8')
+
+    response = service.handle({'input': str(input_path), 'output': str(output_path)})
+
+    assert response == {'output': str(output_path), 'values': 4, 'translated': 4}
+    assert json.loads(output_path.read_text(encoding='utf-8')) == TRANSLATED
+
+
+@pytest.mark.parametrize('request_body, status', [
+    ({'document': 'Hello', 'config_fingerprint': 'other'}, 409),
+    ({}, 400),
+    ({'input': 'missing.json'}, 400),
+    ({'document': {}, 'include': ['a[']}, 400),
+])
+def test_service_rejects_invalid_requests(service, request_body, status):
+    with pytest.raises(ServiceError) as excinfo:
+        service.handle(request_body)
+
+    assert excinfo.value.status == status
+
+
+def test_service_fingerprint_treats_missing_use_cache_as_enabled():
+    assert config_fingerprint({'processing': {}}) == config_fingerprint({'processing': {'use_cache': True}})
+    assert config_fingerprint({'processing': {}}) != config_fingerprint({'processing': {'use_cache': False}})
+    assert config_fingerprint(dict(CONFIG, logging={'level': 'DEBUG'})) == config_fingerprint(CONFIG)
+
+
+def test_service_health(tmp_path):
+    service = TranslationService(dict(CONFIG, processing={'use_cache': True, 'cache_dir': str(tmp_path)}))
+    try:
+        service.handle({'document': 'Save'})
+        service.handle({'document': ['Save']})
+        # 常驻服务批量写入持久层，写出后才计入条目数
+        service.flush()
+        health = service.health()
+    finally:
+        service.close()
+
+    assert health['status'] == 'ok'
+    assert health['requests'] == 2
+    assert health['translators'] == ['reverse']
+    assert health['cache'] == {'entries': 1, 'hits': 1, 'misses': 1}
+    assert set(health) == {'status', 'pid', 'uptime', 'requests', 'translators', 'cache'}
+
+
+def test_service_over_unix_socket(tmp_path):
+    service = TranslationService(CONFIG)
+    ready = threading.Event()
+    address = f"unix:{tmp_path / 'service.sock'}"
+    token_file = tmp_path / '.service-token'
+    thread = threading.Thread(target=serve, args=(service, address, token_file),
+                              kwargs={'flush_interval': 0, 'ready': ready}, daemon=True)
+    thread.start()
+    assert ready.wait(5)
+    client = ServiceClient(address, token_file.read_text(encoding='utf-8'), timeout=10)
+    try:
+        fingerprint = config_fingerprint(CONFIG)
+        assert client.translate({'document': 'Hello', 'config_fingerprint': fingerprint})['document'] == 'olleH'
+        assert client.translate({'document': DOCUMENT})['document'] == TRANSLATED
+        assert client.health()['requests'] == 2
+        client.shutdown()
+    finally:
+        client.close()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert not token_file.exists()
@@ -0,0 +1,124 @@
+"""
+翻译器基类测试：按翻译器和版本划分的缓存键命名空间、失败缓存
+"""
+
+import time
+from datetime import datetime
+
+import pytest
+
+from src.translators.base_translator import BaseTranslator, cache_namespace, make_cache_key
+from src.utils import CacheManager
+
+
+class ScriptedTranslator(BaseTranslator):
+    """按脚本返回结果的测试翻译器：errors 中的文本失败并设置对应的 last_error"""
+
+    translator_id = 'scripted'
+
+    def __init__(self, config, cache_manager=None, errors=None):
+        super().__init__(config, cache_manager)
+        self.errors = errors or {}
+        self.calls = []
+
+    def translate(self, text, source_lang='auto', target_lang='en'):
+        self.calls.append(text)
+        if text in self.errors:
+            self.last_error = self.errors[text]
+            return None
+        return text.upper()
+
+    @staticmethod
+    def get_supported_languages():
+        return {'en': 'English'}
+
+
+def _values(*texts):
+    return [{'path': f"[{index}]", 'original': text} for index, text in enumerate(texts)]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CacheManager(str(tmp_path / 'cache'), negative_ttl=60)
+
+
+def test_namespace_uses_translator_and_version():
+    assert cache_namespace('google', {}) == 'google@1'
+    assert cache_namespace('google', {'processing': {'cache': {'version': '2'}}}) == 'google@2'
+    config = {'processing': {'cache': {'version': {'libre': 'v3', 'default': '7'}}}}
+    assert cache_namespace('libre', config) == 'libre@v3'
+    assert cache_namespace('google', config) == 'google@7'
+
+
+def test_cache_key_round_trips_through_describe_key():
+    key = make_cache_key('google@2', 'Hello: world', 'en', 'zh-cn')
+
+    assert key == 'google@2|en:zh-cn:Hello: world'
+    assert CacheManager.describe_key(key) == {'translator': 'google', 'version': '2', 'source': 'en',
+                                             'target': 'zh-cn', 'text': 'Hello: world'}
+
+
+def test_version_bump_invalidates_cached_translations(cache):
+    ScriptedTranslator({}, cache).translate_batch(_values('Hello'), 'en', 'de')
+    bumped = ScriptedTranslator({'processing': {'cache': {'version': '2'}}}, cache)
+
+    bumped.translate_batch(_values('Hello'), 'en', 'de')
+
+    assert bumped.calls == ['Hello']
+
+
+def test_cached_translation_is_not_requested_again(cache):
+    ScriptedTranslator({}, cache).translate_batch(_values('Hello'), 'en', 'de')
+    translator = ScriptedTranslator({}, cache)
+
+    values = translator.translate_batch(_values('Hello'), 'en', 'de')
+
+    assert values[0]['translated'] == 'HELLO'
+    assert translator.calls == []
+
+
+@pytest.mark.parametrize('reason', ['permanent', 'timeout'])
+def test_permanent_failures_are_cached(cache, reason):
+    ScriptedTranslator({}, cache, errors={'Bad': reason}).translate_batch(_values('Bad', 'Good'), 'en', 'de')
+    translator = ScriptedTranslator({}, cache)
+
+    values = translator.translate_batch(_values('Bad', 'Good'), 'en', 'de')
+
+    # 近期确认失败的文本保留原文，不再请求
+    assert [item['translated'] for item in values] == ['Bad', 'GOOD']
+    assert translator.calls == []
+    assert cache.get_failure(translator._cache_key('Bad', 'en', 'de')) == reason
+
+
+def test_transient_failures_are_retried_next_run(cache):
+    ScriptedTranslator({}, cache, errors={'Flaky': 'transient'}).translate_batch(_values('Flaky'), 'en', 'de')
+    translator = ScriptedTranslator({}, cache)
+
+    values = translator.translate_batch(_values('Flaky'), 'en', 'de')
+
+    assert values[0]['translated'] == 'FLAKY'
+    assert translator.calls == ['Flaky']
+
+
+def test_failure_entries_expire(cache):
+    key = make_cache_key('scripted@1', 'Bad', 'en', 'de')
+    cache.set_failure(key, 'permanent', translator='scripted')
+    cache.cache[cache._hash_key(key)]['timestamp'] = datetime.fromtimestamp(time.time() - 120).isoformat()
+
+    assert cache.get_failure(key) is None
+    assert cache.get_stats()['failures'] == 0
+
+
+def test_failure_never_overwrites_translation(cache):
+    cache.set('key', 'value')
+    cache.set_failure('key', 'permanent')
+
+    assert cache.get('key') == 'value'
+    assert cache.get_failure('key') is None
+
+
+def test_negative_cache_can_be_disabled(tmp_path):
+    cache = CacheManager(str(tmp_path / 'cache'), negative_ttl=0)
+    cache.set_failure('key', 'permanent')
+
+    assert cache.get_failure('key') is None
@@ -0,0 +1,72 @@
+"""
+BatchProcessor 测试：目录任务收集和多文件处理
+"""
+
+import json
+
+import pytest
+
+from src.batch import BatchProcessor, collect_jobs, nested_output
+
+
+class UpperTranslator:
+    """把值转为大写的测试翻译器"""
+
+    def translate_batch(self, values, source_lang='auto', target_lang='en', progress_callback=None):
+        for item in values:
+            item['translated'] = item['original'].upper()
+        return values
+
+
+@pytest.fixture
+def input_dir(tmp_path):
+    root = tmp_path / 'in'
+    (root / 'sub').mkdir(parents=True)
+    (root / 'a.json').write_text(json.dumps({'title': 'Hello', 'count': 1}), encoding='utf-8')
+    (root / 'sub' / 'b.json').write_text(json.dumps(['Open', {'label': 'Save'}]), encoding='utf-8')
+    return root
+
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_collect_jobs_keeps_relative_layout(input_dir, tmp_path):
+    jobs = collect_jobs(str(input_dir), str(tmp_path / 'out'))
+
+    assert jobs == [(str(input_dir / 'a.json'), str(tmp_path / 'out' / 'a.json')),
+                    (str(input_dir / 'sub' / 'b.json'), str(tmp_path / 'out' / 'sub' / 'b.json'))]
+
+
+def test_collect_jobs_skips_nested_output(input_dir):
+    output_dir = input_dir / 'out'
+    (output_dir).mkdir()
+    (output_dir / 'a.json').write_text('{}', encoding='utf-8')
+
+    jobs = collect_jobs(str(input_dir), str(output_dir))
+
+    assert nested_output(str(input_dir), str(output_dir)) == output_dir.resolve()
+    assert [input_path for input_path, _ in jobs] == [str(input_dir / 'a.json'), str(input_dir / 'sub' / 'b.json')]
+    assert nested_output(str(input_dir), str(input_dir)) is None
+
+
+@pytest.mark.parametrize('preserve_format', [False, True])
+def test_process_translates_every_file(input_dir, tmp_path, preserve_format):
+    jobs = collect_jobs(str(input_dir), str(tmp_path / 'out'))
+
+    results = BatchProcessor(UpperTranslator(), workers=0, preserve_format=preserve_format).process(jobs)
+
+    assert [result['values'] for result in results] == [1, 2]
+    assert _read(tmp_path / 'out' / 'a.json') == {'title': 'HELLO', 'count': 1}
+    assert _read(tmp_path / 'out' / 'sub' / 'b.json') == ['OPEN', {'label': 'SAVE'}]
+
+
+@pytest.mark.parametrize('preserve_format', [False, True])
+def test_process_without_translator_writes_values_back(input_dir, tmp_path, preserve_format):
+    jobs = collect_jobs(str(input_dir), str(tmp_path / 'out'))
+
+    BatchProcessor(workers=0, preserve_format=preserve_format).process(jobs)
+
+    assert _read(tmp_path / 'out' / 'a.json') == {'title': 'Hello', 'count': 1}
+    assert _read(tmp_path / 'out' / 'sub' / 'b.json') == ['Open', {'label': 'Save'}]
@@ -0,0 +1,123 @@
+"""
+缓存测试：容量上限下的 LRU 淘汰、按翻译器的 TTL 和两级缓存
+"""
+
+import time
+from datetime import datetime
+
+import pytest
+
+from src.utils import CacheManager, TieredCache, create_cache
+
+
+def _age(cache, text, seconds, accessed=None):
+    """把条目的创建时间（和最近访问时间）往前推 seconds 秒"""
+    entry = cache.cache[cache._hash_key(text)]
+    entry['timestamp'] = datetime.fromtimestamp(time.time() - seconds).isoformat()
+    if accessed is not None:
+        cache.access.pop(cache._hash_key(text), None)
+        entry['accessed'] = time.time() - accessed
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CacheManager(str(tmp_path / 'cache'))
+
+
+def test_set_and_get_persist_across_instances(cache, tmp_path):
+    cache.set('Hello', 'Hallo', translator='google')
+
+    reloaded = CacheManager(str(tmp_path / 'cache'))
+
+    assert reloaded.get('Hello') == 'Hallo'
+    assert reloaded.get('Bye') is None
+    assert reloaded.get_stats()['hits'] == 1
+    assert reloaded.get_stats()['misses'] == 1
+
+
+def test_compact_evicts_least_recently_used(cache):
+    cache.set_many([(text, text.upper(), 'google') for text in ('a', 'b', 'c')])
+    _age(cache, 'a', 30, accessed=1)
+    _age(cache, 'b', 30, accessed=20)
+    _age(cache, 'c', 30, accessed=10)
+
+    result = cache.compact(max_entries=2)
+
+    assert result['evicted'] == 1
+    assert result['retained'] == 2
+    assert cache.get('b') is None
+    assert cache.get('a') == 'A' and cache.get('c') == 'C'
+
+
+def test_compact_respects_byte_limit(cache):
+    cache.set_many([(f"text {index}", 'x' * 100, None) for index in range(10)])
+
+    result = cache.compact(max_bytes=600)
+
+    assert result['bytes_after'] <= 600
+    assert result['evicted'] > 0
+    assert result['retained'] + result['evicted'] == 10
+
+
+def test_ttl_is_per_translator(tmp_path):
+    cache = CacheManager(str(tmp_path / 'cache'), ttl={'google': 60, 'default': None})
+    cache.set('Hello', 'Hallo', translator='google')
+    cache.set('World', 'Welt', translator='libre')
+    _age(cache, 'Hello', 120)
+    _age(cache, 'World', 120)
+
+    assert cache.get('Hello') is None
+    assert cache.get('World') == 'Welt'
+    assert cache.compact()['expired'] == 1
+    assert cache.get_stats()['total_entries'] == 1
+
+
+def test_needs_compaction_only_with_limits(tmp_path):
+    assert not CacheManager(str(tmp_path / 'a')).needs_compaction()
+    assert CacheManager(str(tmp_path / 'b'), max_entries=10).needs_compaction()
+    assert CacheManager(str(tmp_path / 'c'), ttl={'default': 60}).needs_compaction()
+
+
+def test_tiered_cache_evicts_memory_lru_and_writes_in_batches(tmp_path):
+    backend = CacheManager(str(tmp_path / 'cache'))
+    tiered = TieredCache(backend, capacity=2, write_batch=3)
+    tiered.set('a', 'A')
+    tiered.set('b', 'B')
+    tiered.get('a')
+    tiered.set('c', 'C')
+
+    assert list(tiered.memory) == ['a', 'c']
+    # 第三次写入攒够一批，写透到持久层
+    assert backend.get('b') == 'B'
+    assert tiered.get('b') == 'B'
+    stats = tiered.get_stats()
+    assert stats['memory_hits'] == 1 and stats['persistent_hits'] == 1
+
+
+def test_tiered_cache_applies_ttl_in_memory(tmp_path):
+    backend = CacheManager(str(tmp_path / 'cache'), ttl={'default': 60})
+    tiered = TieredCache(backend, capacity=10, write_batch=1)
+    tiered.set('Hello', 'Hallo', translator='google')
+    assert tiered.get('Hello') == 'Hallo'
+
+    # 内存层条目过期，持久层同样过期
+    tiered.memory['Hello'] = ('Hallo', time.time() - 1)
+    _age(backend, 'Hello', 120)
+
+    assert tiered.get('Hello') is None
+    assert 'Hello' not in tiered.memory
+
+
+def test_tiered_cache_close_flushes_pending(tmp_path):
+    tiered = TieredCache(CacheManager(str(tmp_path / 'cache')), capacity=10, write_batch=100)
+    tiered.set('Hello', 'Hallo')
+    tiered.close()
+
+    assert CacheManager(str(tmp_path / 'cache')).get('Hello') == 'Hallo'
+
+
+def test_create_cache_picks_tier_from_config(tmp_path):
+    processing = {'cache_dir': str(tmp_path / 'cache')}
+
+    assert isinstance(create_cache(processing), TieredCache)
+    assert isinstance(create_cache(dict(processing, cache={'memory_entries': 0})), CacheManager)
@@ -0,0 +1,55 @@
+"""
+codec 测试：各后端的格式化输出与标准库 json 逐字节一致
+"""
+
+import json
+
+import pytest
+
+from src import codec
+
+DOCUMENTS = {
+    'non_finite': {'ratio': float('nan'), 'big': float('inf'), 'small': float('-inf'), 'none': None},
+    'floats': [0.1, -0.0, 1e-07, 1e22],
+    'big_int': 2 ** 70,
+    'text': {'greeting': 'Hello "world" / é 😀', 'empty': [{}, []]},
+}
+
+
+def _backends():
+    names = []
+    for name in codec.BACKENDS:
+        try:
+            codec.set_backend(name)
+            names.append(name)
+        except ImportError:
+            pass
+    codec.set_backend()
+    return names
+
+
+@pytest.fixture(params=_backends())
+def backend(request):
+    codec.set_backend(request.param)
+    yield request.param
+    codec.set_backend()
+
+
+@pytest.mark.parametrize('name', DOCUMENTS)
+def test_pretty_output_matches_stdlib(backend, name):
+    document = DOCUMENTS[name]
+
+    assert codec.dumps_bytes(document) == json.dumps(document, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+@pytest.mark.parametrize('name', DOCUMENTS)
+def test_compact_output_round_trips(backend, name):
+    document = DOCUMENTS[name]
+
+    assert json.dumps(codec.loads(codec.dumps_bytes(document, compact=True))) == json.dumps(document)
+
+
+def test_non_finite_values_survive_load_and_dump(backend):
+    text = '{"ratio": NaN, "big": Infinity}'
+
+    assert codec.dumps(codec.loads(text)) == '{\n  "ratio": NaN,\n  "big": Infinity\n}'
@@ -0,0 +1,134 @@
+"""
+交换文件测试：JSON Lines 导出 / 导入往返、部分与乱序导入、旧的 "~" 纯文本格式
+"""
+
+import json
+
+import pytest
+
+from src.exchange import detect_format, export_jsonl, export_text, import_jsonl, import_text
+from src.extractor import JSONExtractor
+from src.rebuilder import JSONRebuilder
+
+DOCUMENT = {
+    "app": {"name": "My App", "description": "Line one\nLine two"},
+    "messages": ["Hello", "Wörld", ""],
+}
+
+
+def _values():
+    return JSONExtractor().extract_from_object(DOCUMENT)
+
+
+def _write_records(path, records):
+    path.write_text(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records),
+                    encoding='utf-8')
+
+
+def test_export_writes_one_record_per_value(tmp_path):
+    path = tmp_path / 'strings.jsonl'
+
+    count = export_jsonl(_values(), str(path))
+
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert count == len(lines) == 5
+    assert json.loads(lines[1]) == {'id': 'app.description', 'source': 'Line one\nLine two', 'translation': ''}
+    assert 'Wörld' in lines[3]
+
+
+def test_round_trip_rebuilds_translated_document(tmp_path):
+    path = tmp_path / 'strings.jsonl'
+    export_jsonl(_values(), str(path))
+    records = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    for record in records:
+        record['translation'] = record['source'].upper()
+    _write_records(path, records)
+
+    values = _values()
+    stats = import_jsonl(values, str(path))
+
+    assert stats['applied'] == 4
+    assert stats['empty'] == 1
+    # 与 main.py 一致：只重建导入了译文的值
+    rebuilt = JSONRebuilder(DOCUMENT).rebuild([item for item in values if item['translated'] is not None])
+    assert rebuilt['app']['description'] == 'LINE ONE\nLINE TWO'
+    assert rebuilt['messages'] == ['HELLO', 'WÖRLD', '']
+
+
+def test_partial_out_of_order_import(tmp_path):
+    path = tmp_path / 'batch.jsonl'
+    _write_records(path, [
+        {'id': 'messages[1]', 'source': 'Wörld', 'translation': 'Welt'},
+        {'id': 'app.name', 'source': 'My App', 'translation': 'Meine App'},
+    ])
+
+    values = _values()
+    stats = import_jsonl(values, str(path))
+
+    assert stats['records'] == stats['applied'] == 2
+    translated = {item['path']: item.get('translated') for item in values}
+    assert translated['app.name'] == 'Meine App'
+    assert translated['messages[1]'] == 'Welt'
+    assert translated['messages[0]'] is None
+
+
+def test_import_reports_unknown_stale_duplicate_and_invalid(tmp_path):
+    path = tmp_path / 'batch.jsonl'
+    path.write_text('\n'.join([
+        json.dumps({'id': 'missing.path', 'translation': 'x'}),
+        json.dumps({'id': 'app.name', 'source': 'Old App', 'translation': 'Alte App'}),
+        json.dumps({'id': 'messages[0]', 'translation': 'Hallo'}),
+        json.dumps({'id': 'messages[0]', 'translation': 'Servus'}),
+        '{not json',
+        json.dumps({'translation': 'no id'}),
+        '',
+    ]), encoding='utf-8')
+
+    values = _values()
+    stats = import_jsonl(values, str(path))
+
+    assert stats['records'] == 4
+    assert stats['applied'] == 1
+    assert stats['duplicates'] == 1
+    assert stats['unknown_ids'] == ['missing.path']
+    assert stats['stale_ids'] == ['app.name']
+    assert stats['invalid'] == 2
+    assert [error.split(':')[0] for error in stats['errors']] == ['第 5 行', '第 6 行']
+    translated = {item['path']: item.get('translated') for item in values}
+    assert translated['messages[0]'] == 'Servus'
+    assert translated['app.name'] is None
+
+
+def test_text_format_round_trip(tmp_path):
+    path = tmp_path / 'strings.txt'
+    export_text(_values(), str(path))
+    content = path.read_text(encoding='utf-8')
+    assert content.count('~\n') == 5
+
+    # 译文被合并成一行时仍按分隔符还原，值内部的换行保留
+    path.write_text(content.replace('Hello', 'Hallo').replace('~\n', '~'), encoding='utf-8')
+    values = _values()
+
+    assert import_text(values, str(path)) == 5
+    assert [item['translated'] for item in values] == ['My App', 'Line one\nLine two', 'Hallo', 'Wörld', '']
+
+
+def test_text_format_rejects_count_mismatch(tmp_path):
+    path = tmp_path / 'strings.txt'
+    path.write_text('one~\ntwo~\n', encoding='utf-8')
+
+    with pytest.raises(ValueError):
+        import_text(_values(), str(path))
+
+
+def test_detect_format(tmp_path):
+    jsonl = tmp_path / 'a.jsonl'
+    export_jsonl(_values(), str(jsonl))
+    text = tmp_path / 'a.txt'
+    export_text(_values(), str(text))
+    braces = tmp_path / 'b.txt'
+    braces.write_text('\n{ not json~\n', encoding='utf-8')
+
+    assert detect_format(str(jsonl)) == 'jsonl'
+    assert detect_format(str(text)) == 'text'
+    assert detect_format(str(braces)) == 'text'
@@ -0,0 +1,79 @@
+"""
+KeywordFilter 测试：多关键词匹配、只移除命中的关键词，以及原始字节预过滤
+"""
+
+import json
+
+import pytest
+
+from src.extractor import JSONExtractor
+from src.keywords import KeywordFilter
+from src.rebuilder import JSONRebuilder
+
+
+def test_longer_keywords_win_over_substrings():
+    keyword_filter = KeywordFilter(['TODO', '%TODO', '[untranslated]'])
+
+    assert keyword_filter.keywords[0] == '[untranslated]'
+    assert keyword_filter.find('%TODO Save') == ['%TODO']
+    assert keyword_filter.find('TODO Save') == ['TODO']
+
+
+def test_find_returns_each_hit_once_in_order():
+    keyword_filter = KeywordFilter(['%TODO', '%FIXME'])
+
+    assert keyword_filter.find('%FIXME a %TODO b %FIXME') == ['%FIXME', '%TODO']
+    assert keyword_filter.find('nothing here') == []
+
+
+def test_strip_removes_only_given_keywords():
+    keyword_filter = KeywordFilter(['%TODO', '%FIXME'])
+
+    assert keyword_filter.strip(' %TODO Save %FIXME ') == 'Save'
+    assert keyword_filter.strip('%TODO Save %FIXME', ['%TODO']) == 'Save %FIXME'
+
+
+def test_create_accepts_strings_lists_and_filters():
+    existing = KeywordFilter('%TODO')
+
+    assert KeywordFilter.create(None) is None
+    assert KeywordFilter.create(['', '']) is None
+    assert KeywordFilter.create(existing) is existing
+    assert KeywordFilter.create('%TODO').keywords == ['%TODO']
+    with pytest.raises(ValueError):
+        KeywordFilter([''])
+
+
+@pytest.mark.parametrize('keyword, can_prefilter', [
+    ('%TODO', True),
+    ('[untranslated]', True),
+    ('say "hi"', False),
+    ('a/b', False),
+    ('待翻译', False),
+])
+def test_prefilter_disabled_for_keywords_json_may_escape(keyword, can_prefilter):
+    keyword_filter = KeywordFilter(keyword)
+
+    assert keyword_filter.can_prefilter is can_prefilter
+    assert keyword_filter.may_match(b'{"a": "plain"}') is not can_prefilter
+
+
+def test_extractor_records_hits_per_value(tmp_path):
+    path = tmp_path / 'in.json'
+    path.write_text(json.dumps({'a': '%TODO Save', 'b': 'Open', 'c': ['%FIXME Close %TODO']}), encoding='utf-8')
+
+    document, values = JSONExtractor(filter_keyword=['%TODO', '%FIXME'], prefilter=True).extract_from_file(str(path))
+
+    assert [(item['path'], item['keywords']) for item in values] == [('a', ['%TODO']), ('c[0]', ['%FIXME', '%TODO'])]
+    for item in values:
+        item['translated'] = item['original'].upper()
+    result = JSONRebuilder(document).rebuild(values, partial_update=True)
+    assert result == {'a': 'SAVE', 'b': 'Open', 'c': ['CLOSE']}
+
+
+def test_prefilter_skips_files_without_keywords(tmp_path):
+    path = tmp_path / 'in.json'
+    path.write_text(json.dumps({'a': 'Save'}), encoding='utf-8')
+
+    assert JSONExtractor(filter_keyword='%TODO', prefilter=True).extract_from_file(str(path)) == (None, [])
+    assert JSONExtractor(filter_keyword='%TODO').extract_from_file(str(path)) == ({'a': 'Save'}, [])
@@ -0,0 +1,86 @@
+"""
+KeyNormalizer 测试：NFC、首尾标点和空白、大小写折叠，以及批次内去重
+"""
+
+import unicodedata
+
+import pytest
+
+from src.normalizer import KeyNormalizer, NormalizedTranslator
+
+
+class RecordingTranslator:
+    """记录收到的文本并返回 "<原文>" 的测试翻译器"""
+
+    def __init__(self):
+        self.requests = []
+
+    def translate_batch(self, values, source_lang='auto', target_lang='en', progress_callback=None):
+        for item in values:
+            self.requests.append(item['original'])
+            item['translated'] = f"<{item['original']}>"
+        return values
+
+
+def _translate(normalizer, *texts):
+    translator = RecordingTranslator()
+    values = [{'path': f"[{index}]", 'original': text} for index, text in enumerate(texts)]
+    NormalizedTranslator(translator, normalizer).translate_batch(values, 'en', 'de')
+    return [item['translated'] for item in values], translator.requests
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('Save', ('', 'Save', '', None)),
+    ('  Save. ', ('  ', 'Save', '. ', None)),
+    ('¿Qué?', ('¿', 'Qué', '?', None)),
+    ('...', ('', '...', '', None)),
+    ('{count} items:', ('', '{count} items', ':', None)),
+])
+def test_split_strips_edges_only(text, expected):
+    assert KeyNormalizer().split(text) == expected
+
+
+def test_split_applies_nfc():
+    decomposed = unicodedata.normalize('NFD', 'Café')
+
+    assert KeyNormalizer().split(decomposed)[1] == 'Café'
+
+
+@pytest.mark.parametrize('text, core, style', [
+    ('SAVE', 'save', 'upper'),
+    ('Save', 'save', 'capitalized'),
+    ('save', 'save', 'lower'),
+    ('iPhone', 'iPhone', None),
+])
+def test_casefold_records_style(text, core, style):
+    assert KeyNormalizer(casefold=True).split(text) == ('', core, '', style)
+
+
+def test_variants_share_one_request_and_keep_their_edges():
+    translated, requests = _translate(KeyNormalizer(), 'Save', 'Save.', ' Save ')
+
+    assert requests == ['Save']
+    assert translated == ['<Save>', '<Save>.', ' <Save> ']
+
+
+def test_casefold_restores_case_style():
+    translated, requests = _translate(KeyNormalizer(casefold=True), 'SAVE', 'Save!', 'save')
+
+    assert requests == ['save']
+    assert translated == ['<SAVE>', '<save>!', '<save>']
+
+
+def test_untranslated_core_keeps_original():
+    translator = RecordingTranslator()
+    translator.translate_batch = lambda values, *args: values
+    values = [{'path': 'a', 'original': 'Save.'}]
+
+    NormalizedTranslator(translator, KeyNormalizer()).translate_batch(values)
+
+    assert values[0]['translated'] == 'Save.'
+
+
+def test_from_config():
+    assert KeyNormalizer.from_config({}) is None
+    normalizer = KeyNormalizer.from_config({'normalize_keys': {'enabled': True, 'casefold': True}})
+    assert normalizer.casefold
@@ -0,0 +1,118 @@
+"""
+PathSelector 测试：选择器解析、include / exclude 语义，以及提取时按选择器剪枝
+"""
+
+import pickle
+
+import pytest
+
+from src.extractor import JSONExtractor
+from src.path_selector import FREE, PathSelector, parse_selector
+
+DOCUMENT = {
+    "app": {"name": "My App", "metadata": {"author": "Alice"}},
+    "settings": {"title": "Settings", "url": "https://example.com", "a.b": "Dotted"},
+    "changelog": ["First", "Second", {"note": "Third"}],
+    "pages": [{"metadata": {"slug": "home"}, "body": "Welcome"}],
+}
+
+
+def _paths(include=None, exclude=None, document=DOCUMENT):
+    """按选择器提取，返回路径列表"""
+    selector = PathSelector(include, exclude)
+    return [item['path'] for item in JSONExtractor(selector=selector).extract_from_object(document)]
+
+
+def test_parse_selector_tokens():
+    assert parse_selector('a.b[0].c') == [('key', 'a'), ('key', 'b'), ('index', 0), ('key', 'c')]
+    assert parse_selector('changelog[*]') == [('key', 'changelog'), ('any_index', None)]
+    assert parse_selector('settings.*') == [('key', 'settings'), ('any_key', None)]
+    assert parse_selector('**.url') == [('deep', None), ('key', 'url')]
+    assert parse_selector('settings["a.b"]') == [('key', 'settings'), ('key', 'a.b')]
+    assert parse_selector('["say \\"hi\\""]') == [('key', 'say "hi"')]
+
+
+def test_parse_selector_jsonpath_forms():
+    assert parse_selector('$.app.name') == parse_selector('app.name')
+    assert parse_selector('$..url') == [('deep', None), ('key', 'url')]
+
+
+@pytest.mark.parametrize('selector', ['', '$', 'a[', 'a]'])
+def test_parse_selector_rejects_invalid(selector):
+    with pytest.raises(ValueError):
+        parse_selector(selector)
+
+
+def test_include_selects_whole_subtree():
+    assert _paths(['app']) == ['app.name', 'app.metadata.author']
+
+
+def test_include_wildcards():
+    assert _paths(['settings.*']) == ['settings.title', 'settings.url', 'settings.a.b']
+    assert _paths(['changelog[*]']) == ['changelog[0]', 'changelog[1]', 'changelog[2].note']
+    assert _paths(['changelog[1]']) == ['changelog[1]']
+    assert _paths(['settings["a.b"]']) == ['settings.a.b']
+
+
+def test_deep_matches_any_depth_including_zero():
+    assert _paths(['**.metadata']) == ['app.metadata.author', 'pages[0].metadata.slug']
+    assert _paths(['$..url']) == ['settings.url']
+    assert _paths(['**.name', '**.title']) == ['app.name', 'settings.title']
+
+
+def test_exclude_wins_over_include():
+    assert _paths(['app', 'settings'], ['**.metadata', 'settings.url']) == [
+        'app.name', 'settings.title', 'settings.a.b',
+    ]
+
+
+def test_exclude_only_keeps_everything_else():
+    assert _paths(exclude=['changelog', 'pages']) == [
+        'app.name', 'app.metadata.author', 'settings.title', 'settings.url', 'settings.a.b',
+    ]
+
+
+def test_excluded_root_extracts_nothing():
+    assert PathSelector(exclude=['**']).start() is None
+    assert _paths(exclude=['**']) == []
+
+
+def test_selected_and_free_states():
+    selector = PathSelector(['app'])
+    root = selector.start()
+
+    assert not selector.selected(root)
+    assert selector.step(root, 'settings') is None
+    assert selector.step(root, 'app') == FREE
+    assert selector.selected(FREE)
+
+
+def test_step_results_are_cached_for_unlisted_keys():
+    selector = PathSelector(['**.metadata'])
+    root = selector.start()
+
+    first = selector.step(root, 'anything')
+    assert selector.step(root, 'something-else') == first
+    assert selector.step(root, 'metadata') == FREE
+
+
+def test_from_config_merges_command_line_selectors():
+    processing = {'selectors': {'include': ['app'], 'exclude': ['**.metadata']}}
+
+    selector = PathSelector.from_config(processing, include=['settings'], exclude=['settings.url'])
+
+    assert selector.include == ['app', 'settings']
+    assert selector.exclude == ['**.metadata', 'settings.url']
+    assert PathSelector.from_config({}) is None
+
+
+def test_pickle_round_trip_drops_caches():
+    selector = PathSelector(['**.metadata'], ['pages'])
+    selector.step(selector.start(), 'app')
+
+    restored = pickle.loads(pickle.dumps(selector))
+
+    assert restored.include == selector.include
+    assert restored.exclude == selector.exclude
+    assert restored._memo == {}
+    assert restored.step(restored.start(), 'pages') is None
@@ -0,0 +1,48 @@
+"""
+Profiler 测试：span 嵌套和折叠栈
+"""
+
+import pytest
+
+from src.profiler import Profiler
+
+
+@pytest.fixture
+def profiler():
+    profiler = Profiler()
+    profiler.enable()
+    return profiler
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    with profiler.span('outer'):
+        profiler.record('inner', 1.0)
+
+    assert profiler.report()['stages'] == {}
+
+
+def test_nested_spans_build_collapsed_paths(profiler):
+    with profiler.span('translate.batch'):
+        with profiler.span('request.libre'):
+            pass
+
+    assert set(profiler.collapsed) == {'translate.batch', 'translate.batch;request.libre'}
+    assert profiler.report()['stages']['request.libre']['count'] == 1
+
+
+def test_record_nests_under_open_span(profiler):
+    with profiler.span('translate.batch'):
+        profiler.record('sleep.backoff', 5.0)
+
+    assert profiler.collapsed['translate.batch;sleep.backoff'] == 5.0
+    assert 'sleep.backoff' not in profiler.collapsed
+    # 外部计时的耗时属于子阶段，不计入父 span 的自身耗时
+    assert profiler.collapsed['translate.batch'] < 1.0
+    assert profiler.report()['stages']['sleep.backoff']['total_seconds'] == 5.0
+
+
+def test_record_without_open_span_is_a_root_frame(profiler):
+    profiler.record('sleep.rate_limit', 2.0)
+
+    assert profiler.collapsed == {'sleep.rate_limit': 2.0}
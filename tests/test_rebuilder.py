@@ -0,0 +1,118 @@
+"""
+JSONRebuilder 往返测试：保留格式写出（save_preserving_format）与 rebuild 的结果一致
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.extractor import JSONExtractor
+from src.rebuilder import JSONRebuilder
+
+INPUT_DIR = Path(__file__).resolve().parent.parent / 'data' / 'input'
+INPUT_FILES = sorted(INPUT_DIR.glob('*.json'))
+
+SOURCE = '{"app": {"name": "My App", "version": "1.0.0"},\n "messages": ["Hello", "W\\u00f6rld"]}\n'
+
+
+def _extract(path):
+    """带字节范围提取，返回 (原始 JSON, 值列表)"""
+    return JSONExtractor(track_spans=True).extract_from_file(str(path))
+
+
+def _splice(source_path, source_json, values, output_path):
+    """保留格式写出，返回 (输出文本, 替换数量)"""
+    count = JSONRebuilder(source_json).save_preserving_format(str(source_path), values, str(output_path))
+    return output_path.read_text(encoding='utf-8'), count
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    path = tmp_path / 'source.json'
+    path.write_text(SOURCE, encoding='utf-8')
+    return path
+
+
+def test_rebuild_replaces_values():
+    document = {"app": {"name": "My App", "version": "1.0.0"}, "messages": ["Hello", "World"]}
+    values = [
+        {"path": "app.name", "original": "My App", "translated": "wIj App"},
+        {"path": "app.version", "original": "1.0.0", "translated": "1.0.0"},
+        {"path": "messages[0]", "original": "Hello", "translated": "nuqneH"},
+        {"path": "messages[1]", "original": "World", "translated": "qo'"},
+    ]
+
+    result = JSONRebuilder(document).rebuild(values)
+
+    assert result == {"app": {"name": "wIj App", "version": "1.0.0"}, "messages": ["nuqneH", "qo'"]}
+    assert document["messages"] == ["Hello", "World"]
+
+
+def test_unchanged_file_is_byte_identical(source_file, tmp_path):
+    source_json, values = _extract(source_file)
+    for item in values:
+        item['translated'] = item['original']
+
+    output, count = _splice(source_file, source_json, values, tmp_path / 'output.json')
+
+    assert count == 0
+    assert output == SOURCE
+
+
+def test_spliced_output_matches_rebuild(source_file, tmp_path):
+    source_json, values = _extract(source_file)
+    translations = {"app.name": "wIj App", "messages[0]": "nuqneH"}
+    for item in values:
+        item['translated'] = translations.get(item['path'], item['original'])
+
+    output, count = _splice(source_file, source_json, values, tmp_path / 'output.json')
+
+    assert count == 2
+    assert json.loads(output) == JSONRebuilder(source_json).rebuild(values)
+    # 未变化的值保留原始转义写法
+    assert '"W\\u00f6rld"' in output
+
+
+@pytest.mark.parametrize('path', INPUT_FILES, ids=lambda path: path.name)
+def test_input_files_round_trip(path, tmp_path):
+    source_json, values = _extract(path)
+    assert values
+    unchanged, _ = _splice(path, source_json, [dict(item, translated=item['original']) for item in values],
+                           tmp_path / 'unchanged.json')
+    assert unchanged.encode('utf-8') == path.read_bytes()
+
+    for item in values:
+        item['translated'] = item['original'][::-1] + ' "x"'
+    output, count = _splice(path, source_json, values, tmp_path / 'output.json')
+
+    assert count == len(values)
+    assert json.loads(output) == JSONRebuilder(source_json).rebuild(values)
+
+
+def test_stale_span_is_rejected(source_file, tmp_path):
+    source_json, values = _extract(source_file)
+    for item in values:
+        item['translated'] = item['original'].upper()
+    # 提取后修改源文件，字节范围错位
+    source_file.write_text(SOURCE.replace('"My App"', '"My Application"'), encoding='utf-8')
+    output_path = tmp_path / 'output.json'
+
+    with pytest.raises(ValueError, match='已被修改'):
+        JSONRebuilder(source_json).save_preserving_format(str(source_file), values, str(output_path))
+    assert not output_path.exists()
+
+
+def test_missing_span_is_rejected(tmp_path):
+    values = [{"path": "a", "original": "x", "translated": "y"}]
+
+    with pytest.raises(ValueError, match='字节范围'):
+        JSONRebuilder({"a": "x"}).save_preserving_format(str(tmp_path / 'in.json'), values, str(tmp_path / 'out.json'))
+
+
+def test_top_level_string_is_replaced():
+    values = [{"path": "", "original": "Hello", "translated": "nuqneH"}]
+    rebuilder = JSONRebuilder("Hello")
+
+    assert rebuilder.rebuild(values) == "nuqneH"
+    assert rebuilder.patch("Hello", values) == "nuqneH"
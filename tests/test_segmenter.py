@@ -0,0 +1,91 @@
+"""
+Segmenter 测试：分句边界、占位符保护、原样拼回，以及只重新翻译改动的句子
+"""
+
+import pytest
+
+from src.segmenter import Segmenter, SegmentedTranslator
+
+PARAGRAPH = "Open the file first. Then press {button.save} to keep it! Changes are lost otherwise."
+
+
+class RecordingTranslator:
+    """记录收到的文本并返回大写译文的测试翻译器"""
+
+    def __init__(self):
+        self.requests = []
+
+    def translate_batch(self, values, source_lang='auto', target_lang='en', progress_callback=None):
+        for item in values:
+            self.requests.append(item['original'])
+            item['translated'] = item['original'].upper()
+        return values
+
+
+def _translate(translator, *texts):
+    values = [{'path': f"[{index}]", 'original': text} for index, text in enumerate(texts)]
+    SegmentedTranslator(translator, Segmenter(min_length=40)).translate_batch(values, 'en', 'de')
+    return [item['translated'] for item in values]
+
+
+def test_short_strings_are_not_split():
+    assert Segmenter(min_length=80).split('Short. Text.') == (['Short. Text.'], ['', ''])
+
+
+def test_split_and_join_round_trip():
+    text = f"  {PARAGRAPH}\n\nSecond paragraph.  "
+    segments, separators = Segmenter(min_length=10).split(text)
+
+    assert segments == ['Open the file first.', 'Then press {button.save} to keep it!',
+                        'Changes are lost otherwise.', 'Second paragraph.']
+    assert separators[0] == '  ' and separators[-1] == '  '
+    assert Segmenter.join(segments, separators) == text
+
+
+@pytest.mark.parametrize('text', [
+    'Click {{user. name}} now. Then continue with the next step please.',
+    'Use <a title="Stop. Go"> here. Then continue with the next step please.',
+    'See e.g. the manual for details. Then continue with the next step please.',
+])
+def test_no_boundary_inside_placeholders_or_before_lowercase(text):
+    segments, _ = Segmenter(min_length=10).split(text)
+
+    assert segments[-1] == 'Then continue with the next step please.'
+    assert len(segments) == 2
+
+
+def test_fullwidth_punctuation_splits_without_space():
+    segments, separators = Segmenter(min_length=5).split('第一句。第二句！第三句')
+
+    assert segments == ['第一句。', '第二句！', '第三句']
+    assert Segmenter.join(segments, separators) == '第一句。第二句！第三句'
+
+
+def test_translation_keeps_placeholders_and_spacing():
+    translator = RecordingTranslator()
+
+    assert _translate(translator, PARAGRAPH) == [PARAGRAPH.upper()]
+    assert len(translator.requests) == 3
+
+
+def test_only_changed_sentence_is_requested_again():
+    translator = RecordingTranslator()
+    edited = PARAGRAPH.replace('Changes are lost', 'Edits are lost')
+
+    _translate(translator, PARAGRAPH, edited)
+
+    # 两段共有的句子只翻译一次
+    assert len(translator.requests) == 4
+    assert 'Edits are lost otherwise.' in translator.requests
+
+
+def test_untranslated_sentence_keeps_original():
+    translator = RecordingTranslator()
+    translator.translate_batch = lambda values, *args: values
+
+    assert _translate(translator, PARAGRAPH) == [PARAGRAPH]
+
+
+def test_from_config():
+    assert Segmenter.from_config({}) is None
+    assert Segmenter.from_config({'segmentation': {'enabled': True, 'min_length': 20}}).min_length == 20
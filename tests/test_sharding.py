@@ -0,0 +1,133 @@
+"""
+分片测试：去重与均衡拆分、返回分片的校验，以及 shard_tool export / merge 只重建受影响的文件
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from src.sharding import (affected_values, balance, collect_strings, load_translations, read_shard, text_id,
+                          write_shards)
+from src.translators.base_translator import cache_namespace, make_cache_key
+from src.utils import CacheManager
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _values(mapping):
+    return [{'path': path, 'original': text} for path, text in mapping.items()]
+
+
+def _read_jsonl(path):
+    return [json.loads(line) for line in Path(path).read_text(encoding='utf-8').splitlines() if line.strip()]
+
+
+def test_collect_strings_deduplicates_across_files(tmp_path):
+    scanned = [
+        (str(tmp_path / 'a.json'), _values({'title': 'Save', 'blank': '  ', 'body': 'Open'})),
+        (str(tmp_path / 'sub' / 'b.json'), _values({'button': 'Save'})),
+    ]
+
+    strings, index = collect_strings(scanned, tmp_path)
+
+    assert [info['text'] for info in strings.values()] == ['Save', 'Open']
+    assert strings[text_id('Save')] == {'text': 'Save', 'count': 2, 'context': 'title'}
+    assert index == [
+        {'file': 'a.json', 'values': [['title', text_id('Save')], ['body', text_id('Open')]]},
+        {'file': 'sub/b.json', 'values': [['button', text_id('Save')]]},
+    ]
+
+
+def test_balance_evens_out_sizes_and_keeps_order():
+    groups = balance([10, 1, 8, 3, 5, 2], 2)
+
+    assert sorted(sum(groups, [])) == list(range(6))
+    assert all(group == sorted(group) for group in groups)
+    totals = [sum([10, 1, 8, 3, 5, 2][i] for i in group) for group in groups]
+    assert max(totals) - min(totals) <= 1
+
+
+def test_write_shards_caps_shard_count(tmp_path):
+    strings, _ = collect_strings([(str(tmp_path / 'a.json'), _values({'a': 'One', 'b': 'Three'}))], tmp_path)
+
+    manifest = write_shards(strings, 5, tmp_path)
+
+    assert [shard['name'] for shard in manifest] == ['shard-001.jsonl', 'shard-002.jsonl']
+    assert sum(shard['chars'] for shard in manifest) == len('One') + len('Three')
+    records = _read_jsonl(tmp_path / 'shard-001.jsonl') + _read_jsonl(tmp_path / 'shard-002.jsonl')
+    assert {record['source'] for record in records} == {'One', 'Three'}
+    assert all(record['translation'] == '' and record['id'] == text_id(record['source']) for record in records)
+
+
+def test_read_shard_validates_records(tmp_path):
+    path = tmp_path / 'shard-001.jsonl'
+    path.write_text('\n'.join([
+        json.dumps({'id': text_id('Save'), 'source': 'Save', 'translation': 'Speichern'}),
+        json.dumps({'id': text_id('Open'), 'source': 'Open', 'translation': ''}),
+        json.dumps({'id': text_id('Open'), 'source': 'Opened', 'translation': 'Geöffnet'}),
+        '{broken',
+        '',
+    ]), encoding='utf-8')
+
+    result = read_shard(str(path))
+
+    assert result['records'] == [(text_id('Save'), 'Save', 'Speichern')]
+    assert (result['empty'], result['mismatched'], result['invalid']) == (1, 1, 1)
+    assert result['errors'][0].startswith('第 4 行')
+
+
+def test_affected_values_only_for_changed_files():
+    entry = {'file': 'a.json', 'values': [['title', text_id('Save')], ['body', text_id('Open')]]}
+    translations = {text_id('Save'): ('Save', 'Speichern')}
+
+    assert affected_values(entry, translations, {text_id('Close')}) is None
+    assert affected_values(entry, translations, {text_id('Save')}) == [
+        {'path': 'title', 'original': 'Save', 'translated': 'Speichern'},
+    ]
+    assert affected_values(entry, {}, None) == []
+
+
+def _shard_tool(*args):
+    completed = subprocess.run([sys.executable, str(ROOT / 'scripts' / 'shard_tool.py'), *args],
+                               capture_output=True, text=True, cwd=ROOT, check=True)
+    return completed.stdout
+
+
+def test_export_and_merge_rebuilds_affected_files(tmp_path):
+    source = tmp_path / 'en'
+    (source / 'sub').mkdir(parents=True)
+    (source / 'a.json').write_text(json.dumps({'title': 'Save', 'body': 'Open the file'}), encoding='utf-8')
+    (source / 'sub' / 'b.json').write_text(json.dumps({'button': 'Save', 'hint': 'Close'}), encoding='utf-8')
+    (source / 'c.json').write_text(json.dumps({'help': 'Press any key to continue'}), encoding='utf-8')
+    shards = tmp_path / 'shards'
+    output = tmp_path / 'zh'
+    cache_dir = tmp_path / 'cache'
+    common = ['-c', str(tmp_path / 'missing.json'), '--cache-dir', str(cache_dir)]
+
+    _shard_tool(*common, 'export', str(source), '-o', str(shards), '--shards', '2', '--translator', 'reverse',
+                '--source-lang', 'en', '--target-lang', 'zh', '--workers', '0')
+
+    manifest = json.loads((shards / 'manifest.json').read_text(encoding='utf-8'))
+    assert (manifest['files'], manifest['strings'], manifest['occurrences']) == (3, 4, 5)
+    # 按字符数均衡：最长的字符串单独一个分片
+    assert [(shard['strings'], shard['chars']) for shard in manifest['shards']] == [(1, 25), (3, 22)]
+
+    # 只返回 "Save" 的译文：包含它的两个文件被重建，c.json 不受影响
+    returned = tmp_path / 'vendor.jsonl'
+    returned.write_text(json.dumps({'id': text_id('Save'), 'source': 'Save', 'translation': '保存'},
+                                   ensure_ascii=False) + '\n', encoding='utf-8')
+    _shard_tool(*common, 'merge', str(shards), str(returned), '-o', str(output), '--workers', '0')
+
+    assert json.loads((output / 'a.json').read_text(encoding='utf-8')) == {'title': '保存', 'body': 'Open the file'}
+    assert json.loads((output / 'sub' / 'b.json').read_text(encoding='utf-8')) == {'button': '保存', 'hint': 'Close'}
+    assert not (output / 'c.json').exists()
+    assert load_translations(shards) == {text_id('Save'): ('Save', '保存')}
+    key = make_cache_key(cache_namespace('reverse', {}), 'Save', 'en', 'zh')
+    assert CacheManager(str(cache_dir)).get(key) == '保存'
+
+    # 内容未变化的返回文件不会重复合并
+    stdout = _shard_tool(*common, 'merge', str(shards), str(returned), '-o', str(output), '--workers', '0')
+    assert '跳过未变化的 1 个' in stdout
+    assert '新译文 0 条' in stdout
+    assert len(_read_jsonl(shards / 'translations.jsonl')) == 1
@@ -0,0 +1,169 @@
+"""
+网络路径回归测试：在进程内启动服务桩（benchmarks/stub_server.py），
+校验 LibreTranslator / KlingonTranslator 的批量请求、429 / 5xx 重试次数和退避等待
+"""
+
+import pytest
+
+pytest.importorskip('requests')
+
+import requests
+
+from benchmarks.bench_network import build_config
+from benchmarks.stub_server import StubTranslationServer, default_transform
+from src.metrics import RETRIES
+from src.translators import create_translator
+from src.translators import klingon_translator, libre_translator
+
+TEXTS = ['Hello world', 'Open the file', 'Save changes']
+MAX_RETRIES = 3
+
+
+class FlakyServer(StubTranslationServer):
+    """前 failures 个翻译请求返回 503，之后正常响应"""
+
+    def __init__(self, failures: int, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+
+    def respond(self, api, route, params):
+        with self.lock:
+            fail = self.failures > 0
+            self.failures -= fail
+        if fail:
+            self._record_status(503)
+            return 503, {'error': 'Injected server error'}, {}
+        return super().respond(api, route, params)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """记录退避和速率限制等待，不真正 sleep"""
+    calls = []
+
+    def fake_sleep(seconds, name='sleep.backoff'):
+        calls.append((seconds, name))
+
+    monkeypatch.setattr(libre_translator, 'timed_sleep', fake_sleep)
+    monkeypatch.setattr(klingon_translator, 'timed_sleep', fake_sleep)
+    return calls
+
+
+def _translator(translator_id, server):
+    return create_translator(translator_id, build_config(server, MAX_RETRIES, 2))
+
+
+def _values(texts=TEXTS):
+    return [{'path': f"[{index}]", 'original': text} for index, text in enumerate(texts)]
+
+
+def _retries(translator_id, action):
+    """执行 action，返回期间增加的重试次数"""
+    before = RETRIES.value(translator=translator_id)
+    result = action()
+    return result, RETRIES.value(translator=translator_id) - before
+
+
+def test_stub_translates_array_q():
+    with StubTranslationServer() as server:
+        response = requests.post(server.libre_url, json={'q': TEXTS, 'source': 'en', 'target': 'de'}, timeout=5)
+        stats = server.get_stats()
+
+    assert response.status_code == 200
+    assert response.json()['translatedText'] == [default_transform(text, 'en', 'de') for text in TEXTS]
+    assert stats['requests'] == 1
+    assert stats['texts'] == len(TEXTS)
+
+
+def test_libre_sends_one_text_per_request():
+    with StubTranslationServer() as server:
+        values = _translator('libre', server).translate_batch(_values(), 'en', 'de')
+        stats = server.get_stats()
+
+    assert [item['translated'] for item in values] == [default_transform(text, 'en', 'de') for text in TEXTS]
+    assert stats['requests'] == len(TEXTS)
+    assert stats['status_codes'] == {'200': len(TEXTS)}
+
+
+def test_klingon_merges_batch_into_one_request():
+    with StubTranslationServer() as server:
+        values = _translator('klingon', server).translate_batch(_values())
+        stats = server.get_stats()
+
+    assert [item['translated'] for item in values] == [default_transform(text, 'en', 'klingon') for text in TEXTS]
+    assert stats['requests'] == 1
+    assert stats['texts'] == 1
+
+
+def test_klingon_waits_retry_after_on_429(sleeps):
+    with StubTranslationServer(rate_limit_ratio=1.0, retry_after=7) as server:
+        translator = _translator('klingon', server)
+        translated, retries = _retries('klingon', lambda: translator.translate('Hello world'))
+        stats = server.get_stats()
+
+    assert translated is None
+    assert translator.last_error == 'transient'
+    assert stats['status_codes'] == {'429': MAX_RETRIES}
+    assert retries == MAX_RETRIES - 1
+    # 每次 429 都按 Retry-After 等待
+    assert sleeps == [(7, 'sleep.rate_limit')] * MAX_RETRIES
+
+
+def test_libre_backs_off_on_429(sleeps):
+    with StubTranslationServer(rate_limit_ratio=1.0, retry_after=7) as server:
+        translator = _translator('libre', server)
+        translated, retries = _retries('libre', lambda: translator.translate('Hello world', 'en', 'de'))
+        stats = server.get_stats()
+
+    assert translated is None
+    assert stats['status_codes'] == {'429': MAX_RETRIES}
+    assert retries == MAX_RETRIES - 1
+    # LibreTranslator 不读取 Retry-After，按指数退避等待
+    assert sleeps == [(1, 'sleep.backoff'), (2, 'sleep.backoff')]
+
+
+def test_throughput_cap_below_one_request_per_second():
+    with StubTranslationServer(max_rps=0.5) as server:
+        statuses = [requests.post(server.libre_url, json={'q': 'Hello'}, timeout=5).status_code
+                    for _ in range(2)]
+
+    # 第一个请求使用初始令牌，紧接着的第二个请求超出每 2 秒 1 次的限额
+    assert statuses == [200, 429]
+
+
+@pytest.mark.parametrize('translator_id', ['libre', 'klingon'])
+def test_recovers_after_transient_5xx(translator_id, sleeps):
+    with FlakyServer(failures=1) as server:
+        translator = _translator(translator_id, server)
+        translated, retries = _retries(translator_id, lambda: translator.translate('Hello world', 'en', 'de'))
+        stats = server.get_stats()
+
+    assert translated == default_transform('Hello world', 'en', 'de')
+    assert stats['status_codes'] == {'503': 1, '200': 1}
+    assert retries == 1
+    assert sleeps == [(1, 'sleep.backoff')]
+
+
+def test_libre_keeps_original_after_persistent_5xx(sleeps):
+    with StubTranslationServer(error_ratio=1.0, error_status=502) as server:
+        translator = _translator('libre', server)
+        values, retries = _retries('libre', lambda: translator.translate_batch(_values(TEXTS[:1]), 'en', 'de'))
+        stats = server.get_stats()
+
+    assert values[0]['translated'] == TEXTS[0]
+    assert translator.last_error == 'transient'
+    assert stats['status_codes'] == {'502': MAX_RETRIES}
+    assert retries == MAX_RETRIES - 1
+
+
+def test_klingon_batch_falls_back_to_single_requests_after_5xx(sleeps):
+    texts = TEXTS[:2]
+    with StubTranslationServer(error_ratio=1.0) as server:
+        translator = _translator('klingon', server)
+        values, retries = _retries('klingon', lambda: translator.translate_batch(_values(texts)))
+        stats = server.get_stats()
+
+    assert [item['translated'] for item in values] == texts
+    # 合并请求重试 MAX_RETRIES 次，之后每个文本各自重试 MAX_RETRIES 次
+    assert stats['status_codes'] == {'503': MAX_RETRIES * (1 + len(texts))}
+    assert retries == (MAX_RETRIES - 1) * (1 + len(texts))
@@ -0,0 +1,178 @@
+"""
+--watch 测试：FileWatcher 的去抖动与排除目录，WatchSession 只翻译变化的值、修补输出和重试
+"""
+
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from src.extractor import JSONExtractor
+from src.watcher import FileWatcher, WatchSession
+
+
+class RecordingTranslator:
+    """把原文转成大写，记录每次交给翻译器的原文；failing 中的原文保持不变（模拟翻译失败）"""
+
+    def __init__(self, failing=()):
+        self.calls = []
+        self.failing = set(failing)
+
+    def translate_batch(self, values, source_lang, target_lang):
+        self.calls.append([item['original'] for item in values])
+        return [{**item, 'translated': item['original'] if item['original'] in self.failing
+                 else item['original'].upper()} for item in values]
+
+
+def _write_json(path, data):
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+
+
+def _read_json(path):
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def _session(translator, tmp_path, data):
+    input_path = tmp_path / 'en.json'
+    output_path = tmp_path / 'out' / 'zh.json'
+    output_path.parent.mkdir()
+    _write_json(input_path, data)
+    session = WatchSession(translator, 'en', 'zh', JSONExtractor)
+    session.add(str(input_path), str(output_path))
+    return session, str(input_path), input_path, output_path
+
+
+@pytest.fixture
+def watched_dir(tmp_path):
+    (tmp_path / 'out').mkdir()
+    (tmp_path / 'a.json').write_text('{}', encoding='utf-8')
+    return tmp_path
+
+
+def test_polling_watcher_debounces_a_burst_of_writes(watched_dir):
+    watcher = FileWatcher([str(watched_dir)], debounce=0.15, poll_interval=0.02, backend='polling')
+    target = watched_dir / 'a.json'
+
+    def burst():
+        for number in range(3):
+            target.write_text(json.dumps({'n': number}) + ' ' * number, encoding='utf-8')
+            time.sleep(0.03)
+
+    thread = threading.Thread(target=burst)
+    thread.start()
+    try:
+        changed = watcher.wait(timeout=2)
+    finally:
+        thread.join()
+
+    assert watcher.backend == 'polling'
+    assert changed == {str(target)}
+    assert watcher.wait(timeout=0.2) == set()
+
+
+def test_polling_watcher_ignores_excluded_and_unmatched_files(watched_dir):
+    watcher = FileWatcher([str(watched_dir)], debounce=0.05, poll_interval=0.02, backend='polling',
+                          exclude=[str(watched_dir / 'out')])
+
+    (watched_dir / 'out' / 'zh.json').write_text('{"a": 1}', encoding='utf-8')
+    (watched_dir / 'notes.txt').write_text('x', encoding='utf-8')
+    assert watcher.wait(timeout=0.2) == set()
+
+    new_file = watched_dir / 'b.json'
+    new_file.write_text('{}', encoding='utf-8')
+    assert watcher.wait(timeout=2) == {str(new_file)}
+
+    new_file.unlink()
+    assert watcher.wait(timeout=2) == {str(new_file)}
+
+
+@pytest.mark.skipif(not hasattr(os, 'uname') or os.uname().sysname != 'Linux', reason='inotify 仅在 Linux 上可用')
+def test_inotify_watcher_sees_atomic_rename_saves(watched_dir):
+    watcher = FileWatcher([str(watched_dir / 'a.json')], debounce=0.05)
+    try:
+        if watcher.backend != 'inotify':
+            pytest.skip('inotify 不可用')
+        temporary = watched_dir / '.a.json.tmp'
+        temporary.write_text('{"saved": true}', encoding='utf-8')
+        os.replace(temporary, watched_dir / 'a.json')
+
+        assert watcher.wait(timeout=2) == {str(watched_dir / 'a.json')}
+    finally:
+        watcher.close()
+
+
+def test_session_translates_only_changed_values_and_patches_output(tmp_path):
+    translator = RecordingTranslator()
+    session, key, input_path, output_path = _session(translator, tmp_path, {'a': 'save', 'b': ['open', 'close']})
+
+    first = session.update(key)
+    assert (first['values'], first['changed'], first['written'], first['patched']) == (3, 3, True, False)
+    assert _read_json(output_path) == {'a': 'SAVE', 'b': ['OPEN', 'CLOSE']}
+
+    _write_json(input_path, {'a': 'save', 'b': ['open', 'quit']})
+    second = session.update(key)
+
+    assert translator.calls[-1] == ['quit']
+    assert (second['changed'], second['patched']) == (1, True)
+    assert _read_json(output_path) == {'a': 'SAVE', 'b': ['OPEN', 'QUIT']}
+
+
+def test_session_rebuilds_when_structure_changes(tmp_path):
+    translator = RecordingTranslator()
+    session, key, input_path, output_path = _session(translator, tmp_path, {'a': 'save', 'n': 1})
+    session.update(key)
+
+    _write_json(input_path, {'a': 'save', 'n': 2, 'c': 'new'})
+    stats = session.update(key)
+
+    assert translator.calls[-1] == ['new']
+    assert (stats['changed'], stats['written'], stats['patched']) == (1, True, False)
+    assert _read_json(output_path) == {'a': 'SAVE', 'n': 2, 'c': 'NEW'}
+
+    _write_json(input_path, {'a': 'save'})
+    stats = session.update(key)
+    assert (stats['removed'], stats['patched']) == (1, False)
+    assert _read_json(output_path) == {'a': 'SAVE'}
+
+
+def test_session_retries_values_left_untranslated(tmp_path):
+    translator = RecordingTranslator(failing={'open'})
+    session, key, input_path, output_path = _session(translator, tmp_path, {'a': 'save', 'b': 'open'})
+    session.update(key)
+    assert session.retry[key] == {'b'}
+    assert _read_json(output_path) == {'a': 'SAVE', 'b': 'open'}
+
+    # 原文未变，失败的值仍会重试；结果仍是原文时不重写输出
+    stats = session.update(key)
+    assert translator.calls[-1] == ['open']
+    assert stats['written'] is False
+
+    translator.failing.clear()
+    stats = session.update(key)
+    assert translator.calls[-1] == ['open']
+    assert stats['patched'] is True
+    assert session.retry[key] == set()
+    assert _read_json(output_path) == {'a': 'SAVE', 'b': 'OPEN'}
+
+
+def test_session_patches_top_level_string(tmp_path):
+    translator = RecordingTranslator()
+    session, key, input_path, output_path = _session(translator, tmp_path, 'hello')
+    session.update(key)
+    assert _read_json(output_path) == 'HELLO'
+
+    _write_json(input_path, 'world')
+    stats = session.update(key)
+
+    assert stats['patched'] is True
+    assert _read_json(output_path) == 'WORLD'
+
+
+def test_session_ignores_unregistered_and_deleted_files(tmp_path):
+    session, key, input_path, _ = _session(RecordingTranslator(), tmp_path, {'a': 'save'})
+
+    assert session.update(str(tmp_path / 'other.json')) is None
+    input_path.unlink()
+    assert session.update(key) is None